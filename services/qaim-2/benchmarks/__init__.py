@@ -0,0 +1,7 @@
+"""
+QAIM-2 Benchmarks
+
+Synthetic workload generator and load harness for the QAIM-2 service.
+"""
+
+__all__ = []
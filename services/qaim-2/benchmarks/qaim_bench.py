@@ -0,0 +1,505 @@
+#!/usr/bin/env python3
+"""
+QAIM-2 Benchmark Harness
+
+Generates synthetic problem families, drives the orchestrator in
+closed-loop (fixed concurrency) or open-loop (Poisson arrivals) mode and
+reports throughput, end-to-end and per-stage latency percentiles and the
+peak RSS of each run. Results are written as JSON; ``compare`` flags regressions between
+two result files (e.g. two commits). ``features`` times SM structural
+feature extraction alone against its latency budget.
+
+Usage:
+    python benchmarks/qaim_bench.py run --family routing --sizes 10,1000 \\
+        --mode closed --concurrency 8 --requests 200 --output bench.json
+    python benchmarks/qaim_bench.py compare baseline.json bench.json
+    python benchmarks/qaim_bench.py features --nnz 100000
+"""
+
+from typing import Dict, Any, List, Optional
+from pathlib import Path
+import argparse
+import asyncio
+import json
+import platform
+import resource
+import subprocess
+import sys
+import time
+
+import numpy as np
+import yaml
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from core.qaim_orchestrator import QAIM2Orchestrator
+from bridges.pcan import ProblemCanonicalizer
+from bridges.surrogate_models import SurrogateModels
+
+
+FAMILIES = ('routing', 'allocation', 'qubo_lanes')
+
+DEFAULT_SIZES = (10, 100, 1000, 10000)
+
+DEFAULT_CONFIG = Path(__file__).parent.parent / 'config' / 'deployment-edge.yaml'
+
+PERCENTILES = (50, 95, 99)
+
+# SM structural feature extraction budget (p50) at 100k nonzeros
+FEATURE_BUDGET_MS = 5.0
+
+# qubo_lanes couples every slot to the next, so its constraint graph is one
+# chain of 12.5k slots at 100k nonzeros. Component labelling needs about
+# log2(chain length) = 14 pointer-jumping passes over all variables where
+# the other families need two or three, which puts its p50 at 6 to 7 ms.
+FAMILY_FEATURE_BUDGET_MS = {'qubo_lanes': 8.0}
+
+
+def generate_problem(family: str, size: int, seed: int = 0) -> Dict[str, Any]:
+    """
+    Generate a synthetic problem with ``size`` decision variables.
+
+    Families:
+        routing: binary arc variables, one assignment row per customer
+            (groups of up to 8 arcs) and a fleet capacity row
+        allocation: bounded integer allocations, one capacity row per
+            resource (groups of up to 16 tasks), maximize value
+        qubo_lanes: binary lane choices, one-hot rows per slot (4 lanes)
+            and quadratic conflict penalties between neighbouring slots
+
+    Problems are deterministic for a (family, size, seed) triple.
+    """
+    if family not in FAMILIES:
+        raise ValueError(f"Unknown benchmark family: {family}")
+    rng = np.random.default_rng(seed)
+    names = [f'x{i}' for i in range(size)]
+
+    if family == 'routing':
+        cost = rng.uniform(1.0, 100.0, size).round(2)
+        load = rng.integers(1, 20, size)
+        groups = np.array_split(np.arange(size), max(1, size // 8))
+        constraints = [
+            {'type': 'assignment', 'name': f'visit_{k}', 'sense': '=', 'rhs': 1,
+             'coefficients': {names[i]: 1.0 for i in group}}
+            for k, group in enumerate(groups)
+        ]
+        constraints.append({
+            'type': 'capacity', 'name': 'fleet', 'sense': '<=', 'rhs': float(load.sum() // 2),
+            'coefficients': dict(zip(names, load.tolist()))
+        })
+        return {
+            'problem_type': 'vehicle_routing',
+            'variables': [{'name': n, 'type': 'binary'} for n in names],
+            'constraints': constraints,
+            'objectives': [{'name': 'distance', 'sense': 'minimize',
+                            'coefficients': dict(zip(names, cost.tolist()))}]
+        }
+
+    if family == 'allocation':
+        value = rng.uniform(1.0, 10.0, size).round(3)
+        demand = rng.uniform(0.5, 5.0, size).round(3)
+        groups = np.array_split(np.arange(size), max(1, size // 16))
+        return {
+            'problem_type': 'resource_allocation',
+            'variables': [
+                {'name': n, 'type': 'integer', 'lower_bound': 0, 'upper_bound': 10}
+                for n in names
+            ],
+            'constraints': [
+                {'type': 'capacity', 'name': f'resource_{k}', 'sense': '<=',
+                 'rhs': float(demand[group].sum() * 3),
+                 'coefficients': {names[i]: float(demand[i]) for i in group}}
+                for k, group in enumerate(groups)
+            ],
+            'objectives': [{'name': 'value', 'sense': 'maximize',
+                            'coefficients': dict(zip(names, value.tolist()))}]
+        }
+
+    # qubo_lanes: slot s chooses one of 4 lanes x[4s..4s+3]
+    lanes = 4
+    slots = max(1, size // lanes)
+    objective = dict(zip(names, rng.uniform(0.0, 1.0, size).round(3).tolist()))
+    conflict = rng.uniform(0.5, 2.0, size).round(3)
+    for i in range(lanes, size):
+        objective[f'{names[i - lanes]}*{names[i]}'] = float(conflict[i])
+    return {
+        'problem_type': 'general_qubo',
+        'variables': [{'name': n, 'type': 'binary'} for n in names],
+        'constraints': [
+            {'type': 'one_hot', 'name': f'slot_{s}', 'sense': '=', 'rhs': 1,
+             'coefficients': {names[i]: 1.0 for i in range(s * lanes, min((s + 1) * lanes, size))}}
+            for s in range(slots)
+        ],
+        'objectives': [{'name': 'lane_cost', 'sense': 'minimize', 'coefficients': objective}]
+    }
+
+
+def load_config(path: Path, sample_rate: float, result_cache: bool) -> Dict[str, Any]:
+    """Deployment config tuned for benchmarking: full tracing, no side effects."""
+    with open(path) as f:
+        config = yaml.safe_load(f)
+    config['tracing'] = dict(config.get('tracing', {}), enabled=True, sample_rate=sample_rate)
+    config['tracing'].pop('metrics_port', None)
+    config.pop('monitoring', None)
+    config['map'] = dict(config.get('map', {}), sinks=['broker'])
+    config['evidence_store'] = {'enabled': False}
+    config['result_cache'] = dict(config.get('result_cache', {}), enabled=result_cache)
+    config['learning'] = dict(config.get('learning', {}), state_path=None)
+    return config
+
+
+def percentiles(values: List[float]) -> Dict[str, float]:
+    """p50/p95/p99 (and mean) of a list of milliseconds."""
+    if not values:
+        return {}
+    data = np.asarray(values)
+    summary = {f'p{p}_ms': float(np.percentile(data, p)) for p in PERCENTILES}
+    summary['mean_ms'] = float(data.mean())
+    return summary
+
+
+def reset_peak_rss() -> bool:
+    """
+    Reset this process's RSS high-water mark (Linux VmHWM).
+
+    Returns:
+        True if the reset took effect, so peak_rss_mb() covers only what
+        ran since; False where the kernel does not support it
+    """
+    try:
+        with open('/proc/self/clear_refs', 'w') as f:
+            f.write('5')
+        return True
+    except OSError:
+        return False
+
+
+def peak_rss_mb() -> float:
+    """
+    Peak resident set size of this process in MiB.
+
+    Reads VmHWM (reset by reset_peak_rss()) on Linux, otherwise falls back
+    to ru_maxrss, which is the peak over the process lifetime.
+    """
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in KiB on Linux, bytes on macOS
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+async def run_closed(orchestrator, problems, constraints, requests: int, concurrency: int) -> list:
+    """Keep ``concurrency`` requests in flight until ``requests`` complete."""
+    samples = []
+    issued = 0
+
+    async def worker():
+        nonlocal issued
+        while issued < requests:
+            problem = problems[issued % len(problems)]
+            issued += 1
+            started = time.perf_counter()
+            result = await orchestrator.optimize(problem, constraints)
+            samples.append((time.perf_counter() - started, result))
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return samples
+
+
+async def run_open(orchestrator, problems, constraints, requests: int, rate: float, seed: int) -> list:
+    """
+    Issue requests at Poisson arrival times with mean ``rate`` req/s.
+
+    Latency is measured from the scheduled arrival, so queueing caused by
+    a saturated service is included (no coordinated omission).
+    """
+    rng = np.random.default_rng(seed)
+    arrivals = np.cumsum(rng.exponential(1.0 / rate, requests))
+    loop = asyncio.get_running_loop()
+    origin = loop.time()
+    samples = []
+
+    async def one(index: int):
+        scheduled = origin + float(arrivals[index])
+        await asyncio.sleep(max(0.0, scheduled - loop.time()))
+        result = await orchestrator.optimize(problems[index % len(problems)], constraints)
+        samples.append((loop.time() - scheduled, result))
+
+    await asyncio.gather(*(one(i) for i in range(requests)))
+    return samples
+
+
+async def run_benchmark(
+    family: str,
+    size: int,
+    mode: str = 'closed',
+    requests: int = 100,
+    concurrency: int = 8,
+    rate: float = 20.0,
+    variants: int = 4,
+    seed: int = 0,
+    config_path: Path = DEFAULT_CONFIG,
+    sample_rate: float = 1.0,
+    result_cache: bool = False,
+    time_limit: float = 60.0
+) -> Dict[str, Any]:
+    """
+    Run one benchmark configuration and summarize it.
+
+    ``variants`` distinct problems of the family are generated and issued
+    round-robin. Identical re-submissions hit the PCAN cache (and the
+    result cache when enabled), as they would in production.
+
+    ``peak_rss_mb`` is this process's high-water mark over the run
+    (``peak_rss_scope`` 'run'), or over the process lifetime where it
+    cannot be reset ('process'). Solver worker processes are not included.
+    """
+    rss_scope = 'run' if reset_peak_rss() else 'process'
+    started = time.perf_counter()
+    problems = [generate_problem(family, size, seed + v) for v in range(max(1, variants))]
+    generation_s = time.perf_counter() - started
+
+    orchestrator = QAIM2Orchestrator(load_config(config_path, sample_rate, result_cache))
+    constraints = {'time_limit': time_limit}
+    try:
+        started = time.perf_counter()
+        if mode == 'closed':
+            samples = await run_closed(orchestrator, problems, constraints, requests, concurrency)
+        elif mode == 'open':
+            samples = await run_open(orchestrator, problems, constraints, requests, rate, seed)
+        else:
+            raise ValueError(f"Unknown benchmark mode: {mode}")
+        elapsed = time.perf_counter() - started
+    finally:
+        await orchestrator.close()
+
+    status = {}
+    solvers = {}
+    stages = {}
+    for _, result in samples:
+        status[result['status']] = status.get(result['status'], 0) + 1
+        solvers[result['solver']] = solvers.get(result['solver'], 0) + 1
+        for stage, ms in result['metrics'].get('stage_ms', {}).items():
+            stages.setdefault(stage, []).append(ms)
+
+    return {
+        'family': family,
+        'size': size,
+        'mode': mode,
+        'requests': len(samples),
+        'concurrency': concurrency if mode == 'closed' else None,
+        'offered_rate': rate if mode == 'open' else None,
+        'elapsed_s': elapsed,
+        'throughput_rps': len(samples) / elapsed if elapsed > 0 else 0.0,
+        'latency': percentiles([seconds * 1e3 for seconds, _ in samples]),
+        'stages': {stage: percentiles(values) for stage, values in stages.items()},
+        'status': status,
+        'solvers': solvers,
+        'generation_s': generation_s,
+        'peak_rss_mb': peak_rss_mb(),
+        'peak_rss_scope': rss_scope
+    }
+
+
+async def bench_features(
+    family: str,
+    nnz: int,
+    repeats: int = 50,
+    seed: int = 0,
+    budget_ms: Optional[float] = None
+) -> Dict[str, Any]:
+    """
+    Time SM structural feature extraction for a problem with about ``nnz``
+    nonzeros (constraint matrix entries plus quadratic terms).
+
+    The problem is canonicalized once; only ``extract_features`` is timed.
+    ``budget_ms`` defaults to the family's budget.
+    """
+    if budget_ms is None:
+        budget_ms = FAMILY_FEATURE_BUDGET_MS.get(family, FEATURE_BUDGET_MS)
+    # routing and qubo_lanes have two nonzeros per variable
+    size = max(10, nnz if family == 'allocation' else nnz // 2)
+    canonical = await ProblemCanonicalizer({}).canonicalize(generate_problem(family, size, seed))
+    surrogate = SurrogateModels({})
+
+    samples = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        await surrogate.extract_features(canonical)
+        samples.append((time.perf_counter() - started) * 1e3)
+
+    latency = percentiles(samples)
+    return {
+        'family': family,
+        'size': size,
+        'nnz': canonical.A.nnz + canonical.obj_quad[0].size + canonical.con_quad[0].size,
+        'repeats': repeats,
+        'latency': latency,
+        'budget_ms': budget_ms,
+        'within_budget': latency['p50_ms'] <= budget_ms
+    }
+
+
+def git_commit() -> Optional[str]:
+    """Current commit of the working tree, if available."""
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=Path(__file__).parent,
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(baseline: Dict[str, Any], current: Dict[str, Any], threshold: float = 0.1) -> List[Dict[str, Any]]:
+    """
+    Compare two result files run by run.
+
+    A run regresses when throughput drops, or p95/p99 latency grows, by
+    more than ``threshold`` (relative).
+
+    Returns:
+        One entry per run present in both files, with relative changes
+        and a regression flag
+    """
+    def key(run):
+        return (run['family'], run['size'], run['mode'], run.get('concurrency'), run.get('offered_rate'))
+
+    previous = {key(run): run for run in baseline['runs']}
+    report = []
+    for run in current['runs']:
+        base = previous.get(key(run))
+        if base is None:
+            continue
+        changes = {'throughput_rps': _change(base['throughput_rps'], run['throughput_rps'])}
+        for p in ('p95_ms', 'p99_ms'):
+            changes[p] = _change(base['latency'].get(p), run['latency'].get(p))
+        regressed = (
+            changes['throughput_rps'] < -threshold
+            or any(changes[p] > threshold for p in ('p95_ms', 'p99_ms'))
+        )
+        report.append({
+            'family': run['family'], 'size': run['size'], 'mode': run['mode'],
+            'changes': changes, 'regressed': regressed
+        })
+    return report
+
+
+def _change(old: Optional[float], new: Optional[float]) -> float:
+    if not old or new is None:
+        return 0.0
+    return (new - old) / old
+
+
+def parse_sizes(text: str) -> List[int]:
+    """Comma-separated sizes; accepts 1e6 style values."""
+    return [int(float(part)) for part in text.split(',') if part.strip()]
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description='QAIM-2 benchmark harness')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    run = commands.add_parser('run', help='run benchmarks and write JSON results')
+    run.add_argument('--family', choices=FAMILIES + ('all',), default='all')
+    run.add_argument('--sizes', type=parse_sizes, default=list(DEFAULT_SIZES),
+                     help='comma-separated variable counts (10 to 1e6)')
+    run.add_argument('--mode', choices=('closed', 'open'), default='closed')
+    run.add_argument('--requests', type=int, default=100)
+    run.add_argument('--concurrency', type=int, default=8, help='closed loop: requests in flight')
+    run.add_argument('--rate', type=float, default=20.0, help='open loop: arrivals per second')
+    run.add_argument('--variants', type=int, default=4, help='distinct problems per family and size')
+    run.add_argument('--seed', type=int, default=0)
+    run.add_argument('--config', type=Path, default=DEFAULT_CONFIG)
+    run.add_argument('--sample-rate', type=float, default=1.0, help='tracing sample rate')
+    run.add_argument('--result-cache', action='store_true', help='keep the result cache enabled')
+    run.add_argument('--time-limit', type=float, default=60.0)
+    run.add_argument('--output', type=Path, default=Path('qaim-bench.json'))
+
+    cmp = commands.add_parser('compare', help='compare two result files')
+    cmp.add_argument('baseline', type=Path)
+    cmp.add_argument('current', type=Path)
+    cmp.add_argument('--threshold', type=float, default=0.1, help='relative regression threshold')
+
+    feat = commands.add_parser('features', help='time SM feature extraction against its budget')
+    feat.add_argument('--family', choices=FAMILIES + ('all',), default='all')
+    feat.add_argument('--nnz', type=parse_sizes, default=[100000],
+                      help='comma-separated constraint matrix nonzero counts')
+    feat.add_argument('--repeats', type=int, default=50)
+    feat.add_argument('--budget-ms', type=float, default=None,
+                      help=f'p50 budget for every family (default {FEATURE_BUDGET_MS:g} ms, '
+                           f'qubo_lanes {FAMILY_FEATURE_BUDGET_MS["qubo_lanes"]:g} ms)')
+
+    args = parser.parse_args(argv)
+
+    if args.command == 'features':
+        families = FAMILIES if args.family == 'all' else (args.family,)
+        runs = [
+            asyncio.run(bench_features(family, nnz, args.repeats, budget_ms=args.budget_ms))
+            for family in families
+            for nnz in args.nnz
+        ]
+        for run in runs:
+            latency = run['latency']
+            print(
+                f"{run['family']:>11} {run['nnz']:>8} nnz  p50 {latency['p50_ms']:6.2f} ms  "
+                f"p95 {latency['p95_ms']:6.2f} ms  budget {run['budget_ms']:.1f} ms  "
+                f"{'ok' if run['within_budget'] else 'OVER BUDGET'}"
+            )
+        return 0 if all(run['within_budget'] for run in runs) else 1
+
+    if args.command == 'compare':
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        with open(args.current) as f:
+            current = json.load(f)
+        report = compare(baseline, current, args.threshold)
+        for entry in report:
+            changes = entry['changes']
+            print(
+                f"{entry['family']:>11} {entry['size']:>8} {entry['mode']:>6}  "
+                f"req/s {changes['throughput_rps']:+7.1%}  p95 {changes['p95_ms']:+7.1%}  "
+                f"p99 {changes['p99_ms']:+7.1%}  {'REGRESSION' if entry['regressed'] else 'ok'}"
+            )
+        return 1 if any(entry['regressed'] for entry in report) else 0
+
+    families = FAMILIES if args.family == 'all' else (args.family,)
+    runs = []
+    for family in families:
+        for size in args.sizes:
+            result = asyncio.run(run_benchmark(
+                family, size, args.mode, args.requests, args.concurrency, args.rate,
+                args.variants, args.seed, args.config, args.sample_rate,
+                args.result_cache, args.time_limit
+            ))
+            runs.append(result)
+            latency = result['latency']
+            print(
+                f"{family:>11} {size:>8} {args.mode:>6}  {result['throughput_rps']:8.1f} req/s  "
+                f"p50 {latency.get('p50_ms', 0):8.1f} ms  p95 {latency.get('p95_ms', 0):8.1f} ms  "
+                f"p99 {latency.get('p99_ms', 0):8.1f} ms  rss {result['peak_rss_mb']:7.1f} MiB ({result['peak_rss_scope']})"
+            )
+
+    output = {
+        'meta': {
+            'commit': git_commit(),
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'config': str(args.config)
+        },
+        'runs': runs
+    }
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    with open(args.output, 'w') as f:
+        json.dump(output, f, indent=2)
+    print(f"Results written to {args.output}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -4,16 +4,23 @@ QAIM-2 AI Bridges
 Bridge components for problem transformation and solver selection.
 """
 
+from .canonical import CanonicalProblem, CSRMatrix
 from .pcan import ProblemCanonicalizer
 from .surrogate_models import SurrogateModels
 from .strategy_policy import StrategyPolicy
 from .arbitration import Arbitration
 from .cross_framework import CrossFrameworkTranslator
+from .decomposition import ProblemDecomposer
+from .runtime_predictor import RuntimePredictor
 
 __all__ = [
+    'CanonicalProblem',
+    'CSRMatrix',
     'ProblemCanonicalizer',
     'SurrogateModels',
     'StrategyPolicy',
     'Arbitration',
-    'CrossFrameworkTranslator'
+    'CrossFrameworkTranslator',
+    'ProblemDecomposer',
+    'RuntimePredictor'
 ]
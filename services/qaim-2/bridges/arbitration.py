@@ -7,11 +7,70 @@ Monitors solver performance and switches if needed.
 TFA Layer: FE (Federation)
 """
 
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional
 import random
 import math
 
 
+class ArmWindow:
+    """
+    Sliding window over an arm's most recent rewards.
+    
+    Rewards live in a fixed-size ring buffer with running sum and sum of
+    squares, so updates and mean/variance queries are O(1).
+    """
+    
+    __slots__ = ('size', 'buffer', 'head', 'count', 'total', 'total_sq')
+    
+    def __init__(self, size: int):
+        self.size = max(1, int(size))
+        self.buffer = [0.0] * self.size
+        self.head = 0
+        self.count = 0
+        self.total = 0.0
+        self.total_sq = 0.0
+    
+    def push(self, reward: float) -> None:
+        """Add a reward, evicting the oldest one when the window is full."""
+        reward = float(reward)
+        if self.count == self.size:
+            old = self.buffer[self.head]
+            self.total -= old
+            self.total_sq -= old * old
+        else:
+            self.count += 1
+        
+        self.buffer[self.head] = reward
+        self.total += reward
+        self.total_sq += reward * reward
+        self.head = (self.head + 1) % self.size
+        
+        if self.head == 0:
+            # Resync running sums once per wrap (amortized O(1)) to stop
+            # floating-point drift from repeated subtraction
+            values = self.buffer[:self.count]
+            self.total = math.fsum(values)
+            self.total_sq = math.fsum(v * v for v in values)
+    
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+    
+    @property
+    def variance(self) -> float:
+        """Unbiased sample variance (0.0 with fewer than two rewards)."""
+        if self.count < 2:
+            return 0.0
+        mean = self.mean
+        return max(self.total_sq / self.count - mean * mean, 0.0) * self.count / (self.count - 1)
+    
+    def rewards(self) -> List[float]:
+        """Rewards in the window, oldest first."""
+        if self.count < self.size:
+            return self.buffer[:self.count]
+        return self.buffer[self.head:] + self.buffer[:self.head]
+
+
 class Arbitration:
     """
     Arbitration Bridge (ARB).
@@ -25,17 +84,27 @@ class Arbitration:
         Initialize arbitration with configuration.
         
         Args:
-            config: Configuration with algorithm, window_size, fallback
+            config: Configuration with algorithm, window_size, fallback,
+                thompson_model ('gaussian' or 'beta'), optional seed and
+                overload handling (overload_threshold, memory_threshold,
+                overload_time_factor, min_time_limit) and pool_limits
+                (maximum in-flight runs per pool, e.g. {'cb': 8})
         """
         self.config = config
         self.enabled = config.get('enabled', True)
         self.algorithm = config.get('algorithm', 'ucb1')
         self.window_size = config.get('window_size', 1000)
         self.fallback = config.get('fallback', 'cb_glpk')
+        self.thompson_model = config.get('thompson_model', 'gaussian')
+        self._rng = random.Random(config.get('seed'))
+        self.overload_threshold = config.get('overload_threshold', 0.9)
+        self.memory_threshold = config.get('memory_threshold', 0.95)
+        self.overload_time_factor = config.get('overload_time_factor', 0.5)
+        self.min_time_limit = config.get('min_time_limit', 1.0)
+        self.pool_limits = config.get('pool_limits', {})
         
-        # Track arm statistics
-        self._arm_counts = {}
-        self._arm_rewards = {}
+        # Per-arm sliding windows of the last window_size rewards
+        self._arms = {}
         self._total_counts = 0
     
     def select_arm(self, context: Dict[str, Any]) -> str:
@@ -55,16 +124,15 @@ class Arbitration:
         features = context.get('features', {})
         system_context = context.get('context', {})
         
-        # Check if solver is available
-        available_solvers = system_context.get('available_solvers', [])
+        # Check if solver is available (pools at their in-flight limit are not)
+        available_solvers = self._available(features, system_context)
         
         if solver_type not in available_solvers:
             # Fallback if requested solver not available
             return self._select_fallback(available_solvers)
         
         # Check system load
-        load = system_context.get('load', 0.0)
-        if load > 0.9:
+        if self.is_overloaded(system_context):
             # Under high load, prefer faster solvers
             return self._select_fast_solver(available_solvers)
         
@@ -78,6 +146,121 @@ class Arbitration:
         
         return refined
     
+    def is_overloaded(self, system_context: Dict[str, Any]) -> bool:
+        """Whether CPU load or memory pressure exceeds its threshold."""
+        return (
+            system_context.get('load', 0.0) > self.overload_threshold
+            or system_context.get('memory', 0.0) > self.memory_threshold
+        )
+    
+    def saturated_pools(self, system_context: Dict[str, Any]) -> List[str]:
+        """Pools whose in-flight solver runs reached their ``pool_limits`` entry."""
+        in_flight = system_context.get('in_flight', {})
+        return [
+            pool for pool, limit in self.pool_limits.items()
+            if in_flight.get(pool, 0) >= limit
+        ]
+    
+    def _available(self, features: Dict[str, Any], system_context: Dict[str, Any]) -> List[str]:
+        """
+        Solvers that can take this problem now.
+        
+        qc_qaoa is dropped when the problem has more variables than
+        ``qubit_limit`` (slack bits only add qubits); pools at their
+        in-flight limit are dropped unless that would leave none.
+        """
+        solvers = system_context.get('available_solvers', [])
+        qubit_limit = system_context.get('qubit_limit')
+        num_vars = features.get('structural_features', {}).get('num_variables', 0)
+        if qubit_limit is not None and num_vars > qubit_limit:
+            solvers = [s for s in solvers if s != 'qc_qaoa']
+        return self._unsaturated(solvers, system_context)
+    
+    def _unsaturated(self, solvers: List[str], system_context: Dict[str, Any]) -> List[str]:
+        """Drop solvers of saturated pools, unless that would leave none."""
+        saturated = self.saturated_pools(system_context)
+        if not saturated:
+            return solvers
+        free = [s for s in solvers if s.split('_', 1)[0] not in saturated]
+        return free or solvers
+    
+    def adjust_parameters(
+        self,
+        params: Dict[str, Any],
+        context: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """
+        Adjust solver parameters for the current system state.
+        
+        Under overload, time limits are scaled by ``overload_time_factor``
+        (not below ``min_time_limit``) so queued requests are not stuck
+        behind long solves.
+        
+        Args:
+            params: Solver parameters
+            context: Context with system state under 'context'
+            
+        Returns:
+            Adjusted copy of params (params itself when unchanged)
+        """
+        if not self.enabled or not self.is_overloaded(context.get('context', {})):
+            return params
+        
+        time_limit = params.get('time_limit')
+        if time_limit is None:
+            return params
+        
+        adjusted = dict(params)
+        adjusted['time_limit'] = max(
+            min(self.min_time_limit, time_limit),
+            time_limit * self.overload_time_factor
+        )
+        return adjusted
+    
+    def rank_arms(
+        self,
+        context: Dict[str, Any],
+        k: int,
+        candidates: Optional[List[str]] = None
+    ) -> List[str]:
+        """
+        Rank solver arms for portfolio execution.
+        
+        Args:
+            context: Context with solver_type, features, system state
+            k: Maximum number of arms to return
+            candidates: Optional arm whitelist (defaults to all available)
+            
+        Returns:
+            Up to k available solver identifiers, best first
+        """
+        solver_type = context.get('solver_type')
+        system_context = context.get('context', {})
+        available_solvers = self._available(context.get('features', {}), system_context)
+        
+        arms = [s for s in (candidates or available_solvers) if s in available_solvers]
+        if not arms:
+            return [self.select_arm(context)]
+        
+        # Unexplored arms rank first; the requested solver wins ties
+        ranked = sorted(
+            arms,
+            key=lambda s: (self._arm_score(s), s == solver_type),
+            reverse=True
+        )
+        return ranked[:max(1, k)]
+    
+    def _arm_score(self, solver: str) -> float:
+        """Score an arm by average reward (plus UCB1 bonus when enabled)."""
+        window = self._arms.get(solver)
+        if not self.enabled or window is None or window.count == 0:
+            return float('inf')
+        
+        score = window.mean
+        if self.algorithm == 'ucb1':
+            score += math.sqrt(2 * math.log(max(self._total_counts, 1)) / window.count)
+        return score
+    
     def _select_fallback(self, available_solvers: list) -> str:
         """Select fallback solver."""
         # Try configured fallback first
@@ -117,18 +300,16 @@ class Arbitration:
         best_score = -float('inf')
         
         for solver in available_solvers:
-            if solver not in self._arm_counts:
+            window = self._arms.get(solver)
+            if window is None or window.count == 0:
                 # Unexplored arm: infinite UCB
                 return solver
             
-            count = self._arm_counts[solver]
-            avg_reward = self._arm_rewards.get(solver, 0.0) / count
-            
-            # UCB1 formula
+            # UCB1 formula over the sliding window
             exploration_bonus = math.sqrt(
-                2 * math.log(self._total_counts) / count
+                2 * math.log(self._total_counts) / window.count
             )
-            ucb_score = avg_reward + exploration_bonus
+            ucb_score = window.mean + exploration_bonus
             
             if ucb_score > best_score:
                 best_score = ucb_score
@@ -137,9 +318,41 @@ class Arbitration:
         return best_solver
     
     def _thompson_select(self, solver_type: str, available_solvers: list) -> str:
-        """Thompson Sampling selection."""
-        # TODO: Implement actual Thompson Sampling with Beta distributions
-        return solver_type
+        """
+        Thompson Sampling selection.
+        
+        Draws one sample per arm from its posterior over the windowed mean
+        reward and picks the largest. ``gaussian`` suits unbounded rewards
+        (e.g. negative solve time); ``beta`` treats rewards in [0, 1] as
+        fractional successes.
+        """
+        best_solver = solver_type
+        best_sample = -float('inf')
+        
+        for solver in available_solvers:
+            window = self._arms.get(solver)
+            if window is None or window.count == 0:
+                # Unexplored arm: sample it before trusting any posterior
+                return solver
+            
+            if self.thompson_model == 'beta':
+                successes = min(max(window.total, 0.0), window.count)
+                sample = self._rng.betavariate(
+                    1.0 + successes, 1.0 + window.count - successes
+                )
+            else:
+                # Normal posterior on the mean; unit variance prior until
+                # the window holds two rewards
+                variance = window.variance if window.count > 1 else 1.0
+                sample = self._rng.gauss(
+                    window.mean, math.sqrt(variance / window.count)
+                )
+            
+            if sample > best_sample:
+                best_sample = sample
+                best_solver = solver
+        
+        return best_solver
     
     def update_arm(self, solver: str, reward: float) -> None:
         """
@@ -149,28 +362,39 @@ class Arbitration:
             solver: Solver that was used
             reward: Observed reward (e.g., negative solve time for minimization)
         """
-        if solver not in self._arm_counts:
-            self._arm_counts[solver] = 0
-            self._arm_rewards[solver] = 0.0
+        window = self._arms.get(solver)
+        if window is None:
+            window = self._arms[solver] = ArmWindow(self.window_size)
         
-        self._arm_counts[solver] += 1
-        self._arm_rewards[solver] += reward
-        self._total_counts += 1
-        
-        # Maintain window size
-        if self._total_counts > self.window_size:
-            self._decay_statistics()
+        # Total counts only grow until the arm's window is full
+        if window.count < window.size:
+            self._total_counts += 1
+        window.push(reward)
+    
+    def get_state(self) -> Dict[str, Any]:
+        """Export arm reward windows for persistence."""
+        return {
+            'window_size': self.window_size,
+            'windows': {solver: window.rewards() for solver, window in self._arms.items()}
+        }
     
-    def _decay_statistics(self) -> None:
-        """Decay old statistics to maintain window size."""
-        # Simple decay: reduce all counts and rewards by 10%
-        decay_factor = 0.9
+    def load_state(self, state: Dict[str, Any]) -> None:
+        """Restore arm reward windows exported by get_state()."""
+        self._arms = {}
+        self._total_counts = 0
         
-        for solver in self._arm_counts:
-            self._arm_counts[solver] = int(self._arm_counts[solver] * decay_factor)
-            self._arm_rewards[solver] *= decay_factor
+        windows = state.get('windows')
+        if windows is None:
+            # Aggregate counts/rewards format: replay each arm's mean reward
+            counts = state.get('arm_counts', {})
+            windows = {
+                solver: [state.get('arm_rewards', {}).get(solver, 0.0) / count] * count
+                for solver, count in counts.items() if count > 0
+            }
         
-        self._total_counts = int(self._total_counts * decay_factor)
+        for solver, rewards in windows.items():
+            for reward in rewards[-self.window_size:]:
+                self.update_arm(solver, reward)
     
     def get_statistics(self) -> Dict[str, Any]:
         """Get current arbitration statistics."""
@@ -179,14 +403,12 @@ class Arbitration:
             'arms': {}
         }
         
-        for solver in self._arm_counts:
-            count = self._arm_counts[solver]
-            avg_reward = self._arm_rewards[solver] / count if count > 0 else 0.0
-            
+        for solver, window in self._arms.items():
             stats['arms'][solver] = {
-                'count': count,
-                'total_reward': self._arm_rewards[solver],
-                'avg_reward': avg_reward
+                'count': window.count,
+                'total_reward': window.total,
+                'avg_reward': window.mean,
+                'std_reward': math.sqrt(window.variance)
             }
         
         return stats
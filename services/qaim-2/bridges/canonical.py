@@ -0,0 +1,464 @@
+"""
+Canonical Problem Representation
+
+Array-backed canonical problem shared by PCAN, SM and XFR.
+Bounds, types and objective coefficients live in NumPy arrays and the
+linear constraint matrix in CSR form, so large problems are represented
+without one Python dict per variable or constraint.
+
+TFA Layer: FWD (Nowcast)
+"""
+
+from typing import Dict, Any, List, Optional, Tuple
+from collections.abc import Mapping
+import hashlib
+import json
+import re
+
+import numpy as np
+
+
+# Variable type codes stored in CanonicalProblem.vtype
+VAR_TYPES = ('continuous', 'integer', 'binary')
+VAR_CONTINUOUS = 0
+VAR_INTEGER = 1
+VAR_BINARY = 2
+
+# Constraint sense codes stored in CanonicalProblem.row_sense
+SENSES = ('<=', '>=', '=')
+SENSE_LE = 0
+SENSE_GE = 1
+SENSE_EQ = 2
+
+_TOKEN_RE = re.compile(
+    r'(?P<num>(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?)'
+    r'|(?P<name>[A-Za-z_]\w*)'
+    r'|(?P<op>[-+*])'
+    r'|(?P<ws>\s+)'
+    r'|(?P<bad>.)'
+)
+
+
+def parse_terms(
+    spec: Any,
+    index: Dict[str, int]
+) -> Optional[Tuple[List[Tuple[int, float]], List[Tuple[int, int, float]], float]]:
+    """
+    Parse linear and bilinear terms over known variables.
+
+    Accepts either a coefficient mapping such as ``{'x1': 2, 'x1*x2': 0.5}``
+    or an expression string such as ``'2*x1 + 0.5*x1*x2 - 3'``.
+
+    Args:
+        spec: Coefficient mapping or expression string
+        index: Variable name to column index
+
+    Returns:
+        Tuple of (linear terms, quadratic terms, constant), or None if an
+        expression string is not a linear/bilinear form over known variables
+
+    Raises:
+        ValueError: If a coefficient mapping references an unknown variable
+    """
+    linear = []
+    quadratic = []
+    constant = 0.0
+
+    if isinstance(spec, Mapping):
+        for term, coef in spec.items():
+            names = [n.strip() for n in str(term).split('*')]
+            cols = []
+            for name in names:
+                if name not in index:
+                    raise ValueError(f"Unknown variable in coefficients: {name}")
+                cols.append(index[name])
+            if len(cols) == 1:
+                linear.append((cols[0], float(coef)))
+            elif len(cols) == 2:
+                quadratic.append((cols[0], cols[1], float(coef)))
+            else:
+                raise ValueError(f"Unsupported term degree in coefficients: {term}")
+        return linear, quadratic, constant
+
+    if not isinstance(spec, str):
+        return None
+
+    # Expression string: sum of [sign] factor (* factor)* terms
+    sign = 1.0
+    coef = 1.0
+    cols = []
+    seen_factor = False
+    expect_factor = True
+
+    def flush():
+        nonlocal constant
+        if not seen_factor:
+            return True
+        if len(cols) == 0:
+            constant += sign * coef
+        elif len(cols) == 1:
+            linear.append((cols[0], sign * coef))
+        elif len(cols) == 2:
+            quadratic.append((cols[0], cols[1], sign * coef))
+        else:
+            return False
+        return True
+
+    for match in _TOKEN_RE.finditer(spec):
+        kind = match.lastgroup
+        text = match.group()
+        if kind == 'ws':
+            continue
+        if kind == 'bad':
+            return None
+        if kind == 'op':
+            if text == '*':
+                if expect_factor:
+                    return None
+                expect_factor = True
+                continue
+            if seen_factor and not expect_factor:
+                if not flush():
+                    return None
+                sign, coef, cols, seen_factor = 1.0, 1.0, [], False
+            elif seen_factor:
+                return None
+            if text == '-':
+                sign = -sign
+            expect_factor = True
+            continue
+        if not expect_factor:
+            return None
+        if kind == 'num':
+            coef *= float(text)
+        else:
+            if text not in index:
+                return None
+            cols.append(index[text])
+        seen_factor = True
+        expect_factor = False
+
+    if expect_factor and seen_factor:
+        return None
+    if not flush():
+        return None
+    return linear, quadratic, constant
+
+
+class CSRMatrix:
+    """Compressed sparse row matrix over NumPy arrays."""
+
+    __slots__ = ('indptr', 'indices', 'data', 'shape')
+
+    def __init__(
+        self,
+        indptr: np.ndarray,
+        indices: np.ndarray,
+        data: np.ndarray,
+        shape: Tuple[int, int]
+    ):
+        self.indptr = indptr
+        self.indices = indices
+        self.data = data
+        self.shape = shape
+
+    @classmethod
+    def from_coo(
+        cls,
+        rows: np.ndarray,
+        cols: np.ndarray,
+        vals: np.ndarray,
+        shape: Tuple[int, int]
+    ) -> 'CSRMatrix':
+        """Build CSR from COO triplets, summing duplicate entries."""
+        rows = np.asarray(rows, dtype=np.int64)
+        cols = np.asarray(cols, dtype=np.int64)
+        vals = np.asarray(vals, dtype=np.float64)
+
+        if rows.size:
+            keys = rows * shape[1] + cols
+            unique_keys, inverse = np.unique(keys, return_inverse=True)
+            vals = np.bincount(inverse, weights=vals, minlength=unique_keys.size)
+            rows = unique_keys // shape[1]
+            cols = unique_keys % shape[1]
+
+        indptr = np.zeros(shape[0] + 1, dtype=np.int64)
+        np.cumsum(np.bincount(rows, minlength=shape[0]), out=indptr[1:])
+        return cls(indptr, cols.astype(np.int32), vals, shape)
+
+    @property
+    def nnz(self) -> int:
+        """Number of stored entries."""
+        return int(self.data.size)
+
+    def row_ids(self) -> np.ndarray:
+        """Row index of every stored entry."""
+        return np.repeat(
+            np.arange(self.shape[0], dtype=np.int64), np.diff(self.indptr)
+        )
+
+    def row(self, i: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Column indices and values of row i (views, not copies)."""
+        start, end = self.indptr[i], self.indptr[i + 1]
+        return self.indices[start:end], self.data[start:end]
+
+    def dot(self, x: np.ndarray) -> np.ndarray:
+        """Matrix-vector product A @ x."""
+        return np.bincount(
+            self.row_ids(),
+            weights=self.data * np.asarray(x, dtype=np.float64)[self.indices],
+            minlength=self.shape[0]
+        )
+
+    def rdot(self, y: np.ndarray) -> np.ndarray:
+        """Transposed product A.T @ y."""
+        return np.bincount(
+            self.indices,
+            weights=self.data * np.asarray(y, dtype=np.float64)[self.row_ids()],
+            minlength=self.shape[1]
+        )
+
+    def to_dense(self) -> np.ndarray:
+        """Materialize as a dense array."""
+        dense = np.zeros(self.shape)
+        dense[self.row_ids(), self.indices] = self.data
+        return dense
+
+
+class CanonicalProblem(Mapping):
+    """
+    Array-backed canonical problem.
+
+    Also behaves as a read-only mapping with the legacy canonical keys
+    (problem_type, variables, constraints, objectives, metadata); the
+    variables and constraints lists are materialized only on access.
+    """
+
+    __slots__ = (
+        'problem_type', 'metadata', 'names', 'index',
+        'lower', 'upper', 'vtype', 'domains',
+        'objective', 'obj_quad', 'obj_constant', 'sense', 'objectives',
+        'A', 'row_sense', 'rhs', 'con_quad', 'row_parsed',
+        'con_types', 'con_names', 'con_expressions', 'con_metadata',
+        '_content_hash'
+    )
+
+    _KEYS = ('problem_type', 'variables', 'constraints', 'objectives', 'metadata')
+
+    def __init__(
+        self,
+        problem_type: str,
+        names: List[str],
+        lower: np.ndarray,
+        upper: np.ndarray,
+        vtype: np.ndarray,
+        objective: np.ndarray,
+        A: CSRMatrix,
+        row_sense: np.ndarray,
+        rhs: np.ndarray,
+        sense: str = 'minimize',
+        obj_quad: Optional[Tuple[np.ndarray, np.ndarray, np.ndarray]] = None,
+        obj_constant: float = 0.0,
+        con_quad: Optional[Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]] = None,
+        objectives: Optional[List[Dict[str, Any]]] = None,
+        con_types: Optional[List[Any]] = None,
+        con_names: Optional[List[Any]] = None,
+        con_expressions: Optional[List[Any]] = None,
+        con_metadata: Optional[List[Dict[str, Any]]] = None,
+        domains: Optional[List[Any]] = None,
+        metadata: Optional[Dict[str, Any]] = None,
+        index: Optional[Dict[str, int]] = None,
+        row_parsed: Optional[np.ndarray] = None
+    ):
+        n = len(names)
+        m = A.shape[0]
+        empty_i = np.zeros(0, dtype=np.int64)
+        empty_f = np.zeros(0, dtype=np.float64)
+
+        self.problem_type = problem_type
+        self.metadata = metadata or {}
+        self.names = names
+        self.index = index if index is not None else {name: i for i, name in enumerate(names)}
+        self.lower = lower
+        self.upper = upper
+        self.vtype = vtype
+        self.domains = domains
+        self.objective = objective
+        self.obj_quad = obj_quad if obj_quad is not None else (empty_i, empty_i, empty_f)
+        self.obj_constant = obj_constant
+        self.sense = sense
+        self.objectives = objectives or []
+        self.A = A
+        self.row_sense = row_sense
+        self.rhs = rhs
+        self.con_quad = con_quad if con_quad is not None else (empty_i, empty_i, empty_i, empty_f)
+        self.row_parsed = row_parsed if row_parsed is not None else np.ones(m, dtype=bool)
+        self.con_types = con_types if con_types is not None else [None] * m
+        self.con_names = con_names if con_names is not None else [None] * m
+        self.con_expressions = con_expressions if con_expressions is not None else [None] * m
+        self.con_metadata = con_metadata if con_metadata is not None else [{} for _ in range(m)]
+        self._content_hash = None
+
+        if not (lower.shape == upper.shape == vtype.shape == objective.shape == (n,)):
+            raise ValueError("Variable arrays must all have length num_variables")
+        if (A.shape[1] != n or rhs.shape != (m,) or row_sense.shape != (m,)
+                or self.row_parsed.shape != (m,)):
+            raise ValueError("Constraint arrays do not match matrix shape")
+
+    @property
+    def num_variables(self) -> int:
+        """Number of decision variables."""
+        return len(self.names)
+
+    @property
+    def num_constraints(self) -> int:
+        """Number of constraints."""
+        return self.A.shape[0]
+
+    @property
+    def num_unparsed(self) -> int:
+        """Number of constraints without a linear/bilinear form (all-zero rows)."""
+        return int(np.count_nonzero(~self.row_parsed))
+
+    def objective_value(self, x: np.ndarray) -> float:
+        """Objective (in its own sense) of a full solution vector."""
+        qi, qj, qv = self.obj_quad
+        return float(self.obj_constant + self.objective @ x + np.sum(qv * x[qi] * x[qj]))
+
+    def row_activity(self, x: np.ndarray) -> np.ndarray:
+        """Left-hand side of every constraint, including bilinear terms."""
+        activity = self.A.dot(x)
+        r, i, j, v = self.con_quad
+        if v.size:
+            activity += np.bincount(r, weights=v * x[i] * x[j], minlength=self.num_constraints)
+        return activity
+
+    def max_violation(self, x: np.ndarray) -> float:
+        """
+        Largest violation of a bound, integrality or parsed constraint.
+
+        Unparsed rows (opaque expressions) cannot be checked and are skipped.
+        """
+        residual = self.row_activity(x) - self.rhs
+        rows = np.where(
+            self.row_sense == SENSE_LE, np.maximum(residual, 0.0),
+            np.where(self.row_sense == SENSE_GE, np.maximum(-residual, 0.0), np.abs(residual))
+        )[self.row_parsed]
+        bounds = np.maximum(self.lower - x, 0.0) + np.maximum(x - self.upper, 0.0)
+        integral = self.vtype != VAR_CONTINUOUS
+        fractional = np.abs(x[integral] - np.round(x[integral]))
+        return float(max(rows.max(initial=0.0), bounds.max(initial=0.0), fractional.max(initial=0.0)))
+
+    def product_pairs(self) -> np.ndarray:
+        """
+        Distinct products (i, j), i <= j, of the objective and constraints.
+
+        Squares of binaries are left out since x_i * x_i = x_i for them.
+        Returns an (count, 2) array sorted by (i, j).
+        """
+        r, ci, cj, _ = self.con_quad
+        qi = np.concatenate([self.obj_quad[0], ci]).astype(np.int64)
+        qj = np.concatenate([self.obj_quad[1], cj]).astype(np.int64)
+        i, j = np.minimum(qi, qj), np.maximum(qi, qj)
+        keep = (i != j) | (self.vtype[i] != VAR_BINARY)
+        return np.unique(np.stack([i[keep], j[keep]], axis=1), axis=0).reshape(-1, 2)
+
+    # Mapping interface (legacy dict view)
+
+    def __getitem__(self, key: str) -> Any:
+        if key == 'problem_type':
+            return self.problem_type
+        if key == 'variables':
+            return self._variables_view()
+        if key == 'constraints':
+            return self._constraints_view()
+        if key == 'objectives':
+            return self.objectives
+        if key == 'metadata':
+            return self.metadata
+        raise KeyError(key)
+
+    def __iter__(self):
+        return iter(self._KEYS)
+
+    def __len__(self) -> int:
+        return len(self._KEYS)
+
+    def __repr__(self) -> str:
+        return (
+            f"CanonicalProblem(problem_type={self.problem_type!r}, "
+            f"num_variables={self.num_variables}, "
+            f"num_constraints={self.num_constraints}, nnz={self.A.nnz})"
+        )
+
+    def _variables_view(self) -> List[Dict[str, Any]]:
+        """Materialize legacy list of variable dicts."""
+        lower = self.lower.tolist()
+        upper = self.upper.tolist()
+        vtype = self.vtype.tolist()
+        domains = self.domains or [None] * self.num_variables
+        return [
+            {
+                'name': name,
+                'type': VAR_TYPES[vtype[i]],
+                'lower_bound': lower[i],
+                'upper_bound': upper[i],
+                'domain': domains[i]
+            }
+            for i, name in enumerate(self.names)
+        ]
+
+    def _constraints_view(self) -> List[Dict[str, Any]]:
+        """Materialize legacy list of constraint dicts."""
+        row_sense = self.row_sense.tolist()
+        rhs = self.rhs.tolist()
+        parsed = self.row_parsed.tolist()
+        return [
+            {
+                'type': self.con_types[i],
+                'expression': self.con_expressions[i],
+                'sense': SENSES[row_sense[i]],
+                'rhs': rhs[i],
+                'parsed': parsed[i],
+                'metadata': self.con_metadata[i]
+            }
+            for i in range(self.num_constraints)
+        ]
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Materialize full legacy dict representation."""
+        return {key: self[key] for key in self._KEYS}
+
+    def content_hash(self) -> str:
+        """
+        SHA-256 over the canonical content.
+
+        Arrays are hashed as raw bytes, each preceded by its dtype and
+        shape, so contents cannot shift across array boundaries.
+        Computed once and memoized; canonical problems are read-only.
+        """
+        if self._content_hash is None:
+            digest = hashlib.sha256()
+            digest.update(self.problem_type.encode() if self.problem_type else b'')
+            digest.update(json.dumps(self.names).encode())
+            for array in (
+                self.lower, self.upper, self.vtype, self.objective,
+                *self.obj_quad,
+                self.A.indptr, self.A.indices, self.A.data,
+                self.row_sense, self.rhs, self.row_parsed,
+                *self.con_quad
+            ):
+                data = np.ascontiguousarray(array)
+                digest.update(f'{data.dtype.str}{data.shape}'.encode())
+                digest.update(data.tobytes())
+            digest.update(json.dumps(
+                [
+                    self.sense, self.obj_constant, self.objectives,
+                    self.con_types, self.con_names, self.con_expressions,
+                    self.con_metadata, self.domains, self.metadata
+                ],
+                sort_keys=True,
+                default=str
+            ).encode())
+            self._content_hash = digest.hexdigest()
+        return self._content_hash
@@ -9,6 +9,11 @@ TFA Layer: CB/QB (Translation)
 
 from typing import Dict, Any
 
+import numpy as np
+
+from .canonical import CanonicalProblem
+from .qubo import QUBOBuilder
+
 
 class CrossFrameworkTranslator:
     """
@@ -28,10 +33,12 @@ class CrossFrameworkTranslator:
         self.config = config
         self.enabled = config.get('enabled', True)
         self.formats = config.get('formats', ['mip', 'sat', 'qubo'])
+        self.qubo_format = config.get('qubo_format', 'sparse')
+        self.qubo_builder = QUBOBuilder({'penalty': config.get('qubo_penalty')})
     
     async def translate(
         self,
-        canonical: Dict[str, Any],
+        canonical: CanonicalProblem,
         solver_type: str
     ) -> Any:
         """
@@ -55,7 +62,7 @@ class CrossFrameworkTranslator:
     
     def _translate_to_classical(
         self,
-        canonical: Dict[str, Any],
+        canonical: CanonicalProblem,
         solver_type: str
     ) -> Dict[str, Any]:
         """
@@ -63,38 +70,29 @@ class CrossFrameworkTranslator:
         
         Returns problem in format compatible with Gurobi, CBC, OR-Tools, GLPK.
         """
-        problem_type = canonical.get('problem_type')
-        variables = canonical.get('variables', [])
-        constraints = canonical.get('constraints', [])
-        objectives = canonical.get('objectives', [])
+        objectives = canonical.objectives
         
-        # Build MIP-style representation
+        # Build MIP-style representation over the canonical arrays (no copies)
         classical_problem = {
             'type': 'mip',
-            'sense': 'minimize' if objectives and objectives[0].get('sense') == 'minimize' else 'maximize',
-            'variables': [],
-            'constraints': [],
+            'sense': canonical.sense,
+            'num_variables': canonical.num_variables,
+            'num_constraints': canonical.num_constraints,
+            'names': canonical.names,
+            'vtype': canonical.vtype,
+            'lb': canonical.lower,
+            'ub': canonical.upper,
+            'c': canonical.objective,
+            'q': canonical.obj_quad,
+            'c0': canonical.obj_constant,
+            'A': canonical.A,
+            'row_sense': canonical.row_sense,
+            'rhs': canonical.rhs,
+            'row_parsed': canonical.row_parsed,
+            'constraint_names': canonical.con_names,
             'objective': {}
         }
         
-        # Translate variables
-        for var in variables:
-            classical_problem['variables'].append({
-                'name': var.get('name'),
-                'type': var.get('type', 'continuous'),
-                'lb': var.get('lower_bound', 0),
-                'ub': var.get('upper_bound', float('inf'))
-            })
-        
-        # Translate constraints
-        for con in constraints:
-            classical_problem['constraints'].append({
-                'name': con.get('name', f"con_{len(classical_problem['constraints'])}"),
-                'expression': con.get('expression'),
-                'sense': con.get('sense', '<='),
-                'rhs': con.get('rhs', 0)
-            })
-        
         # Translate objective
         if objectives:
             obj = objectives[0]
@@ -107,7 +105,7 @@ class CrossFrameworkTranslator:
     
     def _translate_to_cubic_bit(
         self,
-        canonical: Dict[str, Any],
+        canonical: CanonicalProblem,
         solver_type: str
     ) -> Dict[str, Any]:
         """
@@ -115,35 +113,35 @@ class CrossFrameworkTranslator:
         
         QB ≠ qubit. This is non-quantum 3D lifting (CB×CB×CB).
         """
-        problem_type = canonical.get('problem_type')
-        variables = canonical.get('variables', [])
-        constraints = canonical.get('constraints', [])
-        objectives = canonical.get('objectives', [])
+        n = canonical.num_variables
         
         # Build QB representation
         qb_problem = {
             'type': 'qb',
             'method': 'tensor' if 'tensor' in solver_type else 'lifted',
-            'dimensions': len(variables),
-            'variables': variables,
-            'constraints': constraints,
-            'objectives': objectives,
-            'tensor_shape': (len(variables), len(variables), len(variables))
+            'dimensions': n,
+            'canonical': canonical,
+            'names': canonical.names,
+            'objectives': canonical.objectives,
+            'tensor_shape': (n, n, n)
         }
         
         # For tensor method, prepare tensor decomposition
         if qb_problem['method'] == 'tensor':
             qb_problem['tensor_data'] = self._prepare_tensor(canonical)
+            qb_problem['tensor_shape'] = qb_problem['tensor_data']['shape']
         
         # For lifted method, prepare lifted relaxation
         elif qb_problem['method'] == 'lifted':
-            qb_problem['lifted_vars'] = self._prepare_lifting(canonical)
+            lifting = self._prepare_lifting(canonical)
+            qb_problem['lifted_vars'] = lifting['variables']
+            qb_problem['lifted_pairs'] = lifting['pairs']
         
         return qb_problem
     
     def _translate_to_quantum(
         self,
-        canonical: Dict[str, Any],
+        canonical: CanonicalProblem,
         solver_type: str
     ) -> Dict[str, Any]:
         """
@@ -151,11 +149,6 @@ class CrossFrameworkTranslator:
         
         Full quantum with transposition/projection time and teleportation delay.
         """
-        problem_type = canonical.get('problem_type')
-        variables = canonical.get('variables', [])
-        constraints = canonical.get('constraints', [])
-        objectives = canonical.get('objectives', [])
-        
         # Determine quantum algorithm
         if 'qaoa' in solver_type:
             return self._translate_to_qaoa(canonical)
@@ -165,33 +158,29 @@ class CrossFrameworkTranslator:
             # Default to QUBO
             return self._translate_to_qubo(canonical)
     
-    def _translate_to_qubo(self, canonical: Dict[str, Any]) -> Dict[str, Any]:
-        """Translate to QUBO (Quadratic Unconstrained Binary Optimization)."""
-        variables = canonical.get('variables', [])
+    def _translate_to_qubo(self, canonical: CanonicalProblem) -> Dict[str, Any]:
+        """
+        Translate to QUBO (Quadratic Unconstrained Binary Optimization).
         
-        # QUBO requires binary variables
-        num_vars = len(variables)
+        Coefficients come from the canonical objective plus penalty-weighted
+        constraints, stored as a SparseQUBO with only nonzero couplings.
+        With ``qubo_format: 'dict'`` the legacy dict format is returned.
+        """
+        sparse = self.qubo_builder.build(canonical)
+        
+        if self.qubo_format == 'dict':
+            return sparse.to_dict()
         
-        qubo = {
+        return {
             'type': 'qubo',
-            'num_variables': num_vars,
-            'linear': {},
-            'quadratic': {},
-            'offset': 0.0
+            'num_variables': sparse.num_variables,
+            'variable_names': sparse.variable_names,
+            'offset': sparse.offset,
+            'qubo': sparse,
+            'canonical': canonical
         }
-        
-        # Initialize linear coefficients
-        for i, var in enumerate(variables):
-            qubo['linear'][i] = 1.0  # TODO: Compute actual coefficients
-        
-        # Initialize quadratic coefficients
-        for i in range(num_vars):
-            for j in range(i + 1, num_vars):
-                qubo['quadratic'][(i, j)] = 0.5  # TODO: Compute actual coefficients
-        
-        return qubo
     
-    def _translate_to_qaoa(self, canonical: Dict[str, Any]) -> Dict[str, Any]:
+    def _translate_to_qaoa(self, canonical: CanonicalProblem) -> Dict[str, Any]:
         """Translate to QAOA (Quantum Approximate Optimization Algorithm)."""
         qubo = self._translate_to_qubo(canonical)
         
@@ -205,13 +194,11 @@ class CrossFrameworkTranslator:
         
         return qaoa
     
-    def _translate_to_vqe(self, canonical: Dict[str, Any]) -> Dict[str, Any]:
+    def _translate_to_vqe(self, canonical: CanonicalProblem) -> Dict[str, Any]:
         """Translate to VQE (Variational Quantum Eigensolver)."""
-        variables = canonical.get('variables', [])
-        
         vqe = {
             'type': 'vqe',
-            'num_qubits': len(variables),
+            'num_qubits': canonical.num_variables,
             'ansatz': 'UCCSD',
             'optimizer': 'SLSQP',
             'shots': 8192
@@ -219,20 +206,37 @@ class CrossFrameworkTranslator:
         
         return vqe
     
-    def _prepare_tensor(self, canonical: Dict[str, Any]) -> Dict[str, Any]:
-        """Prepare tensor decomposition for QB tensor method."""
-        # TODO: Implement actual tensor preparation
+    def _prepare_tensor(self, canonical: CanonicalProblem) -> Dict[str, Any]:
+        """
+        Prepare the QB tensor method input.
+        
+        The solver decomposes the cubic form of the QUBO over y = (1, x),
+        stored sparse (COO), so only the QUBO and the tensor's shape and
+        entry count are passed on; the n³ tensor is never materialized.
+        """
+        sparse = self.qubo_builder.build(canonical)
+        size = sparse.num_variables + 1
         return {
-            'format': 'tucker',
-            'core_size': 10,
-            'initialized': False
+            'format': 'coo',
+            'qubo': sparse,
+            'shape': (size, size, size),
+            'nnz': 1 + 3 * int(np.count_nonzero(sparse.linear)) + 6 * sparse.nnz
         }
     
-    def _prepare_lifting(self, canonical: Dict[str, Any]) -> list:
-        """Prepare lifted variables for QB lifted method."""
-        # TODO: Implement actual lifting
-        variables = canonical.get('variables', [])
-        return [
-            {'name': f"{var['name']}_lifted", 'type': 'continuous'}
-            for var in variables
-        ]
+    def _prepare_lifting(self, canonical: CanonicalProblem) -> Dict[str, Any]:
+        """
+        Prepare the QB lifted method input.
+        
+        One lifted variable per distinct product that occurs in the
+        problem (never every pair of variables); the lifted engine links
+        each to its factors with McCormick rows.
+        """
+        pairs = canonical.product_pairs()
+        names = canonical.names
+        return {
+            'pairs': pairs,
+            'variables': [
+                {'name': f"{names[i]}*{names[j]}", 'factors': (names[i], names[j]), 'type': 'continuous'}
+                for i, j in pairs.tolist()
+            ]
+        }
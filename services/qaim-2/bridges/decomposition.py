@@ -0,0 +1,552 @@
+"""
+Problem Decomposition
+
+Splits large canonical problems into blocks that can be solved in
+parallel. Independent blocks are the connected components of the
+constraint graph (variables joined by shared rows or quadratic terms).
+When the graph is connected only through a few dense rows, those rows
+are treated as linking constraints (block-angular structure) and the
+blocks are coordinated by Lagrangian relaxation of the linking rows.
+
+TFA Layer: FE (Federation)
+"""
+
+from typing import Dict, Any, List, Optional, Callable, Awaitable, Tuple
+import asyncio
+import time
+
+import numpy as np
+
+from .canonical import CanonicalProblem, CSRMatrix, SENSE_LE, SENSE_GE
+
+
+def connected_components(
+    num_nodes: int,
+    groups: np.ndarray,
+    nodes: np.ndarray,
+    pairs: Optional[Tuple[np.ndarray, np.ndarray]] = None
+) -> np.ndarray:
+    """
+    Label the connected components of a hypergraph.
+
+    Every (group, node) incidence joins the node to all other nodes of the
+    same group; ``pairs`` adds plain edges. Labels are found by hooking
+    roots onto smaller roots and pointer jumping (union-find over arrays),
+    so the loop runs a few NumPy passes instead of one Python step per
+    edge.
+
+    Args:
+        num_nodes: Number of nodes
+        groups: Group id of each incidence, sorted ascending (CSR row order)
+        nodes: Node id of each incidence
+        pairs: Optional (i, j) arrays of edges
+
+    Returns:
+        Component label per node (the smallest node id of its component)
+    """
+    labels = np.arange(num_nodes, dtype=np.int64)
+    empty = np.zeros(0, dtype=np.int64)
+    pair_i, pair_j = pairs if pairs is not None else (empty, empty)
+    if groups.size:
+        starts = np.flatnonzero(np.concatenate(([True], groups[1:] != groups[:-1])))
+        counts = np.diff(np.append(starts, groups.size))
+
+    while True:
+        if groups.size:
+            values = labels[nodes]
+            spread = np.repeat(np.minimum.reduceat(values, starts), counts)
+            above = spread < values
+        else:
+            values = spread = above = empty
+        left = labels[pair_i]
+        right = labels[pair_j]
+        split = left != right
+        if not above.any() and not split.any():
+            # Every group and edge carries one label and labels are roots
+            return labels
+
+        # Hook roots onto a smaller root they share a group or edge with.
+        # Any one of several candidate hooks is valid, so plain scatters do.
+        labels[values[above]] = spread[above]
+        left = left[split]
+        right = right[split]
+        labels[np.maximum(left, right)] = np.minimum(left, right)
+        while True:
+            jumped = labels[labels]
+            if np.array_equal(jumped, labels):
+                break
+            labels = jumped
+
+
+def constraint_incidence(
+    canonical: CanonicalProblem
+) -> Tuple[np.ndarray, np.ndarray, Tuple[np.ndarray, np.ndarray]]:
+    """
+    Incidence of a problem's constraint graph.
+
+    Constraint rows (linear and quadratic terms) are groups of variables;
+    quadratic objective terms are edges between their two variables.
+
+    Returns:
+        Tuple of (row ids, variable ids, objective edges), row ids sorted
+    """
+    cr, ci, cj, _ = canonical.con_quad
+    groups = canonical.A.row_ids()
+    nodes = canonical.A.indices.astype(np.int64)
+    if cr.size:
+        groups = np.concatenate([groups, cr, cr]).astype(np.int64)
+        order = np.argsort(groups, kind='stable')
+        groups = groups[order]
+        nodes = np.concatenate([nodes, ci, cj]).astype(np.int64)[order]
+    return groups, nodes, canonical.obj_quad[:2]
+
+
+class DecompositionPlan:
+    """Blocks of a decomposed problem and the rows that link them."""
+
+    __slots__ = ('kind', 'columns', 'rows', 'linking_rows', 'subproblems')
+
+    def __init__(
+        self,
+        kind: str,
+        columns: List[np.ndarray],
+        rows: List[np.ndarray],
+        linking_rows: np.ndarray,
+        subproblems: List[CanonicalProblem]
+    ):
+        self.kind = kind
+        self.columns = columns
+        self.rows = rows
+        self.linking_rows = linking_rows
+        self.subproblems = subproblems
+
+    @property
+    def num_blocks(self) -> int:
+        """Number of blocks."""
+        return len(self.columns)
+
+    def summary(self) -> Dict[str, Any]:
+        """Block sizes and linking row count for metrics and evidence."""
+        return {
+            'kind': self.kind,
+            'blocks': self.num_blocks,
+            'block_variables': [int(cols.size) for cols in self.columns],
+            'linking_rows': int(self.linking_rows.size)
+        }
+
+
+class ProblemDecomposer:
+    """
+    Decomposition bridge between SM/SP/ARB and XFR.
+
+    ``plan()`` detects independent or block-angular structure and extracts
+    one canonical sub-problem per block; ``coordinate()`` solves the blocks
+    concurrently through a caller-supplied solve function and merges their
+    solutions.
+    """
+
+    def __init__(self, config: Dict[str, Any]):
+        """
+        Initialize decomposer with configuration.
+
+        Args:
+            config: Configuration with enabled, min_variables, max_blocks,
+                min_block_variables, max_linking_fraction, max_iterations,
+                step_size, tolerance and fallback
+        """
+        self.config = config
+        self.enabled = config.get('enabled', False)
+        self.min_variables = config.get('min_variables', 200)
+        self.max_blocks = max(2, config.get('max_blocks', 8))
+        self.min_block_variables = config.get('min_block_variables', 1)
+        self.max_linking_fraction = config.get('max_linking_fraction', 0.05)
+        self.max_iterations = config.get('max_iterations', 20)
+        self.step_size = config.get('step_size', 1.0)
+        self.tolerance = config.get('tolerance', 1e-6)
+        self.fallback = config.get('fallback', True)
+
+        self.planned = 0
+        self.decomposed = 0
+        self.block_solves = 0
+        self.iterations = 0
+        self.fallbacks = 0
+
+    def plan(self, canonical: CanonicalProblem) -> Optional[DecompositionPlan]:
+        """
+        Find a decomposition of a canonical problem.
+
+        Returns:
+            DecompositionPlan with at least two blocks, or None if the
+            problem is too small or has no exploitable structure
+        """
+        if not self.enabled or canonical.num_variables < self.min_variables:
+            return None
+        self.planned += 1
+
+        n = canonical.num_variables
+        m = canonical.num_constraints
+        groups, nodes, pairs = constraint_incidence(canonical)
+
+        linking = np.zeros(0, dtype=np.int64)
+        labels = connected_components(n, groups, nodes, pairs)
+        if np.unique(labels).size < 2:
+            linking, labels = self._split_on_dense_rows(canonical, groups, nodes, pairs)
+            if labels is None:
+                return None
+
+        columns = self._pack(labels)
+        if len(columns) < 2:
+            return None
+
+        block_of = np.empty(n, dtype=np.int64)
+        for k, cols in enumerate(columns):
+            block_of[cols] = k
+        is_linking = np.zeros(m, dtype=bool)
+        is_linking[linking] = True
+        row_block = np.zeros(m, dtype=np.int64)
+        # Every non-linking row lies in one block; empty rows go to block 0
+        row_block[groups] = block_of[nodes]
+        rows = [
+            np.flatnonzero((row_block == k) & ~is_linking) for k in range(len(columns))
+        ]
+
+        self.decomposed += 1
+        return DecompositionPlan(
+            'block_angular' if linking.size else 'independent',
+            columns,
+            rows,
+            linking,
+            [
+                self.extract(canonical, cols, block_rows, k, len(columns))
+                for k, (cols, block_rows) in enumerate(zip(columns, rows))
+            ]
+        )
+
+    async def coordinate(
+        self,
+        canonical: CanonicalProblem,
+        plan: DecompositionPlan,
+        solve_block: Callable[[int, CanonicalProblem], Awaitable[Any]],
+        time_limit: Optional[float] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Solve all blocks concurrently and merge their solutions.
+
+        Independent blocks are solved once. Block-angular plans relax the
+        linking rows into the block objectives and run a projected
+        subgradient update of the multipliers until the merged solution
+        satisfies the linking rows within ``tolerance``.
+
+        Args:
+            canonical: The full problem
+            plan: Plan returned by plan()
+            solve_block: Coroutine function (block index, sub-problem) ->
+                solver result with status, solution and metrics
+            time_limit: Seconds after which no further iteration starts
+
+        Returns:
+            Dictionary with status, solution, metrics and the per-block
+            results of the last round; None if the linking rows could not
+            be satisfied (or checked) and ``fallback`` is enabled
+        """
+        started = time.perf_counter()
+        sign = -1.0 if canonical.sense == 'maximize' else 1.0
+        link = self._linking_matrix(canonical, plan.linking_rows)
+        link_sense = canonical.row_sense[plan.linking_rows]
+        link_rhs = canonical.rhs[plan.linking_rows]
+        multipliers = np.zeros(plan.linking_rows.size)
+
+        iterations = 0
+        violation = None
+        while True:
+            iterations += 1
+            subproblems = plan.subproblems
+            if iterations > 1:
+                penalty = sign * link.rdot(multipliers)
+                subproblems = [
+                    self._with_objective(sub, sub.objective + penalty[cols])
+                    for sub, cols in zip(plan.subproblems, plan.columns)
+                ]
+            results = await asyncio.gather(*(
+                solve_block(k, sub) for k, sub in enumerate(subproblems)
+            ))
+            self.block_solves += len(results)
+
+            if not link.shape[0] or any(
+                r.status not in ('optimal', 'feasible') for r in results
+            ):
+                break
+            x = self._values(canonical, results)
+            if x is None:
+                # Block solutions do not name their variables; cannot check links
+                violation = None
+                break
+            residual = link.dot(x) - link_rhs
+            violation = float(np.max(np.abs(self._violation(residual, link_sense)), initial=0.0))
+            if violation <= self.tolerance * (1.0 + float(np.max(np.abs(link_rhs), initial=0.0))):
+                break
+            if (iterations >= self.max_iterations
+                    or (time_limit and time.perf_counter() - started >= time_limit)):
+                break
+            step = self.step_size / iterations
+            multipliers = self._project(multipliers + step * residual, link_sense)
+        self.iterations += iterations
+
+        linked = link.shape[0] > 0
+        converged = not linked or (
+            violation is not None
+            and violation <= self.tolerance * (1.0 + float(np.max(np.abs(link_rhs), initial=0.0)))
+        )
+        statuses = [r.status for r in results]
+        solved = all(s in ('optimal', 'feasible') for s in statuses)
+        if solved and not converged and self.fallback:
+            self.fallbacks += 1
+            return None
+
+        solution = {}
+        for r in results:
+            if isinstance(r.solution, dict):
+                solution.update(r.solution)
+        if not solved:
+            status = next(s for s in statuses if s not in ('optimal', 'feasible'))
+        elif linked or 'feasible' in statuses:
+            status = 'feasible'
+        else:
+            status = 'optimal'
+
+        x = self._values(canonical, results) if solved else None
+        if x is not None:
+            objective_value = self._objective(canonical, x)
+        elif solved:
+            objective_value = canonical.obj_constant + sum(
+                r.metrics.get('objective_value', 0.0) for r in results
+            )
+        else:
+            objective_value = float('inf')
+
+        return {
+            'status': status,
+            'solution': solution if solved else None,
+            'metrics': {
+                'objective_value': objective_value,
+                'gap': max(r.metrics.get('gap', 0.0) for r in results) if solved else float('inf'),
+                'solve_time': time.perf_counter() - started,
+                'feasible': solved and converged,
+                'decomposition': dict(
+                    plan.summary(),
+                    iterations=iterations,
+                    linking_violation=violation
+                )
+            },
+            'results': results
+        }
+
+    def extract(
+        self,
+        canonical: CanonicalProblem,
+        columns: np.ndarray,
+        rows: np.ndarray,
+        block: int = 0,
+        num_blocks: int = 1
+    ) -> CanonicalProblem:
+        """
+        Sub-problem over a subset of variables and rows.
+
+        Rows must only reference the given columns; quadratic objective
+        terms outside the block are dropped. Arrays are sliced, so the
+        sub-problem does not share mutable state with the original.
+        """
+        n = canonical.num_variables
+        colmap = np.full(n, -1, dtype=np.int64)
+        colmap[columns] = np.arange(columns.size)
+        rowmap = np.full(canonical.num_constraints, -1, dtype=np.int64)
+        rowmap[rows] = np.arange(rows.size)
+
+        A = canonical.A
+        entry_rows = rowmap[A.row_ids()]
+        keep = entry_rows >= 0
+        sub_A = CSRMatrix.from_coo(
+            entry_rows[keep], colmap[A.indices[keep]], A.data[keep],
+            (rows.size, columns.size)
+        )
+
+        qi, qj, qv = canonical.obj_quad
+        keep_q = (colmap[qi] >= 0) & (colmap[qj] >= 0)
+        cr, ci, cj, cv = canonical.con_quad
+        keep_c = rowmap[cr] >= 0
+        row_list = rows.tolist()
+
+        return CanonicalProblem(
+            canonical.problem_type,
+            [canonical.names[i] for i in columns.tolist()],
+            canonical.lower[columns],
+            canonical.upper[columns],
+            canonical.vtype[columns],
+            canonical.objective[columns],
+            sub_A,
+            canonical.row_sense[rows],
+            canonical.rhs[rows],
+            sense=canonical.sense,
+            obj_quad=(colmap[qi[keep_q]], colmap[qj[keep_q]], qv[keep_q]),
+            con_quad=(
+                rowmap[cr[keep_c]], colmap[ci[keep_c]], colmap[cj[keep_c]], cv[keep_c]
+            ),
+            objectives=canonical.objectives,
+            con_types=[canonical.con_types[i] for i in row_list],
+            con_names=[canonical.con_names[i] for i in row_list],
+            con_expressions=[canonical.con_expressions[i] for i in row_list],
+            con_metadata=[canonical.con_metadata[i] for i in row_list],
+            domains=(
+                [canonical.domains[i] for i in columns.tolist()]
+                if canonical.domains else None
+            ),
+            metadata=dict(canonical.metadata, block=block, num_blocks=num_blocks),
+            row_parsed=canonical.row_parsed[rows]
+        )
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """Get decomposition counters."""
+        return {
+            'enabled': self.enabled,
+            'planned': self.planned,
+            'decomposed': self.decomposed,
+            'block_solves': self.block_solves,
+            'iterations': self.iterations,
+            'fallbacks': self.fallbacks
+        }
+
+    def _split_on_dense_rows(
+        self,
+        canonical: CanonicalProblem,
+        groups: np.ndarray,
+        nodes: np.ndarray,
+        pairs: Tuple[np.ndarray, np.ndarray]
+    ) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+        """
+        Look for a small set of linking rows whose removal splits the graph.
+
+        Tries the 1, 2, 4, ... densest linear rows, up to
+        ``max_linking_fraction`` of all rows. Rows with quadratic terms
+        are never relaxed.
+
+        Returns:
+            Tuple of (linking rows, component labels), or (empty, None)
+            if no such set exists
+        """
+        m = canonical.num_constraints
+        n = canonical.num_variables
+        limit = int(self.max_linking_fraction * m)
+        candidates = np.diff(canonical.A.indptr).astype(np.float64)
+        candidates[canonical.con_quad[0]] = -1.0
+        order = np.argsort(-candidates, kind='stable')
+        order = order[candidates[order] > 0]
+
+        k = 1
+        while k <= min(limit, order.size):
+            linking = np.sort(order[:k])
+            removed = np.zeros(m, dtype=bool)
+            removed[linking] = True
+            keep = ~removed[groups]
+            labels = connected_components(n, groups[keep], nodes[keep], pairs)
+            if np.unique(labels).size >= 2 and len(self._pack(labels)) >= 2:
+                return linking, labels
+            k *= 2
+        return np.zeros(0, dtype=np.int64), None
+
+    def _pack(self, labels: np.ndarray) -> List[np.ndarray]:
+        """
+        Pack components into at most ``max_blocks`` balanced blocks.
+
+        Largest components are placed first, each into the currently
+        smallest block. Blocks below ``min_block_variables`` are merged
+        into the smallest remaining block.
+        """
+        _, inverse, sizes = np.unique(labels, return_inverse=True, return_counts=True)
+        num_blocks = min(self.max_blocks, sizes.size)
+        if num_blocks < 2:
+            return []
+
+        load = np.zeros(num_blocks, dtype=np.int64)
+        assign = np.empty(sizes.size, dtype=np.int64)
+        for component in np.argsort(-sizes, kind='stable').tolist():
+            target = int(np.argmin(load))
+            assign[component] = target
+            load[target] += sizes[component]
+
+        block_of = assign[inverse]
+        columns = [np.flatnonzero(block_of == k) for k in range(num_blocks)]
+        columns.sort(key=lambda cols: -cols.size)
+        while len(columns) > 1 and columns[-1].size < self.min_block_variables:
+            small = columns.pop()
+            columns[-1] = np.sort(np.concatenate([columns[-1], small]))
+            columns.sort(key=lambda cols: -cols.size)
+        return columns if len(columns) >= 2 else []
+
+    @staticmethod
+    def _linking_matrix(canonical: CanonicalProblem, rows: np.ndarray) -> CSRMatrix:
+        """Linear part of the linking rows as its own CSR matrix."""
+        A = canonical.A
+        rowmap = np.full(canonical.num_constraints, -1, dtype=np.int64)
+        rowmap[rows] = np.arange(rows.size)
+        entry_rows = rowmap[A.row_ids()]
+        keep = entry_rows >= 0
+        return CSRMatrix.from_coo(
+            entry_rows[keep], A.indices[keep], A.data[keep],
+            (rows.size, canonical.num_variables)
+        )
+
+    @staticmethod
+    def _with_objective(sub: CanonicalProblem, objective: np.ndarray) -> CanonicalProblem:
+        """Copy of a sub-problem with a different linear objective."""
+        return CanonicalProblem(
+            sub.problem_type, sub.names, sub.lower, sub.upper, sub.vtype,
+            objective, sub.A, sub.row_sense, sub.rhs,
+            sense=sub.sense,
+            obj_quad=sub.obj_quad,
+            con_quad=sub.con_quad,
+            objectives=sub.objectives,
+            con_types=sub.con_types,
+            con_names=sub.con_names,
+            con_expressions=sub.con_expressions,
+            con_metadata=sub.con_metadata,
+            domains=sub.domains,
+            metadata=sub.metadata,
+            index=sub.index,
+            row_parsed=sub.row_parsed
+        )
+
+    @staticmethod
+    def _values(canonical: CanonicalProblem, results: List[Any]) -> Optional[np.ndarray]:
+        """Merged solution vector, or None if a variable has no value."""
+        merged = {}
+        for r in results:
+            if isinstance(r.solution, dict):
+                merged.update(r.solution)
+        try:
+            return np.array([merged[name] for name in canonical.names], dtype=np.float64)
+        except (KeyError, TypeError, ValueError):
+            return None
+
+    @staticmethod
+    def _objective(canonical: CanonicalProblem, x: np.ndarray) -> float:
+        """Objective value of a full solution vector."""
+        qi, qj, qv = canonical.obj_quad
+        return float(
+            canonical.obj_constant + canonical.objective @ x + np.sum(qv * x[qi] * x[qj])
+        )
+
+    @staticmethod
+    def _violation(residual: np.ndarray, sense: np.ndarray) -> np.ndarray:
+        """Constraint violation per row for residual = Ax - b."""
+        return np.where(
+            sense == SENSE_LE, np.maximum(residual, 0.0),
+            np.where(sense == SENSE_GE, np.minimum(residual, 0.0), residual)
+        )
+
+    @staticmethod
+    def _project(multipliers: np.ndarray, sense: np.ndarray) -> np.ndarray:
+        """Project multipliers onto their sign constraints (>= 0 for <=, <= 0 for >=)."""
+        return np.where(
+            sense == SENSE_LE, np.maximum(multipliers, 0.0),
+            np.where(sense == SENSE_GE, np.minimum(multipliers, 0.0), multipliers)
+        )
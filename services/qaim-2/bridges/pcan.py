@@ -7,7 +7,31 @@ Implements S1000D/ATA-aware canonicalization with metadata preservation.
 TFA Layer: FWD (Nowcast)
 """
 
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional, Tuple
+from collections import OrderedDict
+import hashlib
+import json
+
+import numpy as np
+
+from .canonical import (
+    CanonicalProblem, CSRMatrix, parse_terms,
+    VAR_TYPES, VAR_BINARY, SENSES
+)
+
+
+def _fingerprint_default(obj: Any) -> Any:
+    """Exact JSON stand-in for NumPy values in fingerprints."""
+    if isinstance(obj, np.ndarray):
+        data = np.ascontiguousarray(obj)
+        return {
+            '__ndarray__': hashlib.sha256(data.tobytes()).hexdigest(),
+            'dtype': data.dtype.str,
+            'shape': list(data.shape)
+        }
+    if isinstance(obj, np.generic):
+        return obj.item()
+    raise TypeError(f"Cannot fingerprint {type(obj).__name__}")
 
 
 class ProblemCanonicalizer:
@@ -29,13 +53,19 @@ class ProblemCanonicalizer:
         self.cache_size = config.get('cache_size', 1000)
         self.s1000d_aware = config.get('s1000d_aware', False)
         self.ata_mapping = config.get('ata_mapping', False)
-        self._cache = {}
+        
+        # Bounded LRU: fingerprint -> canonical problem
+        self._cache = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._uncacheable = 0
     
     async def canonicalize(
         self,
         problem: Dict[str, Any],
         metadata: Optional[Dict[str, Any]] = None
-    ) -> Dict[str, Any]:
+    ) -> CanonicalProblem:
         """
         Canonicalize a problem into standard format.
         
@@ -44,81 +74,239 @@ class ProblemCanonicalizer:
             metadata: Optional metadata (ATA chapter, domain, S1000D refs)
             
         Returns:
-            Canonical problem representation with:
+            CanonicalProblem with bound/type/objective arrays and a CSR
+            constraint matrix. It also reads as a mapping with:
             - problem_type: string identifier
             - variables: list of variable definitions
             - constraints: list of constraint objects
             - objectives: list of objective functions
             - metadata: preserved and enriched metadata
+            
+        Raises:
+            ValueError: If the problem defines no variables or is malformed
+            
+        Canonical problems are cached by fingerprint and shared between
+        calls; callers must treat the returned value as read-only.
         """
+        key = self._fingerprint(problem, metadata) if self.cache_size > 0 else None
+        
+        if key is not None:
+            cached = self._cache.get(key)
+            if cached is not None:
+                self._cache.move_to_end(key)
+                self._hits += 1
+                return cached
+            self._misses += 1
+        
+        canonical = self._build_canonical(problem, metadata)
+        
+        if key is not None:
+            self._cache[key] = canonical
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+                self._evictions += 1
+        
+        return canonical
+    
+    def _build_canonical(
+        self,
+        problem: Dict[str, Any],
+        metadata: Optional[Dict[str, Any]]
+    ) -> CanonicalProblem:
+        """Build canonical representation from a raw problem."""
         problem_type = problem.get('problem_type', 'unknown')
         
-        # Extract and normalize variables
-        variables = self._extract_variables(problem)
+        # Extract and normalize variables into bound/type arrays
+        names, lower, upper, vtype, domains = self._extract_variables(problem)
+        index = {name: i for i, name in enumerate(names)}
+        if len(index) != len(names):
+            raise ValueError("Problem defines duplicate variable names")
         
-        # Extract and normalize constraints
-        constraints = self._extract_constraints(problem)
+        # Extract and normalize constraints into CSR rows
+        constraints = self._extract_constraints(problem, index)
         
-        # Extract and normalize objectives
-        objectives = self._extract_objectives(problem)
+        # Extract and normalize objectives into coefficient arrays
+        objectives = self._extract_objectives(problem, index)
         
         # Enrich metadata with ATA/S1000D mappings
         enriched_metadata = self._enrich_metadata(metadata or {})
         
-        canonical = {
-            'problem_type': problem_type,
-            'variables': variables,
-            'constraints': constraints,
-            'objectives': objectives,
-            'metadata': enriched_metadata
-        }
+        return CanonicalProblem(
+            problem_type=problem_type,
+            names=names,
+            lower=lower,
+            upper=upper,
+            vtype=vtype,
+            domains=domains,
+            index=index,
+            metadata=enriched_metadata,
+            **constraints,
+            **objectives
+        )
+    
+    def _fingerprint(
+        self,
+        problem: Dict[str, Any],
+        metadata: Optional[Dict[str, Any]]
+    ) -> Optional[str]:
+        """
+        Compute structural fingerprint of raw problem plus metadata.
         
-        return canonical
+        NumPy arrays are hashed by dtype, shape and raw bytes. Returns None
+        (problem is not cached) if the input holds other non-JSON values,
+        whose string form may be lossy or differ between equal objects.
+        """
+        try:
+            payload = json.dumps(
+                [problem, metadata or {}],
+                sort_keys=True,
+                default=_fingerprint_default
+            )
+        except (TypeError, ValueError):
+            self._uncacheable += 1
+            return None
+        return hashlib.sha256(payload.encode()).hexdigest()
+    
+    def get_statistics(self) -> Dict[str, Any]:
+        """Get canonicalization cache statistics."""
+        lookups = self._hits + self._misses
+        return {
+            'size': len(self._cache),
+            'capacity': self.cache_size,
+            'hits': self._hits,
+            'misses': self._misses,
+            'hit_rate': self._hits / lookups if lookups else 0.0,
+            'evictions': self._evictions,
+            'uncacheable': self._uncacheable
+        }
     
-    def _extract_variables(self, problem: Dict[str, Any]) -> list:
-        """Extract and normalize variable definitions."""
+    def _extract_variables(
+        self,
+        problem: Dict[str, Any]
+    ) -> Tuple[List[str], np.ndarray, np.ndarray, np.ndarray, Optional[list]]:
+        """Extract variable definitions into name list and bound/type arrays."""
         variables = problem.get('variables', [])
         
-        normalized = []
+        size = len(variables)
+        names = []
+        lower = np.zeros(size)
+        upper = np.full(size, np.inf)
+        vtype = np.zeros(size, dtype=np.int8)
+        domains = [None] * size
+        has_domains = False
+        
         for var in variables:
+            i = len(names)
             if isinstance(var, dict):
-                normalized.append({
-                    'name': var.get('name'),
-                    'type': var.get('type', 'continuous'),
-                    'lower_bound': var.get('lower_bound', 0),
-                    'upper_bound': var.get('upper_bound', float('inf')),
-                    'domain': var.get('domain')
-                })
+                name = var.get('name')
+                if name is None:
+                    raise ValueError("Variable definition without name")
+                var_type = var.get('type', 'continuous')
+                if var_type not in VAR_TYPES:
+                    raise ValueError(f"Unknown variable type for {name}: {var_type}")
+                lb = var.get('lower_bound', 0)
+                ub = var.get('upper_bound', np.inf)
+                lower[i] = -np.inf if lb is None else lb
+                upper[i] = np.inf if ub is None else ub
+                vtype[i] = VAR_TYPES.index(var_type)
+                if var.get('domain') is not None:
+                    domains[i] = var['domain']
+                    has_domains = True
             elif isinstance(var, str):
                 # Simple variable name
-                normalized.append({
-                    'name': var,
-                    'type': 'continuous',
-                    'lower_bound': 0,
-                    'upper_bound': float('inf')
-                })
+                name = var
+            else:
+                continue
+            names.append(name)
         
-        return normalized
+        if not names:
+            raise ValueError("Problem defines no decision variables")
+        
+        count = len(names)
+        lower, upper, vtype = lower[:count], upper[:count], vtype[:count]
+        
+        # Binary variables live in [0, 1]
+        binary = vtype == VAR_BINARY
+        lower[binary] = np.maximum(lower[binary], 0.0)
+        upper[binary] = np.minimum(upper[binary], 1.0)
+        
+        return names, lower, upper, vtype, domains[:count] if has_domains else None
     
-    def _extract_constraints(self, problem: Dict[str, Any]) -> list:
-        """Extract and normalize constraint definitions."""
-        constraints = problem.get('constraints', [])
+    def _extract_constraints(
+        self,
+        problem: Dict[str, Any],
+        index: Dict[str, int]
+    ) -> Dict[str, Any]:
+        """Extract constraint definitions into a CSR matrix and row arrays."""
+        constraints = [c for c in problem.get('constraints', []) if isinstance(c, dict)]
         
-        normalized = []
-        for con in constraints:
-            if isinstance(con, dict):
-                normalized.append({
-                    'type': con.get('type'),
-                    'expression': con.get('expression'),
-                    'sense': con.get('sense', '<='),
-                    'rhs': con.get('rhs', con.get('value', 0)),
-                    'metadata': con.get('metadata', {})
-                })
+        num_rows = len(constraints)
+        rhs = np.zeros(num_rows)
+        row_sense = np.zeros(num_rows, dtype=np.int8)
+        row_parsed = np.zeros(num_rows, dtype=bool)
+        rows, cols, vals = [], [], []
+        q_rows, q_i, q_j, q_vals = [], [], [], []
+        con_types, con_names, con_expressions, con_metadata = [], [], [], []
+        
+        for r, con in enumerate(constraints):
+            sense = con.get('sense', '<=')
+            if sense not in SENSES:
+                raise ValueError(f"Unknown constraint sense: {sense}")
+            row_sense[r] = SENSES.index(sense)
+            value = con.get('rhs', con.get('value', 0))
+            rhs[r] = 0.0 if value is None else value
+            
+            spec = con.get('coefficients', con.get('expression'))
+            terms = parse_terms(spec, index) if spec is not None else None
+            if terms is not None:
+                row_parsed[r] = True
+                linear, quadratic, constant = terms
+                for col, coef in linear:
+                    rows.append(r)
+                    cols.append(col)
+                    vals.append(coef)
+                for i, j, coef in quadratic:
+                    q_rows.append(r)
+                    q_i.append(i)
+                    q_j.append(j)
+                    q_vals.append(coef)
+                rhs[r] -= constant
+            
+            con_types.append(con.get('type'))
+            con_names.append(con.get('name'))
+            con_expressions.append(con.get('expression'))
+            con_metadata.append(con.get('metadata', {}))
+        
+        A = CSRMatrix.from_coo(rows, cols, vals, (num_rows, len(index)))
         
-        return normalized
+        return {
+            'A': A,
+            'row_sense': row_sense,
+            'rhs': rhs,
+            'row_parsed': row_parsed,
+            'con_quad': (
+                np.asarray(q_rows, dtype=np.int64),
+                np.asarray(q_i, dtype=np.int64),
+                np.asarray(q_j, dtype=np.int64),
+                np.asarray(q_vals, dtype=np.float64)
+            ),
+            'con_types': con_types,
+            'con_names': con_names,
+            'con_expressions': con_expressions,
+            'con_metadata': con_metadata
+        }
     
-    def _extract_objectives(self, problem: Dict[str, Any]) -> list:
-        """Extract and normalize objective functions."""
+    def _extract_objectives(
+        self,
+        problem: Dict[str, Any],
+        index: Dict[str, int]
+    ) -> Dict[str, Any]:
+        """
+        Extract objective functions into combined coefficient arrays.
+        
+        Weighted objectives are folded into one objective in the sense of
+        the first objective; objectives with the opposite sense are negated.
+        """
         objectives = problem.get('objectives', [])
         
         normalized = []
@@ -131,7 +319,40 @@ class ProblemCanonicalizer:
                     'weight': obj.get('weight', 1.0)
                 })
         
-        return normalized
+        sense = normalized[0]['sense'] if normalized else 'minimize'
+        c = np.zeros(len(index))
+        q_i, q_j, q_vals = [], [], []
+        constant = 0.0
+        
+        for obj, raw in zip(normalized, (o for o in objectives if isinstance(o, dict))):
+            if obj['sense'] not in ('minimize', 'maximize'):
+                raise ValueError(f"Unknown objective sense: {obj['sense']}")
+            spec = raw.get('coefficients', raw.get('expression'))
+            terms = parse_terms(spec, index) if spec is not None else None
+            if not terms:
+                continue
+            
+            scale = obj['weight'] * (1.0 if obj['sense'] == sense else -1.0)
+            linear, quadratic, const = terms
+            for col, coef in linear:
+                c[col] += scale * coef
+            for i, j, coef in quadratic:
+                q_i.append(i)
+                q_j.append(j)
+                q_vals.append(scale * coef)
+            constant += scale * const
+        
+        return {
+            'objective': c,
+            'obj_quad': (
+                np.asarray(q_i, dtype=np.int64),
+                np.asarray(q_j, dtype=np.int64),
+                np.asarray(q_vals, dtype=np.float64)
+            ),
+            'obj_constant': constant,
+            'sense': sense,
+            'objectives': normalized
+        }
     
     def _enrich_metadata(self, metadata: Dict[str, Any]) -> Dict[str, Any]:
         """Enrich metadata with ATA/S1000D mappings."""
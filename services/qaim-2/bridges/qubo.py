@@ -0,0 +1,268 @@
+"""
+QUBO Builder
+
+Builds sparse QUBO models from canonical problems for the XFR bridge.
+Linear and quadratic coefficients come from the canonical objective and
+penalty-weighted constraints; only nonzero couplings are allocated.
+
+TFA Layer: CB/QB (Translation)
+"""
+
+from typing import Dict, Any, List, Optional
+
+import numpy as np
+
+from .canonical import CanonicalProblem, CSRMatrix, VAR_BINARY, SENSE_GE, SENSE_EQ
+
+
+class SparseQUBO:
+    """
+    Sparse QUBO model: E(x) = offset + h·x + Σ_{i<j} Q_ij x_i x_j.
+
+    Couplings are stored as upper-triangular COO arrays (row < col) with
+    duplicate entries summed.
+    """
+
+    __slots__ = (
+        'num_variables', 'linear', 'rows', 'cols', 'vals', 'offset',
+        'variable_names', 'num_original', 'meta'
+    )
+
+    def __init__(
+        self,
+        linear: np.ndarray,
+        rows: np.ndarray,
+        cols: np.ndarray,
+        vals: np.ndarray,
+        offset: float = 0.0,
+        variable_names: Optional[List[str]] = None,
+        num_original: Optional[int] = None,
+        meta: Optional[Dict[str, Any]] = None
+    ):
+        self.num_variables = int(linear.size)
+        self.linear = linear
+        self.rows = rows
+        self.cols = cols
+        self.vals = vals
+        self.offset = float(offset)
+        self.variable_names = variable_names or [f'x{i}' for i in range(self.num_variables)]
+        self.num_original = self.num_variables if num_original is None else num_original
+        self.meta = meta or {}
+
+    @property
+    def nnz(self) -> int:
+        """Number of stored quadratic couplings."""
+        return int(self.vals.size)
+
+    def to_csr(self) -> CSRMatrix:
+        """Upper-triangular coupling matrix in CSR form."""
+        return CSRMatrix.from_coo(
+            self.rows, self.cols, self.vals,
+            (self.num_variables, self.num_variables)
+        )
+
+    def adjacency(self) -> CSRMatrix:
+        """
+        Symmetric coupling matrix in CSR form.
+
+        Row i holds Q_ij for every neighbour j, so the local field of
+        variable i is ``linear[i] + adjacency().row(i) · x``.
+        """
+        return CSRMatrix.from_coo(
+            np.concatenate([self.rows, self.cols]),
+            np.concatenate([self.cols, self.rows]),
+            np.concatenate([self.vals, self.vals]),
+            (self.num_variables, self.num_variables)
+        )
+
+    def energy(self, x: np.ndarray) -> np.ndarray:
+        """
+        Evaluate energies for one sample (n,) or a batch of samples (k, n).
+        """
+        x = np.asarray(x, dtype=np.float64)
+        quad = (x[..., self.rows] * x[..., self.cols]) @ self.vals
+        return self.offset + x @ self.linear + quad
+
+    def lower_bound(self) -> float:
+        """Trivial lower bound: offset plus all negative coefficients."""
+        return float(
+            self.offset
+            + np.minimum(self.linear, 0.0).sum()
+            + np.minimum(self.vals, 0.0).sum()
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Export in the legacy dict format with (i, j) coupling keys."""
+        return {
+            'type': 'qubo',
+            'num_variables': self.num_variables,
+            'linear': dict(enumerate(self.linear.tolist())),
+            'quadratic': {
+                (i, j): v for i, j, v in zip(
+                    self.rows.tolist(), self.cols.tolist(), self.vals.tolist()
+                )
+            },
+            'offset': self.offset
+        }
+
+    def decode(self, x: np.ndarray) -> Dict[str, int]:
+        """Map a sample to original variable names (slack bits dropped)."""
+        values = np.asarray(x).astype(int).tolist()
+        return {
+            name: values[i] for i, name in enumerate(self.variable_names[:self.num_original])
+        }
+
+
+class QUBOBuilder:
+    """
+    Build sparse QUBOs from canonical problems.
+
+    Equality constraints become P·(a·x - b)²; inequalities get binary slack
+    variables (bounded-coefficient encoding) and are penalized the same way.
+    """
+
+    def __init__(self, config: Optional[Dict[str, Any]] = None):
+        """
+        Initialize builder with configuration.
+
+        Args:
+            config: Configuration with optional fixed ``penalty`` weight
+        """
+        self.config = config or {}
+        self.penalty = self.config.get('penalty')
+
+    def build(self, canonical: CanonicalProblem) -> SparseQUBO:
+        """
+        Build a sparse QUBO from a canonical problem.
+
+        Args:
+            canonical: Canonical problem (non-binary variables are relaxed
+                to binary indicators and counted in ``meta``)
+
+        Returns:
+            SparseQUBO over original variables followed by slack bits
+        """
+        n = canonical.num_variables
+        sign = 1.0 if canonical.sense == 'minimize' else -1.0
+
+        linear = sign * canonical.objective.astype(np.float64, copy=True)
+        offset = sign * canonical.obj_constant
+
+        row_parts = []
+        col_parts = []
+        val_parts = []
+
+        # Objective couplings; x_i * x_i = x_i for binaries
+        q_i, q_j, q_v = canonical.obj_quad
+        if q_v.size:
+            diag = q_i == q_j
+            np.add.at(linear, q_i[diag], sign * q_v[diag])
+            off = ~diag
+            row_parts.append(np.minimum(q_i[off], q_j[off]))
+            col_parts.append(np.maximum(q_i[off], q_j[off]))
+            val_parts.append(sign * q_v[off])
+
+        penalty = self.penalty
+        if penalty is None:
+            penalty = 1.0 + np.abs(linear).sum() + sum(np.abs(v).sum() for v in val_parts)
+
+        # Constraint penalties
+        A = canonical.A
+        m = canonical.num_constraints
+        skip = ~canonical.row_parsed
+        skip[canonical.con_quad[0]] = True
+
+        # Inequalities in a·x <= b form: flip >= rows
+        flip = np.where(canonical.row_sense == SENSE_GE, -1.0, 1.0)
+        rhs_le = flip * canonical.rhs
+        row_ids = A.row_ids()
+        neg_sum = np.bincount(
+            row_ids, weights=np.minimum(flip[row_ids] * A.data, 0.0), minlength=m
+        )
+
+        # a·x + s = b with 0 <= s <= b - min(a·x), s encoded in binary slack bits
+        slack_range = np.ceil(rhs_le - neg_sum).astype(np.int64)
+        slack_range[(canonical.row_sense == SENSE_EQ) | skip | (np.diff(A.indptr) == 0)] = 0
+        slack_bits = np.zeros(m, dtype=np.int64)
+        positive = slack_range > 0
+        slack_bits[positive] = np.floor(np.log2(slack_range[positive])).astype(np.int64) + 1
+        slack_start = n + np.concatenate([[0], np.cumsum(slack_bits)[:-1]]).astype(np.int64)
+        total = n + int(slack_bits.sum())
+        linear = np.concatenate([linear, np.zeros(total - n)])
+
+        for r in range(m):
+            idx, coef = A.row(r)
+            if skip[r] or idx.size == 0:
+                continue
+
+            idx = idx.astype(np.int64)
+            coef = flip[r] * coef
+            rhs = float(rhs_le[r])
+
+            if slack_bits[r]:
+                weights = self._slack_encoding(int(slack_range[r]))
+                start = slack_start[r]
+                idx = np.concatenate([idx, np.arange(start, start + len(weights))])
+                coef = np.concatenate([coef, np.asarray(weights, dtype=np.float64)])
+
+            # P·(a·x - b)² expanded over binaries
+            np.add.at(linear, idx, penalty * (coef * coef - 2.0 * rhs * coef))
+            offset += penalty * rhs * rhs
+
+            upper_i, upper_j = np.triu_indices(idx.size, 1)
+            row_parts.append(idx[upper_i])
+            col_parts.append(idx[upper_j])
+            val_parts.append(2.0 * penalty * coef[upper_i] * coef[upper_j])
+
+        num_slack = total - n
+        rows, cols, vals = self._sum_duplicates(row_parts, col_parts, val_parts, total)
+
+        names = list(canonical.names) + [f'_slack{k}' for k in range(num_slack)]
+        return SparseQUBO(
+            linear=linear,
+            rows=rows,
+            cols=cols,
+            vals=vals,
+            offset=offset,
+            variable_names=names,
+            num_original=n,
+            meta={
+                'penalty': float(penalty),
+                'num_slack': num_slack,
+                'relaxed_variables': int(np.count_nonzero(canonical.vtype != VAR_BINARY)),
+                'skipped_constraints': int(np.count_nonzero(skip)),
+                'unparsed_constraints': canonical.num_unparsed,
+                'sense': canonical.sense
+            }
+        )
+
+    @staticmethod
+    def _slack_encoding(upper: int) -> List[int]:
+        """Binary weights 1, 2, 4, ... whose subset sums cover 0..upper exactly."""
+        weights = []
+        remaining = upper
+        power = 1
+        while remaining > 0:
+            weight = min(power, remaining)
+            weights.append(weight)
+            remaining -= weight
+            power *= 2
+        return weights
+
+    @staticmethod
+    def _sum_duplicates(row_parts, col_parts, val_parts, size: int):
+        """Concatenate COO parts, sum duplicates and drop zeros."""
+        if not row_parts:
+            empty = np.zeros(0, dtype=np.int64)
+            return empty, empty, np.zeros(0)
+
+        rows = np.concatenate(row_parts).astype(np.int64)
+        cols = np.concatenate(col_parts).astype(np.int64)
+        vals = np.concatenate(val_parts).astype(np.float64)
+
+        keys = rows * size + cols
+        unique_keys, inverse = np.unique(keys, return_inverse=True)
+        summed = np.bincount(inverse, weights=vals, minlength=unique_keys.size)
+        keep = summed != 0.0
+        unique_keys = unique_keys[keep]
+        return unique_keys // size, unique_keys % size, summed[keep]
@@ -0,0 +1,347 @@
+"""
+Runtime Predictor
+
+CPU-only learned predictor of solver runtime and solution quality for
+the SM bridge. A small multilayer perceptron over the structural features
+and a one-hot solver encoding is trained offline, in NumPy, from logged
+(features, solver, solve_time, quality) records. Weights are stored as
+``.npy`` files and memory-mapped on load; one forward pass scores every
+known solver at once.
+
+Usage (offline training):
+    python bridges/runtime_predictor.py train outcomes.jsonl /models/runtime-v1
+
+TFA Layer: UE (Collapse)
+"""
+
+from typing import Dict, Any, List, Optional, Iterable, Sequence, Tuple
+from pathlib import Path
+import argparse
+import json
+import math
+import os
+import sys
+
+import numpy as np
+
+
+# Structural features used as model inputs (log-scaled where marked)
+FEATURES = (
+    ('num_variables', 'log'),
+    ('num_constraints', 'log'),
+    ('nnz', 'log'),
+    ('density', 'linear'),
+    ('binary_fraction', 'linear'),
+    ('integer_fraction', 'linear'),
+    ('equality_fraction', 'linear'),
+    ('row_degree_mean', 'log'),
+    ('row_degree_max', 'log'),
+    ('col_degree_mean', 'log'),
+    ('coefficient_range', 'linear'),
+    ('objective_range', 'linear'),
+    ('num_quadratic', 'log'),
+    ('num_components', 'log'),
+    ('largest_component_fraction', 'linear')
+)
+
+FORMAT_VERSION = 1
+
+# Standardized inputs are clipped to +-MAX_Z; predicted log seconds to 1 us .. ~1 week
+MAX_Z = 5.0
+LOG_TIME_RANGE = (math.log(1e-6), math.log(1e6))
+
+
+def feature_vector(structural: Dict[str, Any]) -> np.ndarray:
+    """
+    Model input vector for one problem's structural features.
+
+    Missing features (e.g. from older logs) are treated as zero.
+    """
+    n = max(structural.get('num_variables', 0), 1)
+    m = max(structural.get('num_constraints', 0), 1)
+    row_degree = structural.get('row_degree') or {}
+    col_degree = structural.get('col_degree') or {}
+    raw = {
+        'num_variables': structural.get('num_variables', 0),
+        'num_constraints': structural.get('num_constraints', 0),
+        'nnz': structural.get('nnz', 0),
+        'density': structural.get('density', 0.0),
+        'binary_fraction': structural.get('num_binary', 0) / n,
+        'integer_fraction': structural.get('num_integer', 0) / n,
+        'equality_fraction': structural.get('num_eq', 0) / m,
+        'row_degree_mean': row_degree.get('mean', 0.0),
+        'row_degree_max': row_degree.get('max', 0),
+        'col_degree_mean': col_degree.get('mean', 0.0),
+        'coefficient_range': structural.get('coefficient_range', 0.0),
+        'objective_range': structural.get('objective_range', 0.0),
+        'num_quadratic': (
+            structural.get('num_quadratic_objective', 0)
+            + structural.get('num_quadratic_constraint', 0)
+        ),
+        'num_components': structural.get('num_components', 0),
+        'largest_component_fraction': structural.get('largest_component', 0) / n
+    }
+    return np.array(
+        [
+            math.log1p(max(float(raw[name]), 0.0)) if scale == 'log' else float(raw[name])
+            for name, scale in FEATURES
+        ],
+        dtype=np.float64
+    )
+
+
+class RuntimePredictor:
+    """
+    MLP predicting log solve time and quality per (problem, solver).
+
+    Layers are ReLU except the output, whose first unit is log seconds and
+    whose second unit is a quality logit (sigmoid applied on predict).
+    """
+
+    def __init__(
+        self,
+        solvers: Sequence[str],
+        weights: List[np.ndarray],
+        biases: List[np.ndarray],
+        x_mean: np.ndarray,
+        x_std: np.ndarray
+    ):
+        self.solvers = list(solvers)
+        self.weights = weights
+        self.biases = biases
+        self.x_mean = x_mean
+        self.x_std = x_std
+        self._solver_index = {solver: i for i, solver in enumerate(self.solvers)}
+
+    @property
+    def num_inputs(self) -> int:
+        """Input width: features plus one-hot solver."""
+        return len(FEATURES) + len(self.solvers)
+
+    def predict(self, structural: Dict[str, Any]) -> Dict[str, Dict[str, float]]:
+        """
+        Predict solve time and quality of every known solver for one problem.
+
+        Returns:
+            Mapping solver -> {'solve_time': seconds, 'quality': 0..1}
+        """
+        log_time, quality = self.predict_batch(feature_vector(structural)[None, :])
+        return {
+            solver: {'solve_time': float(np.exp(log_time[0, k])), 'quality': float(quality[0, k])}
+            for k, solver in enumerate(self.solvers)
+        }
+
+    def predict_batch(self, features: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Batched inference over problems and all solvers.
+
+        Args:
+            features: (batch, len(FEATURES)) matrix of feature_vector() rows
+
+        Returns:
+            Tuple of (log solve time, quality), each (batch, num_solvers)
+        """
+        batch = features.shape[0]
+        k = len(self.solvers)
+        inputs = np.empty((batch, k, self.num_inputs))
+        inputs[:, :, :len(FEATURES)] = self._standardize(features)[:, None, :]
+        inputs[:, :, len(FEATURES):] = np.eye(k)
+        outputs = self._forward(inputs.reshape(batch * k, -1))[-1].reshape(batch, k, 2)
+        log_time = np.clip(outputs[:, :, 0], *LOG_TIME_RANGE)
+        return log_time, 1.0 / (1.0 + np.exp(-outputs[:, :, 1]))
+
+    def _standardize(self, features: np.ndarray) -> np.ndarray:
+        """Scale features as in training, bounding how far inputs extrapolate."""
+        return np.clip((features - self.x_mean) / self.x_std, -MAX_Z, MAX_Z)
+
+    def _forward(self, inputs: np.ndarray) -> List[np.ndarray]:
+        """Activations of every layer, input first."""
+        activations = [inputs]
+        last = len(self.weights) - 1
+        for layer, (W, b) in enumerate(zip(self.weights, self.biases)):
+            z = activations[-1] @ W + b
+            activations.append(z if layer == last else np.maximum(z, 0.0))
+        return activations
+
+    @classmethod
+    def fit(
+        cls,
+        records: Iterable[Dict[str, Any]],
+        solvers: Optional[Sequence[str]] = None,
+        hidden: Sequence[int] = (32, 32),
+        epochs: int = 500,
+        learning_rate: float = 0.01,
+        seed: int = 0
+    ) -> 'RuntimePredictor':
+        """
+        Train on logged outcomes with full-batch Adam.
+
+        Args:
+            records: Dicts with 'features' (structural features), 'solver',
+                'solve_time' (seconds) and 'quality' (0..1)
+            solvers: Solver vocabulary (default: solvers seen in records)
+            hidden: Hidden layer widths
+            epochs: Gradient steps
+            learning_rate: Adam step size
+            seed: Weight initialization seed
+
+        Raises:
+            ValueError: If there are no records for known solvers
+        """
+        records = list(records)
+        solvers = list(solvers) if solvers is not None else sorted({r['solver'] for r in records})
+        index = {solver: i for i, solver in enumerate(solvers)}
+        records = [r for r in records if r['solver'] in index]
+        if not records:
+            raise ValueError("No training records for known solvers")
+
+        X = np.stack([feature_vector(r['features']) for r in records])
+        x_mean = X.mean(axis=0)
+        x_std = X.std(axis=0)
+        # Constant columns (std is 0 or rounding noise) pass through unscaled
+        x_std[x_std < 1e-6] = 1.0
+        inputs = np.zeros((len(records), len(FEATURES) + len(solvers)))
+        inputs[:, :len(FEATURES)] = np.clip((X - x_mean) / x_std, -MAX_Z, MAX_Z)
+        inputs[np.arange(len(records)), len(FEATURES) + np.array([index[r['solver']] for r in records])] = 1.0
+        y_time = np.clip(
+            np.log(np.maximum([float(r['solve_time']) for r in records], 1e-6)), *LOG_TIME_RANGE
+        )
+        y_quality = np.clip([float(r.get('quality', 1.0)) for r in records], 0.0, 1.0)
+
+        rng = np.random.default_rng(seed)
+        sizes = [inputs.shape[1], *hidden, 2]
+        weights = [
+            rng.normal(0.0, math.sqrt(2.0 / fan_in), (fan_in, fan_out))
+            for fan_in, fan_out in zip(sizes[:-1], sizes[1:])
+        ]
+        biases = [np.zeros(fan_out) for fan_out in sizes[1:]]
+        biases[-1][0] = y_time.mean()
+        model = cls(solvers, weights, biases, x_mean, x_std)
+
+        params = weights + biases
+        moments = [np.zeros_like(p) for p in params]
+        velocities = [np.zeros_like(p) for p in params]
+        beta1, beta2, eps = 0.9, 0.999, 1e-8
+        count = len(records)
+
+        for step in range(1, epochs + 1):
+            activations = model._forward(inputs)
+            out = activations[-1]
+            quality = 1.0 / (1.0 + np.exp(-out[:, 1]))
+            # Squared error on log time; cross-entropy on quality
+            delta = np.empty_like(out)
+            delta[:, 0] = (out[:, 0] - y_time) / count
+            delta[:, 1] = (quality - y_quality) / count
+
+            grads_w = [None] * len(weights)
+            grads_b = [None] * len(biases)
+            for layer in range(len(weights) - 1, -1, -1):
+                grads_w[layer] = activations[layer].T @ delta
+                grads_b[layer] = delta.sum(axis=0)
+                if layer:
+                    delta = (delta @ weights[layer].T) * (activations[layer] > 0)
+
+            for i, grad in enumerate(grads_w + grads_b):
+                moments[i] = beta1 * moments[i] + (1 - beta1) * grad
+                velocities[i] = beta2 * velocities[i] + (1 - beta2) * grad * grad
+                m_hat = moments[i] / (1 - beta1 ** step)
+                v_hat = velocities[i] / (1 - beta2 ** step)
+                params[i] -= learning_rate * m_hat / (np.sqrt(v_hat) + eps)
+
+        return model
+
+    def save(self, path: str) -> None:
+        """
+        Write weights as .npy files plus meta.json into a directory.
+
+        meta.json is written last (atomically), so a reader never sees a
+        partially written model.
+        """
+        directory = Path(path)
+        directory.mkdir(parents=True, exist_ok=True)
+        for i, (W, b) in enumerate(zip(self.weights, self.biases)):
+            np.save(directory / f'W{i}.npy', np.ascontiguousarray(W))
+            np.save(directory / f'b{i}.npy', np.ascontiguousarray(b))
+        np.save(directory / 'x_mean.npy', self.x_mean)
+        np.save(directory / 'x_std.npy', self.x_std)
+
+        meta = {
+            'version': FORMAT_VERSION,
+            'features': [name for name, _ in FEATURES],
+            'solvers': self.solvers,
+            'layers': len(self.weights)
+        }
+        tmp = directory / 'meta.json.tmp'
+        with open(tmp, 'w') as f:
+            json.dump(meta, f, indent=2)
+        os.replace(tmp, directory / 'meta.json')
+
+    @classmethod
+    def load(cls, path: str, mmap: bool = True) -> 'RuntimePredictor':
+        """
+        Load a model written by save(); weights are memory-mapped by default.
+
+        Raises:
+            OSError: If the model files cannot be read
+            ValueError: If the model format or feature set does not match
+        """
+        directory = Path(path)
+        with open(directory / 'meta.json') as f:
+            meta = json.load(f)
+        if meta.get('version') != FORMAT_VERSION:
+            raise ValueError(f"Unsupported runtime model version: {meta.get('version')}")
+        if meta.get('features') != [name for name, _ in FEATURES]:
+            raise ValueError("Runtime model was trained on a different feature set")
+
+        mode = 'r' if mmap else None
+        layers = meta['layers']
+        return cls(
+            meta['solvers'],
+            [np.load(directory / f'W{i}.npy', mmap_mode=mode) for i in range(layers)],
+            [np.load(directory / f'b{i}.npy', mmap_mode=mode) for i in range(layers)],
+            np.load(directory / 'x_mean.npy'),
+            np.load(directory / 'x_std.npy')
+        )
+
+
+def load_records(path: str) -> List[Dict[str, Any]]:
+    """Read logged outcomes (one JSON object per line), skipping bad lines."""
+    records = []
+    with open(path) as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if isinstance(record, dict) and {'features', 'solver', 'solve_time'} <= set(record):
+                records.append(record)
+    return records
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description='Train the QAIM-2 runtime predictor')
+    commands = parser.add_subparsers(dest='command', required=True)
+    train = commands.add_parser('train', help='fit a model from logged outcomes')
+    train.add_argument('records', help='JSONL outcome log (surrogate.outcome_log)')
+    train.add_argument('output', help='model directory')
+    train.add_argument('--hidden', default='32,32', help='comma-separated hidden layer widths')
+    train.add_argument('--epochs', type=int, default=500)
+    train.add_argument('--learning-rate', type=float, default=0.01)
+    train.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    records = load_records(args.records)
+    model = RuntimePredictor.fit(
+        records,
+        hidden=[int(width) for width in args.hidden.split(',') if width.strip()],
+        epochs=args.epochs,
+        learning_rate=args.learning_rate,
+        seed=args.seed
+    )
+    model.save(args.output)
+    print(f"Trained on {len(records)} records for {len(model.solvers)} solvers -> {args.output}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
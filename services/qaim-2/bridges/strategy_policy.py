@@ -24,7 +24,9 @@ class StrategyPolicy:
         Initialize strategy policy with configuration.
         
         Args:
-            config: Configuration with algorithm, exploration_rate, training_mode
+            config: Configuration with algorithm, exploration_rate, training_mode;
+                ``qc_max_qubits`` caps the problems routed to qc_qaoa (the
+                orchestrator sets it from the QC gateway's statevector providers)
         """
         self.config = config
         self.enabled = config.get('enabled', False)
@@ -32,9 +34,13 @@ class StrategyPolicy:
         self.exploration_rate = config.get('exploration_rate', 0.1)
         self.training_mode = config.get('training_mode', 'offline')
         self.default_solver = config.get('default_solver', 'cb_cbc')
+        self.learning_rate = config.get('learning_rate', 0.1)
+        self.qc_max_qubits = config.get('qc_max_qubits')
         
         # Initialize Q-values or policy parameters
+        # _q_values: state key -> solver -> estimated reward
         self._q_values = {}
+        self._visit_counts = {}
         self._policy_params = {}
         
         if self.enabled:
@@ -90,7 +96,7 @@ class StrategyPolicy:
             solver = self._get_default_solver(features, constraints)[0]
         
         # Generate parameters for selected solver
-        params = self._generate_parameters(solver, features, constraints)
+        params = self.generate_parameters(solver, features, constraints)
         
         return solver, params
     
@@ -107,10 +113,7 @@ class StrategyPolicy:
             return self._explore_solver(num_vars, num_cons)
         
         # Exploitation
-        if recommended:
-            return recommended[0]
-        
-        return self._exploit_solver(num_vars, num_cons, problem_type)
+        return self._exploit_solver(num_vars, num_cons, problem_type, recommended)
     
     def _ucb1(
         self,
@@ -121,9 +124,7 @@ class StrategyPolicy:
     ) -> str:
         """UCB1 (Upper Confidence Bound) solver selection."""
         # TODO: Implement actual UCB1 algorithm
-        if recommended:
-            return recommended[0]
-        return self._exploit_solver(num_vars, num_cons, problem_type)
+        return self._exploit_solver(num_vars, num_cons, problem_type, recommended)
     
     def _thompson_sampling(
         self,
@@ -134,9 +135,7 @@ class StrategyPolicy:
     ) -> str:
         """Thompson Sampling solver selection."""
         # TODO: Implement actual Thompson Sampling
-        if recommended:
-            return recommended[0]
-        return self._exploit_solver(num_vars, num_cons, problem_type)
+        return self._exploit_solver(num_vars, num_cons, problem_type, recommended)
     
     def _explore_solver(self, num_vars: int, num_cons: int) -> str:
         """Explore: select random solver."""
@@ -154,12 +153,19 @@ class StrategyPolicy:
         self,
         num_vars: int,
         num_cons: int,
-        problem_type: str
+        problem_type: str,
+        recommended: list = ()
     ) -> str:
         """Exploit: select best-known solver."""
-        # Simple heuristic-based selection
-        # TODO: Use learned Q-values
+        # Learned Q-values take precedence once this state has been visited
+        q_values = self._q_values.get(self._state_key(num_vars, problem_type))
+        if q_values:
+            return max(q_values, key=q_values.get)
+        
+        if recommended:
+            return recommended[0]
         
+        # Simple heuristic-based selection
         # For small problems, use classical solvers
         if num_vars < 50:
             cb_solvers = self.config.get('cb_solvers', {})
@@ -179,11 +185,15 @@ class StrategyPolicy:
         
         # For large problems, use QB or QC
         else:
-            if self.config.get('qc_enabled'):
+            if self.config.get('qc_enabled') and self._fits_qaoa(num_vars):
                 return 'qc_qaoa'
             else:
                 return 'qb_lifted'
     
+    def _fits_qaoa(self, num_vars: int) -> bool:
+        """Whether a problem can fit the QAOA simulator (slack bits only add qubits)."""
+        return self.qc_max_qubits is None or num_vars <= self.qc_max_qubits
+    
     def _get_default_solver(
         self,
         features: Dict[str, Any],
@@ -191,10 +201,10 @@ class StrategyPolicy:
     ) -> Tuple[str, Dict[str, Any]]:
         """Get default solver when policy is disabled."""
         solver = self.default_solver
-        params = self._generate_parameters(solver, features, constraints)
+        params = self.generate_parameters(solver, features, constraints)
         return solver, params
     
-    def _generate_parameters(
+    def generate_parameters(
         self,
         solver: str,
         features: Dict[str, Any],
@@ -223,6 +233,8 @@ class StrategyPolicy:
         elif solver.startswith('qc_'):
             params['shots'] = constraints.get('shots', 8192)
             params['optimizer'] = 'COBYLA'
+            if 'num_reads' in constraints:
+                params['num_reads'] = constraints['num_reads']
         
         return params
     
@@ -240,6 +252,46 @@ class StrategyPolicy:
             action: Selected solver
             reward: Observed reward (negative solve time or quality)
         """
-        if self.training_mode == 'online':
-            # TODO: Implement online policy update
-            pass
+        if self.training_mode != 'online':
+            return
+        
+        structural = state.get('structural_features', {})
+        key = self._state_key(
+            structural.get('num_variables', 0),
+            structural.get('problem_type', 'unknown')
+        )
+        q_values = self._q_values.setdefault(key, {})
+        counts = self._visit_counts.setdefault(key, {})
+        
+        # Sample average at first, then a constant step to track drift
+        counts[action] = counts.get(action, 0) + 1
+        step = max(self.learning_rate, 1.0 / counts[action])
+        q = q_values.get(action, 0.0)
+        q_values[action] = q + step * (reward - q)
+    
+    @staticmethod
+    def _state_key(num_vars: int, problem_type: str) -> str:
+        """Discretize problem features into a policy state."""
+        if num_vars < 50:
+            size = 'small'
+        elif num_vars < 200:
+            size = 'medium'
+        else:
+            size = 'large'
+        return f'{problem_type}|{size}'
+    
+    def get_state(self) -> Dict[str, Any]:
+        """Export learned Q-values for persistence."""
+        return {
+            'q_values': self._q_values,
+            'visit_counts': self._visit_counts
+        }
+    
+    def load_state(self, state: Dict[str, Any]) -> None:
+        """Restore Q-values exported by get_state()."""
+        self._q_values = {
+            key: dict(values) for key, values in state.get('q_values', {}).items()
+        }
+        self._visit_counts = {
+            key: dict(values) for key, values in state.get('visit_counts', {}).items()
+        }
@@ -2,12 +2,29 @@
 SM — Surrogate Models Bridge
 
 Extract features and predict solver performance using ML models.
-Implements GNN, GP, and Transformer-based feature extraction.
+Implements GNN, GP, and Transformer-based feature extraction, and a
+CPU-only learned runtime predictor (``runtime_predictor.py``). Models run
+concurrently, each under its own deadline; aggregation uses whichever
+models answered in time.
 
 TFA Layer: UE (Collapse)
 """
 
 from typing import Dict, Any, List, Optional
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
+import json
+import os
+
+import numpy as np
+
+from .canonical import (
+    CanonicalProblem, VAR_TYPES, VAR_CONTINUOUS, VAR_INTEGER, VAR_BINARY,
+    SENSES, SENSE_LE, SENSE_GE, SENSE_EQ
+)
+from .decomposition import connected_components, constraint_incidence
+from .runtime_predictor import RuntimePredictor
 
 
 class SurrogateModels:
@@ -23,16 +40,37 @@ class SurrogateModels:
         Initialize surrogate models with configuration.
         
         Args:
-            config: Configuration with enabled flag and model specifications
+            config: Configuration with enabled flag, model specifications
+                (each may set ``timeout`` in seconds and an aggregation
+                ``weight``), model_timeout (default per-model deadline),
+                workers (threads for CPU-bound models) and outcome_log
+                (JSONL path where solve outcomes are appended as runtime
+                predictor training data)
         """
         self.config = config
         self.enabled = config.get('enabled', False)
         self.models = config.get('models', [])
+        self.model_timeout = config.get('model_timeout', 1.0)
+        self.workers = max(1, config.get('workers', 2))
+        self.outcome_log = config.get('outcome_log')
+        self.outcome_flush_every = max(1, config.get('outcome_flush_every', 50))
         
         # Initialize models if enabled
         self._gnn = None
         self._gp = None
         self._transformer = None
+        self._runtime = None
+        
+        self._executor = None
+        
+        self._outcomes = []
+        self.outcomes_logged = 0
+        
+        # Per-model prediction counters
+        self.answered = Counter()
+        self.timeouts = Counter()
+        self.errors = Counter()
+        self.degraded = 0
         
         if self.enabled:
             self._initialize_models()
@@ -51,10 +89,12 @@ class SurrogateModels:
             elif model_type == 'transformer':
                 # TODO: Load Transformer model
                 self._transformer = TransformerModel(model_config)
+            elif model_type == 'runtime':
+                self._runtime = RuntimeModel(model_config)
     
     async def extract_features(
         self,
-        canonical: Dict[str, Any]
+        canonical: CanonicalProblem
     ) -> Dict[str, Any]:
         """
         Extract features from canonical problem.
@@ -68,6 +108,9 @@ class SurrogateModels:
             - predicted_solve_time: estimated solve time
             - predicted_quality: estimated solution quality
             - recommended_solvers: list of recommended solver types
+            - confidence: weight of the models that answered over the
+              weight of all loaded models
+            - model_status: 'ok', 'timeout' or 'error' per model
         """
         if not self.enabled:
             # Return basic features if surrogate models disabled
@@ -76,118 +119,313 @@ class SurrogateModels:
         # Extract structural features
         structural = self._extract_structural_features(canonical)
         
-        # Use ML models for predictions
-        predictions = {}
+        # Use ML models for predictions, concurrently
+        models = self._loaded_models()
+        outcomes = await asyncio.gather(*(
+            self._predict(name, model, canonical, structural) for name, model in models
+        ))
         
-        if self._gnn:
-            predictions['gnn'] = await self._gnn.predict(canonical)
-        
-        if self._gp:
-            predictions['gp'] = await self._gp.predict(canonical)
-        
-        if self._transformer:
-            predictions['transformer'] = await self._transformer.predict(canonical)
+        predictions = {}
+        status = {}
+        for (name, _), (state, prediction) in zip(models, outcomes):
+            status[name] = state
+            if state == 'ok':
+                predictions[name] = prediction
+        if len(predictions) < len(models):
+            self.degraded += 1
         
         # Aggregate predictions
-        aggregated = self._aggregate_predictions(predictions)
+        weights = {name: float(model.config.get('weight', 1.0)) for name, model in models}
+        aggregated = self._aggregate_predictions(predictions, weights)
         
         return {
             'structural_features': structural,
             'predicted_solve_time': aggregated.get('solve_time'),
             'predicted_quality': aggregated.get('quality'),
             'recommended_solvers': aggregated.get('solvers', []),
-            'confidence': aggregated.get('confidence', 0.5)
+            'confidence': aggregated.get('confidence', 0.0),
+            'model_status': status
+        }
+    
+    def _loaded_models(self) -> List[Any]:
+        """(name, model) pairs of the models that can predict."""
+        models = []
+        if self._runtime and self._runtime.loaded:
+            models.append(('runtime', self._runtime))
+        if self._gnn:
+            models.append(('gnn', self._gnn))
+        if self._gp:
+            models.append(('gp', self._gp))
+        if self._transformer:
+            models.append(('transformer', self._transformer))
+        return models
+    
+    async def _predict(
+        self,
+        name: str,
+        model: Any,
+        canonical: CanonicalProblem,
+        structural: Dict[str, Any]
+    ) -> Any:
+        """
+        Run one model under its deadline.
+        
+        CPU-bound models (``cpu_bound = True``) run ``predict_sync`` on the
+        SM thread pool so they neither block the event loop nor delay the
+        other models; the rest are awaited directly. A model that misses
+        its deadline or raises is left out of the aggregate; a timed-out
+        thread finishes in the background and its result is discarded.
+        
+        Returns:
+            Tuple of (status, prediction or None)
+        """
+        if getattr(model, 'cpu_bound', False):
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.workers, thread_name_prefix='sm-model'
+                )
+            call = asyncio.get_running_loop().run_in_executor(
+                self._executor, model.predict_sync, canonical, structural
+            )
+        else:
+            call = model.predict(canonical, structural)
+        
+        try:
+            prediction = await asyncio.wait_for(
+                call, model.config.get('timeout', self.model_timeout)
+            )
+        except asyncio.TimeoutError:
+            self.timeouts[name] += 1
+            return 'timeout', None
+        except Exception:
+            self.errors[name] += 1
+            return 'error', None
+        self.answered[name] += 1
+        return 'ok', prediction
+    
+    def close(self) -> None:
+        """Stop the model thread pool (pending predictions are dropped)."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+    
+    def record_outcome(
+        self,
+        features: Dict[str, Any],
+        solver: str,
+        solve_time: float,
+        quality: float
+    ) -> bool:
+        """
+        Buffer a solve outcome as a runtime predictor training record.
+        
+        Records are only kept when ``outcome_log`` is configured; they are
+        written by flush_outcomes().
+        
+        Returns:
+            True when the buffer is due to be flushed
+        """
+        if not self.outcome_log:
+            return False
+        self._outcomes.append({
+            'features': features.get('structural_features', {}),
+            'solver': solver,
+            'solve_time': solve_time,
+            'quality': quality
+        })
+        return len(self._outcomes) >= self.outcome_flush_every
+    
+    def flush_outcomes(self) -> None:
+        """
+        Append buffered outcomes to ``outcome_log`` (blocking file I/O).
+        
+        Raises:
+            OSError: If the log cannot be written (records are kept for
+                the next flush)
+        """
+        if not self.outcome_log or not self._outcomes:
+            return
+        records, self._outcomes = self._outcomes, []
+        try:
+            directory = os.path.dirname(self.outcome_log)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with open(self.outcome_log, 'a') as f:
+                f.writelines(json.dumps(record) + '\n' for record in records)
+        except OSError:
+            self._outcomes[:0] = records
+            raise
+        self.outcomes_logged += len(records)
+    
+    def get_statistics(self) -> Dict[str, Any]:
+        """Get loaded models and outcome log counters."""
+        return {
+            'enabled': self.enabled,
+            'models': [
+                name for name, model in (
+                    ('runtime', self._runtime if self._runtime and self._runtime.loaded else None),
+                    ('gnn', self._gnn), ('gp', self._gp), ('transformer', self._transformer)
+                ) if model
+            ],
+            'answered': dict(self.answered),
+            'timeouts': dict(self.timeouts),
+            'errors': dict(self.errors),
+            'degraded': self.degraded,
+            'outcomes_buffered': len(self._outcomes),
+            'outcomes_logged': self.outcomes_logged
         }
     
-    def _extract_basic_features(self, canonical: Dict[str, Any]) -> Dict[str, Any]:
+    def _extract_basic_features(self, canonical: CanonicalProblem) -> Dict[str, Any]:
         """Extract basic features without ML models."""
         return {
             'structural_features': self._extract_structural_features(canonical),
             'predicted_solve_time': None,
             'predicted_quality': None,
             'recommended_solvers': [],
-            'confidence': 0.0
+            'confidence': 0.0,
+            'model_status': {}
         }
     
-    def _extract_structural_features(self, canonical: Dict[str, Any]) -> Dict[str, Any]:
-        """Extract structural features from problem."""
-        num_variables = len(canonical.get('variables', []))
-        num_constraints = len(canonical.get('constraints', []))
-        num_objectives = len(canonical.get('objectives', []))
+    def _extract_structural_features(self, canonical: CanonicalProblem) -> Dict[str, Any]:
+        """
+        Extract structural features from problem.
+        
+        All counts come from the canonical arrays (bincounts over the CSR
+        indices, one component labelling of the constraint graph), so the
+        cost is linear in the number of nonzeros with no per-variable or
+        per-constraint Python loop.
+        """
+        num_variables = canonical.num_variables
+        num_constraints = canonical.num_constraints
+        num_objectives = len(canonical.objectives)
+        A = canonical.A
         
-        # Analyze variable types
-        variables = canonical.get('variables', [])
-        num_binary = sum(1 for v in variables if v.get('type') == 'binary')
-        num_integer = sum(1 for v in variables if v.get('type') == 'integer')
-        num_continuous = sum(1 for v in variables if v.get('type') == 'continuous')
+        # Analyze variable types and constraint senses (int8 codes)
+        type_counts = [
+            int(np.count_nonzero(canonical.vtype == code)) for code in range(len(VAR_TYPES))
+        ]
+        sense_counts = [
+            int(np.count_nonzero(canonical.row_sense == code)) for code in range(len(SENSES))
+        ]
         
         # Analyze constraint types
-        constraints = canonical.get('constraints', [])
         constraint_types = {}
-        for con in constraints:
-            con_type = con.get('type', 'linear')
-            constraint_types[con_type] = constraint_types.get(con_type, 0) + 1
+        for con_type, count in Counter(canonical.con_types).items():
+            con_type = con_type or 'linear'
+            constraint_types[con_type] = constraint_types.get(con_type, 0) + count
+        
+        # Degree distributions of the constraint matrix
+        row_degree = np.diff(A.indptr)
+        col_degree = np.bincount(A.indices, minlength=num_variables)
+        
+        # Constraint graph components (rows and quadratic terms join variables)
+        groups, nodes, pairs = constraint_incidence(canonical)
+        labels = connected_components(num_variables, groups, nodes, pairs)
+        component_sizes = np.bincount(labels, minlength=num_variables)
+        component_sizes = component_sizes[component_sizes > 0]
         
         return {
             'num_variables': num_variables,
             'num_constraints': num_constraints,
+            'num_unparsed_constraints': canonical.num_unparsed,
             'num_objectives': num_objectives,
-            'num_binary': num_binary,
-            'num_integer': num_integer,
-            'num_continuous': num_continuous,
+            'num_binary': type_counts[VAR_BINARY],
+            'num_integer': type_counts[VAR_INTEGER],
+            'num_continuous': type_counts[VAR_CONTINUOUS],
+            'num_le': sense_counts[SENSE_LE],
+            'num_ge': sense_counts[SENSE_GE],
+            'num_eq': sense_counts[SENSE_EQ],
             'constraint_types': constraint_types,
-            'problem_type': canonical.get('problem_type'),
-            'density': self._compute_density(canonical)
+            'problem_type': canonical.problem_type,
+            'nnz': A.nnz,
+            'density': self._compute_density(canonical),
+            'num_quadratic_objective': int(canonical.obj_quad[0].size),
+            'num_quadratic_constraint': int(canonical.con_quad[0].size),
+            'row_degree': self._distribution(row_degree),
+            'col_degree': self._distribution(col_degree),
+            'empty_columns': int(np.count_nonzero(col_degree == 0)),
+            'coefficient_range': self._dynamic_range(A.data),
+            'objective_range': self._dynamic_range(canonical.objective),
+            'rhs_range': self._dynamic_range(canonical.rhs),
+            'num_components': int(component_sizes.size),
+            'largest_component': int(component_sizes.max(initial=0))
         }
     
-    def _compute_density(self, canonical: Dict[str, Any]) -> float:
+    def _compute_density(self, canonical: CanonicalProblem) -> float:
         """Compute problem density (non-zero coefficients / total)."""
-        num_vars = len(canonical.get('variables', []))
-        num_cons = len(canonical.get('constraints', []))
+        num_vars = canonical.num_variables
+        num_cons = canonical.num_constraints
         
         if num_vars == 0 or num_cons == 0:
             return 0.0
         
-        # Simplified density calculation
-        # TODO: Implement actual non-zero coefficient counting
-        return min(1.0, (num_cons * 5.0) / (num_vars * num_cons))
+        return canonical.A.nnz / (num_vars * num_cons)
     
-    def _aggregate_predictions(self, predictions: Dict[str, Any]) -> Dict[str, Any]:
-        """Aggregate predictions from multiple models."""
+    @staticmethod
+    def _distribution(degrees: np.ndarray) -> Dict[str, float]:
+        """Min, mean, max and standard deviation of a degree array."""
+        if degrees.size == 0:
+            return {'min': 0, 'mean': 0.0, 'max': 0, 'std': 0.0}
+        mean = float(degrees.sum()) / degrees.size
+        # E[d^2] - E[d]^2 via an integer dot product (no temporary arrays)
+        variance = float(np.dot(degrees, degrees)) / degrees.size - mean * mean
+        return {
+            'min': int(degrees.min()),
+            'mean': mean,
+            'max': int(degrees.max()),
+            'std': float(np.sqrt(max(variance, 0.0)))
+        }
+    
+    @staticmethod
+    def _dynamic_range(values: np.ndarray) -> float:
+        """log10 of the largest over the smallest nonzero magnitude (0 if none)."""
+        magnitudes = np.abs(values)
+        largest = magnitudes.max(initial=0.0)
+        if largest == 0:
+            return 0.0
+        smallest = magnitudes.min(where=magnitudes > 0, initial=largest)
+        return float(np.log10(largest / smallest))
+    
+    def _aggregate_predictions(
+        self,
+        predictions: Dict[str, Any],
+        weights: Optional[Dict[str, float]] = None
+    ) -> Dict[str, Any]:
+        """
+        Aggregate the predictions of the models that answered.
+        
+        Solve time and quality are weighted means, and solvers are ranked
+        by weighted votes (ties keep first-recommended order). Confidence
+        is the answered share of the total weight of ``weights`` (every
+        model that was asked).
+        """
         if not predictions:
             return {}
-        
-        # Simple averaging for now
-        # TODO: Implement weighted aggregation
-        solve_times = [p.get('solve_time') for p in predictions.values() if p.get('solve_time')]
-        qualities = [p.get('quality') for p in predictions.values() if p.get('quality')]
+        weights = weights or {name: 1.0 for name in predictions}
         
         aggregated = {}
+        for key in ('solve_time', 'quality'):
+            answered = [
+                (weights.get(name, 1.0), p[key])
+                for name, p in predictions.items() if p.get(key) is not None
+            ]
+            total = sum(weight for weight, _ in answered)
+            if total > 0:
+                aggregated[key] = sum(weight * value for weight, value in answered) / total
         
-        if solve_times:
-            aggregated['solve_time'] = sum(solve_times) / len(solve_times)
+        # Rank by weighted votes
+        votes = {}
+        for name, p in predictions.items():
+            for solver in p.get('solvers', []):
+                votes[solver] = votes.get(solver, 0.0) + weights.get(name, 1.0)
+        aggregated['solvers'] = sorted(votes, key=lambda s: votes[s], reverse=True)
         
-        if qualities:
-            aggregated['quality'] = sum(qualities) / len(qualities)
-        
-        # Collect all recommended solvers
-        all_solvers = []
-        for p in predictions.values():
-            all_solvers.extend(p.get('solvers', []))
-        
-        # Rank by frequency
-        solver_counts = {}
-        for solver in all_solvers:
-            solver_counts[solver] = solver_counts.get(solver, 0) + 1
-        
-        aggregated['solvers'] = sorted(
-            solver_counts.keys(),
-            key=lambda s: solver_counts[s],
-            reverse=True
+        total_weight = sum(weights.values())
+        aggregated['confidence'] = (
+            sum(weights.get(name, 1.0) for name in predictions) / total_weight
+            if total_weight > 0 else 0.0
         )
         
-        aggregated['confidence'] = min(1.0, len(predictions) / 3.0)
-        
         return aggregated
 
 
@@ -198,7 +436,11 @@ class GNNModel:
         self.config = config
         # TODO: Load actual model from checkpoint
     
-    async def predict(self, canonical: Dict[str, Any]) -> Dict[str, Any]:
+    async def predict(
+        self,
+        canonical: CanonicalProblem,
+        structural: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
         """Predict using GNN model."""
         # TODO: Implement actual GNN prediction
         return {
@@ -215,7 +457,11 @@ class GPModel:
         self.config = config
         # TODO: Load actual model
     
-    async def predict(self, canonical: Dict[str, Any]) -> Dict[str, Any]:
+    async def predict(
+        self,
+        canonical: CanonicalProblem,
+        structural: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
         """Predict using GP model."""
         # TODO: Implement actual GP prediction
         return {
@@ -232,7 +478,11 @@ class TransformerModel:
         self.config = config
         # TODO: Load actual model from checkpoint
     
-    async def predict(self, canonical: Dict[str, Any]) -> Dict[str, Any]:
+    async def predict(
+        self,
+        canonical: CanonicalProblem,
+        structural: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
         """Predict using Transformer model."""
         # TODO: Implement actual Transformer prediction
         return {
@@ -240,3 +490,62 @@ class TransformerModel:
             'quality': 0.97,
             'solvers': ['cb_gurobi', 'qb_lifted']
         }
+
+
+class RuntimeModel:
+    """
+    Learned runtime and quality predictor (pure NumPy, CPU only).
+    
+    Loads a model trained offline by ``runtime_predictor.py train`` from
+    ``path``, memory-mapping its weights. A missing or incompatible model
+    leaves the predictor unloaded, so SM runs without it.
+    """
+    
+    cpu_bound = True
+    
+    def __init__(self, config: Dict[str, Any]):
+        self.config = config
+        self.top_k = config.get('top_k', 3)
+        self.predictor = None
+        self.error = None
+        
+        path = config.get('path')
+        if path:
+            try:
+                self.predictor = RuntimePredictor.load(path, mmap=config.get('mmap', True))
+            except (OSError, ValueError, KeyError) as e:
+                self.error = str(e)
+    
+    @property
+    def loaded(self) -> bool:
+        return self.predictor is not None
+    
+    async def predict(
+        self,
+        canonical: CanonicalProblem,
+        structural: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """Predict inline (SM runs predict_sync on its thread pool instead)."""
+        return self.predict_sync(canonical, structural)
+    
+    def predict_sync(
+        self,
+        canonical: CanonicalProblem,
+        structural: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """
+        Predict per-solver runtime and quality; recommend the solvers with
+        the lowest predicted time per unit of quality.
+        """
+        per_solver = self.predictor.predict(structural or {})
+        ranked = sorted(
+            per_solver,
+            key=lambda s: per_solver[s]['solve_time'] / max(per_solver[s]['quality'], 1e-3)
+        )
+        best = per_solver[ranked[0]]
+        return {
+            'solve_time': best['solve_time'],
+            'quality': best['quality'],
+            'solvers': ranked[:self.top_k],
+            'per_solver': per_solver
+        }
@@ -0,0 +1,250 @@
+"""
+QAIM-2 Admission Control
+
+Priority admission in front of the orchestrator. Requests are classified
+from their metadata, wait in bounded per-class queues for one of
+``max_concurrent`` slots, and are dispatched by weighted fair queueing so
+a burst of low-priority work cannot starve latency-critical requests.
+Requests whose ``time_limit`` cannot be met given the current queue are
+rejected up front instead of timing out later.
+"""
+
+from typing import Dict, Any, Optional
+from collections import deque
+import asyncio
+import time
+
+
+# Priority classes, highest first
+PRIORITY_CLASSES = ('critical', 'high', 'normal', 'batch')
+
+DEFAULT_WEIGHTS = {'critical': 8, 'high': 4, 'normal': 2, 'batch': 1}
+
+DEFAULT_QUEUE_SIZE = {'critical': 64, 'high': 128, 'normal': 256, 'batch': 1024}
+
+# Flight-critical ATA chapters (FDIR re-planning) jump the queue
+DEFAULT_ATA_PRIORITY = {
+    'ATA-22': 'critical',  # Auto Flight
+    'ATA-34': 'critical',  # Navigation
+    'ATA-42': 'critical',  # Integrated Modular Avionics
+    'ATA-24': 'high',      # Electrical Power
+    'ATA-71': 'high'       # Powerplant
+}
+
+
+class AdmissionRejected(Exception):
+    """Raised when a request is refused admission."""
+
+    def __init__(self, priority: str, reason: str, detail: str):
+        super().__init__(f"Admission rejected ({priority}): {detail}")
+        self.priority = priority
+        self.reason = reason
+
+
+class AdmissionController:
+    """
+    Bounded priority queues with weighted fair dispatch.
+
+    Each class keeps a virtual clock that advances by ``1 / weight`` per
+    dispatch; the non-empty class whose next request would finish earliest
+    in virtual time is served next. A class that was idle restarts at the
+    current virtual time, so idle periods do not bank credit.
+    """
+
+    def __init__(self, config: Optional[Dict[str, Any]] = None):
+        """
+        Initialize admission controller with configuration.
+
+        Args:
+            config: Configuration with enabled, max_concurrent, weights,
+                queue_size (int or per class), default_class, ata_priority
+                and initial_service_time (seconds)
+        """
+        config = config or {}
+        self.enabled = config.get('enabled', True)
+        self.max_concurrent = max(1, config.get('max_concurrent', 64))
+        self.default_class = config.get('default_class', 'normal')
+
+        self.weights = dict(DEFAULT_WEIGHTS)
+        self.weights.update(config.get('weights', {}))
+
+        queue_size = config.get('queue_size', DEFAULT_QUEUE_SIZE)
+        if isinstance(queue_size, int):
+            queue_size = {name: queue_size for name in PRIORITY_CLASSES}
+        self.queue_size = dict(DEFAULT_QUEUE_SIZE)
+        self.queue_size.update(queue_size)
+
+        self.ata_priority = dict(DEFAULT_ATA_PRIORITY)
+        self.ata_priority.update(config.get('ata_priority', {}))
+
+        # Smoothed time a request holds its slot, for deadline estimates
+        self._service_time = config.get('initial_service_time', 0.5)
+
+        self._queues = {name: deque() for name in PRIORITY_CLASSES}
+        self._pass = {name: 0.0 for name in PRIORITY_CLASSES}
+        self._vtime = 0.0
+        self._active = 0
+
+        self._admitted = {name: 0 for name in PRIORITY_CLASSES}
+        self._rejected = {name: {'queue_full': 0, 'deadline': 0} for name in PRIORITY_CLASSES}
+        self._wait_total = {name: 0.0 for name in PRIORITY_CLASSES}
+
+    def classify(
+        self,
+        metadata: Optional[Dict[str, Any]],
+        constraints: Optional[Dict[str, Any]] = None,
+        default: Optional[str] = None
+    ) -> str:
+        """
+        Derive the priority class of a request.
+
+        An explicit ``priority`` in metadata (or constraints) wins, then the
+        ATA chapter mapping, then ``default`` (``default_class`` if None).
+        """
+        metadata = metadata or {}
+        priority = metadata.get('priority') or (constraints or {}).get('priority')
+        if priority in self._queues:
+            return priority
+        return self.ata_priority.get(
+            metadata.get('ata_chapter'), default or self.default_class
+        )
+
+    async def acquire(self, priority: str, time_limit: Optional[float] = None) -> float:
+        """
+        Wait for an execution slot.
+
+        Args:
+            priority: Priority class from classify()
+            time_limit: Request time limit in seconds, for deadline checks
+
+        Returns:
+            Seconds spent waiting in the queue
+
+        Raises:
+            AdmissionRejected: If the class queue is full, or the estimated
+                queue wait plus service time exceeds time_limit
+        """
+        if not self.enabled:
+            return 0.0
+
+        if self._active < self.max_concurrent and not self.queue_depth():
+            self._active += 1
+            self._admitted[priority] += 1
+            return 0.0
+
+        queue = self._queues[priority]
+        if len(queue) >= self.queue_size[priority]:
+            self._rejected[priority]['queue_full'] += 1
+            raise AdmissionRejected(
+                priority, 'queue_full', f"{priority} queue is full ({len(queue)} waiting)"
+            )
+
+        estimate = self.estimate_wait(priority)
+        if time_limit is not None and estimate + self._service_time > time_limit:
+            self._rejected[priority]['deadline'] += 1
+            raise AdmissionRejected(
+                priority, 'deadline',
+                f"estimated queue wait {estimate:.2f}s plus service "
+                f"{self._service_time:.2f}s exceeds time_limit {time_limit}s"
+            )
+
+        if not queue:
+            self._pass[priority] = max(self._pass[priority], self._vtime)
+
+        waiter = asyncio.get_running_loop().create_future()
+        queue.append(waiter)
+        start = time.monotonic()
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter in queue:
+                queue.remove(waiter)
+            elif not waiter.cancelled():
+                # Slot was granted just before cancellation: hand it on
+                self.release()
+            raise
+
+        waited = time.monotonic() - start
+        self._admitted[priority] += 1
+        self._wait_total[priority] += waited
+        return waited
+
+    def release(self, service_time: Optional[float] = None) -> None:
+        """
+        Release a slot and dispatch the next waiter.
+
+        Args:
+            service_time: Seconds the slot was held, folded into the
+                service time estimate
+        """
+        if not self.enabled:
+            return
+
+        if service_time is not None:
+            self._service_time += 0.1 * (service_time - self._service_time)
+
+        self._active -= 1
+        self._dispatch()
+
+    def _dispatch(self) -> None:
+        """Hand free slots to waiters in weighted fair order."""
+        while self._active < self.max_concurrent:
+            ready = [name for name in PRIORITY_CLASSES if self._queues[name]]
+            if not ready:
+                return
+
+            name = min(ready, key=lambda n: self._pass[n] + 1.0 / self.weights[n])
+            waiter = self._queues[name].popleft()
+            if waiter.cancelled():
+                continue
+            self._vtime = self._pass[name]
+            self._pass[name] += 1.0 / self.weights[name]
+            self._active += 1
+            waiter.set_result(None)
+
+    def estimate_wait(self, priority: str) -> float:
+        """
+        Estimate the queue wait of a new request in the given class.
+
+        Counts the requests that weighted fair dispatch would serve before
+        it: each other class contributes in proportion to its weight,
+        capped by its queue length.
+        """
+        if self._active < self.max_concurrent:
+            return 0.0
+
+        position = len(self._queues[priority]) + 1
+        share = position / self.weights[priority]
+        ahead = position - 1 + sum(
+            min(len(queue), int(share * self.weights[name]))
+            for name, queue in self._queues.items() if name != priority
+        )
+        # All slots are busy: one slot frees every service_time / max_concurrent
+        return (ahead + 1) * self._service_time / self.max_concurrent
+
+    def queue_depth(self, priority: Optional[str] = None) -> int:
+        """Number of requests waiting (per class or total)."""
+        if priority is not None:
+            return len(self._queues[priority])
+        return sum(len(queue) for queue in self._queues.values())
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """Get per-class admission statistics."""
+        return {
+            'active': self._active,
+            'max_concurrent': self.max_concurrent,
+            'service_time': self._service_time,
+            'classes': {
+                name: {
+                    'weight': self.weights[name],
+                    'queued': len(self._queues[name]),
+                    'admitted': self._admitted[name],
+                    'rejected': dict(self._rejected[name]),
+                    'avg_wait': (
+                        self._wait_total[name] / self._admitted[name]
+                        if self._admitted[name] else 0.0
+                    )
+                }
+                for name in PRIORITY_CLASSES
+            }
+        }
@@ -0,0 +1,548 @@
+"""
+QAIM-2 Evidence Store
+
+Append-only store for UTCS v5.0 evidence records. Records are written as
+length-prefixed JSON into rotating segment files. Each record carries the
+SHA-256 chain hash over its segment so far, so any edit, reordering or
+truncation inside a segment is detectable. Sealed segments get a binary
+index file: a sorted request_id key table for O(log n) lookups and a
+sparse timestamp table (every ``index_interval`` records) for range
+scans. Old segments are merged per time window (compaction) and dropped
+after the retention period; that maintenance is left to the caller (the
+orchestrator runs it on a worker thread after a rotation), so appends
+never wait for it.
+"""
+
+from typing import Dict, Any, List, Optional, Iterator
+from datetime import datetime, timezone
+from pathlib import Path
+import hashlib
+import json
+import os
+import struct
+import threading
+import time
+
+import numpy as np
+
+
+# Record: payload length, chain hash, then the JSON payload
+RECORD_HEADER = struct.Struct('>I32s')
+
+# Index: magic, version, id entries, time entries, covered-through segment,
+# log size, chain head, min/max timestamp
+INDEX_HEADER = struct.Struct('<4sIQQQQ32sdd')
+INDEX_MAGIC = b'QEIX'
+INDEX_VERSION = 1
+
+ID_ENTRY = np.dtype([('key', '<u8'), ('offset', '<u8')])
+TIME_ENTRY = np.dtype([('ts', '<f8'), ('offset', '<u8')])
+
+
+def record_key(request_id: str) -> int:
+    """64-bit index key of a request_id (collisions are resolved on read)."""
+    return int.from_bytes(hashlib.sha256(request_id.encode()).digest()[:8], 'big')
+
+
+def genesis_hash(seq: int) -> bytes:
+    """Chain hash a segment starts from."""
+    return hashlib.sha256(f'qaim2-evidence:{seq}'.encode()).digest()
+
+
+def evidence_timestamp(evidence: Dict[str, Any]) -> float:
+    """Epoch seconds of an evidence record (naive ISO timestamps are UTC)."""
+    try:
+        stamp = datetime.fromisoformat(evidence['timestamp'])
+    except (KeyError, TypeError, ValueError):
+        return time.time()
+    if stamp.tzinfo is None:
+        stamp = stamp.replace(tzinfo=timezone.utc)
+    return stamp.timestamp()
+
+
+class Segment:
+    """One segment file and, once sealed, its index."""
+
+    def __init__(self, directory: Path, seq: int):
+        self.seq = seq
+        self.log_path = directory / f'{seq:016d}.log'
+        self.idx_path = directory / f'{seq:016d}.idx'
+        self.covers = seq
+        self.count = 0
+        self.size = 0
+        self.head = genesis_hash(seq)
+        self.min_ts = float('inf')
+        self.max_ts = float('-inf')
+        self.sealed = False
+
+        # Active segment only: in-memory index until sealed
+        self.keys = []
+        self.offsets = []
+        self.times = []
+
+    def load_index(self) -> bool:
+        """Read the index header; False if missing or stale for the log."""
+        try:
+            with open(self.idx_path, 'rb') as f:
+                header = f.read(INDEX_HEADER.size)
+            size = self.log_path.stat().st_size
+        except OSError:
+            return False
+        if len(header) < INDEX_HEADER.size:
+            return False
+
+        magic, version, count, _, covers, log_size, head, min_ts, max_ts = \
+            INDEX_HEADER.unpack(header)
+        if magic != INDEX_MAGIC or version != INDEX_VERSION or log_size != size:
+            return False
+
+        self.count, self.covers, self.size, self.head = count, covers, size, head
+        self.min_ts, self.max_ts = min_ts, max_ts
+        self.sealed = True
+        return True
+
+    def scan(self, verify: bool = True, start: int = 0) -> Iterator[tuple]:
+        """
+        Yield (offset, payload bytes, chain hash) for each record.
+
+        Stops at the first torn record, or the first chain mismatch when
+        verify is set (verification needs start=0).
+        """
+        head = genesis_hash(self.seq)
+        with open(self.log_path, 'rb') as f:
+            f.seek(start)
+            offset = start
+            while True:
+                header = f.read(RECORD_HEADER.size)
+                if len(header) < RECORD_HEADER.size:
+                    return
+                length, chain = RECORD_HEADER.unpack(header)
+                payload = f.read(length)
+                if len(payload) < length:
+                    return
+                head = hashlib.sha256(head + payload).digest()
+                if verify and head != chain:
+                    return
+                yield offset, payload, chain
+                offset += RECORD_HEADER.size + length
+
+    def read(self, offset: int) -> Dict[str, Any]:
+        """Read the record at a byte offset."""
+        with open(self.log_path, 'rb') as f:
+            f.seek(offset)
+            length, _ = RECORD_HEADER.unpack(f.read(RECORD_HEADER.size))
+            return json.loads(f.read(length))
+
+    def id_table(self) -> np.ndarray:
+        """Sorted request_id key table (memory-mapped for sealed segments)."""
+        if not self.sealed:
+            table = np.empty(len(self.keys), dtype=ID_ENTRY)
+            table['key'] = self.keys
+            table['offset'] = self.offsets
+            return np.sort(table, order='key')
+        if self.count == 0:
+            return np.empty(0, dtype=ID_ENTRY)
+        return np.memmap(
+            self.idx_path, dtype=ID_ENTRY, mode='r',
+            offset=INDEX_HEADER.size, shape=(self.count,)
+        )
+
+    def time_table(self) -> np.ndarray:
+        """
+        Sparse (timestamp, offset) table in append order.
+
+        Each entry holds the newest timestamp of all records *before* its
+        offset. Timestamps are only nearly ordered under concurrency, but
+        this running maximum is monotonic, so it can be binary searched.
+        """
+        if not self.sealed:
+            return np.array(self.times, dtype=TIME_ENTRY)
+        with open(self.idx_path, 'rb') as f:
+            header = INDEX_HEADER.unpack(f.read(INDEX_HEADER.size))
+            f.seek(INDEX_HEADER.size + header[2] * ID_ENTRY.itemsize)
+            return np.fromfile(f, dtype=TIME_ENTRY, count=header[3])
+
+
+class EvidenceStore:
+    """
+    Segmented, hash-chained evidence log with id and time indexes.
+
+    Appends go to the active segment. A segment is sealed once it reaches
+    ``segment_max_bytes`` or ``segment_max_age`` seconds. Sealing writes its
+    index and sets ``maintenance_due``; maintain() then applies compaction
+    and retention and may run on another thread while appends continue
+    (a lock guards the segment list). The store is opt-in.
+    ``path`` is created on the first append, and an I/O error disables the
+    store instead of failing requests.
+    """
+
+    def __init__(self, config: Optional[Dict[str, Any]] = None):
+        """
+        Initialize evidence store with configuration.
+
+        Args:
+            config: Configuration with enabled, path, segment_max_bytes,
+                segment_max_age (seconds), index_interval (records per
+                sparse time index entry), compaction_window (seconds),
+                retention_days and fsync ('segment' or 'always')
+        """
+        config = config or {}
+        self.enabled = config.get('enabled', False)
+        self.path = Path(config.get('path', 'evidence'))
+        self.segment_max_bytes = config.get('segment_max_bytes', 64 * 1024 * 1024)
+        self.segment_max_age = config.get('segment_max_age', 3600)
+        self.index_interval = max(1, config.get('index_interval', 64))
+        self.compaction_window = config.get('compaction_window', 86400)
+        self.retention_seconds = config.get('retention_days', 90) * 86400
+        self.fsync = config.get('fsync', 'segment')
+
+        self._segments = []
+        self._active = None
+        self._file = None
+        self._opened = False
+        self._lock = threading.RLock()
+        self.maintenance_due = False
+
+        self.appended = 0
+        self.lookups = 0
+        self.compactions = 0
+        self.expired_segments = 0
+        self.errors = 0
+
+    def append(self, evidence: Dict[str, Any]) -> None:
+        """Append an evidence record to the active segment."""
+        if not self.enabled:
+            return
+        with self._lock:
+            try:
+                self._open()
+                self._append(evidence)
+            except OSError:
+                self._disable()
+
+    def _append(self, evidence: Dict[str, Any]) -> None:
+        segment = self._active
+        timestamp = evidence_timestamp(evidence)
+        if segment.count and (
+                segment.size >= self.segment_max_bytes
+                or timestamp - segment.min_ts >= self.segment_max_age):
+            self._rotate()
+            segment = self._active
+
+        payload = json.dumps(evidence, sort_keys=True, separators=(',', ':'), default=str).encode()
+        chain = hashlib.sha256(segment.head + payload).digest()
+        self._file.write(RECORD_HEADER.pack(len(payload), chain) + payload)
+        if self.fsync == 'always':
+            self._file.flush()
+            os.fsync(self._file.fileno())
+
+        self._track(segment, segment.size, evidence, timestamp)
+        segment.head = chain
+        segment.size += RECORD_HEADER.size + len(payload)
+        self.appended += 1
+
+    def _track(self, segment: Segment, offset: int, evidence: Dict[str, Any], timestamp: float) -> None:
+        """Add a record to the active segment's in-memory index."""
+        if segment.count % self.index_interval == 0:
+            segment.times.append((segment.max_ts, offset))
+        segment.keys.append(record_key(str(evidence.get('request_id', ''))))
+        segment.offsets.append(offset)
+        segment.count += 1
+        segment.min_ts = min(segment.min_ts, timestamp)
+        segment.max_ts = max(segment.max_ts, timestamp)
+
+    def get(self, request_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up a record by request_id (binary search per segment, newest first).
+
+        Returns:
+            Evidence record, or None if not stored
+        """
+        if not self.enabled:
+            return None
+        self.lookups += 1
+        with self._lock:
+            try:
+                self._open()
+                if self._file:
+                    self._file.flush()
+                key = record_key(request_id)
+                for segment in reversed(self._segments):
+                    table = segment.id_table()
+                    lo = int(np.searchsorted(table['key'], key, side='left'))
+                    hi = int(np.searchsorted(table['key'], key, side='right'))
+                    for offset in table['offset'][lo:hi]:
+                        record = segment.read(int(offset))
+                        if record.get('request_id') == request_id:
+                            return record
+            except OSError:
+                self._disable()
+        return None
+
+    def range(self, start: float, end: float) -> Iterator[Dict[str, Any]]:
+        """
+        Iterate records with start <= timestamp < end (epoch seconds).
+
+        Segments outside the window are skipped. Inside a segment the sparse
+        time index gives the offset to start scanning from.
+        """
+        if not self.enabled:
+            return
+        with self._lock:
+            self._open()
+            if self._file:
+                self._file.flush()
+            segments = list(self._segments)
+        for segment in segments:
+            if segment.count == 0 or segment.max_ts < start or segment.min_ts >= end:
+                continue
+            # Every record before the last entry whose running max < start is older
+            times = segment.time_table()
+            position = max(int(np.searchsorted(times['ts'], start, side='left')) - 1, 0)
+            first = int(times['offset'][position]) if times.size else 0
+            for offset, payload, _ in segment.scan(verify=False, start=first):
+                record = json.loads(payload)
+                if start <= evidence_timestamp(record) < end:
+                    yield record
+
+    def verify(self) -> List[int]:
+        """
+        Check every segment's hash chain.
+
+        Returns:
+            Sequence numbers of segments whose chain does not verify
+        """
+        if not self.enabled:
+            return []
+        with self._lock:
+            self._open()
+            if self._file:
+                self._file.flush()
+            return [segment.seq for segment in self._segments if not self._verify(segment)]
+
+    @staticmethod
+    def _verify(segment: Segment) -> bool:
+        count = 0
+        head = genesis_hash(segment.seq)
+        for _, _, chain in segment.scan(verify=True):
+            count += 1
+            head = chain
+        return count == segment.count and head == segment.head
+
+    def maintain(self, now: Optional[float] = None) -> None:
+        """
+        Apply retention and time-window compaction to sealed segments.
+
+        Blocking (chains are re-verified and merged segments rewritten);
+        call it off the event loop. Appends may continue meanwhile: only
+        swapping segments in and out of the list takes the lock.
+        """
+        if not self.enabled:
+            return
+        self.maintenance_due = False
+        now = time.time() if now is None else now
+        try:
+            with self._lock:
+                self._open()
+                self._expire(now)
+            self._compact(now)
+        except OSError:
+            with self._lock:
+                self._disable()
+
+    def _expire(self, now: float) -> None:
+        """Delete sealed segments whose newest record is past retention."""
+        cutoff = now - self.retention_seconds
+        for segment in [s for s in self._segments if s.sealed and s.max_ts < cutoff]:
+            self._segments.remove(segment)
+            self._unlink(segment)
+            self.expired_segments += 1
+
+    def _compact(self, now: float) -> None:
+        """Merge sealed segments of each closed compaction window into one."""
+        with self._lock:
+            segments = list(self._segments)
+        groups = {}
+        for segment in segments:
+            if not segment.sealed or segment.count == 0:
+                continue
+            window = int(segment.min_ts // self.compaction_window)
+            if (window + 1) * self.compaction_window <= now and \
+                    int(segment.max_ts // self.compaction_window) == window:
+                groups.setdefault(window, []).append(segment)
+
+        for group in groups.values():
+            if len(group) > 1 and all(self._verify(s) for s in group):
+                self._merge(group)
+
+    def _merge(self, group: List[Segment]) -> None:
+        """
+        Rewrite a group of segments as one segment with a fresh chain.
+
+        Sealed segments are immutable, so the merged log is written without
+        the lock. Its index (recording ``covers``) is written before the log
+        is swapped in: a crash before the swap leaves an index that does not
+        match the old log, which is then recovered unmerged; a crash after it
+        leaves a valid index whose ``covers`` drops the merged segments.
+        """
+        merged = Segment(self.path, group[0].seq)
+        tmp_log = merged.log_path.with_suffix('.log.tmp')
+        with open(tmp_log, 'wb') as out:
+            for segment in group:
+                for _, payload, _ in segment.scan(verify=False):
+                    chain = hashlib.sha256(merged.head + payload).digest()
+                    out.write(RECORD_HEADER.pack(len(payload), chain) + payload)
+                    record = json.loads(payload)
+                    self._track(merged, merged.size, record, evidence_timestamp(record))
+                    merged.head = chain
+                    merged.size += RECORD_HEADER.size + len(payload)
+            out.flush()
+            os.fsync(out.fileno())
+        merged.covers = group[-1].covers
+
+        with self._lock:
+            if not all(segment in self._segments for segment in group):
+                # Expired or closed meanwhile
+                tmp_log.unlink()
+                return
+            self._write_index(merged)
+            os.replace(tmp_log, merged.log_path)
+            for segment in group[1:]:
+                self._unlink(segment)
+
+            position = self._segments.index(group[0])
+            for segment in group:
+                self._segments.remove(segment)
+            self._segments.insert(position, merged)
+            self.compactions += 1
+
+    def close(self) -> None:
+        """Flush and close the active segment file (it stays appendable)."""
+        with self._lock:
+            if self._file is not None:
+                try:
+                    self._file.flush()
+                    os.fsync(self._file.fileno())
+                    self._file.close()
+                except OSError:
+                    self.errors += 1
+                self._file = None
+            self._opened = False
+            self._segments = []
+            self._active = None
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """Get store size and operation counters."""
+        return {
+            'enabled': self.enabled,
+            'segments': len(self._segments),
+            'records': sum(s.count for s in self._segments),
+            'bytes': sum(s.size for s in self._segments),
+            'appended': self.appended,
+            'lookups': self.lookups,
+            'compactions': self.compactions,
+            'expired_segments': self.expired_segments,
+            'errors': self.errors
+        }
+
+    def _open(self) -> None:
+        """Create the directory and load segments on first use."""
+        if self._opened:
+            return
+        self.path.mkdir(parents=True, exist_ok=True)
+        # Merged logs whose swap was interrupted
+        for tmp_log in self.path.glob('*.log.tmp'):
+            tmp_log.unlink()
+
+        segments = {}
+        for log_path in sorted(self.path.glob('*.log')):
+            try:
+                seq = int(log_path.stem)
+            except ValueError:
+                continue
+            segment = Segment(self.path, seq)
+            if not segment.load_index():
+                segment = self._recover(segment)
+            segments[seq] = segment
+
+        # Segments merged into an earlier one whose removal was interrupted
+        covered = set()
+        for segment in segments.values():
+            covered.update(range(segment.seq + 1, segment.covers + 1))
+        for seq in covered & set(segments):
+            self._unlink(segments.pop(seq))
+
+        self._segments = [segments[seq] for seq in sorted(segments)]
+        # Segments left unsealed by an interrupted rotation
+        for segment in self._segments[:-1]:
+            if not segment.sealed:
+                self._write_index(segment)
+        if self._segments and not self._segments[-1].sealed:
+            self._active = self._segments[-1]
+        else:
+            self._active = Segment(self.path, self._segments[-1].covers + 1 if self._segments else 0)
+            self._segments.append(self._active)
+        self._file = open(self._active.log_path, 'ab')
+        self._opened = True
+
+    def _recover(self, segment: Segment) -> Segment:
+        """Rebuild an unindexed segment's in-memory index, dropping a torn tail."""
+        for offset, payload, chain in segment.scan(verify=True):
+            record = json.loads(payload)
+            self._track(segment, offset, record, evidence_timestamp(record))
+            segment.head = chain
+            segment.size = offset + RECORD_HEADER.size + len(payload)
+        with open(segment.log_path, 'r+b') as f:
+            f.truncate(segment.size)
+        return segment
+
+    def _rotate(self) -> None:
+        """Seal the active segment and start the next one."""
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._file.close()
+        self._write_index(self._active)
+
+        self._active = Segment(self.path, self._active.covers + 1)
+        self._segments.append(self._active)
+        self._file = open(self._active.log_path, 'ab')
+        self.maintenance_due = True
+
+    def _write_index(self, segment: Segment) -> None:
+        """Write a segment's index atomically and mark it sealed."""
+        ids = segment.id_table()
+        times = segment.time_table()
+        header = INDEX_HEADER.pack(
+            INDEX_MAGIC, INDEX_VERSION, len(ids), len(times), segment.covers,
+            segment.size, segment.head, segment.min_ts, segment.max_ts
+        )
+        tmp_path = segment.idx_path.with_suffix('.idx.tmp')
+        with open(tmp_path, 'wb') as f:
+            f.write(header)
+            f.write(ids.tobytes())
+            f.write(times.tobytes())
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, segment.idx_path)
+
+        segment.sealed = True
+        segment.keys, segment.offsets, segment.times = [], [], []
+
+    def _disable(self) -> None:
+        """Stop persisting after an I/O failure; requests are unaffected."""
+        self.errors += 1
+        self.enabled = False
+        if self._file is not None:
+            try:
+                self._file.close()
+            except OSError:
+                pass
+            self._file = None
+
+    @staticmethod
+    def _unlink(segment: Segment) -> None:
+        for path in (segment.log_path, segment.idx_path):
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
@@ -0,0 +1,444 @@
+"""
+QAIM-2 Job Table
+
+Asynchronous job model for long QB and QC runs: submit() returns a job id
+immediately and the run continues on its own task. Clients poll the job
+status, stream intermediate incumbents reported by the solver, wait for
+the result or cancel the job.
+
+The table is bounded (``max_jobs``) and optionally persisted as one JSON
+file per job, so finished results survive a restart; jobs that were still
+queued or running when the process stopped are reloaded as ``interrupted``.
+"""
+
+from typing import Dict, Any, Optional, Callable, Awaitable, AsyncIterator
+from collections import OrderedDict
+from pathlib import Path
+import asyncio
+import json
+import os
+import threading
+import time
+import uuid
+
+
+JOB_QUEUED = 'queued'
+JOB_RUNNING = 'running'
+JOB_COMPLETED = 'completed'
+JOB_FAILED = 'failed'
+JOB_CANCELLED = 'cancelled'
+JOB_INTERRUPTED = 'interrupted'
+
+TERMINAL = (JOB_COMPLETED, JOB_FAILED, JOB_CANCELLED, JOB_INTERRUPTED)
+
+
+class JobTableFull(Exception):
+    """Raised by submit() when every slot of the job table holds a live job."""
+
+
+def _json_default(obj: Any) -> Any:
+    """Serialize array-like and other non-JSON values."""
+    if hasattr(obj, 'tolist'):
+        return obj.tolist()
+    return str(obj)
+
+
+class Job:
+    """One submitted run: status, timestamps, incumbents and result."""
+
+    def __init__(self, job_id: str, metadata: Optional[Dict[str, Any]] = None):
+        self.job_id = job_id
+        self.status = JOB_QUEUED
+        self.metadata = metadata or {}
+        self.submitted_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self.incumbents = []
+        self.num_incumbents = 0
+        self.result = None
+        self.error = None
+        self.cancel_event = threading.Event()
+        self.task = None
+        self.changed = None
+        self.persisted_at = 0.0
+
+    @property
+    def done(self) -> bool:
+        """Whether the job reached a terminal status."""
+        return self.status in TERMINAL
+
+    def to_dict(self, include_result: bool = True) -> Dict[str, Any]:
+        """Job record; the result is left out for status polls if asked."""
+        record = {
+            'job_id': self.job_id,
+            'status': self.status,
+            'metadata': self.metadata,
+            'submitted_at': self.submitted_at,
+            'started_at': self.started_at,
+            'finished_at': self.finished_at,
+            'num_incumbents': self.num_incumbents,
+            'incumbent': self.incumbents[-1] if self.incumbents else None,
+            'error': self.error
+        }
+        if include_result:
+            record['incumbents'] = list(self.incumbents)
+            record['result'] = self.result
+        return record
+
+    @classmethod
+    def from_dict(cls, record: Dict[str, Any]) -> 'Job':
+        """Job reloaded from the persisted table (no task attached)."""
+        job = cls(record['job_id'], record.get('metadata'))
+        job.status = record['status']
+        job.submitted_at = record.get('submitted_at', 0.0)
+        job.started_at = record.get('started_at')
+        job.finished_at = record.get('finished_at')
+        job.incumbents = record.get('incumbents', [])
+        job.num_incumbents = record.get('num_incumbents', len(job.incumbents))
+        job.result = record.get('result')
+        job.error = record.get('error')
+        if not job.done:
+            job.status = JOB_INTERRUPTED
+            job.error = job.error or 'process stopped before the job finished'
+            job.finished_at = job.finished_at or time.time()
+        return job
+
+
+class JobManager:
+    """
+    Bounded table of asynchronous jobs.
+
+    Each job runs its coroutine on a separate task. Solvers report
+    incumbents through reporter(), which may be called from worker
+    threads. When the table is full, the oldest finished job is evicted;
+    if every job is still live, submit() raises JobTableFull. Finished
+    jobs older than ``retention_seconds`` are dropped on submit. A job's
+    file is rewritten atomically on every status change and at most every
+    ``persist_interval`` seconds while incumbents arrive. If the directory
+    cannot be written, persistence is disabled and the table stays
+    memory-only.
+    """
+
+    def __init__(self, config: Dict[str, Any]):
+        """
+        Initialize job table with configuration.
+
+        Args:
+            config: Configuration with max_jobs, max_incumbents (kept per
+                job, newest last), retention_seconds, path (directory
+                holding one JSON file per job) and persist_interval
+        """
+        self.config = config
+        self.max_jobs = max(1, config.get('max_jobs', 1024))
+        self.max_incumbents = max(1, config.get('max_incumbents', 100))
+        self.retention_seconds = config.get('retention_seconds', 86400)
+        self.path = Path(config['path']) if config.get('path') else None
+        self.persist_interval = config.get('persist_interval', 1.0)
+
+        self._jobs = OrderedDict()  # job_id -> Job, oldest first
+
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.cancelled = 0
+        self.rejected = 0
+        self.evictions = 0
+        self.expired = 0
+        self.persist_errors = 0
+
+        if self.path:
+            self._load()
+
+    def submit(
+        self,
+        run: Callable[[Job], Awaitable[Dict[str, Any]]],
+        metadata: Optional[Dict[str, Any]] = None
+    ) -> str:
+        """
+        Start a job (must be called from the event loop).
+
+        Args:
+            run: Coroutine function taking the Job and returning its result
+            metadata: Client metadata stored with the job
+
+        Returns:
+            Job id
+
+        Raises:
+            JobTableFull: If no finished job can be evicted to make room
+        """
+        self._prune()
+        if len(self._jobs) >= self.max_jobs and not self._evict():
+            self.rejected += 1
+            raise JobTableFull(f"Job table full ({self.max_jobs} live jobs)")
+
+        job = Job(str(uuid.uuid4()), metadata)
+        job.changed = asyncio.Condition()
+        self._jobs[job.job_id] = job
+        self.submitted += 1
+        job.task = asyncio.create_task(self._execute(job, run))
+        self._persist(job, force=True)
+        return job.job_id
+
+    def get(self, job_id: str, include_result: bool = True) -> Optional[Dict[str, Any]]:
+        """
+        Poll a job.
+
+        Returns:
+            Job record (status, timestamps, latest incumbent, result when
+            finished), or None if the id is unknown or was evicted
+        """
+        job = self._jobs.get(job_id)
+        return job.to_dict(include_result) if job is not None else None
+
+    def list_jobs(self, status: Optional[str] = None) -> list:
+        """Records (without results) of all jobs, or those in one status."""
+        return [
+            job.to_dict(include_result=False) for job in self._jobs.values()
+            if status is None or job.status == status
+        ]
+
+    async def stream(self, job_id: str, after: int = 0) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Yield the job's incumbents with ``seq`` above ``after`` as they
+        arrive, ending once the job has finished.
+
+        Raises:
+            KeyError: If the job id is unknown
+        """
+        job = self._job(job_id)
+        seq = after
+        while True:
+            for incumbent in list(job.incumbents):
+                if incumbent['seq'] > seq:
+                    seq = incumbent['seq']
+                    yield incumbent
+            if job.done or job.changed is None:
+                return
+            async with job.changed:
+                await job.changed.wait_for(lambda: job.done or job.num_incumbents > seq)
+
+    async def wait(self, job_id: str, timeout: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Wait until the job has finished and return its record.
+
+        Raises:
+            KeyError: If the job id is unknown
+            asyncio.TimeoutError: If ``timeout`` elapses first
+        """
+        job = self._job(job_id)
+        if job.task is not None and not job.done:
+            await asyncio.wait({job.task}, timeout=timeout)
+            if not job.done:
+                raise asyncio.TimeoutError(f"Job {job_id} still {job.status}")
+        return job.to_dict()
+
+    async def cancel(self, job_id: str) -> bool:
+        """
+        Cancel a queued or running job.
+
+        The job's task is cancelled and its cancel_event set, so solvers
+        running on worker threads stop at their next check.
+
+        Returns:
+            True if the job was live and is now cancelled
+        """
+        job = self._jobs.get(job_id)
+        if job is None or job.done or job.task is None:
+            return False
+        job.cancel_event.set()
+        job.task.cancel()
+        await asyncio.gather(job.task, return_exceptions=True)
+        if not job.done:
+            # Cancelled before its task started
+            await self._finish(job, JOB_CANCELLED)
+        return job.status == JOB_CANCELLED
+
+    def reporter(self, job_id: str, solver: str) -> Callable[[Dict[str, Any]], None]:
+        """
+        Incumbent callback for a solver working on the job.
+
+        The callback is thread-safe. Each incumbent is stamped with
+        ``seq``, ``solver`` and ``elapsed`` (seconds since the job started).
+        """
+        loop = asyncio.get_running_loop()
+
+        def report(incumbent: Dict[str, Any]) -> None:
+            loop.call_soon_threadsafe(self._record, job_id, solver, dict(incumbent))
+
+        return report
+
+    def cancel_event(self, job_id: str) -> Optional[threading.Event]:
+        """Event set when the job is cancelled (None for unknown jobs)."""
+        job = self._jobs.get(job_id)
+        return job.cancel_event if job is not None else None
+
+    async def close(self) -> None:
+        """Cancel live jobs (their files record the cancellation)."""
+        live = [job for job in self._jobs.values() if job.task is not None and not job.done]
+        for job in live:
+            job.cancel_event.set()
+            job.task.cancel()
+        await asyncio.gather(*(job.task for job in live), return_exceptions=True)
+        for job in live:
+            if not job.done:
+                await self._finish(job, JOB_CANCELLED)
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """Get job table statistics."""
+        statuses = {}
+        for job in self._jobs.values():
+            statuses[job.status] = statuses.get(job.status, 0) + 1
+        return {
+            'jobs': len(self._jobs),
+            'max_jobs': self.max_jobs,
+            'statuses': statuses,
+            'submitted': self.submitted,
+            'completed': self.completed,
+            'failed': self.failed,
+            'cancelled': self.cancelled,
+            'rejected': self.rejected,
+            'evictions': self.evictions,
+            'expired': self.expired,
+            'persistent': self.path is not None,
+            'persist_errors': self.persist_errors
+        }
+
+    async def _execute(self, job: Job, run: Callable[[Job], Awaitable[Dict[str, Any]]]) -> None:
+        """Run the job coroutine and record how it ended."""
+        job.status = JOB_RUNNING
+        job.started_at = time.time()
+        self._persist(job, force=True)
+        await self._notify(job)
+        try:
+            result = await run(job)
+        except asyncio.CancelledError:
+            await self._finish(job, JOB_CANCELLED)
+        except Exception as e:
+            await self._finish(job, JOB_FAILED, error=str(e))
+        else:
+            await self._finish(job, JOB_COMPLETED, result=result)
+
+    async def _finish(
+        self,
+        job: Job,
+        status: str,
+        result: Optional[Dict[str, Any]] = None,
+        error: Optional[str] = None
+    ) -> None:
+        """Move a job to a terminal status, persist and wake streams."""
+        job.status = status
+        job.result = result
+        job.error = error
+        job.finished_at = time.time()
+        if status == JOB_COMPLETED:
+            self.completed += 1
+        elif status == JOB_FAILED:
+            self.failed += 1
+        else:
+            self.cancelled += 1
+        self._persist(job, force=True)
+        await self._notify(job)
+
+    def _record(self, job_id: str, solver: str, incumbent: Dict[str, Any]) -> None:
+        """Append an incumbent (on the event loop) and wake streams."""
+        job = self._jobs.get(job_id)
+        if job is None or job.done:
+            return
+        job.num_incumbents += 1
+        incumbent.update({
+            'seq': job.num_incumbents,
+            'solver': solver,
+            'elapsed': time.time() - (job.started_at or job.submitted_at)
+        })
+        job.incumbents.append(incumbent)
+        del job.incumbents[:-self.max_incumbents]
+        self._persist(job)
+        asyncio.ensure_future(self._notify(job))
+
+    @staticmethod
+    async def _notify(job: Job) -> None:
+        """Wake streams and waiters of a job."""
+        async with job.changed:
+            job.changed.notify_all()
+
+    def _job(self, job_id: str) -> Job:
+        """Job by id, raising KeyError if unknown."""
+        job = self._jobs.get(job_id)
+        if job is None:
+            raise KeyError(f"Unknown job: {job_id}")
+        return job
+
+    def _prune(self) -> None:
+        """Drop finished jobs past the retention period."""
+        if not self.retention_seconds:
+            return
+        cutoff = time.time() - self.retention_seconds
+        for job_id in [j.job_id for j in self._jobs.values() if j.done and j.finished_at < cutoff]:
+            self._forget(job_id)
+            self.expired += 1
+
+    def _evict(self) -> bool:
+        """Drop the oldest finished job; False if every job is live."""
+        for job_id, job in self._jobs.items():
+            if job.done:
+                self._forget(job_id)
+                self.evictions += 1
+                return True
+        return False
+
+    def _forget(self, job_id: str) -> None:
+        """Remove a job from the table and its file."""
+        del self._jobs[job_id]
+        if self.path is not None:
+            try:
+                self._job_file(job_id).unlink()
+            except FileNotFoundError:
+                pass
+
+    def _job_file(self, job_id: str) -> Path:
+        """Get the file path of a job."""
+        return self.path / f'{job_id}.json'
+
+    def _load(self) -> None:
+        """Reload persisted jobs, keeping the newest max_jobs."""
+        records = []
+        try:
+            files = list(self.path.glob('*.json'))
+        except OSError:
+            self.persist_errors += 1
+            self.path = None
+            return
+        for path in files:
+            try:
+                with open(path) as f:
+                    records.append(json.load(f))
+            except (OSError, ValueError):
+                self.persist_errors += 1
+        records.sort(key=lambda record: record.get('submitted_at', 0.0))
+        for record in records[:-self.max_jobs]:
+            self._job_file(record['job_id']).unlink(missing_ok=True)
+        for record in records[-self.max_jobs:]:
+            job = Job.from_dict(record)
+            self._jobs[job.job_id] = job
+            if job.status != record['status']:
+                self._persist(job, force=True)
+
+    def _persist(self, job: Job, force: bool = False) -> None:
+        """Write a job's file atomically (throttled unless forced)."""
+        if self.path is None:
+            return
+        now = time.monotonic()
+        if not force and now - job.persisted_at < self.persist_interval:
+            return
+        job.persisted_at = now
+        path = self._job_file(job.job_id)
+        tmp_path = path.with_suffix('.tmp')
+        try:
+            self.path.mkdir(parents=True, exist_ok=True)
+            with open(tmp_path, 'w') as f:
+                json.dump(job.to_dict(), f, default=_json_default)
+            os.replace(tmp_path, path)
+        except OSError:
+            self.persist_errors += 1
+            self.path = None
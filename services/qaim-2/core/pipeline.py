@@ -0,0 +1,138 @@
+"""
+QAIM-2 Bridge Pipeline
+
+Bounded-concurrency stage gates for the TFA V2 bridge sequence
+(PCAN → SM → SP → ARB → decompose → XFR → solver). Every request passes through the
+same gates, so concurrent requests overlap across stages while each stage
+keeps its own concurrency limit and queue depth. With a tracer attached,
+each stage (gate wait included) is recorded as a span of the current
+request.
+"""
+
+from typing import Dict, Any, Optional
+from contextlib import asynccontextmanager, nullcontext
+import asyncio
+
+
+# Bridge stages in execution order
+STAGES = ('pcan', 'sm', 'sp', 'arb', 'decompose', 'xfr', 'solve')
+
+# Default per-stage concurrency when not configured
+DEFAULT_STAGE_CONCURRENCY = {
+    'pcan': 16,
+    'sm': 16,
+    'sp': 16,
+    'arb': 16,
+    'decompose': 16,
+    'xfr': 16,
+    'solve': 8
+}
+
+
+class StageGate:
+    """Concurrency gate and queue counters for a single bridge stage."""
+
+    def __init__(self, name: str, concurrency: int):
+        self.name = name
+        self.concurrency = max(1, int(concurrency))
+        self.waiting = 0
+        self.active = 0
+        self.completed = 0
+        self._semaphore = asyncio.Semaphore(self.concurrency)
+
+    @asynccontextmanager
+    async def slot(self):
+        """Hold one stage slot for the duration of the block."""
+        self.waiting += 1
+        try:
+            await self._semaphore.acquire()
+        finally:
+            self.waiting -= 1
+
+        self.active += 1
+        try:
+            yield
+        finally:
+            self.active -= 1
+            self.completed += 1
+            self._semaphore.release()
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """Get current gate counters."""
+        return {
+            'concurrency': self.concurrency,
+            'waiting': self.waiting,
+            'active': self.active,
+            'completed': self.completed
+        }
+
+
+class BridgePipeline:
+    """
+    Asyncio pipeline over the bridge stages.
+
+    Requests enter a stage through its gate; the number of requests waiting
+    at each gate is the per-stage queue depth reported to arbitration.
+    """
+
+    def __init__(self, config: Optional[Dict[str, Any]] = None, tracer: Optional[Any] = None):
+        """
+        Initialize pipeline with configuration.
+
+        Args:
+            config: Configuration with stage_concurrency and max_in_flight
+            tracer: Optional Tracer that records a span per stage
+        """
+        self.config = config or {}
+        self.tracer = tracer
+        concurrency = dict(DEFAULT_STAGE_CONCURRENCY)
+        concurrency.update(self.config.get('stage_concurrency', {}))
+        self.max_in_flight = self.config.get('max_in_flight', 64)
+        self._gates = {
+            name: StageGate(name, concurrency[name]) for name in STAGES
+        }
+
+    def stage(self, name: str, solver: Optional[str] = None):
+        """
+        Async context manager holding a slot in the named stage.
+
+        Args:
+            name: Stage name
+            solver: Solver the stage runs for, when it differs per span
+                (portfolio arms)
+        """
+        if name not in self._gates:
+            raise ValueError(f"Unknown pipeline stage: {name}")
+        span = self.tracer.span(name, solver) if self.tracer else nullcontext()
+        return self._traced(span, self._gates[name].slot())
+
+    @staticmethod
+    @asynccontextmanager
+    async def _traced(span, slot):
+        with span:
+            async with slot:
+                yield
+
+    def queue_depth(self, name: Optional[str] = None) -> int:
+        """
+        Get number of requests waiting for a stage slot.
+
+        Args:
+            name: Stage name, or None for the total across all stages
+        """
+        if name is not None:
+            return self._gates[name].waiting
+        return sum(gate.waiting for gate in self._gates.values())
+
+    def in_flight(self) -> int:
+        """Get number of requests currently holding or waiting for a slot."""
+        return sum(gate.waiting + gate.active for gate in self._gates.values())
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """Get per-stage pipeline statistics."""
+        return {
+            'queue_depth': self.queue_depth(),
+            'stages': {
+                name: gate.get_statistics() for name, gate in self._gates.items()
+            }
+        }
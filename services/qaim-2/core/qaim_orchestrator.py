@@ -5,12 +5,15 @@ Main orchestration engine for Quantum-Classical Optimization via AI Bridges.
 Implements TFA V2 bridge pattern: QS→FWD→UE→FE→CB→QB
 """
 
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional, Tuple, Union, AsyncIterator
 import asyncio
+import contextvars
 from datetime import datetime
 import uuid
 import hashlib
 import json
+import os
+import time
 
 # Import bridges and solvers
 try:
@@ -19,9 +22,19 @@ try:
     from ..bridges.strategy_policy import StrategyPolicy
     from ..bridges.arbitration import Arbitration
     from ..bridges.cross_framework import CrossFrameworkTranslator
+    from ..bridges.decomposition import ProblemDecomposer
     from ..solvers.cb_pool import ClassicalSolverPool
     from ..solvers.qb_pool import CubicBitSolverPool
     from ..solvers.qc_gateway import QuantumGateway
+    from .pipeline import BridgePipeline
+    from .result_cache import ResultCache
+    from .resource_monitor import ResourceMonitor
+    from .admission import AdmissionController, AdmissionRejected
+    from .telemetry import MAPPublisher, TOPIC_TELEMETRY, TOPIC_LOG
+    from .evidence_store import EvidenceStore
+    from .tracing import Tracer, STAGE_ADMISSION, STAGE_EVIDENCE
+    from .warm_start import WarmStartCache
+    from .jobs import JobManager
 except ImportError:
     # Fallback for direct execution
     import sys
@@ -32,9 +45,22 @@ except ImportError:
     from bridges.strategy_policy import StrategyPolicy
     from bridges.arbitration import Arbitration
     from bridges.cross_framework import CrossFrameworkTranslator
+    from bridges.decomposition import ProblemDecomposer
     from solvers.cb_pool import ClassicalSolverPool
     from solvers.qb_pool import CubicBitSolverPool
     from solvers.qc_gateway import QuantumGateway
+    from core.pipeline import BridgePipeline
+    from core.result_cache import ResultCache
+    from core.resource_monitor import ResourceMonitor
+    from core.admission import AdmissionController, AdmissionRejected
+    from core.telemetry import MAPPublisher, TOPIC_TELEMETRY, TOPIC_LOG
+    from core.evidence_store import EvidenceStore
+    from core.tracing import Tracer, STAGE_ADMISSION, STAGE_EVIDENCE
+    from core.warm_start import WarmStartCache
+    from core.jobs import JobManager
+
+# Job id of the submitted job the current task works for (None for optimize())
+_current_job = contextvars.ContextVar('qaim2_job', default=None)
 
 
 class OptimizationResult:
@@ -67,19 +93,46 @@ class QAIM2Orchestrator:
         self.config = config
         self.pcan = ProblemCanonicalizer(config.get('pcan', {}))
         self.surrogate = SurrogateModels(config.get('surrogate', {}))
-        self.strategy = StrategyPolicy(config.get('strategy', {}))
+        qc_gateway_cfg = config.get('qc_gateway', {})
+        self.qc_gateway = QuantumGateway(qc_gateway_cfg) if qc_gateway_cfg.get('enabled') else None
+        strategy_cfg = dict(config.get('strategy', {}))
+        strategy_cfg.setdefault('qc_max_qubits', self._qubit_limit())
+        self.strategy = StrategyPolicy(strategy_cfg)
         self.arbitration = Arbitration(config.get('arbitration', {}))
         self.translator = CrossFrameworkTranslator(config.get('translator', {}))
+        self.decomposer = ProblemDecomposer(config.get('decomposition', {}))
         self.cb_pool = ClassicalSolverPool(config.get('cb_solvers', {}))
         self.qb_pool = CubicBitSolverPool(config.get('qb_solvers', {}))
-        qc_gateway_cfg = config.get('qc_gateway', {})
-        self.qc_gateway = QuantumGateway(qc_gateway_cfg) if qc_gateway_cfg.get('enabled') else None
+        tracing_cfg = dict(config.get('tracing', {}))
+        monitoring = config.get('monitoring', {})
+        if monitoring.get('prometheus_enabled'):
+            tracing_cfg.setdefault('metrics_port', monitoring.get('prometheus_port'))
+        self.tracer = Tracer(tracing_cfg)
+        self.pipeline = BridgePipeline(config.get('pipeline', {}), self.tracer)
+        self.result_cache = ResultCache(config.get('result_cache', {}))
+        self.warm_start = WarmStartCache(config.get('warm_start', {}))
+        monitor_cfg = dict(config.get('resource_monitor', {}))
+        monitor_cfg.setdefault('cpu_count', config.get('resources', {}).get('cpu_limit'))
+        self.resource_monitor = ResourceMonitor(monitor_cfg)
+        self.admission = AdmissionController(config.get('admission', {}))
+        self.telemetry = MAPPublisher(config.get('map', {}))
+        store_cfg = dict(config.get('evidence_store', {}))
+        store_cfg.setdefault('path', config.get('utcs', {}).get('evidence_path', 'evidence'))
+        self.evidence_store = EvidenceStore(store_cfg)
+        self.jobs = JobManager(config.get('jobs', {}))
+        self.portfolio = config.get('portfolio', {})
+        self.learning = config.get('learning', {})
+        self._learner_tasks = set()
+        self._maintenance_task = None
+        self._learning_updates = 0
+        self._load_learning_state()
         
     async def optimize(
         self,
         problem: Dict[str, Any],
         constraints: Dict[str, Any],
-        metadata: Optional[Dict[str, Any]] = None
+        metadata: Optional[Dict[str, Any]] = None,
+        base_request_id: Optional[str] = None
     ) -> Dict[str, Any]:
         """
         Main optimization entry point.
@@ -91,50 +144,141 @@ class QAIM2Orchestrator:
             problem: Problem specification (type, variables, objectives)
             constraints: Optimization constraints
             metadata: Optional metadata (ATA chapter, domain, S1000D references)
+            base_request_id: Earlier request this one re-plans; its solution
+                warm-starts the solver if the problem changed only slightly.
+                Without it, the latest solve with the same structure is used.
             
         Returns:
             Dictionary with request_id, solver, solution, metrics, evidence, status
+            ('rejected' when admission control refuses the request)
         """
+        return await self._admit_and_run(
+            problem, constraints, metadata, base_request_id=base_request_id
+        )
+    
+    async def _admit_and_run(
+        self,
+        problem: Dict[str, Any],
+        constraints: Dict[str, Any],
+        metadata: Optional[Dict[str, Any]],
+        default_priority: Optional[str] = None,
+        base_request_id: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Pass admission control, then run the request (traced if sampled)."""
         request_id = str(uuid.uuid4())
         start_time = datetime.utcnow()
+        problem_type = problem.get('problem_type') if isinstance(problem, dict) else None
         
+        trace = self.tracer.start(request_id)
+        response = None
+        try:
+            response = await self._admit(
+                request_id, start_time, problem, constraints, metadata,
+                default_priority, base_request_id
+            )
+        finally:
+            stage_ms = self.tracer.finish(
+                trace, response['solver'] if response else 'none', problem_type
+            )
+        
+        if stage_ms is not None:
+            response['metrics']['stage_ms'] = stage_ms
+        return response
+    
+    async def _admit(
+        self,
+        request_id: str,
+        start_time: datetime,
+        problem: Dict[str, Any],
+        constraints: Dict[str, Any],
+        metadata: Optional[Dict[str, Any]],
+        default_priority: Optional[str],
+        base_request_id: Optional[str]
+    ) -> Dict[str, Any]:
+        """Acquire an admission slot, run the request and release the slot."""
+        # 0. Admission control: priority class, bounded queue, deadline check
+        priority = self.admission.classify(metadata, constraints, default_priority)
+        try:
+            with self.tracer.span(STAGE_ADMISSION):
+                queue_wait = await self.admission.acquire(
+                    priority, (constraints or {}).get('time_limit')
+                )
+        except AdmissionRejected as e:
+            return await self._reject(request_id, e, start_time)
+        
+        admission = {'priority': priority, 'queue_wait_ms': int(queue_wait * 1000)}
+        admitted_at = time.monotonic()
+        try:
+            return await self._run(
+                request_id, start_time, problem, constraints, metadata, admission,
+                base_request_id
+            )
+        finally:
+            self.admission.release(time.monotonic() - admitted_at)
+    
+    async def _run(
+        self,
+        request_id: str,
+        start_time: datetime,
+        problem: Dict[str, Any],
+        constraints: Dict[str, Any],
+        metadata: Optional[Dict[str, Any]],
+        admission: Dict[str, Any],
+        base_request_id: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Run an admitted request through the bridge stages and solver."""
         try:
             # 1. QS Layer: Establish provenance
             await self._log_provenance(request_id, problem, metadata)
             
             # 2. PCAN Bridge: Canonicalize problem (FWD layer)
-            canonical = await self.pcan.canonicalize(problem, metadata)
+            async with self.pipeline.stage('pcan'):
+                canonical = await self.pcan.canonicalize(problem, metadata)
             
-            # 3. SM Bridge: Extract features with surrogate models (UE layer)
-            features = await self.surrogate.extract_features(canonical)
+            # Content-addressed result cache lookup, ahead of SM/SP/ARB
+            input_hash = self._hash_input(canonical)
+            cache_key = self._cache_key(input_hash, constraints)
+            cached = self.result_cache.get(cache_key)
             
-            # 4. SP Bridge: Select solver using strategy policy (FE layer)
-            solver_type, params = await self.strategy.select_solver(
-                features, constraints
-            )
+            if cached is not None:
+                solver_instance = cached['solver']
+                result = OptimizationResult(
+                    cached['status'],
+                    cached['solution'],
+                    dict(cached['metrics'], cached=True)
+                )
+            else:
+                solver_instance, result = await self._select_and_solve(
+                    canonical, constraints, base_request_id
+                )
+                if result.status in ('optimal', 'feasible'):
+                    self.result_cache.put(cache_key, {
+                        'solver': str(solver_instance),
+                        'status': result.status,
+                        'solution': result.solution,
+                        'metrics': {
+                            k: v for k, v in result.metrics.items() if k != 'warm_start'
+                        }
+                    })
             
-            # 5. ARB Bridge: Runtime arbitration and refinement
-            solver_instance = self.arbitration.select_arm({
-                'solver_type': solver_type,
-                'features': features,
-                'context': self._get_context()
-            })
-            
-            # 6. XFR Bridge: Translate problem to solver format (CB/QB layer)
-            solver_problem = await self.translator.translate(
-                canonical, solver_type
-            )
+            if result.status in ('optimal', 'feasible'):
+                self.warm_start.retain(
+                    request_id, canonical, result.solution,
+                    result.metrics.get('solve_time'),
+                    warm_start=result.metrics.get('warm_start'),
+                    basis=result.metrics.get('basis')
+                )
             
-            # 7. Execute solver (CB/QB/QC execution)
-            result = await self._solve(
-                solver_instance, solver_problem, params
-            )
-            
-            # 8. Generate UTCS v5.0 evidence (QS layer)
-            evidence = await self._generate_evidence(
-                request_id, canonical, solver_instance, result, 
-                start_time, datetime.utcnow()
-            )
+            # 8. Generate and store UTCS v5.0 evidence (QS layer)
+            with self.tracer.span(STAGE_EVIDENCE):
+                evidence = await self._generate_evidence(
+                    request_id, canonical, solver_instance, result, 
+                    start_time, datetime.utcnow(),
+                    input_hash=input_hash,
+                    cached=cached is not None,
+                    admission=admission
+                )
+                self._store_evidence(evidence)
             
             # 9. Emit to MAP topics
             await self._emit_evidence(request_id, solver_instance, result)
@@ -143,7 +287,7 @@ class QAIM2Orchestrator:
                 'request_id': request_id,
                 'solver': str(solver_instance),
                 'solution': result.solution,
-                'metrics': result.metrics,
+                'metrics': dict(result.metrics, **admission),
                 'evidence': evidence,
                 'status': result.status
             }
@@ -154,17 +298,343 @@ class QAIM2Orchestrator:
             error_evidence = await self._generate_error_evidence(
                 request_id, str(e), start_time, end_time
             )
+            error_evidence['admission'] = admission
+            self._store_evidence(error_evidence)
             await self._emit_error(request_id, str(e))
             
             return {
                 'request_id': request_id,
                 'solver': 'none',
                 'solution': None,
-                'metrics': {'error': str(e)},
+                'metrics': dict({'error': str(e)}, **admission),
                 'evidence': error_evidence,
                 'status': 'error'
             }
     
+    async def _select_and_solve(
+        self,
+        canonical: Any,
+        constraints: Dict[str, Any],
+        base_request_id: Optional[str] = None
+    ) -> tuple:
+        """
+        Run SM, SP, ARB and XFR, then the selected solver (or portfolio).
+        
+        A retained solve of the same problem structure (``base_request_id``
+        or the latest match) is passed to the solver as ``warm_start``.
+        
+        Returns:
+            Tuple of (solver, result)
+        """
+        # 3. SM Bridge: Extract features with surrogate models (UE layer)
+        async with self.pipeline.stage('sm'):
+            features = await self.surrogate.extract_features(canonical)
+        
+        # 4. SP Bridge: Select solver using strategy policy (FE layer)
+        async with self.pipeline.stage('sp'):
+            solver_type, params = await self.strategy.select_solver(
+                features, constraints
+            )
+        
+        # 5. ARB Bridge: Runtime arbitration and refinement
+        async with self.pipeline.stage('arb'):
+            arb_context = {
+                'solver_type': solver_type,
+                'features': features,
+                'context': self._get_context()
+            }
+            solver_instance = self.arbitration.select_arm(arb_context)
+            params = self.arbitration.adjust_parameters(params, arb_context)
+            arms = self._select_portfolio(arb_context)
+        
+        # Warm start from a retained solve with small deltas (re-planning)
+        warm = self.warm_start.lookup(canonical, base_request_id)
+        warm_params = {} if warm is None else {
+            'warm_start': {
+                'start': warm['start'],
+                'solution': warm['solution'],
+                'basis': warm['basis']
+            }
+        }
+        
+        if arms:
+            # Portfolio mode: race the top-k arms under a shared deadline
+            async with self.pipeline.stage('xfr'):
+                arm_problems = {
+                    arm: await self.translator.translate(canonical, arm)
+                    for arm in arms
+                }
+            
+            solver_instance, result = await self._race(
+                arms, arm_problems, features,
+                {
+                    arm: dict(params if arm == solver_type else
+                              self.arbitration.adjust_parameters(
+                                  self.strategy.generate_parameters(arm, features, constraints),
+                                  arb_context
+                              ), **warm_params)
+                    for arm in arms
+                },
+                constraints
+            )
+        else:
+            # Split large problems into blocks solved in parallel
+            async with self.pipeline.stage('decompose'):
+                plan = self.decomposer.plan(canonical)
+            decomposed = None
+            if plan is not None:
+                decomposed = await self._solve_decomposed(
+                    canonical, plan, constraints, arb_context, warm
+                )
+            
+            if decomposed is not None:
+                solver_instance, result = decomposed
+            else:
+                # 6. XFR Bridge: Translate problem to solver format (CB/QB layer)
+                async with self.pipeline.stage('xfr'):
+                    solver_problem = await self.translator.translate(
+                        canonical, solver_instance
+                    )
+                
+                # 7. Execute solver (CB/QB/QC execution)
+                async with self.pipeline.stage('solve'):
+                    result = await self._solve(
+                        solver_instance, solver_problem, dict(params, **warm_params)
+                    )
+                
+                self._record_outcome(features, solver_instance, result, constraints)
+        
+        if warm is not None:
+            result.metrics['warm_start'] = {
+                'base_request_id': warm['base_request_id'],
+                'delta': warm['delta'],
+                'cold_solve_time': warm['cold_solve_time'],
+                'speedup': WarmStartCache.speedup(warm, result.metrics.get('solve_time'))
+            }
+        return solver_instance, result
+    
+    async def _solve_decomposed(
+        self,
+        canonical: Any,
+        plan: Any,
+        constraints: Dict[str, Any],
+        arb_context: Dict[str, Any],
+        warm: Optional[Dict[str, Any]]
+    ) -> Optional[tuple]:
+        """
+        Solve the blocks of a decomposition plan concurrently.
+        
+        Every block gets its own SM features and SP/ARB solver choice, so
+        blocks small enough for a classical solver go to the CB pool.
+        
+        Returns:
+            Tuple of ('decomposed', result), or None if the blocks could
+            not be coordinated and the full problem should be solved
+        """
+        selections = []
+        for cols, sub in zip(plan.columns, plan.subproblems):
+            async with self.pipeline.stage('sm'):
+                features = await self.surrogate.extract_features(sub)
+            solver, params = await self.strategy.select_solver(features, constraints)
+            params = self.arbitration.adjust_parameters(
+                params, dict(arb_context, solver_type=solver, features=features)
+            )
+            if warm is not None:
+                params['warm_start'] = {
+                    'start': warm['start'][cols],
+                    'solution': warm['solution'],
+                    'basis': None
+                }
+            selections.append((solver, params, features))
+        
+        async def solve_block(index: int, subproblem: Any) -> Any:
+            solver, params, _ = selections[index]
+            async with self.pipeline.stage('xfr', solver):
+                problem = await self.translator.translate(subproblem, solver)
+            async with self.pipeline.stage('solve', solver):
+                return await self._solve(solver, problem, params)
+        
+        merged = await self.decomposer.coordinate(
+            canonical, plan, solve_block, constraints.get('time_limit')
+        )
+        if merged is None:
+            return None
+        
+        for (solver, _, features), block_result in zip(selections, merged['results']):
+            self._record_outcome(features, solver, block_result, constraints)
+        merged['metrics']['decomposition']['solvers'] = [s for s, _, _ in selections]
+        return 'decomposed', OptimizationResult(
+            merged['status'], merged['solution'], merged['metrics']
+        )
+    
+    def _cache_key(self, input_hash: str, constraints: Dict[str, Any]) -> str:
+        """
+        Result cache key for a request.
+        
+        Built from the request alone: the requested solver ('auto', or
+        'portfolio' when racing) and the request constraints. The arm that
+        SP/ARB pick and their load-adjusted parameters vary with exploration
+        and load, so they are not part of the key.
+        """
+        solver = constraints.get('solver', 'auto')
+        if solver == 'auto' and self.portfolio.get('enabled', False):
+            solver = 'portfolio'
+        params = {
+            k: v for k, v in constraints.items()
+            if k not in ('solver', 'gap_tolerance', 'priority')
+        }
+        return self.result_cache.make_key(
+            input_hash, solver, params, constraints.get('gap_tolerance')
+        )
+    
+    async def _reject(
+        self,
+        request_id: str,
+        rejection: AdmissionRejected,
+        start_time: datetime
+    ) -> Dict[str, Any]:
+        """Build the response for a request refused by admission control."""
+        evidence = await self._generate_error_evidence(
+            request_id, str(rejection), start_time, datetime.utcnow()
+        )
+        evidence['status'] = 'rejected'
+        evidence['admission'] = {
+            'priority': rejection.priority,
+            'reason': rejection.reason,
+            'queue_wait_ms': 0
+        }
+        self._store_evidence(evidence)
+        await self._emit_error(request_id, str(rejection))
+        
+        return {
+            'request_id': request_id,
+            'solver': 'none',
+            'solution': None,
+            'metrics': {
+                'error': str(rejection),
+                'reason': rejection.reason,
+                'priority': rejection.priority,
+                'queue_wait_ms': 0
+            },
+            'evidence': evidence,
+            'status': 'rejected'
+        }
+    
+    async def optimize_batch(
+        self,
+        problems: List[Dict[str, Any]],
+        constraints: Union[Dict[str, Any], List[Dict[str, Any]]],
+        metadata: Optional[Union[Dict[str, Any], List[Dict[str, Any]]]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Optimize a batch of problems through the bridge pipeline.
+        
+        Requests run concurrently and overlap across bridge stages, each
+        stage bounded by its configured concurrency. At most
+        ``pipeline.max_in_flight`` requests of the batch are admitted at once.
+        Items are admitted in the ``batch`` priority class unless their
+        metadata sets a priority or maps to one via its ATA chapter.
+        
+        Args:
+            problems: Problem specifications
+            constraints: Shared constraints dict, or one dict per problem
+            metadata: Optional shared metadata dict, or one dict per problem
+            
+        Returns:
+            List of optimize() results in the same order as ``problems``
+        """
+        constraints_list = self._broadcast(constraints, len(problems), 'constraints')
+        metadata_list = self._broadcast(metadata, len(problems), 'metadata')
+        
+        in_flight = asyncio.Semaphore(max(1, self.pipeline.max_in_flight))
+        
+        async def run_one(index: int) -> Dict[str, Any]:
+            async with in_flight:
+                return await self._admit_and_run(
+                    problems[index], constraints_list[index], metadata_list[index],
+                    default_priority='batch'
+                )
+        
+        return list(await asyncio.gather(
+            *(run_one(i) for i in range(len(problems)))
+        ))
+    
+    @staticmethod
+    def _broadcast(value: Any, count: int, name: str) -> list:
+        """Expand a shared value to one entry per problem."""
+        if isinstance(value, list):
+            if len(value) != count:
+                raise ValueError(
+                    f"Expected {count} {name} entries, got {len(value)}"
+                )
+            return value
+        return [value] * count
+    
+    async def submit(
+        self,
+        problem: Dict[str, Any],
+        constraints: Dict[str, Any],
+        metadata: Optional[Dict[str, Any]] = None,
+        base_request_id: Optional[str] = None
+    ) -> str:
+        """
+        Submit an optimization as an asynchronous job.
+        
+        The request runs exactly as optimize() on its own task, so long QB
+        and QC runs do not hold the caller. QB and QC solvers report
+        improving incumbents to the job while they run.
+        
+        Args:
+            problem: Problem specification
+            constraints: Optimization constraints
+            metadata: Optional metadata (stored with the job)
+            base_request_id: Earlier request to warm-start from
+            
+        Returns:
+            Job id for poll(), stream(), wait() and cancel()
+            
+        Raises:
+            JobTableFull: If the job table holds ``jobs.max_jobs`` live jobs
+        """
+        async def run(job: Any) -> Dict[str, Any]:
+            _current_job.set(job.job_id)
+            return await self._admit_and_run(
+                problem, constraints, metadata, base_request_id=base_request_id
+            )
+        
+        return self.jobs.submit(run, metadata)
+    
+    def poll(self, job_id: str, include_result: bool = True) -> Optional[Dict[str, Any]]:
+        """
+        Get a job's status (GET /v1/jobs/{job_id}).
+        
+        Returns:
+            Job record with status, timestamps, latest incumbent and, once
+            completed, the optimize() response as ``result``; None if the
+            job is unknown
+        """
+        return self.jobs.get(job_id, include_result)
+    
+    def stream(self, job_id: str, after: int = 0) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Stream a job's incumbents (seq, solver, elapsed, objective_value,
+        gap, solution) after sequence number ``after`` until it finishes.
+        """
+        return self.jobs.stream(job_id, after)
+    
+    async def wait(self, job_id: str, timeout: Optional[float] = None) -> Dict[str, Any]:
+        """Wait for a job to finish and return its record."""
+        return await self.jobs.wait(job_id, timeout)
+    
+    async def cancel(self, job_id: str) -> bool:
+        """
+        Cancel a queued or running job.
+        
+        Returns:
+            True if the job was live and is now cancelled
+        """
+        return await self.jobs.cancel(job_id)
+    
     async def _solve(
         self, 
         solver: Any, 
@@ -182,33 +652,353 @@ class QAIM2Orchestrator:
         Returns:
             OptimizationResult with status, solution, and metrics
         """
-        def normalize_params(solver_name: str, params: Dict[str, Any]) -> Dict[str, Any]:
-            # Always return a dict with at least 'solver_name', 'options', and 'metadata'
-            normalized = {
-                'solver_name': solver_name,
-                'options': params.get('options', {}),
-                'metadata': params.get('metadata', {})
-            }
-            # Merge in any other keys from params that aren't 'solver_name', 'options', or 'metadata'
-            for k, v in params.items():
-                if k not in normalized:
-                    normalized[k] = v
-            return normalized
-
         if isinstance(solver, str):
-            params_normalized = normalize_params(solver, params)
-            if solver.startswith('cb_'):
-                return await self.cb_pool.solve(problem, params_normalized)
-            elif solver.startswith('qb_'):
-                return await self.qb_pool.solve(problem, params_normalized)
-            elif solver.startswith('qc_'):
-                if self.qc_gateway:
-                    return await self.qc_gateway.solve(problem, params_normalized)
-                else:
-                    raise ValueError("QC not enabled in configuration")
+            params_normalized = self._normalize_params(solver, params)
+            job_id = _current_job.get()
+            if job_id is not None and solver.startswith(('qb_', 'qc_')):
+                # Long-running engines stream incumbents and stop on cancel
+                params_normalized['on_incumbent'] = self.jobs.reporter(job_id, solver)
+                params_normalized['cancel_event'] = self.jobs.cancel_event(job_id)
+            with self.resource_monitor.track(solver):
+                if solver.startswith('cb_'):
+                    return await self.cb_pool.solve(problem, params_normalized)
+                elif solver.startswith('qb_'):
+                    return await self.qb_pool.solve(problem, params_normalized)
+                elif solver.startswith('qc_'):
+                    if self.qc_gateway:
+                        return await self.qc_gateway.solve(problem, params_normalized)
+                    else:
+                        raise ValueError("QC not enabled in configuration")
         
         raise ValueError(f"Unknown solver type: {solver}")
     
+    def _select_portfolio(self, arb_context: Dict[str, Any]) -> List[str]:
+        """
+        Select arms to race in portfolio mode.
+        
+        Returns:
+            Ranked arms, or an empty list (single-arm execution) when
+            portfolio mode is disabled, the host is overloaded, or fewer
+            than two arms are available
+        """
+        if not self.portfolio.get('enabled', False):
+            return []
+        if self.arbitration.is_overloaded(arb_context['context']):
+            # Racing multiplies CPU demand; shed it under overload
+            return []
+        
+        arms = self.arbitration.rank_arms(
+            arb_context,
+            self.portfolio.get('top_k', 3),
+            self.portfolio.get('arms')
+        )
+        return arms if len(arms) > 1 else []
+    
+    async def _race(
+        self,
+        arms: List[str],
+        problems: Dict[str, Any],
+        features: Dict[str, Any],
+        arm_params: Dict[str, Dict[str, Any]],
+        constraints: Dict[str, Any]
+    ) -> tuple:
+        """
+        Run solver arms in parallel and take the first good answer.
+        
+        The first result within ``gap_tolerance`` wins and the remaining
+        arms are cancelled. Every arm that finishes or raises before that is
+        fed back to the learners (a raising arm as an infeasible run). If no
+        arm reaches the tolerance before the shared deadline, the best
+        feasible finisher is returned. Each arm holds its own ``solve``
+        stage slot.
+        
+        Args:
+            arms: Solver identifiers to race
+            problems: Translated problem per arm
+            features: Problem features (learning state)
+            arm_params: Solver parameters per arm
+            constraints: Optimization constraints (time_limit, gap_tolerance)
+            
+        Returns:
+            Tuple of (winning solver, result); ('none', error result) when
+            every arm raised
+        """
+        gap_tolerance = constraints.get('gap_tolerance', 0.01)
+        time_limit = max(
+            p.get('time_limit', constraints.get('time_limit', 60))
+            for p in arm_params.values()
+        )
+        
+        async def run_arm(arm: str) -> OptimizationResult:
+            async with self.pipeline.stage('solve', arm):
+                return await self._solve(arm, problems[arm], arm_params[arm])
+        
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        deadline = started + time_limit
+        tasks = {asyncio.create_task(run_arm(arm)): arm for arm in arms}
+        pending = set(tasks)
+        finished = {}
+        errors = {}
+        winner = None
+        
+        try:
+            while pending and winner is None:
+                done, pending = await asyncio.wait(
+                    pending,
+                    timeout=max(0.0, deadline - loop.time()),
+                    return_when=asyncio.FIRST_COMPLETED
+                )
+                if not done:
+                    break
+                
+                for task in done:
+                    arm = tasks[task]
+                    if task.exception() is not None:
+                        errors[arm] = str(task.exception())
+                        self._record_outcome(features, arm, OptimizationResult('error', None, {
+                            'solve_time': loop.time() - started,
+                            'feasible': False
+                        }), constraints)
+                        continue
+                    result = task.result()
+                    finished[arm] = result
+                    self._record_outcome(features, arm, result, constraints)
+                    if (result.status in ('optimal', 'feasible')
+                            and result.gap <= gap_tolerance
+                            and (winner is None or result.gap < finished[winner].gap)):
+                        winner = arm
+        finally:
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+        
+        if winner is None:
+            feasible = [arm for arm, r in finished.items() if r.feasible]
+            if feasible:
+                winner = min(feasible, key=lambda arm: finished[arm].gap)
+            elif finished:
+                winner = next(iter(finished))
+        
+        if winner is not None:
+            result = finished[winner]
+        else:
+            elapsed = loop.time() - started
+            status = 'timeout' if pending else 'error'
+            metrics = {
+                'objective_value': float('inf'),
+                'gap': float('inf'),
+                'solve_time': elapsed,
+                'feasible': False
+            }
+            if status == 'error':
+                metrics['error'] = '; '.join(f'{arm}: {e}' for arm, e in errors.items())
+            result = OptimizationResult(status, None, metrics)
+        
+        result.metrics['portfolio'] = {
+            'arms': list(arms),
+            'winner': winner,
+            'finished': list(finished),
+            'errors': errors,
+            'cancelled': [arm for task, arm in tasks.items() if task in pending]
+        }
+        return winner or 'none', result
+    
+    def _compute_reward(
+        self,
+        result: Any,
+        constraints: Dict[str, Any]
+    ) -> float:
+        """
+        Reward for a finished solve, per ``learning.reward``.
+        
+        - ``time``: negative solve time (infeasible: negative time limit)
+        - ``quality``: 1 / (1 + gap / gap_tolerance), 0 when infeasible
+        - ``pareto``: weighted quality minus weighted fraction of the time
+          limit used (``learning.weights``)
+        """
+        mode = self.learning.get('reward', 'time')
+        time_limit = float(constraints.get('time_limit', 60))
+        solve_time, quality = self._outcome(result, constraints)
+        
+        if mode == 'time':
+            return -solve_time
+        elif mode == 'quality':
+            return quality
+        elif mode == 'pareto':
+            weights = self.learning.get('weights', {})
+            time_used = min(solve_time / time_limit, 1.0) if time_limit > 0 else 1.0
+            return (
+                weights.get('quality', 0.5) * quality
+                - weights.get('time', 0.5) * time_used
+            )
+        raise ValueError(f"Unknown reward mode: {mode}")
+    
+    @staticmethod
+    def _outcome(result: Any, constraints: Dict[str, Any]) -> Tuple[float, float]:
+        """
+        Solve time and quality of a finished solve.
+        
+        Quality is 1 / (1 + gap / gap_tolerance); infeasible solves have
+        quality 0 and are charged the full time limit.
+        """
+        time_limit = float(constraints.get('time_limit', 60))
+        if not result.feasible:
+            return time_limit, 0.0
+        gap_tolerance = max(float(constraints.get('gap_tolerance', 0.01)), 1e-9)
+        return (
+            float(result.metrics.get('solve_time', time_limit)),
+            1.0 / (1.0 + max(float(result.gap), 0.0) / gap_tolerance)
+        )
+    
+    def _record_outcome(
+        self,
+        features: Dict[str, Any],
+        solver: str,
+        result: Any,
+        constraints: Dict[str, Any]
+    ) -> None:
+        """
+        Push a solve outcome to ARB and SP, and log it as SM runtime
+        predictor training data, without blocking the request.
+        """
+        if not self.learning.get('enabled', True):
+            return
+        
+        reward = self._compute_reward(result, constraints)
+        solve_time, quality = self._outcome(result, constraints)
+        task = asyncio.get_running_loop().create_task(
+            self._learn(features, solver, reward, solve_time, quality)
+        )
+        self._learner_tasks.add(task)
+        task.add_done_callback(self._learner_tasks.discard)
+    
+    def _store_evidence(self, evidence: Dict[str, Any]) -> None:
+        """
+        Append evidence to the store; once a segment rotation makes
+        compaction and retention due, run them on a worker thread so the
+        request does not wait for segment rewrites.
+        """
+        self.evidence_store.append(evidence)
+        if self.evidence_store.maintenance_due and self._maintenance_task is None:
+            self._maintenance_task = asyncio.get_running_loop().create_task(
+                asyncio.to_thread(self.evidence_store.maintain)
+            )
+            self._maintenance_task.add_done_callback(self._maintenance_done)
+    
+    def _maintenance_done(self, task: asyncio.Task) -> None:
+        """Allow the next rotation to schedule maintenance again."""
+        self._maintenance_task = None
+    
+    async def _learn(
+        self,
+        features: Dict[str, Any],
+        solver: str,
+        reward: float,
+        solve_time: float,
+        quality: float
+    ) -> None:
+        """Update both learners, log the outcome and periodically persist state."""
+        self.arbitration.update_arm(solver, reward)
+        self.strategy.update_policy(features, solver, reward)
+        self._learning_updates += 1
+        
+        if self.surrogate.record_outcome(features, solver, solve_time, quality):
+            try:
+                await asyncio.to_thread(self.surrogate.flush_outcomes)
+            except OSError:
+                # Best-effort; buffered outcomes are retried on the next flush
+                pass
+        
+        if (self.learning.get('state_path')
+                and self._learning_updates % self.learning.get('persist_every', 50) == 0):
+            try:
+                await asyncio.to_thread(self.save_learning_state)
+            except OSError:
+                # Persistence is best-effort; state is retried next interval
+                pass
+    
+    def save_learning_state(self) -> None:
+        """Atomically write learner state to ``learning.state_path``."""
+        path = self.learning.get('state_path')
+        if not path:
+            return
+        
+        state = {
+            'version': 1,
+            'updates': self._learning_updates,
+            'arbitration': self.arbitration.get_state(),
+            'strategy': self.strategy.get_state()
+        }
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f'{path}.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(state, f)
+        os.replace(tmp_path, path)
+    
+    def _load_learning_state(self) -> None:
+        """Restore learner state persisted by a previous instance."""
+        path = self.learning.get('state_path')
+        if not path or not os.path.exists(path):
+            return
+        
+        try:
+            with open(path) as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            # Corrupt or unreadable state: start learning from scratch
+            return
+        
+        self._learning_updates = state.get('updates', 0)
+        self.arbitration.load_state(state.get('arbitration', {}))
+        self.strategy.load_state(state.get('strategy', {}))
+    
+    async def close(self) -> None:
+        """
+        Release the orchestrator's resources.
+        
+        Cancels live jobs, drains and persists learning state and SM
+        outcomes, stops SM and QC worker threads and processes, and closes
+        the evidence store, metrics endpoint and MAP telemetry.
+        """
+        await self.jobs.close()
+        if self._learner_tasks:
+            await asyncio.gather(*self._learner_tasks, return_exceptions=True)
+        for persist in (self.save_learning_state, self.surrogate.flush_outcomes):
+            try:
+                persist()
+            except OSError:
+                # Best-effort, as in _learn; telemetry must still be flushed
+                pass
+        self.surrogate.close()
+        if self.qc_gateway:
+            self.qc_gateway.close()
+        if self._maintenance_task is not None:
+            await asyncio.gather(self._maintenance_task, return_exceptions=True)
+        self.evidence_store.close()
+        self.tracer.close()
+        await self.telemetry.close()
+    
+    @staticmethod
+    def _normalize_params(solver_name: Any, params: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Normalize solver parameters.
+        
+        Always returns a dict with at least 'solver_name', 'options' and
+        'metadata', merged with any other keys from params.
+        """
+        normalized = {
+            'solver_name': str(solver_name),
+            'options': params.get('options', {}),
+            'metadata': params.get('metadata', {})
+        }
+        for k, v in params.items():
+            if k not in normalized:
+                normalized[k] = v
+        return normalized
+    
     async def _generate_evidence(
         self,
         request_id: str,
@@ -216,7 +1006,10 @@ class QAIM2Orchestrator:
         solver: Any,
         result: OptimizationResult,
         start_time: datetime,
-        end_time: datetime
+        end_time: datetime,
+        input_hash: Optional[str] = None,
+        cached: bool = False,
+        admission: Optional[Dict[str, Any]] = None
     ) -> Dict[str, Any]:
         """
         Generate UTCS v5.0 evidence bundle.
@@ -228,6 +1021,9 @@ class QAIM2Orchestrator:
             result: Optimization result
             start_time: Start timestamp
             end_time: End timestamp
+            input_hash: Precomputed canonical hash (computed if omitted)
+            cached: Whether the result was served from the result cache
+            admission: Priority class and queue wait from admission control
             
         Returns:
             UTCS v5.0 compliant evidence dictionary
@@ -237,7 +1033,11 @@ class QAIM2Orchestrator:
             'request_id': request_id,
             'timestamp': end_time.isoformat(),
             'duration_ms': int((end_time - start_time).total_seconds() * 1000),
-            'input_hash': self._hash_input(canonical),
+            'input_hash': input_hash or self._hash_input(canonical),
+            'cached': cached,
+            'admission': admission or {},
+            'warm_start': result.metrics.get('warm_start'),
+            'decomposition': result.metrics.get('decomposition'),
             'solver': {
                 'name': str(solver),
                 'version': getattr(solver, 'version', 'unknown'),
@@ -291,9 +1091,16 @@ class QAIM2Orchestrator:
         
         Publishes to map/1/telemetry for monitoring and audit trail.
         """
-        # TODO: Implement actual MAP publishing
-        # For now, log to console
-        print(f"[MAP] Telemetry: request_id={request_id}, solver={solver}, status={result.status}")
+        await self.telemetry.publish(TOPIC_TELEMETRY, {
+            'event': 'result',
+            'request_id': request_id,
+            'solver': str(solver),
+            'status': result.status,
+            'objective_value': result.objective_value,
+            'gap': result.gap,
+            'solve_time': result.metrics.get('solve_time'),
+            'cached': result.metrics.get('cached', False)
+        })
     
     async def _emit_error(
         self,
@@ -301,8 +1108,11 @@ class QAIM2Orchestrator:
         error: str
     ) -> None:
         """Emit error to MAP topics."""
-        # TODO: Implement actual MAP publishing
-        print(f"[MAP] Error: request_id={request_id}, error={error}")
+        await self.telemetry.publish(TOPIC_LOG, {
+            'event': 'error',
+            'request_id': request_id,
+            'error': error
+        })
     
     async def _log_provenance(
         self,
@@ -311,31 +1121,84 @@ class QAIM2Orchestrator:
         metadata: Optional[Dict[str, Any]]
     ) -> None:
         """Log provenance at QS layer."""
-        # TODO: Implement actual QS logging
-        print(f"[QS] Provenance: request_id={request_id}, problem_type={problem.get('problem_type')}")
+        await self.telemetry.publish(TOPIC_LOG, {
+            'event': 'provenance',
+            'layer': 'QS',
+            'request_id': request_id,
+            'problem_type': problem.get('problem_type'),
+            'ata_chapter': (metadata or {}).get('ata_chapter')
+        })
     
     def _get_context(self) -> Dict[str, Any]:
         """
         Get current system context for arbitration.
         
         Returns:
-            Dictionary with system load, queue depth, available solvers
+            Dictionary with system load, memory pressure, in-flight solver
+            runs per pool, queue depth, available solvers and the largest
+            QUBO qc_qaoa can simulate
         """
         return {
             'load': self._get_system_load(),
+            'memory': self.resource_monitor.sample()['memory'],
+            'in_flight': self.resource_monitor.in_flight(),
             'queue_depth': self._get_queue_depth(),
-            'available_solvers': self._get_available_solvers()
+            'available_solvers': self._get_available_solvers(),
+            'qubit_limit': self._qubit_limit()
+        }
+    
+    def _qubit_limit(self) -> int:
+        """Largest QUBO (in variables) the QC gateway's statevector providers simulate."""
+        return self.qc_gateway.max_qubits() if self.qc_gateway else 0
+    
+    def get_statistics(self) -> Dict[str, Any]:
+        """Get orchestrator runtime statistics."""
+        return {
+            'pipeline': self.pipeline.get_statistics(),
+            'pcan': self.pcan.get_statistics(),
+            'surrogate': self.surrogate.get_statistics(),
+            'cb_pool': self.cb_pool.get_statistics(),
+            'qc_samplers': self.qc_gateway.get_statistics() if self.qc_gateway else {},
+            'result_cache': self.result_cache.get_statistics(),
+            'resources': self.resource_monitor.get_statistics(),
+            'admission': self.admission.get_statistics(),
+            'telemetry': self.telemetry.get_statistics(),
+            'evidence_store': self.evidence_store.get_statistics(),
+            'warm_start': self.warm_start.get_statistics(),
+            'decomposition': self.decomposer.get_statistics(),
+            'tracing': self.tracer.get_statistics(),
+            'jobs': self.jobs.get_statistics()
         }
     
+    def get_metrics(self) -> str:
+        """Per-stage latency histograms in the Prometheus text format."""
+        return self.tracer.prometheus()
+    
+    def serve_metrics(self) -> Optional[Tuple[str, int]]:
+        """
+        Start the /metrics and /stages HTTP endpoint (service entry point only).
+        
+        Returns:
+            Bound (host, port), or None if no port is configured or the bind failed
+        """
+        return self.tracer.serve()
+    
+    def get_evidence(self, request_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up stored UTCS evidence by request_id (GET /v1/evidence/{request_id}).
+        
+        Returns:
+            Evidence dictionary, or None if not stored or the store is disabled
+        """
+        return self.evidence_store.get(request_id)
+    
     def _get_system_load(self) -> float:
         """Get current system load (0.0 to 1.0)."""
-        # TODO: Implement actual load monitoring
-        return 0.3
+        return self.resource_monitor.load()
     
     def _get_queue_depth(self) -> int:
-        """Get current queue depth."""
-        # TODO: Implement actual queue monitoring
-        return 0
+        """Get current queue depth (requests waiting for admission or a stage)."""
+        return self.admission.queue_depth() + self.pipeline.queue_depth()
     
     def _get_available_solvers(self) -> list:
         """Get list of currently available solvers."""
@@ -356,6 +1219,9 @@ class QAIM2Orchestrator:
         Returns:
             Hexadecimal hash string
         """
+        if hasattr(canonical, 'content_hash'):
+            # Array-backed canonical problems hash their raw buffers
+            return canonical.content_hash()
         return hashlib.sha256(
             json.dumps(canonical, sort_keys=True).encode()
         ).hexdigest()
@@ -0,0 +1,138 @@
+"""
+QAIM-2 Resource Monitor
+
+Lightweight host telemetry for arbitration: CPU utilization and load
+average from /proc/stat and /proc/loadavg, memory pressure from
+/proc/meminfo, and in-flight solver counts per pool. Reads are cached for
+``sample_interval`` seconds so every request can consult the monitor
+without touching /proc each time.
+"""
+
+from typing import Dict, Any, Optional
+from contextlib import contextmanager
+import os
+import time
+
+
+# Solver pools tracked for in-flight counts (solver name prefixes)
+POOLS = ('cb', 'qb', 'qc')
+
+
+class ResourceMonitor:
+    """
+    Samples host load and solver pool occupancy.
+
+    ``load()`` is the larger of CPU utilization since the previous sample
+    and the 1-minute load average per CPU, clipped to [0, 1].
+    """
+
+    def __init__(self, config: Optional[Dict[str, Any]] = None):
+        """
+        Initialize monitor with configuration.
+
+        Args:
+            config: Configuration with enabled, sample_interval (seconds),
+                cpu_count (defaults to os.cpu_count()) and proc_root
+        """
+        config = config or {}
+        self.enabled = config.get('enabled', True)
+        self.sample_interval = config.get('sample_interval', 1.0)
+        self.cpu_count = config.get('cpu_count') or os.cpu_count() or 1
+        self.proc_root = config.get('proc_root', '/proc')
+
+        self._in_flight = {pool: 0 for pool in POOLS}
+        self._cpu_times = None
+        self._sampled_at = None
+        self._sample = {'cpu': 0.0, 'loadavg': 0.0, 'memory': 0.0}
+
+    def sample(self) -> Dict[str, float]:
+        """
+        Get the current host sample, refreshed at most once per interval.
+
+        Returns:
+            Dictionary with cpu (utilization), loadavg (1-minute load per
+            CPU) and memory (fraction in use), each 0.0 when unavailable
+        """
+        if not self.enabled:
+            return dict(self._sample)
+
+        now = time.monotonic()
+        if self._sampled_at is not None and now - self._sampled_at < self.sample_interval:
+            return dict(self._sample)
+        self._sampled_at = now
+
+        self._sample = {
+            'cpu': self._read_cpu(),
+            'loadavg': self._read_loadavg(),
+            'memory': self._read_memory()
+        }
+        return dict(self._sample)
+
+    def load(self) -> float:
+        """Get current system load (0.0 to 1.0)."""
+        sample = self.sample()
+        return min(max(sample['cpu'], sample['loadavg']), 1.0)
+
+    @contextmanager
+    def track(self, solver: str):
+        """Count a solver run as in flight for its pool for the block."""
+        pool = solver.split('_', 1)[0]
+        if pool not in self._in_flight:
+            yield
+            return
+
+        self._in_flight[pool] += 1
+        try:
+            yield
+        finally:
+            self._in_flight[pool] -= 1
+
+    def in_flight(self) -> Dict[str, int]:
+        """In-flight solver runs per pool."""
+        return dict(self._in_flight)
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """Get the latest sample and pool occupancy."""
+        return dict(self._sample, load=self.load(), in_flight=self.in_flight())
+
+    def _read(self, name: str) -> str:
+        with open(os.path.join(self.proc_root, name)) as f:
+            return f.read()
+
+    def _read_cpu(self) -> float:
+        """CPU utilization since the previous sample (since boot on the first)."""
+        try:
+            fields = self._read('stat').split('\n', 1)[0].split()
+            times = [int(v) for v in fields[1:]]
+        except (OSError, ValueError, IndexError):
+            return 0.0
+
+        # idle + iowait count as idle time
+        current = (sum(times), times[3] + (times[4] if len(times) > 4 else 0))
+        previous = self._cpu_times or (0, 0)
+        self._cpu_times = current
+
+        total = current[0] - previous[0]
+        idle = current[1] - previous[1]
+        if total <= 0:
+            return 0.0
+        return min(max(1.0 - idle / total, 0.0), 1.0)
+
+    def _read_loadavg(self) -> float:
+        """1-minute load average per CPU."""
+        try:
+            load_1m = float(self._read('loadavg').split()[0])
+        except (OSError, ValueError, IndexError):
+            return 0.0
+        return load_1m / self.cpu_count
+
+    def _read_memory(self) -> float:
+        """Fraction of memory in use (1 - MemAvailable / MemTotal)."""
+        try:
+            info = {}
+            for line in self._read('meminfo').splitlines():
+                key, _, value = line.partition(':')
+                info[key] = int(value.split()[0])
+            return min(max(1.0 - info['MemAvailable'] / info['MemTotal'], 0.0), 1.0)
+        except (OSError, ValueError, IndexError, KeyError, ZeroDivisionError):
+            return 0.0
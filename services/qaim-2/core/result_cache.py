@@ -0,0 +1,248 @@
+"""
+QAIM-2 Result Cache
+
+Content-addressed cache of solver results keyed on the canonical problem
+hash, solver, normalized parameters and gap tolerance.
+Two tiers: an in-memory LRU and an optional on-disk JSON tier.
+"""
+
+from typing import Dict, Any, Optional
+from collections import OrderedDict
+from pathlib import Path
+import copy
+import hashlib
+import json
+import os
+import time
+
+
+def _json_default(obj: Any) -> Any:
+    """Serialize array-like and other non-JSON values."""
+    if hasattr(obj, 'tolist'):
+        return obj.tolist()
+    return str(obj)
+
+
+class ResultCache:
+    """
+    Two-tier result cache with TTL and size-based eviction.
+
+    Memory tier is an LRU bounded by ``max_entries``; the disk tier stores
+    one JSON file per key under ``disk_path`` bounded by ``disk_max_entries``.
+    Entries older than ``ttl_seconds`` are treated as misses and dropped.
+    Entries are copied on put and get, so callers never share a cached
+    solution. If the disk tier cannot be read or written it is disabled and
+    the cache continues memory-only.
+    """
+
+    def __init__(self, config: Dict[str, Any]):
+        """
+        Initialize result cache with configuration.
+
+        Args:
+            config: Configuration with enabled, max_entries, ttl_seconds,
+                disk_path and disk_max_entries
+        """
+        self.config = config
+        self.enabled = config.get('enabled', False)
+        self.max_entries = config.get('max_entries', 1024)
+        self.ttl_seconds = config.get('ttl_seconds', 3600)
+        self.disk_path = Path(config['disk_path']) if config.get('disk_path') else None
+        self.disk_max_entries = config.get('disk_max_entries', 10000)
+
+        self._memory = OrderedDict()  # key -> (expires_at, entry)
+        self._disk_index = OrderedDict()  # key -> file path, oldest first
+
+        self.hits = 0
+        self.misses = 0
+        self.disk_hits = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.disk_errors = 0
+
+        if self.enabled and self.disk_path:
+            self._load_disk_index()
+
+    @staticmethod
+    def make_key(
+        input_hash: str,
+        solver: str,
+        params: Dict[str, Any],
+        gap_tolerance: Optional[float] = None
+    ) -> str:
+        """
+        Build cache key from canonical hash, solver and parameters.
+
+        Args:
+            input_hash: SHA-256 of the canonical problem
+            solver: Solver identifier
+            params: Normalized solver parameters
+            gap_tolerance: Requested gap tolerance
+
+        Returns:
+            Hexadecimal key string
+        """
+        payload = json.dumps(
+            {
+                'input_hash': input_hash,
+                'solver': solver,
+                'params': params,
+                'gap_tolerance': gap_tolerance
+            },
+            sort_keys=True,
+            default=_json_default
+        )
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up a cached result.
+
+        Args:
+            key: Cache key from make_key()
+
+        Returns:
+            Cached entry with status, solution and metrics, or None on miss
+        """
+        if not self.enabled:
+            return None
+
+        item = self._memory.get(key)
+        if item is not None:
+            expires_at, entry = item
+            if expires_at > time.time():
+                self._memory.move_to_end(key)
+                self.hits += 1
+                return copy.deepcopy(entry)
+            del self._memory[key]
+            self.expirations += 1
+
+        if self.disk_path:
+            entry = self._read_disk(key)
+            if entry is not None:
+                self.hits += 1
+                self.disk_hits += 1
+                return copy.deepcopy(entry)
+
+        self.misses += 1
+        return None
+
+    def put(self, key: str, entry: Dict[str, Any]) -> None:
+        """
+        Store a result in the cache.
+
+        Args:
+            key: Cache key from make_key()
+            entry: Result entry with status, solution and metrics
+        """
+        if not self.enabled:
+            return
+
+        entry = copy.deepcopy(entry)
+        expires_at = time.time() + self.ttl_seconds
+        self._memory[key] = (expires_at, entry)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+            self.evictions += 1
+
+        if self.disk_path:
+            self._write_disk(key, expires_at, entry)
+
+    def clear(self) -> None:
+        """Remove all entries from both tiers."""
+        self._memory.clear()
+        for path in self._disk_index.values():
+            self._unlink(path)
+        self._disk_index.clear()
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """Get cache hit/miss and eviction statistics."""
+        lookups = self.hits + self.misses
+        return {
+            'enabled': self.enabled,
+            'entries': len(self._memory),
+            'disk_entries': len(self._disk_index),
+            'hits': self.hits,
+            'misses': self.misses,
+            'disk_hits': self.disk_hits,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'evictions': self.evictions,
+            'expirations': self.expirations,
+            'disk_errors': self.disk_errors
+        }
+
+    def _disk_file(self, key: str) -> Path:
+        """Get disk tier file path for a key."""
+        return self.disk_path / key[:2] / f'{key}.json'
+
+    def _load_disk_index(self) -> None:
+        """Index existing disk entries, oldest first (directory is created on first write)."""
+        try:
+            files = sorted(self.disk_path.glob('*/*.json'), key=lambda p: p.stat().st_mtime)
+        except OSError:
+            self._disable_disk()
+            return
+        for path in files:
+            self._disk_index[path.stem] = path
+
+    def _disable_disk(self) -> None:
+        """Fall back to memory-only after a disk tier failure."""
+        self.disk_errors += 1
+        self.disk_path = None
+        self._disk_index.clear()
+
+    def _read_disk(self, key: str) -> Optional[Dict[str, Any]]:
+        """Read an entry from the disk tier, promoting it to memory."""
+        path = self._disk_index.get(key)
+        if path is None:
+            return None
+
+        try:
+            with open(path) as f:
+                record = json.load(f)
+        except (OSError, ValueError):
+            self._disk_index.pop(key, None)
+            return None
+
+        expires_at = record.get('expires_at', 0)
+        if expires_at <= time.time():
+            self._disk_index.pop(key, None)
+            self._unlink(path)
+            self.expirations += 1
+            return None
+
+        entry = record['entry']
+        self._memory[key] = (expires_at, entry)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+            self.evictions += 1
+        return entry
+
+    def _write_disk(self, key: str, expires_at: float, entry: Dict[str, Any]) -> None:
+        """Write an entry to the disk tier atomically."""
+        path = self._disk_file(key)
+        tmp_path = path.with_suffix('.tmp')
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with open(tmp_path, 'w') as f:
+                json.dump({'expires_at': expires_at, 'entry': entry}, f, default=_json_default)
+            os.replace(tmp_path, path)
+        except OSError:
+            self._disable_disk()
+            return
+
+        self._disk_index[key] = path
+        self._disk_index.move_to_end(key)
+        while len(self._disk_index) > self.disk_max_entries:
+            _, oldest = self._disk_index.popitem(last=False)
+            self._unlink(oldest)
+            self.evictions += 1
+
+    @staticmethod
+    def _unlink(path: Path) -> None:
+        """Remove a disk tier file if present."""
+        try:
+            path.unlink()
+        except FileNotFoundError:
+            pass
@@ -0,0 +1,249 @@
+"""
+QAIM-2 MAP Telemetry
+
+Non-blocking publisher for MAP topics (map/1/telemetry, map/1/log, ...).
+Requests enqueue records into a bounded in-memory queue; a background task
+batches them by count and time and hands each batch to the configured
+sinks, so request latency does not depend on stdout, disk or broker speed.
+"""
+
+from typing import Dict, Any, List, Optional, Callable
+from collections import deque
+from datetime import datetime
+from pathlib import Path
+import asyncio
+import json
+import sys
+
+
+# MAP topics used by the orchestrator
+TOPIC_CONTROL = 'map/1/control'
+TOPIC_TELEMETRY = 'map/1/telemetry'
+TOPIC_LOG = 'map/1/log'
+
+# Queue-full policies
+POLICIES = ('drop_oldest', 'drop_newest', 'block')
+
+
+def topic_matches(pattern: str, topic: str) -> bool:
+    """MQTT topic filter match with '+' (one level) and '#' (rest) wildcards."""
+    pattern_levels = pattern.split('/')
+    topic_levels = topic.split('/')
+
+    for i, level in enumerate(pattern_levels):
+        if level == '#':
+            return True
+        if i >= len(topic_levels):
+            return False
+        if level != '+' and level != topic_levels[i]:
+            return False
+    return len(pattern_levels) == len(topic_levels)
+
+
+class LocalBroker:
+    """
+    In-process stand-in for the MQTT broker.
+
+    Supports MQTT topic filters for subscriptions and keeps the most recent
+    messages per broker for inspection, so deployments and tests without a
+    reachable broker still exercise the MAP publishing path.
+    """
+
+    def __init__(self, address: Optional[str] = None, history: int = 1000):
+        self.address = address
+        self.messages = deque(maxlen=history)
+        self._subscriptions = []
+
+    def subscribe(self, pattern: str, callback: Callable[[str, Dict[str, Any]], None]) -> None:
+        """Register a callback for topics matching an MQTT filter."""
+        self._subscriptions.append((pattern, callback))
+
+    def write_batch(self, records: List[Dict[str, Any]]) -> None:
+        """Deliver a batch of records to matching subscribers."""
+        for record in records:
+            self.messages.append(record)
+            for pattern, callback in self._subscriptions:
+                if topic_matches(pattern, record['topic']):
+                    callback(record['topic'], record['payload'])
+
+
+class FileSink:
+    """Appends records as JSON lines to a file."""
+
+    blocking = True
+
+    def __init__(self, path: str):
+        self.path = Path(path)
+
+    def write_batch(self, records: List[Dict[str, Any]]) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, 'a') as f:
+            f.write(''.join(json.dumps(r, default=str) + '\n' for r in records))
+
+
+class ConsoleSink:
+    """Writes records to stdout, one line per record."""
+
+    blocking = True
+
+    def write_batch(self, records: List[Dict[str, Any]]) -> None:
+        sys.stdout.write(''.join(
+            f"[MAP] {r['topic']} {json.dumps(r['payload'], default=str)}\n" for r in records
+        ))
+        sys.stdout.flush()
+
+
+class MAPPublisher:
+    """
+    Batched asynchronous MAP publisher.
+
+    ``publish()`` only enqueues. When the queue is full, ``drop_oldest``
+    and ``drop_newest`` discard a record (counted in statistics) and
+    ``block`` makes the caller wait for space (backpressure). File and
+    console sinks run in a worker thread so slow I/O never stalls the
+    event loop.
+    """
+
+    def __init__(self, config: Optional[Dict[str, Any]] = None):
+        """
+        Initialize publisher with configuration.
+
+        Args:
+            config: MAP configuration with enabled, broker, sinks
+                ('broker', 'file', 'console'), file_path, queue_size,
+                batch_size, flush_interval (seconds) and policy
+        """
+        config = config or {}
+        self.enabled = config.get('enabled', True)
+        self.queue_size = config.get('queue_size', 10000)
+        self.batch_size = max(1, config.get('batch_size', 100))
+        self.flush_interval = config.get('flush_interval', 0.1)
+        self.policy = config.get('policy', 'drop_oldest')
+        if self.policy not in POLICIES:
+            raise ValueError(f"Unknown MAP queue policy: {self.policy}")
+
+        self.broker = LocalBroker(config.get('broker'))
+        self.sinks = []
+        for sink in config.get('sinks', ['console']):
+            if sink == 'broker':
+                self.sinks.append(self.broker)
+            elif sink == 'file':
+                self.sinks.append(FileSink(config.get('file_path', 'map-telemetry.jsonl')))
+            elif sink == 'console':
+                self.sinks.append(ConsoleSink())
+            else:
+                raise ValueError(f"Unknown MAP sink: {sink}")
+
+        self._queue = None
+        self._batch_ready = None
+        self._task = None
+        self._closed = False
+
+        self.published = 0
+        self.dropped = 0
+        self.batches = 0
+        self.sink_errors = 0
+
+    async def publish(self, topic: str, payload: Dict[str, Any]) -> None:
+        """
+        Enqueue a record for a MAP topic.
+
+        Returns immediately unless the queue is full under the ``block``
+        policy.
+        """
+        if not self.enabled or self._closed:
+            return
+
+        self._bind_loop()
+        record = {
+            'topic': topic,
+            'timestamp': datetime.utcnow().isoformat(),
+            'payload': payload
+        }
+
+        if self.policy == 'block':
+            self._ensure_flushing()
+            await self._queue.put(record)
+        elif self._queue.full():
+            self.dropped += 1
+            if self.policy == 'drop_oldest':
+                self._queue.get_nowait()
+                self._queue.put_nowait(record)
+        else:
+            self._queue.put_nowait(record)
+
+        if self._queue.qsize() >= min(self.batch_size, self._queue.maxsize or self.batch_size):
+            self._batch_ready.set()
+        self._ensure_flushing()
+
+    def _bind_loop(self) -> None:
+        """Create the queue on the running loop (again after a loop change)."""
+        loop = asyncio.get_running_loop()
+        if self._task is not None and self._task.get_loop() is not loop:
+            # Records queued on a finished loop cannot be flushed any more
+            self._task = None
+            self._queue = None
+        if self._queue is None:
+            self._queue = asyncio.Queue(maxsize=self.queue_size)
+            self._batch_ready = asyncio.Event()
+
+    def _ensure_flushing(self) -> None:
+        """Start a flush task unless one is already draining the queue."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._flush())
+
+    async def _flush(self) -> None:
+        """
+        Drain the queue in batches of up to batch_size records.
+
+        A partial batch waits up to flush_interval for more records. The
+        task ends once the queue is empty, so there is never an idle
+        background task left for the event loop to tear down; the next
+        publish() starts a new one.
+        """
+        while not self._queue.empty():
+            if self._queue.qsize() < self.batch_size and not self._closed:
+                self._batch_ready.clear()
+                try:
+                    await asyncio.wait_for(self._batch_ready.wait(), self.flush_interval)
+                except asyncio.TimeoutError:
+                    pass
+
+            batch = []
+            while len(batch) < self.batch_size and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+            await self._write(batch)
+
+    async def _write(self, batch: List[Dict[str, Any]]) -> None:
+        """Hand a batch to every sink; sink failures are counted, not raised."""
+        for sink in self.sinks:
+            try:
+                if getattr(sink, 'blocking', False):
+                    await asyncio.to_thread(sink.write_batch, batch)
+                else:
+                    sink.write_batch(batch)
+            except Exception:
+                self.sink_errors += 1
+
+        self.batches += 1
+        self.published += len(batch)
+
+    async def close(self) -> None:
+        """Stop accepting records and flush everything still queued."""
+        self._closed = True
+        task, self._task = self._task, None
+        if task is None or task.done() or task.get_loop() is not asyncio.get_running_loop():
+            return
+
+        self._batch_ready.set()
+        await task
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """Get publisher counters."""
+        return {
+            'queued': self._queue.qsize() if self._queue else 0,
+            'published': self.published,
+            'dropped': self.dropped,
+            'batches': self.batches,
+            'sink_errors': self.sink_errors
+        }
@@ -0,0 +1,362 @@
+"""
+QAIM-2 Request Tracing
+
+Per-stage latency spans for the TFA V2 bridge sequence. A sampled request
+carries a trace through the pipeline; each bridge stage (including the
+time spent waiting at its gate) adds a span. When the request finishes,
+span durations are folded into HDR-style latency histograms keyed by
+stage, solver and problem_type, which are exposed as a JSON snapshot and
+in the Prometheus text format (optionally over HTTP at ``/metrics``).
+"""
+
+from typing import Dict, Any, List, Optional, Tuple
+from contextlib import contextmanager, nullcontext
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import contextvars
+import json
+import logging
+import math
+import random
+import threading
+import time
+
+
+# Request-level spans around the bridge stages
+STAGE_ADMISSION = 'admission'
+STAGE_EVIDENCE = 'evidence'
+STAGE_TOTAL = 'total'
+
+# Prometheus histogram bucket bounds (seconds)
+DEFAULT_BUCKETS = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+    0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0
+)
+
+PERCENTILES = (50, 95, 99)
+
+_current_trace = contextvars.ContextVar('qaim2_trace', default=None)
+
+logger = logging.getLogger(__name__)
+
+
+class LatencyHistogram:
+    """
+    HDR-style log-linear histogram of durations in microseconds.
+
+    Values below ``2 ** precision`` get one bucket each. Above that, every
+    power-of-two range is split into ``2 ** (precision - 1)`` equal
+    buckets, so the relative error of any recorded value is below
+    ``2 ** (1 - precision)`` (1.6% at the default precision of 7) with a
+    fixed, small number of buckets. Values above ``highest`` are clamped.
+    """
+
+    def __init__(self, precision: int = 7, highest: float = 3600.0):
+        self.precision = precision
+        self.sub_buckets = 1 << precision
+        self.half = self.sub_buckets >> 1
+        self.highest = int(highest * 1e6)
+        self.counts = [0] * (self._index(self.highest) + 1)
+        self.count = 0
+        self.total = 0
+        self.min = None
+        self.max = 0
+
+    def _index(self, value: int) -> int:
+        if value < self.sub_buckets:
+            return value
+        shift = value.bit_length() - self.precision
+        return self.sub_buckets + (shift - 1) * self.half + (value >> shift) - self.half
+
+    def _bounds(self, index: int) -> Tuple[int, int]:
+        """Lowest and highest value (microseconds) of a bucket."""
+        if index < self.sub_buckets:
+            return index, index
+        shift, position = divmod(index - self.sub_buckets, self.half)
+        shift += 1
+        lower = (position + self.half) << shift
+        return lower, lower + (1 << shift) - 1
+
+    def record(self, seconds: float) -> None:
+        """Record one duration."""
+        value = min(max(int(seconds * 1e6), 0), self.highest)
+        self.counts[self._index(value)] += 1
+        self.count += 1
+        self.total += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = max(self.max, value)
+
+    def percentile(self, p: float) -> float:
+        """Duration (seconds) at or below which p percent of values fall."""
+        if not self.count:
+            return 0.0
+        rank = max(1, math.ceil(p / 100.0 * self.count))
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank:
+                return min(self._bounds(index)[1], self.max) / 1e6
+        return self.max / 1e6
+
+    def cumulative(self, bounds: Tuple[float, ...]) -> List[int]:
+        """Number of values in buckets starting at or below each bound."""
+        limits = [int(b * 1e6) for b in bounds]
+        result = [0] * len(limits)
+        position = 0
+        seen = 0
+        for index, count in enumerate(self.counts):
+            if not count:
+                continue
+            lower = self._bounds(index)[0]
+            while position < len(limits) and lower > limits[position]:
+                result[position] = seen
+                position += 1
+            seen += count
+        for i in range(position, len(limits)):
+            result[i] = seen
+        return result
+
+    def summary(self) -> Dict[str, Any]:
+        """Count, mean, max and percentiles in milliseconds."""
+        summary = {
+            'count': self.count,
+            'mean_ms': self.total / self.count / 1e3 if self.count else 0.0,
+            'max_ms': self.max / 1e3
+        }
+        for p in PERCENTILES:
+            summary[f'p{p}_ms'] = self.percentile(p) * 1e3
+        return summary
+
+
+class Trace:
+    """Spans of one sampled request."""
+
+    __slots__ = ('request_id', 'started', 'spans')
+
+    def __init__(self, request_id: str):
+        self.request_id = request_id
+        self.started = time.perf_counter()
+        self.spans = []
+
+    def add(self, stage: str, seconds: float, solver: Optional[str] = None) -> None:
+        self.spans.append((stage, seconds, solver))
+
+    def stage_ms(self) -> Dict[str, float]:
+        """Total milliseconds per stage (portfolio arms are summed)."""
+        result = {}
+        for stage, seconds, _ in self.spans:
+            result[stage] = result.get(stage, 0.0) + seconds * 1e3
+        return result
+
+
+class Tracer:
+    """
+    Samples requests and aggregates their spans into histograms.
+
+    ``span()`` is a no-op outside a sampled request, so unsampled requests
+    only pay for one context variable lookup per stage.
+    """
+
+    def __init__(self, config: Optional[Dict[str, Any]] = None):
+        """
+        Initialize tracer with configuration.
+
+        Args:
+            config: Configuration with enabled, sample_rate (0.0 to 1.0),
+                precision (histogram sub-bucket bits), buckets (Prometheus
+                bounds in seconds), metrics_host and metrics_port (HTTP
+                endpoint started by serve(), off when unset)
+        """
+        config = config or {}
+        self.enabled = config.get('enabled', True)
+        self.sample_rate = config.get('sample_rate', 1.0)
+        self.precision = config.get('precision', 7)
+        self.buckets = tuple(sorted(config.get('buckets', DEFAULT_BUCKETS)))
+        self.metrics_host = config.get('metrics_host', '127.0.0.1')
+        self.metrics_port = config.get('metrics_port')
+
+        self._histograms = {}
+        self._lock = threading.Lock()
+        self._server = None
+        self.serve_error = None
+
+        self.traced = 0
+        self.skipped = 0
+
+    def start(self, request_id: str) -> Optional[contextvars.Token]:
+        """
+        Start tracing a request in the current context if it is sampled.
+
+        Returns:
+            Token for finish(), or None when the request is not traced
+        """
+        if not self.enabled or (self.sample_rate < 1.0 and random.random() >= self.sample_rate):
+            self.skipped += 1
+            return None
+        return _current_trace.set(Trace(request_id))
+
+    def finish(
+        self,
+        token: Optional[contextvars.Token],
+        solver: str,
+        problem_type: Optional[str]
+    ) -> Optional[Dict[str, float]]:
+        """
+        End a traced request and record its spans.
+
+        Stages without a span-level solver (everything except portfolio
+        arms) are recorded under the solver that produced the response.
+
+        Returns:
+            Milliseconds per stage including 'total', or None if untraced
+        """
+        if token is None:
+            return None
+        trace = _current_trace.get()
+        _current_trace.reset(token)
+        if trace is None:
+            return None
+
+        trace.add(STAGE_TOTAL, time.perf_counter() - trace.started)
+        problem_type = str(problem_type or 'unknown')
+        with self._lock:
+            for stage, seconds, span_solver in trace.spans:
+                key = (stage, span_solver or solver, problem_type)
+                histogram = self._histograms.get(key)
+                if histogram is None:
+                    histogram = self._histograms[key] = LatencyHistogram(self.precision)
+                histogram.record(seconds)
+            self.traced += 1
+        return trace.stage_ms()
+
+    def span(self, stage: str, solver: Optional[str] = None):
+        """Context manager timing a stage of the current request."""
+        trace = _current_trace.get()
+        if trace is None:
+            return nullcontext()
+        return self._span(trace, stage, solver)
+
+    @staticmethod
+    @contextmanager
+    def _span(trace: Trace, stage: str, solver: Optional[str]):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            trace.add(stage, time.perf_counter() - started, solver)
+
+    def snapshot(self) -> List[Dict[str, Any]]:
+        """Latency summary per (stage, solver, problem_type) series."""
+        with self._lock:
+            return [
+                dict(histogram.summary(), stage=stage, solver=solver, problem_type=problem_type)
+                for (stage, solver, problem_type), histogram in sorted(self._histograms.items())
+            ]
+
+    def prometheus(self) -> str:
+        """Render all histograms in the Prometheus text exposition format."""
+        name = 'qaim2_stage_duration_seconds'
+        lines = [
+            f'# HELP {name} Time spent per TFA bridge stage, including gate wait.',
+            f'# TYPE {name} histogram'
+        ]
+        with self._lock:
+            for (stage, solver, problem_type), histogram in sorted(self._histograms.items()):
+                labels = (
+                    f'stage="{_escape(stage)}",solver="{_escape(solver)}",'
+                    f'problem_type="{_escape(problem_type)}"'
+                )
+                for bound, count in zip(self.buckets, histogram.cumulative(self.buckets)):
+                    lines.append(f'{name}_bucket{{{labels},le="{bound:g}"}} {count}')
+                lines.append(f'{name}_bucket{{{labels},le="+Inf"}} {histogram.count}')
+                lines.append(f'{name}_sum{{{labels}}} {histogram.total / 1e6:.6f}')
+                lines.append(f'{name}_count{{{labels}}} {histogram.count}')
+
+            lines.append('# HELP qaim2_traces_total Requests considered for tracing.')
+            lines.append('# TYPE qaim2_traces_total counter')
+            lines.append(f'qaim2_traces_total{{sampled="true"}} {self.traced}')
+            lines.append(f'qaim2_traces_total{{sampled="false"}} {self.skipped}')
+        return '\n'.join(lines) + '\n'
+
+    def serve(self) -> Optional[Tuple[str, int]]:
+        """
+        Start the HTTP endpoint (/metrics and /stages) if a port is configured.
+
+        A bind failure (e.g. the port is taken by another process) is logged
+        and disables the endpoint; tracing itself keeps working.
+
+        Returns:
+            Bound (host, port), or None if the endpoint is not serving
+        """
+        if self.metrics_port is None or self._server is not None:
+            return self.server_address
+        try:
+            server = ThreadingHTTPServer(
+                (self.metrics_host, self.metrics_port), _handler(self)
+            )
+        except OSError as e:
+            logger.warning(
+                'metrics endpoint disabled: cannot bind %s:%s (%s)',
+                self.metrics_host, self.metrics_port, e
+            )
+            self.serve_error = str(e)
+            self.metrics_port = None
+            return None
+        server.daemon_threads = True
+        self._server = server
+        threading.Thread(
+            target=server.serve_forever, name='qaim2-metrics', daemon=True
+        ).start()
+        return self.server_address
+
+    @property
+    def server_address(self) -> Optional[Tuple[str, int]]:
+        """Bound (host, port) of the HTTP endpoint, or None if not serving."""
+        return self._server.server_address if self._server else None
+
+    def close(self) -> None:
+        """Stop the HTTP endpoint."""
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """Get sampling counters and per-series latency summaries."""
+        return {
+            'sample_rate': self.sample_rate,
+            'traced': self.traced,
+            'skipped': self.skipped,
+            'metrics_address': self.server_address,
+            'serve_error': self.serve_error,
+            'series': self.snapshot()
+        }
+
+
+def _escape(value: str) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _handler(tracer: Tracer) -> type:
+    """Request handler class bound to a tracer."""
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path == '/metrics':
+                body = tracer.prometheus().encode()
+                content_type = 'text/plain; version=0.0.4; charset=utf-8'
+            elif self.path == '/stages':
+                body = json.dumps(tracer.snapshot()).encode()
+                content_type = 'application/json'
+            else:
+                self.send_error(404)
+                return
+            self.send_response(200)
+            self.send_header('Content-Type', content_type)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    return MetricsHandler
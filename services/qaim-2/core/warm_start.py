@@ -0,0 +1,235 @@
+"""
+QAIM-2 Warm Start
+
+Retains recent solves so that a re-submitted problem with small changes
+(bounds, right-hand sides, objective or matrix coefficients) can start
+from the previous solution. Problems are matched either explicitly by
+``base_request_id`` or implicitly by structure: same variables, types,
+constraint senses and sparsity pattern. The numeric diff against the
+retained canonical problem decides whether the previous solution is
+close enough to be useful.
+"""
+
+from typing import Dict, Any, Optional
+from collections import OrderedDict
+import hashlib
+import time
+
+import numpy as np
+
+
+def structure_signature(canonical: Any) -> str:
+    """
+    Hash of a canonical problem's structure, ignoring numeric values.
+
+    Two problems with the same signature differ at most in bounds,
+    right-hand sides and coefficient values, so they can be diffed array
+    by array.
+    """
+    digest = hashlib.sha256()
+    digest.update((canonical.problem_type or '').encode())
+    digest.update('\x00'.join(canonical.names).encode())
+    digest.update(canonical.sense.encode())
+    for array in (
+        canonical.vtype, canonical.row_sense,
+        canonical.A.indptr, canonical.A.indices,
+        canonical.obj_quad[0], canonical.obj_quad[1],
+        *canonical.con_quad[:3]
+    ):
+        digest.update(np.ascontiguousarray(array).tobytes())
+    return digest.hexdigest()
+
+
+def structural_diff(previous: Any, current: Any) -> Dict[str, int]:
+    """
+    Count changed values between two problems with the same structure.
+
+    Returns:
+        Changed entries per component (bounds, rhs, objective,
+        coefficients) and their total as 'size'
+    """
+    delta = {
+        'bounds': int(np.count_nonzero(
+            (previous.lower != current.lower) | (previous.upper != current.upper)
+        )),
+        'rhs': int(np.count_nonzero(previous.rhs != current.rhs)),
+        'objective': int(
+            np.count_nonzero(previous.objective != current.objective)
+            + np.count_nonzero(previous.obj_quad[2] != current.obj_quad[2])
+        ),
+        'coefficients': int(
+            np.count_nonzero(previous.A.data != current.A.data)
+            + np.count_nonzero(previous.con_quad[3] != current.con_quad[3])
+        )
+    }
+    delta['size'] = sum(delta.values())
+    return delta
+
+
+class WarmStartCache:
+    """
+    Bounded LRU of retained solves for warm starting re-submissions.
+
+    Each entry keeps the canonical problem, the solution (and basis when
+    the solver reports one) and the cold solve time of the chain it
+    belongs to, so a warm-started solve can report its speedup over the
+    original cold solve.
+    """
+
+    def __init__(self, config: Optional[Dict[str, Any]] = None):
+        """
+        Initialize warm start cache with configuration.
+
+        Args:
+            config: Configuration with enabled, max_entries, ttl_seconds
+                and max_delta (largest changed fraction of variables,
+                rows and nonzeros that is still warm started)
+        """
+        config = config or {}
+        self.enabled = config.get('enabled', True)
+        self.max_entries = max(1, config.get('max_entries', 256))
+        self.ttl_seconds = config.get('ttl_seconds', 600)
+        self.max_delta = config.get('max_delta', 0.1)
+
+        self._entries = OrderedDict()
+        self._by_structure = {}
+
+        self.retained = 0
+        self.evictions = 0
+        self.warm_starts = 0
+        self.rejected = 0
+
+    def lookup(
+        self,
+        canonical: Any,
+        base_request_id: Optional[str] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Find a warm start for a problem.
+
+        Uses the entry of ``base_request_id`` when given and still
+        retained, otherwise the most recent entry with the same structure.
+
+        Returns:
+            Warm start dictionary with base_request_id, solution, basis,
+            start (previous values per variable, repaired to the new
+            bounds and integrality, NaN where unknown), delta and
+            cold_solve_time; None if there is no retained solve, the
+            structure differs or the delta exceeds max_delta
+        """
+        if not self.enabled:
+            return None
+        signature = structure_signature(canonical)
+        request_id = base_request_id
+        entry = self._get(request_id)
+        if entry is None:
+            request_id = self._by_structure.get(signature)
+            entry = self._get(request_id)
+        if entry is None:
+            return None
+        if entry['signature'] != signature:
+            self.rejected += 1
+            return None
+
+        delta = structural_diff(entry['canonical'], canonical)
+        elements = canonical.num_variables + canonical.num_constraints + canonical.A.nnz
+        delta['fraction'] = delta['size'] / max(1, elements)
+        if delta['fraction'] > self.max_delta:
+            self.rejected += 1
+            return None
+
+        start = np.clip(entry['values'], canonical.lower, canonical.upper)
+        integral = canonical.vtype != 0
+        start[integral] = np.round(start[integral])
+        known = ~np.isnan(entry['values'])
+        delta['repaired'] = int(np.count_nonzero(start[known] != entry['values'][known]))
+
+        self.warm_starts += 1
+        return {
+            'base_request_id': request_id,
+            'solution': entry['solution'],
+            'basis': entry['basis'],
+            'start': start,
+            'delta': delta,
+            'cold_solve_time': entry['cold_solve_time']
+        }
+
+    def retain(
+        self,
+        request_id: str,
+        canonical: Any,
+        solution: Any,
+        solve_time: Optional[float],
+        warm_start: Optional[Dict[str, Any]] = None,
+        basis: Any = None
+    ) -> None:
+        """
+        Retain a finished solve as a warm start candidate.
+
+        Args:
+            request_id: Request that produced the solution
+            canonical: Its canonical problem
+            solution: Variable name to value mapping
+            solve_time: Solver time in seconds
+            warm_start: The warm start the solve used, if any (its chain's
+                cold solve time is carried over)
+            basis: Solver basis, if reported
+        """
+        if not self.enabled or not isinstance(solution, dict):
+            return
+        signature = structure_signature(canonical)
+        cold = warm_start['cold_solve_time'] if warm_start else solve_time
+
+        self._entries[request_id] = {
+            'signature': signature,
+            'canonical': canonical,
+            'solution': dict(solution),
+            'values': np.array(
+                [solution.get(name, np.nan) for name in canonical.names], dtype=np.float64
+            ),
+            'basis': basis,
+            'cold_solve_time': cold,
+            'stored_at': time.monotonic()
+        }
+        self._entries.move_to_end(request_id)
+        self._by_structure[signature] = request_id
+        self.retained += 1
+
+        while len(self._entries) > self.max_entries:
+            evicted, entry = self._entries.popitem(last=False)
+            if self._by_structure.get(entry['signature']) == evicted:
+                del self._by_structure[entry['signature']]
+            self.evictions += 1
+
+    @staticmethod
+    def speedup(warm_start: Dict[str, Any], solve_time: Optional[float]) -> Optional[float]:
+        """Cold solve time of the chain over the warm-started solve time."""
+        cold = warm_start.get('cold_solve_time')
+        if not cold or not solve_time:
+            return None
+        return cold / solve_time
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """Get cache size and warm start counters."""
+        return {
+            'entries': len(self._entries),
+            'retained': self.retained,
+            'evictions': self.evictions,
+            'warm_starts': self.warm_starts,
+            'rejected': self.rejected
+        }
+
+    def _get(self, request_id: Optional[str]) -> Optional[Dict[str, Any]]:
+        """Entry for a request, dropping it if expired."""
+        if request_id is None:
+            return None
+        entry = self._entries.get(request_id)
+        if entry is None:
+            return None
+        if self.ttl_seconds and time.monotonic() - entry['stored_at'] > self.ttl_seconds:
+            del self._entries[request_id]
+            if self._by_structure.get(entry['signature']) == request_id:
+                del self._by_structure[entry['signature']]
+            return None
+        self._entries.move_to_end(request_id)
+        return entry
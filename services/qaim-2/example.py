@@ -49,6 +49,7 @@ async def main():
     # Create orchestrator
     print("Creating QAIM-2 Orchestrator...")
     orchestrator = QAIM2Orchestrator(config)
+    orchestrator.serve_metrics()  # No-op unless tracing.metrics_port is set
     print("✓ Orchestrator initialized")
     print()
     
@@ -104,6 +105,7 @@ async def main():
         constraints=constraints,
         metadata=metadata
     )
+    await orchestrator.close()  # Flush queued MAP telemetry
     print("-" * 60)
     print()
     
@@ -11,6 +11,11 @@ from typing import Dict, Any
 import asyncio
 from datetime import datetime
 
+try:
+    from .executor import SolverExecutor
+except ImportError:
+    from solvers.executor import SolverExecutor
+
 
 class SolverResult:
     """Result from a solver execution."""
@@ -69,6 +74,13 @@ class ClassicalSolverPool:
                 if solver_config.get('enabled', True):
                     solver_name = solver_config.get('name')
                     self.solvers[f'cb_{solver_name}'] = solver_config
+        
+        # Solvers with executor: 'process' run in per-solver worker processes
+        self.executor = SolverExecutor({
+            name: SolverExecutor.pool_size_for(solver_config)
+            for name, solver_config in self.solvers.items()
+            if solver_config.get('executor', 'inline') == 'process'
+        })
     
     async def solve(
         self,
@@ -80,12 +92,14 @@ class ClassicalSolverPool:
         
         Args:
             problem: Problem in classical format (MIP, SAT, CSP)
-            params: Solver parameters (time_limit, gap_tolerance, etc.)
+            params: Solver parameters (time_limit, gap_tolerance, etc.);
+                ``warm_start`` carries a MIP start (``start``, one value per
+                variable, NaN where unknown) and the previous ``basis``
             
         Returns:
             SolverResult with status, solution, and metrics
         """
-        solver_name = params.get('solver')
+        solver_name = params.get('solver') or params.get('solver_name')
         if not solver_name:
             # Prefer cb_cbc if available, else pick the first available solver
             if 'cb_cbc' in self.solvers:
@@ -98,7 +112,49 @@ class ClassicalSolverPool:
         if solver_name not in self.solvers:
             raise ValueError(f"Solver {solver_name} not available")
         
-        # Route to appropriate solver
+        if self.executor.handles(solver_name):
+            result = await self._solve_in_process(solver_name, problem, params)
+        else:
+            result = await self._dispatch(solver_name, problem, params)
+        
+        if params.get('warm_start'):
+            result.metrics['warm_started'] = True
+        return result
+    
+    async def _solve_in_process(
+        self,
+        solver_name: str,
+        problem: Dict[str, Any],
+        params: Dict[str, Any]
+    ) -> SolverResult:
+        """Run a solver in its worker pool, killing it when time_limit expires."""
+        start_time = datetime.utcnow()
+        time_limit = params.get('time_limit', self.solvers[solver_name].get('time_limit'))
+        
+        try:
+            return await self.executor.run(
+                solver_name,
+                _solve_in_worker,
+                (self.config, solver_name, problem, params),
+                timeout=time_limit
+            )
+        except asyncio.TimeoutError:
+            return SolverResult(
+                status='timeout',
+                solution=None,
+                objective_value=float('inf'),
+                gap=float('inf'),
+                solve_time=(datetime.utcnow() - start_time).total_seconds(),
+                feasible=False
+            )
+    
+    async def _dispatch(
+        self,
+        solver_name: str,
+        problem: Dict[str, Any],
+        params: Dict[str, Any]
+    ) -> SolverResult:
+        """Route to the solver implementation on the current event loop."""
         if solver_name == 'cb_gurobi':
             return await self._solve_gurobi(problem, params)
         elif solver_name == 'cb_cbc':
@@ -234,3 +290,18 @@ class ClassicalSolverPool:
     def get_available_solvers(self) -> list:
         """Get list of available classical solvers."""
         return list(self.solvers.keys())
+    
+    def get_statistics(self) -> Dict[str, Any]:
+        """Get worker pool statistics for process-backed solvers."""
+        return {'executor': self.executor.get_statistics()}
+
+
+def _solve_in_worker(
+    config: Dict[str, Any],
+    solver_name: str,
+    problem: Dict[str, Any],
+    params: Dict[str, Any]
+) -> SolverResult:
+    """Worker process entry: run one solver call on a private event loop."""
+    pool = ClassicalSolverPool(config)
+    return asyncio.run(pool._dispatch(solver_name, problem, params))
@@ -0,0 +1,205 @@
+"""
+Solver Executor — Process Execution Backend
+
+Runs CPU-bound solver calls in worker processes so the orchestrator's
+event loop keeps serving other requests while long solves run.
+Each solver has its own bounded set of worker slots, and a worker that
+exceeds its wall-clock limit is killed. Workers are forked from a
+single-threaded fork server (spawned where that is unavailable), never
+from the orchestrator process itself, which runs helper threads.
+
+TFA Layer: CB (Classical Bit)
+"""
+
+from typing import Dict, Any, Callable, Optional, Tuple
+import asyncio
+import multiprocessing
+import os
+
+
+class SolverExecutionError(RuntimeError):
+    """Raised when a solver worker fails or exits without a result."""
+
+
+def _worker_main(conn, target: Callable, args: Tuple) -> None:
+    """Worker process entry: run target and send the pickled outcome back."""
+    try:
+        conn.send(('ok', target(*args)))
+    except BaseException as e:
+        conn.send(('error', f'{type(e).__name__}: {e}'))
+    finally:
+        conn.close()
+
+
+def process_context():
+    """
+    Multiprocessing context: forkserver where available, else spawn.
+
+    Plain fork is avoided: the orchestrator runs worker threads (sink
+    writes, learner persistence), and forking a threaded process can
+    deadlock the child on a lock held by another thread.
+    """
+    methods = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context('forkserver' if 'forkserver' in methods else 'spawn')
+
+
+class SolverExecutor:
+    """
+    Per-solver process worker pools with hard wall-clock kill.
+
+    Every solve runs in its own worker process, bounded per solver by the
+    configured number of worker slots. A worker is started per call rather
+    than reused so that a solve past its deadline can be killed without
+    tearing down work belonging to other requests. The fork server preloads
+    the first target's module, so per-call start-up is a cheap fork.
+    """
+
+    def __init__(self, pool_sizes: Dict[str, int]):
+        """
+        Initialize executor.
+
+        Args:
+            pool_sizes: Worker slots per solver name
+        """
+        self.pool_sizes = {name: max(1, int(size)) for name, size in pool_sizes.items()}
+        self._ctx = process_context()
+        self._slots = {}
+        self._in_flight = {name: 0 for name in self.pool_sizes}
+        self._completed = {name: 0 for name in self.pool_sizes}
+        self._killed = {name: 0 for name in self.pool_sizes}
+        self._preloaded = False
+
+    @staticmethod
+    def pool_size_for(solver_config: Dict[str, Any]) -> int:
+        """
+        Worker slots for a solver.
+
+        Uses ``workers`` when configured, otherwise as many workers as fit
+        the host cores given the solver's ``threads`` setting.
+        """
+        if solver_config.get('workers'):
+            return int(solver_config['workers'])
+        threads = max(1, int(solver_config.get('threads', 1)))
+        return max(1, (os.cpu_count() or 1) // threads)
+
+    def handles(self, solver_name: str) -> bool:
+        """Whether the solver runs on this executor."""
+        return solver_name in self.pool_sizes
+
+    async def run(
+        self,
+        solver_name: str,
+        target: Callable,
+        args: Tuple,
+        timeout: Optional[float] = None
+    ) -> Any:
+        """
+        Run ``target(*args)`` in a worker process of the solver's pool.
+
+        Args:
+            solver_name: Solver whose worker slots to use
+            target: Picklable top-level callable
+            args: Arguments for target
+            timeout: Wall-clock limit in seconds; the worker is killed on expiry
+
+        Returns:
+            Value returned by target
+
+        Raises:
+            asyncio.TimeoutError: If the worker exceeded the time limit
+            SolverExecutionError: If the worker raised or died
+        """
+        slots = self._slots.get(solver_name)
+        if slots is None:
+            slots = self._slots[solver_name] = asyncio.Semaphore(self.pool_sizes[solver_name])
+
+        if not self._preloaded and self._ctx.get_start_method() == 'forkserver':
+            # Import the solver module once in the fork server, not per worker
+            self._ctx.set_forkserver_preload([target.__module__])
+            self._preloaded = True
+
+        async with slots:
+            self._in_flight[solver_name] += 1
+            receiver, sender = self._ctx.Pipe(duplex=False)
+            process = self._ctx.Process(
+                target=_worker_main, args=(sender, target, args), daemon=True
+            )
+            try:
+                process.start()
+                sender.close()
+                status, value = await asyncio.wait_for(self._receive(receiver), timeout)
+            except BaseException:
+                # Timeout, cancellation or loop shutdown: hard-kill the worker
+                if process.is_alive():
+                    process.kill()
+                    self._killed[solver_name] += 1
+                raise
+            finally:
+                receiver.close()
+                await self._reap(process)
+                self._in_flight[solver_name] -= 1
+                self._completed[solver_name] += 1
+
+        if status == 'error':
+            raise SolverExecutionError(f'{solver_name}: {value}')
+        return value
+
+    async def _receive(self, conn) -> Tuple[str, Any]:
+        """Wait for the worker's message without blocking the event loop."""
+        loop = asyncio.get_running_loop()
+        ready = loop.create_future()
+        fd = conn.fileno()
+        loop.add_reader(fd, lambda: ready.done() or ready.set_result(None))
+        try:
+            await ready
+        finally:
+            loop.remove_reader(fd)
+
+        try:
+            return conn.recv()
+        except EOFError:
+            raise SolverExecutionError('worker exited without a result')
+
+    async def _reap(self, process, grace: float = 1.0) -> None:
+        """Wait for a worker to exit without blocking the event loop."""
+        if process.pid is None:
+            return  # never started
+        if process.exitcode is None:
+            try:
+                await asyncio.wait_for(self._wait_exit(process), grace)
+            except asyncio.TimeoutError:
+                process.kill()
+                await self._wait_exit(process)
+        process.join(timeout=0)
+        process.close()
+
+    @staticmethod
+    async def _wait_exit(process) -> None:
+        """Wait until the worker's sentinel signals exit."""
+        loop = asyncio.get_running_loop()
+        exited = loop.create_future()
+        fd = process.sentinel
+        loop.add_reader(fd, lambda: exited.done() or exited.set_result(None))
+        try:
+            if process.exitcode is None:
+                await exited
+        finally:
+            loop.remove_reader(fd)
+
+    def in_flight(self, solver_name: Optional[str] = None) -> int:
+        """Number of solves currently running (per solver or total)."""
+        if solver_name is not None:
+            return self._in_flight.get(solver_name, 0)
+        return sum(self._in_flight.values())
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """Get per-solver worker pool statistics."""
+        return {
+            name: {
+                'workers': size,
+                'in_flight': self._in_flight[name],
+                'completed': self._completed[name],
+                'killed': self._killed[name]
+            }
+            for name, size in self.pool_sizes.items()
+        }
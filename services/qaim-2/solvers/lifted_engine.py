@@ -0,0 +1,757 @@
+"""
+Lifted Engine — McCormick/RLT Relaxation with Cutting Planes for QB Lifted
+
+Builds the lifted linear relaxation of a problem with bilinear terms:
+every product x_i·x_j that occurs in the objective or a constraint gets
+one lifted variable w_ij (pairs that never occur are never created), and
+the products are linked to their factors by McCormick envelope rows. The
+LP is kept in CSR form and solved with a pure-NumPy primal-dual
+interior-point method (conjugate-gradient normal equations), and
+violated cuts (envelope rows, tangents of squares, triangle inequalities
+of binary triples) are separated and appended round by round. Every
+round reports the relaxation bound, the best rounded incumbent and the
+gap.
+
+TFA Layer: QB (Cubic Bit)
+"""
+
+from typing import Dict, Any, Optional, Tuple, Callable, Union
+import time
+
+import numpy as np
+
+try:
+    from ..bridges.canonical import CSRMatrix, SENSE_LE, SENSE_EQ, VAR_BINARY, VAR_CONTINUOUS
+    from .tensor_engine import PenaltySearch
+except ImportError:
+    from bridges.canonical import CSRMatrix, SENSE_LE, SENSE_EQ, VAR_BINARY, VAR_CONTINUOUS
+    from solvers.tensor_engine import PenaltySearch
+
+
+# Normal equations are factored densely up to this many rows (and A up to
+# DENSE_ENTRIES entries); larger systems use conjugate gradients
+DENSE_ROWS = 1000
+DENSE_ENTRIES = 2_000_000
+
+
+def solve_lp(
+    c: np.ndarray,
+    A: Union[CSRMatrix, np.ndarray],
+    row_sense: np.ndarray,
+    rhs: np.ndarray,
+    lower: np.ndarray,
+    upper: np.ndarray,
+    tolerance: float = 1e-8,
+    max_iterations: int = 100,
+    deadline: Optional[float] = None
+) -> Dict[str, Any]:
+    """
+    Solve min c·x s.t. A x (<=, >=, =) rhs, lower <= x <= upper.
+
+    Mehrotra predictor-corrector interior point on the bounded standard
+    form (finite lower bounds shifted to zero, free variables split,
+    inequality rows given slacks, rows equilibrated). A stays sparse
+    (a dense array is converted to CSR); beyond DENSE_ROWS rows the normal
+    equations are solved by preconditioned conjugate gradients, so memory
+    is linear in the nonzeros. ``deadline`` (time.monotonic()) stops the
+    solve between iterations and inside the linear solves.
+
+    Returns:
+        Dictionary with status ('optimal', 'infeasible', 'iteration_limit'
+        or 'time_limit'), x, objective, bound (dual objective, a lower
+        bound when optimal), iterations and cg_iterations
+    """
+    if not isinstance(A, CSRMatrix):
+        A = np.asarray(A, dtype=np.float64)
+        rows, cols = np.nonzero(A)
+        A = CSRMatrix.from_coo(rows, cols, A[rows, cols], A.shape)
+    n = c.size
+    m = rhs.size
+
+    # Columns of the standard form: x = shift + Σ sign * x_std[col]
+    finite_lo = np.isfinite(lower)
+    finite_up = np.isfinite(upper)
+    flipped = ~finite_lo & finite_up
+    free = ~finite_lo & ~finite_up
+    shift = np.where(finite_lo, lower, np.where(flipped, upper, 0.0))
+    columns = np.concatenate([np.arange(n), np.flatnonzero(free)])
+    signs = np.concatenate([np.where(flipped, -1.0, 1.0), -np.ones(int(free.sum()))])
+    bounds = np.concatenate([
+        np.where(finite_lo & finite_up, upper - lower, np.inf), np.full(int(free.sum()), np.inf)
+    ])
+
+    # Standard-form entries: every column with its sign, plus the negated
+    # copy of each free column
+    rows = A.row_ids()
+    cols = A.indices.astype(np.int64)
+    split_column = np.full(n, -1, dtype=np.int64)
+    split_column[free] = n + np.arange(int(free.sum()))
+    split = free[cols]
+    std_rows = np.concatenate([rows, rows[split]])
+    std_cols = np.concatenate([cols, split_column[cols[split]]])
+    std_vals = np.concatenate([A.data * signs[cols], -A.data[split]])
+
+    # Inequality rows get a slack column each, kept implicit as (row, coefficient)
+    slack_rows = np.flatnonzero(row_sense != SENSE_EQ)
+    slack_coef = np.where(row_sense[slack_rows] == SENSE_LE, 1.0, -1.0)
+    b = rhs - A.dot(shift)
+    c_std = np.concatenate([c[columns] * signs, np.zeros(slack_rows.size)])
+    u = np.concatenate([bounds, np.full(slack_rows.size, np.inf)])
+    offset = float(c @ shift)
+
+    # Row equilibration
+    scale = np.zeros(m)
+    np.maximum.at(scale, std_rows, np.abs(std_vals))
+    scale[slack_rows] = np.maximum(scale[slack_rows], 1.0)
+    scale[scale == 0] = 1.0
+    A_std = CSRMatrix.from_coo(std_rows, std_cols, std_vals / scale[std_rows], (m, columns.size))
+    slack_coef /= scale[slack_rows]
+    b = b / scale
+
+    x_std, y, bound, status, iterations, cg_iterations = _interior_point(
+        c_std, A_std, slack_rows, slack_coef, b, u, tolerance, max_iterations, deadline
+    )
+
+    x = shift.copy()
+    np.add.at(x, columns, signs * x_std[:columns.size])
+    return {
+        'status': status,
+        'x': x,
+        'objective': float(c @ x),
+        'bound': bound + offset if bound is not None else None,
+        'iterations': iterations,
+        'cg_iterations': cg_iterations
+    }
+
+
+def _interior_point(
+    c: np.ndarray,
+    A: CSRMatrix,
+    slack_rows: np.ndarray,
+    slack_coef: np.ndarray,
+    b: np.ndarray,
+    u: np.ndarray,
+    tolerance: float,
+    max_iterations: int,
+    deadline: Optional[float] = None
+) -> Tuple[np.ndarray, np.ndarray, Optional[float], str, int, int]:
+    """
+    Primal-dual interior point for min c·x, [A S] x = b, 0 <= x <= u.
+
+    S holds one slack column per entry of ``slack_rows`` and is applied
+    without being materialized. Small systems (DENSE_ROWS, DENSE_ENTRIES)
+    form the normal matrix A Θ Aᵀ + S Θ Sᵀ densely. Larger ones never
+    form it: each iteration builds a Jacobi preconditioner and runs
+    conjugate gradients (two sparse products per step) for the predictor
+    and the corrector, checking the deadline as it goes.
+    """
+    m, k = A.shape
+    n = c.size
+    bounded = np.isfinite(u)
+    u_safe = np.where(bounded, u, 0.0)
+    row_ids = A.row_ids()
+    indices = A.indices
+    data = A.data
+    dense = A.to_dense() if m <= DENSE_ROWS and m * k <= DENSE_ENTRIES else None
+
+    def product(v):
+        return (
+            np.bincount(row_ids, weights=data * v[indices], minlength=m)
+            + np.bincount(slack_rows, weights=slack_coef * v[k:], minlength=m)
+        )
+
+    def transpose(v):
+        return np.concatenate([
+            np.bincount(indices, weights=data * v[row_ids], minlength=k),
+            slack_coef * v[slack_rows]
+        ])
+
+    x = np.where(bounded, np.minimum(1.0, u_safe / 2.0), 1.0)
+    x[bounded & (u_safe <= 0)] = 0.0
+    x = np.maximum(x, 1e-2)
+    s = np.where(bounded, np.maximum(u_safe - x, 1e-2), 1.0)
+    z = np.ones(n)
+    w = np.where(bounded, 1.0, 0.0)
+    y = np.zeros(m)
+    b_norm = 1.0 + np.linalg.norm(b)
+    c_norm = 1.0 + np.linalg.norm(c)
+    regularization = 1e-10
+    iteration = 0
+    cg_iterations = 0
+    status = 'iteration_limit'
+
+    for iteration in range(1, max_iterations + 1):
+        rb = b - product(x)
+        rc = c - transpose(y) - z + w
+        ru = np.where(bounded, u_safe - x - s, 0.0)
+        complementarity = x @ z + s[bounded] @ w[bounded]
+        mu = complementarity / (n + int(bounded.sum()))
+        primal = float(c @ x)
+        dual = float(b @ y - u_safe[bounded] @ w[bounded])
+
+        if (np.linalg.norm(rb) / b_norm < tolerance
+                and np.linalg.norm(rc) / c_norm < tolerance
+                and abs(primal - dual) / (1.0 + abs(primal)) < tolerance):
+            return x, y, dual, 'optimal', iteration, cg_iterations
+        if (not np.isfinite(mu) or np.max(np.abs(x), initial=0.0) > 1e12
+                or np.max(np.abs(y), initial=0.0) > 1e12):
+            break
+        if _expired(deadline):
+            status = 'time_limit'
+            break
+
+        theta = 1.0 / (z / x + np.where(bounded, w / s, 0.0))
+        theta_k = theta[:k]
+        slack_diag = np.bincount(slack_rows, weights=slack_coef ** 2 * theta[k:], minlength=m)
+        if dense is not None:
+            M = (dense * theta_k) @ dense.T
+            M[np.diag_indices(m)] += slack_diag + regularization
+
+            def solve(rhs):
+                return np.linalg.solve(M, rhs), 0
+        else:
+            inverse_diagonal = 1.0 / (
+                np.bincount(row_ids, weights=data ** 2 * theta_k[indices], minlength=m)
+                + slack_diag + regularization
+            )
+            # Inexact Newton: the CG residual lands in the primal residual of
+            # the step, so it only has to stay well below the current one
+            target = max(1e-2 * np.linalg.norm(rb), 1e-1 * tolerance * b_norm)
+
+            def normal(v):
+                scaled = theta_k * np.bincount(indices, weights=data * v[row_ids], minlength=k)
+                return (
+                    np.bincount(row_ids, weights=data * scaled[indices], minlength=m)
+                    + (slack_diag + regularization) * v
+                )
+
+            def solve(rhs):
+                return _conjugate_gradient(normal, rhs, inverse_diagonal, target, deadline)
+
+        def direction(rxz, rsw):
+            nonlocal cg_iterations
+            r = rc - rxz / x + np.where(bounded, (rsw - w * ru) / s, 0.0)
+            dy, steps = solve(rb + product(theta * r))
+            cg_iterations += steps
+            dx = theta * (transpose(dy) - r)
+            ds = np.where(bounded, ru - dx, 0.0)
+            dz = (rxz - z * dx) / x
+            dw = np.where(bounded, (rsw - w * ds) / s, 0.0)
+            return dx, dy, ds, dz, dw
+
+        try:
+            # Predictor (affine scaling)
+            dx, dy, ds, dz, dw = direction(-x * z, np.where(bounded, -s * w, 0.0))
+            alpha_p = min(1.0, _step(x, dx), _step(s[bounded], ds[bounded]))
+            alpha_d = min(1.0, _step(z, dz), _step(w[bounded], dw[bounded]))
+            affine = (
+                (x + alpha_p * dx) @ (z + alpha_d * dz)
+                + (s + alpha_p * ds)[bounded] @ (w + alpha_d * dw)[bounded]
+            ) / (n + int(bounded.sum()))
+            sigma = (affine / mu) ** 3 if mu > 0 else 0.0
+
+            # Corrector with centering
+            dx, dy, ds, dz, dw = direction(
+                sigma * mu - x * z - dx * dz,
+                np.where(bounded, sigma * mu - s * w - ds * dw, 0.0)
+            )
+        except np.linalg.LinAlgError:
+            break
+        if not (np.isfinite(dx).all() and np.isfinite(dy).all()):
+            break
+        alpha_p = min(1.0, 0.99 * min(_step(x, dx), _step(s[bounded], ds[bounded])))
+        alpha_d = min(1.0, 0.99 * min(_step(z, dz), _step(w[bounded], dw[bounded])))
+        x = x + alpha_p * dx
+        s = np.where(bounded, s + alpha_p * ds, 1.0)
+        y = y + alpha_d * dy
+        z = z + alpha_d * dz
+        w = np.where(bounded, w + alpha_d * dw, 0.0)
+
+    if status != 'time_limit':
+        residual = np.linalg.norm(b - product(x)) / b_norm
+        status = 'infeasible' if residual > 1e-4 else 'iteration_limit'
+    return x, y, None, status, iteration, cg_iterations
+
+
+def _conjugate_gradient(
+    apply: Callable[[np.ndarray], np.ndarray],
+    rhs: np.ndarray,
+    inverse_diagonal: np.ndarray,
+    target: float,
+    deadline: Optional[float] = None,
+    max_iterations: Optional[int] = None
+) -> Tuple[np.ndarray, int]:
+    """
+    Jacobi-preconditioned conjugate gradients for a symmetric positive
+    definite operator.
+
+    Stops once the residual norm is within ``target``, after
+    ``max_iterations`` (default: four times the dimension) or at the deadline,
+    returning the current iterate.
+
+    Returns:
+        Tuple of (solution, iterations)
+    """
+    if max_iterations is None:
+        max_iterations = 4 * rhs.size + 50
+    x = np.zeros_like(rhs)
+    r = rhs.copy()
+    p = inverse_diagonal * r
+    rz = r @ p
+    iteration = 0
+    while iteration < max_iterations and np.linalg.norm(r) > target:
+        q = apply(p)
+        curvature = p @ q
+        if not curvature > 0:
+            break
+        alpha = rz / curvature
+        x += alpha * p
+        r -= alpha * q
+        z = inverse_diagonal * r
+        rz, previous = r @ z, rz
+        p = z + (rz / previous) * p
+        iteration += 1
+        if iteration % 16 == 0 and _expired(deadline):
+            break
+    return x, iteration
+
+
+def _step(values: np.ndarray, direction: np.ndarray) -> float:
+    """Largest step in [0, inf) keeping values + step * direction >= 0."""
+    shrinking = direction < 0
+    if not shrinking.any():
+        return np.inf
+    return float(np.min(-values[shrinking] / direction[shrinking]))
+
+
+class LiftedLP:
+    """
+    Lifted LP over (x, w) with rows kept in COO form.
+
+    Rows are appended block by block (original rows, then cuts), so the
+    relaxation grows only by the cuts that were actually separated.
+    """
+
+    def __init__(self, canonical: Any, pairs: np.ndarray):
+        n = canonical.num_variables
+        self.n = n
+        self.pairs = pairs
+        self.size = n + len(pairs)
+        self.sign = 1.0 if canonical.sense == 'minimize' else -1.0
+        self.constant = self.sign * canonical.obj_constant
+        self._keys = pairs[:, 0] * n + pairs[:, 1]
+
+        # Bounds: factors from the canonical problem, products from the factor boxes
+        self.lower = canonical.lower.astype(np.float64)
+        self.upper = canonical.upper.astype(np.float64)
+        li, ui = self.lower[pairs[:, 0]], self.upper[pairs[:, 0]]
+        lj, uj = self.lower[pairs[:, 1]], self.upper[pairs[:, 1]]
+        finite = np.isfinite(li) & np.isfinite(ui) & np.isfinite(lj) & np.isfinite(uj)
+        with np.errstate(invalid='ignore'):
+            corners = np.stack([li * lj, li * uj, ui * lj, ui * uj])
+        w_lower = np.where(finite, corners.min(axis=0), -np.inf)
+        w_upper = np.where(finite, corners.max(axis=0), np.inf)
+        square = pairs[:, 0] == pairs[:, 1]
+        w_lower[square] = np.where(
+            (li[square] <= 0) & (ui[square] >= 0), 0.0,
+            np.minimum(li[square] ** 2, ui[square] ** 2)
+        )
+        self.lower = np.concatenate([self.lower, w_lower])
+        self.upper = np.concatenate([self.upper, w_upper])
+
+        # Objective in minimization form
+        self.c = np.zeros(self.size)
+        self.c[:n] = self.sign * canonical.objective
+        qi, qj, qv = canonical.obj_quad
+        np.add.at(self.c, self.lift(qi, qj), self.sign * qv)
+
+        # Original rows with their products lifted; opaque rows are skipped
+        A = canonical.A
+        row_ids = A.row_ids()
+        r, i, j, v = canonical.con_quad
+        parsed = canonical.row_parsed
+        keep = parsed[row_ids]
+        quad = parsed[r]
+        rows = np.flatnonzero(parsed)
+        renumber = np.full(canonical.num_constraints, -1, dtype=np.int64)
+        renumber[rows] = np.arange(rows.size)
+        self._rows = [np.concatenate([renumber[row_ids[keep]], renumber[r[quad]]])]
+        self._cols = [np.concatenate([A.indices[keep].astype(np.int64), self.lift(i[quad], j[quad])])]
+        self._vals = [np.concatenate([A.data[keep], v[quad]])]
+        self._sense = [canonical.row_sense[rows]]
+        self._rhs = [canonical.rhs[rows]]
+        self.num_rows = rows.size
+        self.num_original_rows = rows.size
+
+    def lift(self, i: np.ndarray, j: np.ndarray) -> np.ndarray:
+        """Column of each product x_i·x_j (the factor's column for binary squares)."""
+        i = np.asarray(i, dtype=np.int64)
+        j = np.asarray(j, dtype=np.int64)
+        a, b = np.minimum(i, j), np.maximum(i, j)
+        if not self._keys.size:
+            return a
+        keys = a * self.n + b
+        pos = np.minimum(np.searchsorted(self._keys, keys), self._keys.size - 1)
+        return np.where(self._keys[pos] == keys, self.n + pos, a)
+
+    def add_rows(
+        self,
+        cols: np.ndarray,
+        vals: np.ndarray,
+        rhs: np.ndarray
+    ) -> None:
+        """Append <= rows given as (count, width) coefficient and column blocks."""
+        count = rhs.size
+        if not count:
+            return
+        self._rows.append(np.repeat(np.arange(self.num_rows, self.num_rows + count), cols.shape[1]))
+        self._cols.append(cols.ravel())
+        self._vals.append(vals.ravel())
+        self._sense.append(np.full(count, SENSE_LE, dtype=np.int8))
+        self._rhs.append(rhs)
+        self.num_rows += count
+
+    def matrix(self) -> Tuple[CSRMatrix, np.ndarray, np.ndarray]:
+        """CSR constraint matrix (duplicates summed), row senses and right-hand sides."""
+        A = CSRMatrix.from_coo(
+            np.concatenate(self._rows), np.concatenate(self._cols), np.concatenate(self._vals),
+            (self.num_rows, self.size)
+        )
+        return A, np.concatenate(self._sense), np.concatenate(self._rhs)
+
+
+# Triangle inequalities over (x_i, x_j, x_k, w_ij, w_ik, w_jk), all <= rhs
+_TRIANGLE = np.array([
+    [1.0, 1.0, 1.0, -1.0, -1.0, -1.0],
+    [-1.0, 0.0, 0.0, 1.0, 1.0, -1.0],
+    [0.0, -1.0, 0.0, 1.0, -1.0, 1.0],
+    [0.0, 0.0, -1.0, -1.0, 1.0, 1.0]
+])
+_TRIANGLE_RHS = np.array([1.0, 0.0, 0.0, 0.0])
+
+
+class CutSeparator:
+    """
+    Separation of the lifted cut families at an LP point.
+
+    McCormick kinds per pair (w = x_i·x_j, l/u the factor bounds):
+    0: w >= l_j x_i + l_i x_j - l_i l_j     1: w >= u_j x_i + u_i x_j - u_i u_j
+    2: w <= u_j x_i + l_i x_j - l_i u_j     3: w <= l_j x_i + u_i x_j - u_i l_j
+    A kind exists only when the bounds it uses are finite.
+    """
+
+    def __init__(self, lp: LiftedLP, canonical: Any, max_triangles: int):
+        pairs = lp.pairs
+        n = lp.n
+        self.lp = lp
+        self.w = n + np.arange(len(pairs))
+        self.i, self.j = pairs[:, 0], pairs[:, 1]
+        li, ui = lp.lower[self.i], lp.upper[self.i]
+        lj, uj = lp.lower[self.j], lp.upper[self.j]
+
+        # (pairs, kind, [w, x_i, x_j]) coefficients and (pairs, kind) rhs
+        with np.errstate(invalid='ignore'):
+            self.coef = np.stack([
+                np.stack([-np.ones_like(li), lj, li], axis=1),
+                np.stack([-np.ones_like(li), uj, ui], axis=1),
+                np.stack([np.ones_like(li), -uj, -li], axis=1),
+                np.stack([np.ones_like(li), -lj, -ui], axis=1)
+            ], axis=1)
+            self.rhs = np.stack([li * lj, ui * uj, -li * uj, -ui * lj], axis=1)
+        self.valid = np.stack([
+            np.isfinite(li) & np.isfinite(lj), np.isfinite(ui) & np.isfinite(uj),
+            np.isfinite(li) & np.isfinite(uj), np.isfinite(ui) & np.isfinite(lj)
+        ], axis=1)
+        self.coef[~self.valid] = 0.0
+        self.rhs[~self.valid] = 0.0
+        self.added = np.zeros_like(self.valid)
+
+        # Squares of non-binaries get tangent cuts w >= 2 x̄ x - x̄²
+        self.squares = np.flatnonzero(self.i == self.j)
+
+        # Binary triples whose three products are all lifted
+        binary = canonical.vtype == VAR_BINARY
+        off = (self.i != self.j) & binary[self.i] & binary[self.j]
+        neighbours: Dict[int, set] = {}
+        for a, b in zip(self.i[off].tolist(), self.j[off].tolist()):
+            neighbours.setdefault(a, set()).add(b)
+            neighbours.setdefault(b, set()).add(a)
+        triples = []
+        for a, b in zip(self.i[off].tolist(), self.j[off].tolist()):
+            for c in neighbours[a] & neighbours[b]:
+                if c > b:
+                    triples.append((a, b, c))
+            if len(triples) >= max_triangles:
+                break
+        self.triples = np.array(triples[:max_triangles], dtype=np.int64).reshape(-1, 3)
+        if len(self.triples):
+            t = self.triples
+            self.triangle_cols = np.hstack([
+                t, np.stack([lp.lift(t[:, 0], t[:, 1]), lp.lift(t[:, 0], t[:, 2]),
+                             lp.lift(t[:, 1], t[:, 2])], axis=1)
+            ])
+        else:
+            self.triangle_cols = np.zeros((0, 6), dtype=np.int64)
+
+    def envelope(self, kinds: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Rows for the (pair, kind) mask ``kinds`` (marked as added)."""
+        kinds = kinds & self.valid & ~self.added
+        self.added |= kinds
+        pair, kind = np.nonzero(kinds)
+        cols = np.stack([self.w[pair], self.i[pair], self.j[pair]], axis=1)
+        return cols, self.coef[pair, kind], self.rhs[pair, kind]
+
+    def separate(
+        self,
+        z: np.ndarray,
+        tolerance: float,
+        limit: int
+    ) -> Dict[str, Tuple[np.ndarray, np.ndarray, np.ndarray]]:
+        """Most violated cuts of every family at the LP point z."""
+        cuts = {}
+
+        values = np.stack([z[self.w], z[self.i], z[self.j]], axis=1)
+        violation = np.einsum('pkc,pc->pk', self.coef, values) - self.rhs
+        violation[~self.valid | self.added] = 0.0
+        cuts['envelope'] = self.envelope(_top(violation, tolerance, limit))
+
+        x = z[self.i[self.squares]]
+        violation = x * x - z[self.w[self.squares]]
+        chosen = _top(violation, tolerance, limit)
+        cuts['tangent'] = (
+            np.stack([self.w[self.squares][chosen], self.i[self.squares][chosen]], axis=1),
+            np.stack([-np.ones(int(chosen.sum())), 2.0 * x[chosen]], axis=1),
+            x[chosen] ** 2
+        )
+
+        violation = z[self.triangle_cols] @ _TRIANGLE.T - _TRIANGLE_RHS
+        triple, kind = np.nonzero(_top(violation, tolerance, limit))
+        cuts['triangle'] = (self.triangle_cols[triple], _TRIANGLE[kind], _TRIANGLE_RHS[kind])
+        return cuts
+
+
+def _top(violation: np.ndarray, tolerance: float, limit: int) -> np.ndarray:
+    """Mask of the ``limit`` largest violations above tolerance."""
+    mask = violation > tolerance
+    if mask.sum() > limit:
+        threshold = np.partition(violation[mask], -limit)[-limit]
+        mask &= violation >= threshold
+    return mask
+
+
+class LiftedEngine:
+    """
+    QB lifted-method solver: McCormick/RLT relaxation with cutting planes.
+
+    The relaxation starts from the original rows plus the envelope side
+    the objective pushes against; every round solves the LP, rounds its
+    x part to an incumbent and appends the most violated cuts, until no
+    cut is violated, the gap closes, or the round or time limit is hit.
+    """
+
+    def __init__(self, config: Optional[Dict[str, Any]] = None):
+        """
+        Initialize lifted engine with configuration.
+
+        Args:
+            config: Configuration with max_rounds, max_cuts_per_round,
+                cut_tolerance, max_triangles, lp_tolerance,
+                lp_max_iterations, max_flips_per_variable,
+                pair_candidates and feasibility_tolerance
+        """
+        config = config or {}
+        self.max_rounds = config.get('max_rounds', 20)
+        self.max_cuts_per_round = config.get('max_cuts_per_round', 200)
+        self.cut_tolerance = config.get('cut_tolerance', 1e-6)
+        self.max_triangles = config.get('max_triangles', 10000)
+        self.lp_tolerance = config.get('lp_tolerance', 1e-8)
+        self.lp_max_iterations = config.get('lp_max_iterations', 100)
+        self.max_flips_per_variable = config.get('max_flips_per_variable', 10)
+        self.pair_candidates = config.get('pair_candidates', 32)
+        self.feasibility_tolerance = config.get('feasibility_tolerance', 1e-6)
+
+    def solve(
+        self,
+        canonical: Any,
+        params: Dict[str, Any],
+        pairs: Optional[np.ndarray] = None
+    ) -> Dict[str, Any]:
+        """
+        Run the cutting-plane loop (blocking; run it off the event loop).
+
+        Args:
+            canonical: Canonical problem
+            params: max_iterations (caps the rounds), time_limit,
+                gap_tolerance, optional warm_start (``start``) and, for
+                submitted jobs, on_incumbent (called with every improving
+                incumbent) and cancel_event (stops after the round)
+            pairs: Lifted (i, j) pairs from the XFR bridge; derived from
+                the problem when omitted
+
+        Returns:
+            Dictionary with status, solution, objective_value, gap,
+            feasible, iterations and metrics['lifted']
+        """
+        start_time = time.monotonic()
+        time_limit = params.get('time_limit')
+        deadline = start_time + time_limit if time_limit else None
+        gap_tolerance = params.get('gap_tolerance', 0.01)
+        max_rounds = min(self.max_rounds, params.get('max_iterations', self.max_rounds))
+        on_incumbent = params.get('on_incumbent')
+        cancel_event = params.get('cancel_event')
+
+        n = canonical.num_variables
+        if pairs is None:
+            pairs = canonical.product_pairs()
+        lp = LiftedLP(canonical, np.asarray(pairs, dtype=np.int64).reshape(-1, 2))
+        separator = CutSeparator(lp, canonical, self.max_triangles)
+
+        # Initial envelopes: the side the objective pushes against, both sides
+        # for products that only occur in constraints
+        cost = lp.c[separator.w][:, None]
+        initial = np.where(cost > 0, [True, True, False, False],
+                           np.where(cost < 0, [False, False, True, True], True))
+        lp.add_rows(*separator.envelope(initial))
+
+        search = None
+        if n and (canonical.vtype == VAR_BINARY).all():
+            penalty = 1.0 + np.abs(canonical.objective).sum() + np.abs(canonical.obj_quad[2]).sum()
+            search = PenaltySearch(canonical, penalty, self.pair_candidates)
+        max_flips = self.max_flips_per_variable * max(n, 1)
+
+        best, best_value = None, np.inf
+        warm_start = params.get('warm_start') or {}
+        start = warm_start.get('start')
+        if start is not None and len(start) == n:
+            best, best_value = self._incumbent(
+                canonical, lp, np.nan_to_num(np.asarray(start, dtype=np.float64)),
+                search, max_flips, deadline, best, best_value
+            )
+
+        bound = -np.inf
+        cut_counts = {'envelope': int(separator.added.sum()), 'tangent': 0, 'triangle': 0}
+        history = []
+        lp_iterations = 0
+        cg_iterations = 0
+        lp_status = None
+        rounds = 0
+
+        while rounds < max_rounds:
+            rounds += 1
+            A, row_sense, rhs = lp.matrix()
+            result = solve_lp(
+                lp.c, A, row_sense, rhs, lp.lower, lp.upper,
+                self.lp_tolerance, self.lp_max_iterations, deadline
+            )
+            lp_iterations += result['iterations']
+            cg_iterations += result['cg_iterations']
+            lp_status = result['status']
+            if lp_status == 'infeasible':
+                break
+            if result['bound'] is not None:
+                bound = max(bound, result['bound'] + lp.constant)
+
+            z = result['x']
+            previous = best_value
+            best, best_value = self._incumbent(
+                canonical, lp, z[:n], search, max_flips, deadline, best, best_value
+            )
+            gap = _gap(best_value, bound)
+            if on_incumbent is not None and best_value < previous:
+                on_incumbent({
+                    'objective_value': lp.sign * best_value,
+                    'gap': gap,
+                    'bound': lp.sign * bound if np.isfinite(bound) else None,
+                    'round': rounds,
+                    'solution': {name: float(best[i]) for i, name in enumerate(canonical.names)}
+                })
+            cuts = separator.separate(z, self.cut_tolerance, self.max_cuts_per_round)
+            added = 0
+            for family, rows in cuts.items():
+                lp.add_rows(*rows)
+                cut_counts[family] += rows[2].size
+                added += rows[2].size
+
+            history.append({
+                'round': rounds,
+                'elapsed': time.monotonic() - start_time,
+                'bound': lp.sign * bound if np.isfinite(bound) else None,
+                'incumbent': lp.sign * best_value if best is not None else None,
+                'gap': gap,
+                'rows': lp.num_rows,
+                'cuts': added
+            })
+            if not added or gap <= gap_tolerance or _expired(deadline):
+                break
+            if cancel_event is not None and cancel_event.is_set():
+                break
+
+        gap = _gap(best_value, bound)
+        if best is None:
+            status = 'infeasible' if lp_status == 'infeasible' else 'no_incumbent'
+            best = np.clip(np.zeros(n), canonical.lower, canonical.upper)
+        elif gap <= gap_tolerance:
+            status = 'optimal'
+        else:
+            status = 'feasible'
+
+        return {
+            'status': status,
+            'solution': {name: float(best[i]) for i, name in enumerate(canonical.names)},
+            'objective_value': canonical.objective_value(best),
+            'gap': gap,
+            'feasible': status in ('optimal', 'feasible'),
+            'iterations': rounds,
+            'metrics': {
+                'lifted': {
+                    'lifted_variables': int(len(lp.pairs)),
+                    'rows': lp.num_rows,
+                    'original_rows': lp.num_original_rows,
+                    'cuts': cut_counts,
+                    'triangles': int(len(separator.triples)),
+                    'rounds': rounds,
+                    'bound': lp.sign * bound if np.isfinite(bound) else None,
+                    'incumbent': lp.sign * best_value if np.isfinite(best_value) else None,
+                    'lp_status': lp_status,
+                    'lp_iterations': lp_iterations,
+                    'cg_iterations': cg_iterations,
+                    'history': history,
+                    'elapsed': time.monotonic() - start_time
+                }
+            }
+        }
+
+    def _incumbent(
+        self,
+        canonical: Any,
+        lp: LiftedLP,
+        x: np.ndarray,
+        search: Optional[PenaltySearch],
+        max_flips: int,
+        deadline: Optional[float],
+        best: Optional[np.ndarray],
+        best_value: float
+    ) -> Tuple[Optional[np.ndarray], float]:
+        """Round x (and polish 0/1 problems); keep it if feasible and better."""
+        integral = canonical.vtype != VAR_CONTINUOUS
+        x = np.where(integral, np.round(x), x)
+        x = np.clip(x, canonical.lower, canonical.upper)
+        if search is not None:
+            x, _ = search.descend(x, max_flips, deadline)
+        if canonical.max_violation(x) > self.feasibility_tolerance:
+            return best, best_value
+        value = lp.sign * canonical.objective_value(x)
+        if value < best_value:
+            return x, value
+        return best, best_value
+
+
+def _gap(value: float, bound: float) -> float:
+    """Relative gap of a minimization incumbent over a lower bound (1.0 if unknown)."""
+    if not np.isfinite(value) or not np.isfinite(bound):
+        return 1.0
+    return float(max(value - bound, 0.0) / max(abs(value), abs(bound), 1e-9))
+
+
+def _expired(deadline: Optional[float]) -> bool:
+    return deadline is not None and time.monotonic() >= deadline
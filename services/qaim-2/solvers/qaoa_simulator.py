@@ -0,0 +1,331 @@
+"""
+QAOA Simulator — CPU Statevector Backend for the QC Gateway
+
+Simulates QAOA circuits over a QUBO on a complex128 statevector. The cost
+Hamiltonian is diagonal in the computational basis, so its 2^n energies
+are computed once per QUBO and every cost layer is an elementwise phase.
+Mixer layers rotate each qubit in place on the state buffer. Several
+(γ, β) parameter sets are simulated side by side in one batched buffer,
+so each pass of the classical optimizer evaluates all of its trial
+points at once. Expectations are exact or estimated from ``shots``
+measurement samples.
+
+TFA Layer: QC (Quantum Computing)
+"""
+
+from typing import Dict, Any, Callable, Optional
+import threading
+import time
+
+import numpy as np
+
+try:
+    from ..bridges.qubo import SparseQUBO
+    from .qubo_sampler import SampleSet
+except ImportError:
+    from bridges.qubo import SparseQUBO
+    from solvers.qubo_sampler import SampleSet
+
+
+# Amplitudes per block for phase, expectation and sampling passes
+BLOCK = 1 << 18
+
+# Lowest qubits transformed together by one dense Hadamard matmul
+DENSE_QUBITS = 6
+
+
+def diagonal_energies(qubo: SparseQUBO) -> np.ndarray:
+    """
+    QUBO energy of every basis state; bit k of the index is x_k.
+
+    Built by doubling: the states with x_k = 1 are the states over
+    x_0..x_{k-1} shifted by h_k + Σ_{j<k} Q_jk x_j, which is itself built
+    by doubling over j, so the whole table costs O(2^n).
+    """
+    n = qubo.num_variables
+    energies = np.empty(1 << n)
+    energies[0] = qubo.offset
+    field = np.empty(max(1 << max(n - 1, 0), 1))
+    coupling = np.zeros(n)
+    order = np.argsort(qubo.cols, kind='stable')
+    rows, cols, vals = qubo.rows[order], qubo.cols[order], qubo.vals[order]
+    bounds = np.searchsorted(cols, np.arange(n + 1))
+
+    for k in range(n):
+        coupling[:k] = 0.0
+        np.add.at(coupling, rows[bounds[k]:bounds[k + 1]], vals[bounds[k]:bounds[k + 1]])
+        field[0] = qubo.linear[k]
+        for j in range(k):
+            size = 1 << j
+            np.add(field[:size], coupling[j], out=field[size:2 * size])
+        size = 1 << k
+        np.add(energies[:size], field[:size], out=energies[size:2 * size])
+    return energies
+
+
+class QAOASimulator:
+    """
+    Statevector QAOA with batched parameter evaluation.
+
+    Angles are optimized in scaled units (γ times the standard deviation
+    of the diagonal), first over a batch of linear-ramp schedules, then
+    by a derivative-free trust-radius pattern search: every pass polls
+    ±ρ along each angle in one batched simulation, moves to the best
+    improving point or halves ρ, and stops at ``rhoend`` or
+    ``max_evaluations``.
+    """
+
+    def __init__(self, config: Optional[Dict[str, Any]] = None):
+        """
+        Initialize simulator with configuration.
+
+        Args:
+            config: Configuration with max_qubits, batch_size (parameter
+                sets per pass), memory_budget_mb (caps the batch),
+                max_evaluations, rhobeg, rhoend, readout_shots (final
+                measurements when expectations are exact) and seed
+        """
+        config = config or {}
+        self.max_qubits = config.get('max_qubits', 26)
+        self.batch_size = max(1, int(config.get('batch_size', 8)))
+        self.memory_budget = int(config.get('memory_budget_mb', 2048) * 2 ** 20)
+        self.max_evaluations = config.get('max_evaluations', 200)
+        self.rhobeg = config.get('rhobeg', 0.5)
+        self.rhoend = config.get('rhoend', 1e-3)
+        self.readout_shots = config.get('readout_shots', 1024)
+        self.seed = config.get('seed')
+        self._stats = {'runs': 0, 'evaluations': 0, 'simulate_time': 0.0}
+
+    def solve(
+        self,
+        qubo: SparseQUBO,
+        num_layers: int,
+        shots: int = 0,
+        cancel_event: Optional[threading.Event] = None,
+        on_pass: Optional[Callable[[SampleSet], None]] = None
+    ) -> Dict[str, Any]:
+        """
+        Optimize QAOA angles and read out the final state (blocking).
+
+        Args:
+            qubo: Model to minimize
+            num_layers: QAOA depth p
+            shots: Measurement samples per expectation and for the final
+                read-out; 0 evaluates exact expectations and reads out
+                ``readout_shots`` samples
+            cancel_event: Ends the angle search early once set; the
+                current best angles are still read out
+            on_pass: Called (on the calling thread) after each search
+                pass that improves the angles, with a read-out of the
+                improved state (``shots``, or ``readout_shots`` when 0)
+
+        Returns:
+            Dictionary with gammas, betas, expectation, sampleset,
+            evaluations, passes, batch_size, qubits, simulate_time and
+            optimize_time
+        """
+        n = qubo.num_variables
+        if n > self.max_qubits:
+            raise ValueError(f"QAOA needs {n} qubits; simulator limit is {self.max_qubits}")
+
+        start = time.monotonic()
+        rng = np.random.default_rng(self.seed)
+        energies = diagonal_energies(qubo)
+        scale = float(energies.std()) or 1.0
+        # Per row: state, transform spare and half-size scratch (complex128)
+        batch = max(1, min(self.batch_size, self.memory_budget // (40 * energies.size)))
+        state = _Statevector(n, batch)
+        simulate_time = 0.0
+        evaluations = 0
+
+        def evaluate(points: np.ndarray) -> np.ndarray:
+            nonlocal simulate_time, evaluations
+            values = np.empty(len(points))
+            for first in range(0, len(points), batch):
+                chunk = points[first:first + batch]
+                tick = time.monotonic()
+                state.run(energies, chunk[:, :num_layers] / scale, chunk[:, num_layers:])
+                values[first:first + len(chunk)] = state.expectations(energies, len(chunk), shots, rng)
+                simulate_time += time.monotonic() - tick
+            evaluations += len(points)
+            return values
+
+        # Linear-ramp schedules at several strengths
+        ramp = (np.arange(num_layers) + 0.5) / num_layers
+        starts = np.array([
+            np.concatenate([g * ramp, b * ramp[::-1]])
+            for g in (0.25, 0.5, 1.0, 2.0) for b in (0.25, 0.5, 1.0)
+        ])
+        values = evaluate(starts)
+        best = int(np.argmin(values))
+        x, fx = starts[best], float(values[best])
+
+        # Pattern search: poll ±ρ along every angle per pass
+        rho = self.rhobeg
+        directions = np.vstack([np.eye(2 * num_layers), -np.eye(2 * num_layers)])
+        passes = 0
+        while rho >= self.rhoend and evaluations + len(directions) <= self.max_evaluations:
+            if cancel_event is not None and cancel_event.is_set():
+                break
+            passes += 1
+            trial = x + rho * directions
+            values = evaluate(trial)
+            best = int(np.argmin(values))
+            if values[best] < fx - 1e-12 * max(abs(fx), 1.0):
+                x, fx = trial[best], float(values[best])
+                if on_pass is not None:
+                    tick = time.monotonic()
+                    state.run(energies, x[None, :num_layers] / scale, x[None, num_layers:])
+                    samples = state.read_out(energies, shots or self.readout_shots, rng)
+                    simulate_time += time.monotonic() - tick
+                    on_pass(samples)
+            else:
+                rho *= 0.5
+
+        # Read-out of the optimized state
+        tick = time.monotonic()
+        state.run(energies, x[None, :num_layers] / scale, x[None, num_layers:])
+        sampleset = state.read_out(energies, shots or self.readout_shots, rng)
+        simulate_time += time.monotonic() - tick
+
+        self._stats['runs'] += 1
+        self._stats['evaluations'] += evaluations
+        self._stats['simulate_time'] += simulate_time
+
+        return {
+            'gammas': (x[:num_layers] / scale).tolist(),
+            'betas': x[num_layers:].tolist(),
+            'expectation': fx,
+            'sampleset': sampleset,
+            'evaluations': evaluations,
+            'passes': passes,
+            'batch_size': batch,
+            'qubits': n,
+            'simulate_time': simulate_time,
+            'optimize_time': time.monotonic() - start - simulate_time
+        }
+
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """Get simulator statistics."""
+        return {
+            **self._stats,
+            'max_qubits': self.max_qubits,
+            'batch_size': self.batch_size
+        }
+
+
+class _Statevector:
+    """
+    Batched complex128 state buffer (batch, 2^n) with in-place QAOA layers.
+
+    The mixer exp(-iβ ΣX) is applied as H^n · exp(-iβ ΣZ) · H^n: the
+    middle factor is a phase that depends only on the Hamming weight of
+    the basis index, and the unnormalized Walsh–Hadamard transforms are
+    add/subtract butterflies, with the lowest qubits (whose butterflies
+    would be short strided runs) merged into one small real matmul.
+    """
+
+    def __init__(self, n: int, batch: int):
+        self.n = n
+        self.batch = batch
+        self.count = batch
+        self.psi = np.empty((batch, 1 << n), dtype=np.complex128)
+        self._spare = np.empty_like(self.psi)
+        self._phase = np.empty((batch, min(BLOCK, 1 << n)), dtype=np.complex128)
+        self._half = np.empty((batch, max(1 << max(n - 1, 0), 1)), dtype=np.complex128)
+        self.dense = min(n, DENSE_QUBITS)
+        hadamard = np.ones((1, 1))
+        for _ in range(self.dense):
+            hadamard = np.block([[hadamard, hadamard], [hadamard, -hadamard]])
+        self._hadamard = hadamard.astype(np.complex128)
+        weight = np.zeros(1 << n, dtype=np.uint8)
+        for k in range(n):
+            np.add(weight[:1 << k], 1, out=weight[1 << k:2 << k])
+        self._weight = weight
+
+    def run(self, energies: np.ndarray, gammas: np.ndarray, betas: np.ndarray) -> None:
+        """
+        Prepare |+>^n and apply the layers; row k uses gammas[k], betas[k].
+        Only the first len(gammas) rows of the buffer are touched.
+        """
+        self.count = len(gammas)
+        self.psi[:self.count].fill((1 << self.n) ** -0.5)
+        for layer in range(gammas.shape[1]):
+            self._cost(energies, gammas[:, layer])
+            self._mix(betas[:, layer])
+
+    def _cost(self, energies: np.ndarray, gamma: np.ndarray) -> None:
+        """ψ_z *= exp(-i γ E_z), block by block."""
+        factor = (-1j * gamma)[:, None]
+        for first in range(0, energies.size, BLOCK):
+            block = energies[first:first + BLOCK]
+            phase = self._phase[:self.count, :block.size]
+            np.multiply(factor, block, out=phase)
+            np.exp(phase, out=phase)
+            self.psi[:self.count, first:first + block.size] *= phase
+
+    def _mix(self, beta: np.ndarray) -> None:
+        """Apply exp(-i β X) to every qubit in place."""
+        self._transform()
+        # exp(-iβ ΣZ) with ΣZ = n - 2w, scaled by 2^-n for the two transforms
+        table = np.exp(-1j * np.outer(beta, self.n - 2.0 * np.arange(self.n + 1))) / (1 << self.n)
+        for first in range(0, self._weight.size, BLOCK):
+            weight = self._weight[first:first + BLOCK]
+            phase = self._phase[:self.count, :weight.size]
+            np.take(table, weight, axis=1, out=phase)
+            self.psi[:self.count, first:first + weight.size] *= phase
+        self._transform()
+
+    def _transform(self) -> None:
+        """Unnormalized Walsh–Hadamard transform of every row, in place."""
+        width = 1 << self.dense
+        np.matmul(
+            self.psi[:self.count].reshape(-1, width), self._hadamard,
+            out=self._spare[:self.count].reshape(-1, width)
+        )
+        self.psi, self._spare = self._spare, self.psi
+        for qubit in range(self.dense, self.n):
+            view = self.psi[:self.count].reshape(self.count, -1, 2, 1 << qubit)
+            low, high = view[:, :, 0, :], view[:, :, 1, :]
+            saved = self._half[:self.count].reshape(low.shape)
+            np.subtract(low, high, out=saved)
+            low += high
+            high[...] = saved
+
+    def expectations(
+        self,
+        energies: np.ndarray,
+        count: int,
+        shots: int,
+        rng: np.random.Generator
+    ) -> np.ndarray:
+        """<E> of the first ``count`` rows, exact or as the mean of ``shots`` samples."""
+        if not shots:
+            total = np.zeros(count)
+            for first in range(0, energies.size, BLOCK):
+                block = self.psi[:count, first:first + BLOCK]
+                total += (block.real ** 2 + block.imag ** 2) @ energies[first:first + BLOCK]
+            return total
+        return np.array([energies[self._sample(row, shots, rng)].mean() for row in range(count)])
+
+    def _sample(self, row: int, shots: int, rng: np.random.Generator) -> np.ndarray:
+        """Basis-state indices of ``shots`` measurements of batch row ``row``."""
+        psi = self.psi[row]
+        masses = np.array([
+            np.sum(np.abs(psi[first:first + BLOCK]) ** 2) for first in range(0, psi.size, BLOCK)
+        ])
+        counts = rng.multinomial(shots, masses / masses.sum())
+        indices = []
+        for block, count in enumerate(counts.tolist()):
+            if count:
+                first = block * BLOCK
+                p = np.abs(psi[first:first + BLOCK]) ** 2
+                indices.append(first + rng.choice(p.size, size=count, p=p / p.sum()))
+        return np.concatenate(indices)
+
+    def read_out(self, energies: np.ndarray, shots: int, rng: np.random.Generator) -> SampleSet:
+        """Measurement outcomes of row 0 as a SampleSet, one occurrence per shot."""
+        indices, counts = np.unique(self._sample(0, shots, rng), return_counts=True)
+        bits = ((indices[:, None] >> np.arange(self.n)) & 1).astype(np.int8)
+        return SampleSet.from_reads(bits, energies[indices], counts, info={'method': 'qaoa'})
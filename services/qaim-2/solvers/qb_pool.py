@@ -11,6 +11,13 @@ from typing import Dict, Any
 import asyncio
 from datetime import datetime
 
+try:
+    from .tensor_engine import TensorEngine
+    from .lifted_engine import LiftedEngine
+except ImportError:
+    from solvers.tensor_engine import TensorEngine
+    from solvers.lifted_engine import LiftedEngine
+
 
 class QBResult:
     """Result from QB solver execution."""
@@ -54,12 +61,16 @@ class CubicBitSolverPool:
         Initialize QB solver pool.
         
         Args:
-            config: Configuration with methods and time limits
+            config: Configuration with methods, time limits and the
+                ``tensor`` and ``lifted`` engine settings (see
+                tensor_engine.py and lifted_engine.py)
         """
         self.config = config
         self.enabled = config.get('enabled', False)
         self.methods = config.get('methods', ['tensor_decomposition', 'lifted_relaxation'])
         self.time_limit = config.get('time_limit', 300)
+        self.tensor_engine = TensorEngine(config.get('tensor', {}))
+        self.lifted_engine = LiftedEngine(config.get('lifted', {}))
     
     async def solve(
         self,
@@ -71,7 +82,8 @@ class CubicBitSolverPool:
         
         Args:
             problem: Problem in QB format (tensor or lifted representation)
-            params: Solver parameters
+            params: Solver parameters; ``warm_start`` carries the previous
+                solution as an initial point (``start``)
             
         Returns:
             QBResult with status, solution, and metrics
@@ -82,11 +94,15 @@ class CubicBitSolverPool:
         method = problem.get('method', 'tensor')
         
         if method == 'tensor':
-            return await self._solve_tensor(problem, params)
+            result = await self._solve_tensor(problem, params)
         elif method == 'lifted':
-            return await self._solve_lifted(problem, params)
+            result = await self._solve_lifted(problem, params)
         else:
             raise ValueError(f"Unknown QB method: {method}")
+        
+        if params.get('warm_start'):
+            result.metrics['warm_started'] = True
+        return result
     
     async def _solve_tensor(
         self,
@@ -96,36 +112,32 @@ class CubicBitSolverPool:
         """
         Solve using tensor decomposition method.
         
-        Uses Tucker or CP decomposition for 3D tensor factorization.
+        Uses Tucker or CP decomposition of the sparse cubic form of the
+        problem (``tensor_data`` from XFR); the engine runs on a worker
+        thread so the event loop keeps serving other requests.
         """
         start_time = datetime.utcnow()
         
         try:
-            # TODO: Implement actual tensor decomposition
-            # For now, simulate solving
+            tensor_data = problem['tensor_data']
+            params = dict(params)
+            params.setdefault('time_limit', self.time_limit)
             
-            tensor_shape = problem.get('tensor_shape', (10, 10, 10))
-            max_iterations = params.get('max_iterations', 1000)
-            
-            # Simulate iterative tensor decomposition
-            iterations = 0
-            for i in range(min(max_iterations, 100)):
-                await asyncio.sleep(0.01)  # Simulate iteration
-                iterations += 1
-                
-                # Simulate convergence check
-                if i > 50:
-                    break
+            solved = await asyncio.to_thread(
+                self.tensor_engine.solve, problem['canonical'], tensor_data['qubo'], params
+            )
             
-            return QBResult(
-                status='optimal',
-                solution={'x1': 1.0, 'x2': 2.0},
-                objective_value=10.2,
-                gap=0.015,
+            result = QBResult(
+                status=solved['status'],
+                solution=solved['solution'],
+                objective_value=solved['objective_value'],
+                gap=solved['gap'],
                 solve_time=(datetime.utcnow() - start_time).total_seconds(),
-                feasible=True,
-                iterations=iterations
+                feasible=solved['feasible'],
+                iterations=solved['iterations']
             )
+            result.metrics.update(solved['metrics'])
+            return result
             
         except Exception as e:
             return QBResult(
@@ -146,36 +158,31 @@ class CubicBitSolverPool:
         """
         Solve using lifted linear relaxation method.
         
-        Creates lifted variables and solves relaxed problem.
+        Lifts the products of the problem (``lifted_pairs`` from XFR) into
+        an LP with McCormick rows and tightens it with separated cuts; the
+        bound and gap of every round are reported in metrics['lifted'].
         """
         start_time = datetime.utcnow()
         
         try:
-            # TODO: Implement actual lifted relaxation
-            # For now, simulate solving
-            
-            lifted_vars = problem.get('lifted_vars', [])
-            max_iterations = params.get('max_iterations', 1000)
+            params = dict(params)
+            params.setdefault('time_limit', self.time_limit)
             
-            # Simulate iterative refinement
-            iterations = 0
-            for i in range(min(max_iterations, 80)):
-                await asyncio.sleep(0.01)  # Simulate iteration
-                iterations += 1
-                
-                # Simulate convergence
-                if i > 40:
-                    break
+            solved = await asyncio.to_thread(
+                self.lifted_engine.solve, problem['canonical'], params, problem.get('lifted_pairs')
+            )
             
-            return QBResult(
-                status='optimal',
-                solution={'x1': 1.0, 'x2': 2.0},
-                objective_value=10.4,
-                gap=0.018,
+            result = QBResult(
+                status=solved['status'],
+                solution=solved['solution'],
+                objective_value=solved['objective_value'],
+                gap=solved['gap'],
                 solve_time=(datetime.utcnow() - start_time).total_seconds(),
-                feasible=True,
-                iterations=iterations
+                feasible=solved['feasible'],
+                iterations=solved['iterations']
             )
+            result.metrics.update(solved['metrics'])
+            return result
             
         except Exception as e:
             return QBResult(
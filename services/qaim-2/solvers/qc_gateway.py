@@ -2,17 +2,30 @@
 QC Gateway — Quantum Computing Gateway
 
 Interface to quantum hardware and simulators.
-Supports IBM Quantum, D-Wave, IonQ, Rigetti.
+Supports IBM Quantum, D-Wave, IonQ, Rigetti, and local CPU backends for
+hosts without quantum access: a QUBO sampler (simulated annealing / tabu)
+and a statevector QAOA simulator.
 Implements QAOA, VQE, and Quantum Annealing.
 
 TFA Layer: QC (Quantum Computing)
 Note: QC includes transposition/projection time and teleportation delay vs TP₀
 """
 
-from typing import Dict, Any
+from typing import Dict, Any, Callable, Optional
 import asyncio
 from datetime import datetime
 
+import numpy as np
+
+try:
+    from ..bridges.qubo import SparseQUBO
+    from .qubo_sampler import QUBOSampler
+    from .qaoa_simulator import QAOASimulator
+except ImportError:
+    from bridges.qubo import SparseQUBO
+    from solvers.qubo_sampler import QUBOSampler
+    from solvers.qaoa_simulator import QAOASimulator
+
 
 class QCResult:
     """Result from quantum computing execution."""
@@ -27,7 +40,8 @@ class QCResult:
         feasible: bool,
         shots: int = 0,
         quantum_time: float = 0.0,
-        classical_time: float = 0.0
+        classical_time: float = 0.0,
+        sampleset: Any = None
     ):
         self.status = status
         self.solution = solution
@@ -38,6 +52,7 @@ class QCResult:
         self.shots = shots
         self.quantum_time = quantum_time
         self.classical_time = classical_time
+        self.sampleset = sampleset
         self.metrics = {
             'objective_value': objective_value,
             'gap': gap,
@@ -62,7 +77,10 @@ class QuantumGateway:
         Initialize quantum gateway.
         
         Args:
-            config: Configuration with providers and algorithms
+            config: Configuration with providers and algorithms; a
+                provider with ``type: 'local_sampler'`` runs annealing on
+                the local CPU (see qubo_sampler.py) and one with
+                ``type: 'statevector'`` simulates QAOA (see qaoa_simulator.py)
         """
         self.config = config
         self.enabled = config.get('enabled', False)
@@ -71,6 +89,8 @@ class QuantumGateway:
         
         # Initialize provider connections
         self._providers = {}
+        self._samplers = {}
+        self._simulators = {}
         if self.enabled:
             self._initialize_providers()
     
@@ -78,6 +98,10 @@ class QuantumGateway:
         """Initialize quantum provider connections."""
         for provider_config in self.providers:
             provider_name = provider_config.get('name')
+            if provider_config.get('type') == 'local_sampler':
+                self._samplers[provider_name] = QUBOSampler(provider_config)
+            elif provider_config.get('type') == 'statevector':
+                self._simulators[provider_name] = QAOASimulator(provider_config)
             # TODO: Initialize actual provider connections
             self._providers[provider_name] = provider_config
     
@@ -119,50 +143,54 @@ class QuantumGateway:
         Solve using QAOA (Quantum Approximate Optimization Algorithm).
         
         Hybrid quantum-classical algorithm for combinatorial optimization.
+        Runs on a statevector provider; ``params['provider']`` selects one
+        by name and ``params['shots']`` sets the measurements per
+        expectation (0 for exact expectations). ``params['cancel_event']``
+        (submitted jobs) ends the angle search early. With
+        ``params['on_incumbent']``, the best sample read out after each
+        improving angle-search pass is reported if it improves.
         """
         start_time = datetime.utcnow()
         
         try:
-            # TODO: Implement actual QAOA solver interface
-            # For now, simulate quantum + classical execution
-            
+            simulator = self._simulator(params.get('provider'))
+            source = problem.get('qubo', {})
+            qubo = source.get('qubo')
+            if not isinstance(qubo, SparseQUBO):
+                qubo = self._qubo_from_dict(source)
             num_layers = problem.get('num_layers', 3)
-            shots = params.get('shots', 8192)
+            shots = params.get('shots', problem.get('shots', 8192))
+            on_pass = None
+            if params.get('on_incumbent') is not None:
+                on_pass = self._chunk_reporter(
+                    qubo, source.get('canonical'), params, params['on_incumbent']
+                )
             
-            # Simulate quantum execution
-            quantum_start = datetime.utcnow()
-            await asyncio.sleep(0.5)  # Simulate quantum circuit execution
-            quantum_time = (datetime.utcnow() - quantum_start).total_seconds()
+            # Angle optimization; circuit simulation counts as quantum time
+            run = await asyncio.to_thread(
+                simulator.solve, qubo, num_layers, shots, params.get('cancel_event'), on_pass
+            )
+            sampleset = run['sampleset']
             
-            # Simulate classical optimization
             classical_start = datetime.utcnow()
-            await asyncio.sleep(1.0)  # Simulate parameter optimization
-            classical_time = (datetime.utcnow() - classical_start).total_seconds()
+            result = self._sample_result(qubo, sampleset, source.get('canonical'), params)
+            classical_time = run['optimize_time'] + (datetime.utcnow() - classical_start).total_seconds()
             
-            return QCResult(
-                status='optimal',
-                solution={'x1': 1, 'x2': 0},
-                objective_value=9.8,
-                gap=0.032,
-                solve_time=(datetime.utcnow() - start_time).total_seconds(),
-                feasible=True,
-                shots=shots,
-                quantum_time=quantum_time,
-                classical_time=classical_time
-            )
+            result.solve_time = (datetime.utcnow() - start_time).total_seconds()
+            result.shots = sampleset.num_reads
+            result.quantum_time = run['simulate_time']
+            result.classical_time = classical_time
+            result.metrics.update({
+                'solve_time': result.solve_time,
+                'shots': result.shots,
+                'quantum_time': result.quantum_time,
+                'classical_time': classical_time,
+                'qaoa': {key: value for key, value in run.items() if key != 'sampleset'}
+            })
+            return result
             
         except Exception as e:
-            return QCResult(
-                status='error',
-                solution=None,
-                objective_value=float('inf'),
-                gap=float('inf'),
-                solve_time=(datetime.utcnow() - start_time).total_seconds(),
-                feasible=False,
-                shots=0,
-                quantum_time=0.0,
-                classical_time=0.0
-            )
+            return self._error_result(start_time, e)
     
     async def _solve_vqe(
         self,
@@ -204,17 +232,7 @@ class QuantumGateway:
             )
             
         except Exception as e:
-            return QCResult(
-                status='error',
-                solution=None,
-                objective_value=float('inf'),
-                gap=float('inf'),
-                solve_time=(datetime.utcnow() - start_time).total_seconds(),
-                feasible=False,
-                shots=0,
-                quantum_time=0.0,
-                classical_time=0.0
-            )
+            return self._error_result(start_time, e)
     
     async def _solve_quantum_annealing(
         self,
@@ -222,51 +240,210 @@ class QuantumGateway:
         params: Dict[str, Any]
     ) -> QCResult:
         """
-        Solve using Quantum Annealing (D-Wave).
+        Solve using Quantum Annealing.
         
-        Adiabatic quantum computing for QUBO problems.
+        Runs on a local sampler provider (simulated annealing or tabu over
+        the sparse QUBO); ``params['provider']`` selects one by name.
+        The lowest-energy sample is decoded and checked against the
+        canonical problem when XFR attached it. Sampling stops at
+        ``params['time_limit']`` or when ``params['cancel_event']`` is set,
+        keeping the reads reached so far. With ``params['on_incumbent']``
+        (submitted jobs), each worker chunk's best sample is reported as
+        it completes if it improves.
         """
         start_time = datetime.utcnow()
         
         try:
-            # TODO: Implement actual D-Wave interface
+            sampler = self._sampler(params.get('provider'))
+            qubo = problem.get('qubo')
+            if not isinstance(qubo, SparseQUBO):
+                qubo = self._qubo_from_dict(problem)
+            num_reads = params.get('num_reads', sampler.num_reads)
+            on_chunk = None
+            if params.get('on_incumbent') is not None:
+                on_chunk = self._chunk_reporter(
+                    qubo, problem.get('canonical'), params, params['on_incumbent']
+                )
             
-            num_reads = params.get('num_reads', 1000)
-            
-            # Simulate quantum annealing
             quantum_start = datetime.utcnow()
-            await asyncio.sleep(0.3)
+            sampleset = await sampler.sample(
+                qubo, num_reads, on_chunk=on_chunk, time_limit=params.get('time_limit'),
+                cancel_event=params.get('cancel_event')
+            )
             quantum_time = (datetime.utcnow() - quantum_start).total_seconds()
             
-            # Post-processing
+            # Post-processing: decode and check the best sample
             classical_start = datetime.utcnow()
-            await asyncio.sleep(0.1)
+            result = self._sample_result(qubo, sampleset, problem.get('canonical'), params)
             classical_time = (datetime.utcnow() - classical_start).total_seconds()
             
-            return QCResult(
-                status='optimal',
-                solution={'x1': 1, 'x2': 1},
-                objective_value=9.5,
-                gap=0.028,
-                solve_time=(datetime.utcnow() - start_time).total_seconds(),
-                feasible=True,
-                shots=num_reads,
-                quantum_time=quantum_time,
-                classical_time=classical_time
-            )
+            result.solve_time = (datetime.utcnow() - start_time).total_seconds()
+            result.quantum_time = quantum_time
+            result.classical_time = classical_time
+            result.metrics.update({
+                'solve_time': result.solve_time,
+                'quantum_time': quantum_time,
+                'classical_time': classical_time
+            })
+            return result
             
         except Exception as e:
-            return QCResult(
-                status='error',
-                solution=None,
-                objective_value=float('inf'),
-                gap=float('inf'),
-                solve_time=(datetime.utcnow() - start_time).total_seconds(),
-                feasible=False,
-                shots=0,
-                quantum_time=0.0,
-                classical_time=0.0
-            )
+            return self._error_result(start_time, e)
+    
+    @staticmethod
+    def _error_result(start_time: datetime, error: Exception) -> QCResult:
+        """Error result carrying the exception message in ``metrics['error']``."""
+        result = QCResult(
+            status='error',
+            solution=None,
+            objective_value=float('inf'),
+            gap=float('inf'),
+            solve_time=(datetime.utcnow() - start_time).total_seconds(),
+            feasible=False,
+            shots=0,
+            quantum_time=0.0,
+            classical_time=0.0
+        )
+        result.metrics['error'] = str(error)
+        return result
+    
+    def _sample_result(
+        self,
+        qubo: SparseQUBO,
+        sampleset: Any,
+        canonical: Any,
+        params: Dict[str, Any]
+    ) -> QCResult:
+        """
+        Decode the lowest-energy sample into a QCResult.
+        
+        The sample is checked against the canonical problem when XFR
+        attached it; the gap is measured against the QUBO lower bound.
+        Timing fields are left for the caller to fill in.
+        """
+        best, energy, occurrences = sampleset.first
+        solution = qubo.decode(best)
+        sign = 1.0 if qubo.meta.get('sense', 'minimize') == 'minimize' else -1.0
+        objective_value, feasible = self._evaluate(qubo, best, energy, canonical, params)
+        value = sign * objective_value
+        lower_bound = qubo.lower_bound()
+        gap = max(value - lower_bound, 0.0) / max(abs(value), abs(lower_bound), 1e-9)
+        if not feasible:
+            status = 'infeasible'
+        elif gap <= params.get('gap_tolerance', 0.01):
+            status = 'optimal'
+        else:
+            status = 'feasible'
+        
+        result = QCResult(
+            status=status,
+            solution=solution,
+            objective_value=objective_value,
+            gap=gap,
+            solve_time=0.0,
+            feasible=feasible,
+            shots=sampleset.num_reads,
+            sampleset=sampleset
+        )
+        result.metrics['sampleset'] = {
+            'method': sampleset.info.get('method'),
+            'num_reads': sampleset.num_reads,
+            'distinct': len(sampleset),
+            'best_energy': energy,
+            'best_occurrences': occurrences,
+            'workers': sampleset.info.get('workers', 1),
+            'stopped': sampleset.info.get('stopped', False)
+        }
+        return result
+    
+    @staticmethod
+    def _evaluate(
+        qubo: SparseQUBO,
+        sample: np.ndarray,
+        energy: float,
+        canonical: Any,
+        params: Dict[str, Any]
+    ) -> tuple:
+        """Objective value and feasibility of a sample (from its energy without canonical)."""
+        if canonical is None:
+            sign = 1.0 if qubo.meta.get('sense', 'minimize') == 'minimize' else -1.0
+            return sign * energy, True
+        x = sample[:qubo.num_original].astype(np.float64)
+        feasible = canonical.max_violation(x) <= params.get('feasibility_tolerance', 1e-6)
+        return canonical.objective_value(x), bool(feasible)
+    
+    def _chunk_reporter(
+        self,
+        qubo: SparseQUBO,
+        canonical: Any,
+        params: Dict[str, Any],
+        on_incumbent: Callable[[Dict[str, Any]], None]
+    ) -> Callable[[Any], None]:
+        """Sampler chunk (or QAOA pass) callback reporting improving best samples as incumbents."""
+        best_energy = float('inf')
+        
+        def on_chunk(chunk: Any) -> None:
+            nonlocal best_energy
+            sample, energy, _ = chunk.first
+            if energy >= best_energy:
+                return
+            best_energy = energy
+            objective_value, feasible = self._evaluate(qubo, sample, energy, canonical, params)
+            on_incumbent({
+                'objective_value': objective_value,
+                'energy': energy,
+                'feasible': feasible,
+                'solution': qubo.decode(sample)
+            })
+        
+        return on_chunk
+    
+    def _sampler(self, name: Optional[str] = None) -> QUBOSampler:
+        """Local sampler provider by name, or the first one configured."""
+        if name is not None:
+            if name not in self._samplers:
+                raise ValueError(f"No local sampler provider named {name}")
+            return self._samplers[name]
+        if not self._samplers:
+            raise ValueError("No annealing provider available")
+        return next(iter(self._samplers.values()))
+    
+    def _simulator(self, name: Optional[str] = None) -> QAOASimulator:
+        """Statevector provider by name, or the first one configured."""
+        if name is not None:
+            if name not in self._simulators:
+                raise ValueError(f"No statevector provider named {name}")
+            return self._simulators[name]
+        if not self._simulators:
+            raise ValueError("No QAOA provider available")
+        return next(iter(self._simulators.values()))
+    
+    @staticmethod
+    def _qubo_from_dict(problem: Dict[str, Any]) -> SparseQUBO:
+        """SparseQUBO from the legacy dict format (``qubo_format: 'dict'``)."""
+        n = problem['num_variables']
+        linear = np.zeros(n)
+        for i, v in problem.get('linear', {}).items():
+            linear[int(i)] = v
+        pairs = list(problem.get('quadratic', {}).items())
+        rows = np.array([min(i, j) for (i, j), _ in pairs], dtype=np.int64)
+        cols = np.array([max(i, j) for (i, j), _ in pairs], dtype=np.int64)
+        vals = np.array([v for _, v in pairs], dtype=np.float64)
+        return SparseQUBO(linear, rows, cols, vals, problem.get('offset', 0.0))
+    
+    def max_qubits(self) -> int:
+        """Largest QUBO (in variables) a statevector provider simulates; 0 without one."""
+        return max((sim.max_qubits for sim in self._simulators.values()), default=0)
+    
+    def close(self) -> None:
+        """Stop local sampler worker processes."""
+        for sampler in self._samplers.values():
+            sampler.close()
+    
+    def get_statistics(self) -> Dict[str, Any]:
+        """Get local sampler and simulator statistics per provider."""
+        backends = {**self._samplers, **self._simulators}
+        return {name: backend.get_statistics() for name, backend in backends.items()}
     
     def get_available_solvers(self) -> list:
         """Get list of available quantum solvers."""
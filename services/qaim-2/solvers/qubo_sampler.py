@@ -0,0 +1,641 @@
+"""
+QUBO Sampler — Local CPU Annealing Backend for the QC Gateway
+
+Samples low-energy states of a SparseQUBO without quantum hardware.
+Simulated annealing and tabu search both run all reads at once: the
+state of every read is one row of a (reads, n) matrix, and moves are
+evaluated as matrix operations over all rows. Annealing sweeps visit the
+variables one color class at a time (variables of a class share no
+coupling), so a whole class is updated per step. Reads are split across
+worker processes when more than one worker is configured. Both methods
+check a deadline and a cancellation flag between sweeps (iterations).
+
+TFA Layer: QC (Quantum Computing)
+"""
+
+from typing import Dict, Any, Callable, List, Optional, Sequence, Tuple
+import asyncio
+import concurrent.futures
+import threading
+import time
+
+import numpy as np
+
+try:
+    from ..bridges.qubo import SparseQUBO
+    from .executor import process_context
+except ImportError:
+    from bridges.qubo import SparseQUBO
+    from solvers.executor import process_context
+
+
+# Couplings denser than this (fraction of n²) use dense field updates
+DENSE_FRACTION = 0.1
+# Largest dense coupling matrix in bytes
+DENSE_MAX_BYTES = 256 * 2 ** 20
+# Padded (equal-width) field updates while padding stays below this factor
+PADDING_LIMIT = 8
+# Concurrent multi-chunk requests that can be stopped mid-run
+STOP_SLOTS = 256
+
+# Stop flags shared with the worker processes (set by _init_worker)
+_stop_flags = None
+
+
+def _init_worker(flags: Any) -> None:
+    """Worker-process initializer: keep the pool's shared stop flags."""
+    global _stop_flags
+    _stop_flags = flags
+
+
+class _StopFlag:
+    """Picklable handle to one slot of the pool's shared stop flags."""
+
+    __slots__ = ('slot',)
+
+    def __init__(self, slot: int):
+        self.slot = slot
+
+    def is_set(self) -> bool:
+        return _stop_flags is not None and bool(_stop_flags[self.slot])
+
+
+class SampleSet:
+    """
+    Distinct samples with energies and occurrence counts.
+
+    Samples are rows of a 0/1 int8 matrix, sorted by energy (lowest
+    first); ``num_occurrences`` counts how many reads ended in each.
+    """
+
+    __slots__ = ('samples', 'energies', 'num_occurrences', 'variable_names', 'info')
+
+    def __init__(
+        self,
+        samples: np.ndarray,
+        energies: np.ndarray,
+        num_occurrences: np.ndarray,
+        variable_names: Optional[List[str]] = None,
+        info: Optional[Dict[str, Any]] = None
+    ):
+        self.samples = samples
+        self.energies = energies
+        self.num_occurrences = num_occurrences
+        self.variable_names = variable_names
+        self.info = info or {}
+
+    @classmethod
+    def from_reads(
+        cls,
+        reads: np.ndarray,
+        energies: np.ndarray,
+        occurrences: Optional[np.ndarray] = None,
+        variable_names: Optional[List[str]] = None,
+        info: Optional[Dict[str, Any]] = None
+    ) -> 'SampleSet':
+        """Aggregate reads (k, n) into distinct samples, lowest energy first."""
+        reads = np.asarray(reads, dtype=np.int8)
+        if occurrences is None:
+            occurrences = np.ones(len(reads), dtype=np.int64)
+        if not len(reads):
+            return cls(reads, np.zeros(0), np.zeros(0, dtype=np.int64), variable_names, info)
+
+        # Distinct rows via their packed bytes
+        packed = np.packbits(reads, axis=1)
+        keys = np.ascontiguousarray(packed).view(np.dtype((np.void, packed.shape[1]))).ravel()
+        _, first, inverse = np.unique(keys, return_index=True, return_inverse=True)
+        counts = np.bincount(inverse.ravel(), weights=occurrences).astype(np.int64)
+        order = np.argsort(energies[first], kind='stable')
+        return cls(
+            reads[first[order]], np.asarray(energies, dtype=np.float64)[first[order]],
+            counts[order], variable_names, info
+        )
+
+    @classmethod
+    def concatenate(cls, sets: List['SampleSet']) -> 'SampleSet':
+        """Merge sample sets of the same model (occurrences are summed)."""
+        info = dict(sets[0].info)
+        info['chunks'] = len(sets)
+        info['stopped'] = any(s.info.get('stopped', False) for s in sets)
+        return cls.from_reads(
+            np.vstack([s.samples for s in sets]),
+            np.concatenate([s.energies for s in sets]),
+            np.concatenate([s.num_occurrences for s in sets]),
+            sets[0].variable_names,
+            info
+        )
+
+    def __len__(self) -> int:
+        return len(self.energies)
+
+    @property
+    def num_reads(self) -> int:
+        """Total number of reads aggregated into this set."""
+        return int(self.num_occurrences.sum())
+
+    @property
+    def first(self) -> Tuple[np.ndarray, float, int]:
+        """Lowest-energy sample with its energy and occurrence count."""
+        return self.samples[0], float(self.energies[0]), int(self.num_occurrences[0])
+
+    def data(self, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Samples as dicts (named when variable names are known), lowest energy first."""
+        names = self.variable_names
+        records = []
+        for sample, energy, count in zip(
+            self.samples[:limit], self.energies[:limit], self.num_occurrences[:limit]
+        ):
+            values = sample.tolist()
+            records.append({
+                'sample': dict(zip(names, values)) if names else values,
+                'energy': float(energy),
+                'num_occurrences': int(count)
+            })
+        return records
+
+
+class CouplingPlan:
+    """
+    Symmetric couplings of a QUBO prepared for batched local fields.
+
+    States are stored variables-major, X[i, r] for variable i of read r.
+    The local field F[i, r] = linear[i] + Σ_j Q_ij X[j, r] gives the
+    energy change (1 - 2 X[i, r]) F[i, r] of flipping x_i. Fields are
+    kept up to date as variables flip: through a dense coupling matrix
+    when the couplings are dense enough, otherwise through segmented
+    sums over the CSR rows of the flipped variables.
+    """
+
+    def __init__(self, qubo: SparseQUBO):
+        n = qubo.num_variables
+        self.n = n
+        self.linear = qubo.linear.astype(np.float64)
+        self.adjacency = qubo.adjacency()
+        nnz = self.adjacency.nnz
+        self.dense = (
+            n > 0 and nnz >= DENSE_FRACTION * n * n and n * n * 8 <= DENSE_MAX_BYTES
+        )
+        self.matrix = self.adjacency.to_dense() if self.dense else None
+        self.classes = self._color_classes()
+        self._segments = None if self.dense else [self._segment(members) for members in self.classes]
+
+    def _color_classes(self) -> List[np.ndarray]:
+        """Greedy coloring, highest degree first; no two coupled variables share a class."""
+        adjacency = self.adjacency
+        degree = np.diff(adjacency.indptr)
+        color = np.full(self.n, -1, dtype=np.int64)
+        for i in np.argsort(-degree, kind='stable').tolist():
+            idx, _ = adjacency.row(i)
+            taken = set(color[idx].tolist())
+            c = 0
+            while c in taken:
+                c += 1
+            color[i] = c
+        return [np.flatnonzero(color == c) for c in range(int(color.max(initial=-1)) + 1)]
+
+    def fields(self, X: np.ndarray) -> np.ndarray:
+        """Local fields of a batch of states (n, reads)."""
+        if self.dense:
+            return self.linear[:, None] + self.matrix @ X
+        F = np.repeat(self.linear[:, None], X.shape[1], axis=1)
+        for k, members in enumerate(self.classes):
+            self.apply(F, k, X[members])
+        return F
+
+    def apply(self, F: np.ndarray, k: int, delta: np.ndarray) -> None:
+        """Update fields for value changes ``delta`` (class size, reads) of color class k."""
+        if self.dense:
+            F += self.matrix[:, self.classes[k]] @ delta
+            return
+        segment = self._segments[k]
+        if segment[0] == 'padded':
+            _, source, values, targets = segment
+            F[targets] += np.einsum('tw,twr->tr', values, delta[source])
+        elif segment[0] == 'segmented':
+            _, source, values, starts, targets = segment
+            F[targets] += np.add.reduceat(delta[source] * values[:, None], starts, axis=0)
+
+    def _segment(self, members: np.ndarray) -> Tuple[Any, ...]:
+        """
+        Coupling entries of ``members`` grouped by the variable they act on.
+
+        Unless degrees are very skewed the groups are padded to equal
+        width (one gather and one contraction per update, much faster
+        than a segmented reduction); otherwise entries are sorted by
+        target and reduced segment by segment.
+        """
+        adjacency = self.adjacency
+        lengths = np.diff(adjacency.indptr)[members]
+        if not lengths.sum():
+            return ('empty',)
+        source = np.repeat(np.arange(members.size), lengths)
+        entries = np.concatenate(
+            [np.arange(adjacency.indptr[i], adjacency.indptr[i + 1]) for i in members.tolist()]
+        )
+        target = adjacency.indices[entries].astype(np.int64)
+        order = np.argsort(target, kind='stable')
+        target, source, values = target[order], source[order], adjacency.data[entries][order]
+        starts = np.flatnonzero(np.r_[True, target[1:] != target[:-1]])
+        counts = np.diff(np.r_[starts, target.size])
+
+        width = int(counts.max())
+        if starts.size * width <= PADDING_LIMIT * target.size:
+            group = np.repeat(np.arange(starts.size), counts)
+            slot = np.arange(target.size) - np.repeat(starts, counts)
+            padded_source = np.zeros((starts.size, width), dtype=np.int64)
+            padded_values = np.zeros((starts.size, width))
+            padded_source[group, slot] = source
+            padded_values[group, slot] = values
+            return ('padded', padded_source, padded_values, target[starts])
+        return ('segmented', source, values, starts, target[starts])
+
+    def flip_rows(self, F: np.ndarray, reads: np.ndarray, variables: np.ndarray, delta: np.ndarray) -> None:
+        """Update fields for one flipped variable per read (tabu moves)."""
+        if self.dense:
+            F[:, reads] += self.matrix[:, variables] * delta
+            return
+        indptr = self.adjacency.indptr
+        lengths = indptr[variables + 1] - indptr[variables]
+        read_ids = np.repeat(reads, lengths)
+        offsets = np.arange(lengths.sum()) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+        entries = np.repeat(indptr[variables], lengths) + offsets
+        np.add.at(
+            F, (self.adjacency.indices[entries], read_ids),
+            np.repeat(delta, lengths) * self.adjacency.data[entries]
+        )
+
+
+def default_beta_range(qubo: SparseQUBO) -> Tuple[float, float]:
+    """
+    Inverse temperatures for annealing.
+
+    Hot: the largest possible flip is accepted with probability 1/2.
+    Cold: the smallest nonzero coefficient is accepted with probability 1/100.
+    """
+    coefficients = np.abs(np.concatenate([qubo.linear, qubo.vals]))
+    coefficients = coefficients[coefficients > 0]
+    if not coefficients.size:
+        return 0.1, 1.0
+    largest = np.abs(qubo.linear) + np.bincount(
+        np.concatenate([qubo.rows, qubo.cols]),
+        weights=np.abs(np.concatenate([qubo.vals, qubo.vals])),
+        minlength=qubo.num_variables
+    )
+    hot = np.log(2.0) / largest.max()
+    cold = np.log(100.0) / coefficients.min()
+    return float(hot), float(max(cold, hot))
+
+
+def simulated_annealing(
+    qubo: SparseQUBO,
+    num_reads: int,
+    num_sweeps: int = 1000,
+    beta_range: Optional[Tuple[float, float]] = None,
+    seed: Optional[int] = None,
+    plan: Optional[CouplingPlan] = None,
+    stop: Optional[Callable[[], bool]] = None
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Metropolis annealing of ``num_reads`` independent reads at once.
+
+    Each sweep visits every color class; all reads and all variables of
+    the class are proposed together. Betas follow a geometric schedule,
+    and zero-temperature sweeps at the end leave every read in a local
+    minimum. ``stop`` is checked after every sweep; when it returns True
+    the current states are returned.
+
+    Returns:
+        Final states (num_reads, n) as int8 and their energies
+    """
+    plan = plan or CouplingPlan(qubo)
+    rng = np.random.default_rng(seed)
+    X = rng.integers(0, 2, size=(plan.n, num_reads)).astype(np.float64)
+    F = plan.fields(X)
+    hot, cold = beta_range or default_beta_range(qubo)
+
+    schedule = np.geomspace(hot, cold, max(num_sweeps, 1))
+    sweep = 0
+    while True:
+        # Annealing sweeps, then zero-temperature sweeps until no read moves
+        beta = schedule[sweep] if sweep < schedule.size else np.inf
+        moved = False
+        for k, members in enumerate(plan.classes):
+            step = 1.0 - 2.0 * X[members]
+            delta_energy = step * F[members]
+            if np.isfinite(beta):
+                accept = rng.random(delta_energy.shape) < np.exp(-beta * np.maximum(delta_energy, 0.0))
+            else:
+                accept = delta_energy < -1e-12
+                moved = moved or bool(accept.any())
+            delta = step * accept
+            X[members] += delta
+            plan.apply(F, k, delta)
+        sweep += 1
+        if sweep > schedule.size and (not moved or sweep > schedule.size + plan.n):
+            break
+        if stop is not None and stop():
+            break
+
+    return X.T.astype(np.int8), qubo.energy(X.T)
+
+
+def tabu_search(
+    qubo: SparseQUBO,
+    num_reads: int,
+    num_iterations: int = 1000,
+    tenure: Optional[int] = None,
+    seed: Optional[int] = None,
+    plan: Optional[CouplingPlan] = None,
+    stop: Optional[Callable[[], bool]] = None
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Best-improvement tabu search of ``num_reads`` independent reads at once.
+
+    Every iteration each read flips its best non-tabu variable (a tabu
+    flip is allowed when it beats the read's best energy); a flipped
+    variable stays tabu for ``tenure`` iterations. ``stop`` is checked
+    after every iteration.
+
+    Returns:
+        Best state of every read (num_reads, n) as int8 and its energy
+    """
+    plan = plan or CouplingPlan(qubo)
+    n = plan.n
+    rng = np.random.default_rng(seed)
+    if tenure is None:
+        tenure = min(20, n // 4)
+    X = rng.integers(0, 2, size=(n, num_reads)).astype(np.float64)
+    F = plan.fields(X)
+    energy = qubo.energy(X.T)
+    best, best_energy = X.copy(), energy.copy()
+    tabu_until = np.zeros((n, num_reads), dtype=np.int64)
+    reads = np.arange(num_reads)
+
+    for iteration in range(num_iterations if n else 0):
+        step = 1.0 - 2.0 * X
+        delta_energy = step * F
+        allowed = (tabu_until <= iteration) | (
+            energy + delta_energy < best_energy - 1e-12
+        )
+        masked = np.where(allowed, delta_energy, np.inf)
+        choice = np.argmin(masked, axis=0)
+        moving = np.isfinite(masked[choice, reads])
+        active, variables = reads[moving], choice[moving]
+
+        delta = step[variables, active]
+        X[variables, active] += delta
+        energy[active] += delta_energy[variables, active]
+        tabu_until[variables, active] = iteration + 1 + tenure
+        plan.flip_rows(F, active, variables, delta)
+
+        improved = energy < best_energy - 1e-12
+        best[:, improved] = X[:, improved]
+        best_energy[improved] = energy[improved]
+        if stop is not None and stop():
+            break
+
+    return best.T.astype(np.int8), qubo.energy(best.T)
+
+
+def sample_qubo(
+    qubo: SparseQUBO,
+    method: str,
+    num_reads: int,
+    options: Dict[str, Any],
+    seed: Optional[int] = None,
+    deadline: Optional[float] = None,
+    cancel: Sequence[Any] = ()
+) -> SampleSet:
+    """
+    Draw ``num_reads`` reads with one method (worker-process entry point).
+
+    Args:
+        qubo: Model to sample
+        method: 'sa' (simulated annealing) or 'tabu'
+        num_reads: Reads to draw
+        options: num_sweeps and beta_range (sa), num_iterations and
+            tenure (tabu)
+        seed: Random seed
+        deadline: time.monotonic() value after which the reads stop
+            where they are (the clock is system-wide, so a deadline set
+            in the parent holds in worker processes)
+        cancel: Flags (anything with ``is_set()``) that stop the reads
+    """
+    start = time.monotonic()
+    stopped = []
+
+    def stop() -> bool:
+        if (deadline is not None and time.monotonic() >= deadline) or any(
+                flag.is_set() for flag in cancel):
+            stopped.append(True)
+            return True
+        return False
+
+    if method == 'sa':
+        reads, energies = simulated_annealing(
+            qubo, num_reads, options.get('num_sweeps', 1000), options.get('beta_range'), seed,
+            stop=stop
+        )
+    elif method == 'tabu':
+        reads, energies = tabu_search(
+            qubo, num_reads, options.get('num_iterations', 1000), options.get('tenure'), seed,
+            stop=stop
+        )
+    else:
+        raise ValueError(f"Unknown sampling method: {method}")
+    return SampleSet.from_reads(
+        reads, energies, variable_names=qubo.variable_names,
+        info={'method': method, 'elapsed': time.monotonic() - start, 'stopped': bool(stopped)}
+    )
+
+
+class QUBOSampler:
+    """
+    Local QUBO sampler registered as a QC gateway provider.
+
+    Reads are split into chunks of at least ``min_chunk_reads``, one per
+    worker process (at most ``workers``), and the chunks' sample sets are
+    merged. With a single chunk the sampler runs on a thread.
+    """
+
+    def __init__(self, config: Optional[Dict[str, Any]] = None):
+        """
+        Initialize sampler with configuration.
+
+        Args:
+            config: Configuration with method ('sa' or 'tabu'), num_reads,
+                num_sweeps, beta_range, num_iterations, tenure, workers,
+                min_chunk_reads and seed
+        """
+        config = config or {}
+        self.method = config.get('method', 'sa')
+        self.num_reads = config.get('num_reads', 1000)
+        self.options = {
+            'num_sweeps': config.get('num_sweeps', 1000),
+            'beta_range': config.get('beta_range'),
+            'num_iterations': config.get('num_iterations', 1000),
+            'tenure': config.get('tenure')
+        }
+        self.workers = max(1, int(config.get('workers', 1)))
+        self.min_chunk_reads = max(1, int(config.get('min_chunk_reads', 64)))
+        self.seed = config.get('seed')
+        self._pool = None
+        self._stop_flags = None
+        self._free_slots = []
+        self._slot_lock = threading.Lock()
+        self._stats = {'samples': 0, 'reads': 0, 'chunks': 0, 'stopped': 0, 'sampling_time': 0.0}
+
+        if self.method not in ('sa', 'tabu'):
+            raise ValueError(f"Unknown sampling method: {self.method}")
+
+    async def sample(
+        self,
+        qubo: SparseQUBO,
+        num_reads: Optional[int] = None,
+        method: Optional[str] = None,
+        on_chunk: Optional[Callable[[SampleSet], None]] = None,
+        time_limit: Optional[float] = None,
+        cancel_event: Optional[threading.Event] = None
+    ) -> SampleSet:
+        """
+        Sample a QUBO.
+
+        Reads stop where they are at ``time_limit`` or once
+        ``cancel_event`` is set, and the states reached so far are
+        returned (``info['stopped']``). Cancelling the awaiting task stops
+        the worker chunks too: queued chunks are dropped and running ones
+        stop at their next sweep.
+
+        Args:
+            qubo: Model to sample
+            num_reads: Reads to draw (default: configured num_reads)
+            method: Override of the configured method
+            on_chunk: Called with each worker chunk's sample set as it
+                completes (multi-chunk runs only)
+            time_limit: Seconds before the reads stop
+            cancel_event: Event that stops the reads when set
+
+        Returns:
+            SampleSet over all reads
+        """
+        start = time.monotonic()
+        deadline = start + time_limit if time_limit else None
+        num_reads = int(num_reads or self.num_reads)
+        method = method or self.method
+        chunks = max(1, min(self.workers, num_reads // self.min_chunk_reads))
+        sizes = np.full(chunks, num_reads // chunks)
+        sizes[:num_reads % chunks] += 1
+        seeds = np.random.SeedSequence(self.seed).generate_state(chunks).tolist()
+
+        if chunks == 1:
+            stop = threading.Event()
+            cancel = (stop,) if cancel_event is None else (stop, cancel_event)
+            try:
+                sampleset = await asyncio.to_thread(
+                    sample_qubo, qubo, method, num_reads, self.options, seeds[0], deadline, cancel
+                )
+            except asyncio.CancelledError:
+                stop.set()
+                raise
+        else:
+            sampleset = SampleSet.concatenate(await self._sample_chunks(
+                qubo, method, sizes, seeds, deadline, cancel_event, on_chunk
+            ))
+
+        elapsed = time.monotonic() - start
+        sampleset.info.update({'num_reads': num_reads, 'workers': chunks, 'elapsed': elapsed})
+        self._stats['samples'] += 1
+        self._stats['reads'] += num_reads
+        self._stats['chunks'] += chunks
+        self._stats['sampling_time'] += elapsed
+        if sampleset.info['stopped']:
+            self._stats['stopped'] += 1
+        return sampleset
+
+    async def _sample_chunks(
+        self,
+        qubo: SparseQUBO,
+        method: str,
+        sizes: np.ndarray,
+        seeds: List[int],
+        deadline: Optional[float],
+        cancel_event: Optional[threading.Event],
+        on_chunk: Optional[Callable[[SampleSet], None]]
+    ) -> List[SampleSet]:
+        """
+        Run the chunks on the worker processes.
+
+        The chunks of one request share a stop-flag slot; it is raised on
+        cancellation and returned to the free list only once every chunk
+        has actually finished, so a slot is never reused under a chunk
+        that is still running.
+        """
+        pool = self._executor()
+        with self._slot_lock:
+            slot = self._free_slots.pop() if self._free_slots else None
+        cancel = (_StopFlag(slot),) if slot is not None else ()
+        futures = [
+            pool.submit(sample_qubo, qubo, method, int(size), self.options, seed, deadline, cancel)
+            for size, seed in zip(sizes, seeds)
+        ]
+        if slot is not None:
+            remaining = [len(futures)]
+            flags, free = self._stop_flags, self._free_slots
+
+            def release(_):
+                with self._slot_lock:
+                    remaining[0] -= 1
+                    if remaining[0] == 0:
+                        flags[slot] = 0
+                        free.append(slot)
+
+            for future in futures:
+                future.add_done_callback(release)
+
+        pending = {asyncio.wrap_future(future) for future in futures}
+        try:
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, timeout=0.05, return_when=asyncio.FIRST_COMPLETED
+                )
+                if on_chunk is not None:
+                    for completed in done:
+                        on_chunk(completed.result())
+                if cancel_event is not None and cancel_event.is_set() and slot is not None:
+                    self._stop_flags[slot] = 1
+        except asyncio.CancelledError:
+            if slot is not None:
+                self._stop_flags[slot] = 1
+            for future in futures:
+                future.cancel()
+            raise
+        return [future.result() for future in futures]
+
+    def _executor(self) -> concurrent.futures.ProcessPoolExecutor:
+        """Worker processes, started on first multi-chunk request."""
+        if self._pool is None:
+            context = process_context()
+            self._stop_flags = context.RawArray('b', STOP_SLOTS)
+            self._free_slots = list(range(STOP_SLOTS))
+            self._pool = concurrent.futures.ProcessPoolExecutor(
+                max_workers=self.workers, mp_context=context,
+                initializer=_init_worker, initargs=(self._stop_flags,)
+            )
+        return self._pool
+
+    def close(self) -> None:
+        """
+        Stop the worker processes without blocking.
+
+        Queued chunks are dropped and running ones are told to stop; the
+        processes exit on their own once their current sweep ends.
+        """
+        if self._pool is not None:
+            for slot in range(STOP_SLOTS):
+                self._stop_flags[slot] = 1
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """Get sampling statistics."""
+        return dict(self._stats, method=self.method, workers=self.workers)
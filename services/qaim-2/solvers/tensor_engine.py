@@ -0,0 +1,642 @@
+"""
+Tensor Engine — CP/Tucker Decomposition for the QB Tensor Method
+
+Solves binary problems through a low-rank decomposition of their cubic
+(CB×CB×CB) form. The QUBO energy is homogenized with a constant
+coordinate y = (1, x), so E(x) = Σ T_ijk y_i y_j y_k for a sparse,
+symmetric 3-way tensor T that is stored in COO form and never densified.
+CP-ALS or Tucker-HOOI factor columns are rounded to candidate
+assignments, which are polished by greedy descent on the penalized
+objective.
+
+TFA Layer: QB (Cubic Bit)
+"""
+
+from typing import Dict, Any, List, Optional, Sequence, Tuple
+import time
+
+import numpy as np
+
+try:
+    from ..bridges.canonical import CSRMatrix, SENSE_LE, SENSE_GE
+    from ..bridges.qubo import SparseQUBO
+except ImportError:
+    from bridges.canonical import CSRMatrix, SENSE_LE, SENSE_GE
+    from bridges.qubo import SparseQUBO
+
+
+class SparseTensor:
+    """
+    Sparse 3-way tensor in COO form.
+
+    Entries are sorted per mode on first use, so MTTKRP and TTMc reduce
+    all rank columns of a mode with one segmented sum.
+    """
+
+    __slots__ = ('indices', 'values', 'shape', '_segments')
+
+    def __init__(
+        self,
+        indices: Sequence[np.ndarray],
+        values: np.ndarray,
+        shape: Tuple[int, int, int]
+    ):
+        self.indices = tuple(np.asarray(ix, dtype=np.int64) for ix in indices)
+        self.values = np.asarray(values, dtype=np.float64)
+        self.shape = tuple(int(dim) for dim in shape)
+        self._segments = [None, None, None]
+
+    @classmethod
+    def from_qubo(cls, qubo: SparseQUBO) -> 'SparseTensor':
+        """
+        Symmetric cubic form of a QUBO over y = (1, x).
+
+        The offset sits at (0, 0, 0); each linear term is spread over the 3
+        placements of (0, 0, i) and each coupling over the 6 permutations
+        of (0, i, j), so T(y, y, y) equals the QUBO energy.
+        """
+        n = qubo.num_variables
+        linear = np.flatnonzero(qubo.linear)
+        lin_idx = linear + 1
+        lin_val = qubo.linear[linear] / 3.0
+        zeros_l = np.zeros_like(lin_idx)
+        qi, qj = qubo.rows + 1, qubo.cols + 1
+        q_val = qubo.vals / 6.0
+        zeros_q = np.zeros_like(qi)
+
+        parts = [((np.zeros(1, dtype=np.int64),) * 3, np.array([qubo.offset]))]
+        for placement in (
+            (zeros_l, zeros_l, lin_idx), (zeros_l, lin_idx, zeros_l), (lin_idx, zeros_l, zeros_l)
+        ):
+            parts.append((placement, lin_val))
+        for placement in (
+            (zeros_q, qi, qj), (zeros_q, qj, qi), (qi, zeros_q, qj),
+            (qj, zeros_q, qi), (qi, qj, zeros_q), (qj, qi, zeros_q)
+        ):
+            parts.append((placement, q_val))
+
+        values = np.concatenate([v for _, v in parts])
+        keep = values != 0.0
+        indices = [
+            np.concatenate([p[mode] for p, _ in parts])[keep] for mode in range(3)
+        ]
+        return cls(indices, values[keep], (n + 1,) * 3)
+
+    @property
+    def nnz(self) -> int:
+        """Number of stored entries."""
+        return int(self.values.size)
+
+    def norm(self) -> float:
+        """Frobenius norm."""
+        return float(np.sqrt(self.values @ self.values))
+
+    def dense_nbytes(self) -> int:
+        """Bytes a dense float64 copy would need."""
+        return 8 * self.shape[0] * self.shape[1] * self.shape[2]
+
+    def contract(self, y: np.ndarray) -> float:
+        """T(y, y, y) for one vector."""
+        i, j, k = self.indices
+        return float(self.values @ (y[i] * y[j] * y[k]))
+
+    def sample(self, size: int, rng: np.random.Generator) -> 'SparseTensor':
+        """
+        Importance-sampled sketch with ``size`` draws.
+
+        Entries are drawn with probability proportional to |value| and
+        rescaled, so the sketch is an unbiased estimate of the tensor.
+        """
+        magnitude = np.abs(self.values)
+        p = magnitude / magnitude.sum()
+        draw = rng.choice(self.nnz, size=size, p=p)
+        return SparseTensor(
+            [ix[draw] for ix in self.indices],
+            self.values[draw] / (size * p[draw]),
+            self.shape
+        )
+
+    def mttkrp(self, factors: Sequence[np.ndarray], mode: int) -> np.ndarray:
+        """
+        Matricized tensor times Khatri-Rao product for one mode.
+
+        All rank columns are computed in one batched kernel: entry
+        products (nnz × rank) reduced per mode index.
+        """
+        a, b = [m for m in range(3) if m != mode]
+        indices, values, rows, starts = self._segment(mode)
+        products = values[:, None] * factors[a][indices[a]] * factors[b][indices[b]]
+        return self._reduce(products, mode, rows, starts)
+
+    def ttmc(self, factors: Sequence[np.ndarray], mode: int) -> np.ndarray:
+        """
+        Tensor times matrix chain over the other two modes (Tucker kernel).
+
+        Returns:
+            (shape[mode], r_a * r_b) matrix
+        """
+        a, b = [m for m in range(3) if m != mode]
+        indices, values, rows, starts = self._segment(mode)
+        fa = factors[a][indices[a]]
+        fb = factors[b][indices[b]]
+        products = (values[:, None, None] * fa[:, :, None] * fb[:, None, :]).reshape(
+            values.size, -1
+        )
+        return self._reduce(products, mode, rows, starts)
+
+    def _reduce(
+        self,
+        products: np.ndarray,
+        mode: int,
+        rows: np.ndarray,
+        starts: np.ndarray
+    ) -> np.ndarray:
+        """Sum entry rows into their mode index (one segmented reduction)."""
+        out = np.zeros((self.shape[mode], products.shape[1]))
+        if products.shape[0]:
+            out[rows] = np.add.reduceat(products, starts, axis=0)
+        return out
+
+    def _segment(self, mode: int) -> Tuple[Tuple[np.ndarray, ...], np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Entries sorted by their mode index (indices, values), the distinct
+        mode indices and their segment starts; cached per mode.
+        """
+        if self._segments[mode] is None:
+            order = np.argsort(self.indices[mode], kind='stable')
+            indices = tuple(ix[order] for ix in self.indices)
+            keys = indices[mode]
+            starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]]) if keys.size else keys
+            self._segments[mode] = (indices, self.values[order], keys[starts], starts)
+        return self._segments[mode]
+
+
+def cp_als(
+    tensor: SparseTensor,
+    rank: int,
+    max_iterations: int = 100,
+    tolerance: float = 1e-6,
+    seed: int = 0,
+    sketch_size: Optional[int] = None,
+    deadline: Optional[float] = None
+) -> Dict[str, Any]:
+    """
+    CP decomposition by alternating least squares.
+
+    Args:
+        tensor: Sparse tensor
+        rank: Number of rank-one components
+        max_iterations: ALS sweeps
+        tolerance: Stop when the fit changes by less than this
+        seed: Initialization seed
+        sketch_size: If set, every sweep works on an importance-sampled
+            sketch of this many entries (randomized ALS)
+        deadline: time.monotonic() value after which no sweep starts
+
+    Returns:
+        Dictionary with factors (unit columns), weights, fit, history,
+        iterations and converged
+    """
+    rng = np.random.default_rng(seed)
+    factors = [_unit_columns(rng.standard_normal((dim, rank)))[0] for dim in tensor.shape]
+    weights = np.ones(rank)
+    norm = tensor.norm() or 1.0
+    fit = 0.0
+    history = []
+    converged = False
+    iterations = 0
+
+    while iterations < max_iterations and not _expired(deadline):
+        iterations += 1
+        sample = tensor.sample(sketch_size, rng) if sketch_size else tensor
+        for mode in range(3):
+            a, b = [m for m in range(3) if m != mode]
+            gram = (factors[a].T @ factors[a]) * (factors[b].T @ factors[b])
+            mttkrp = sample.mttkrp(factors, mode)
+            factors[mode], weights = _unit_columns(mttkrp @ np.linalg.pinv(gram))
+
+        # ||T - X||² = ||T||² - 2<T, X> + ||X||², with <T, X> from the last
+        # MTTKRP (exact) or from a held-out sketch (a sketch the sweep fitted
+        # would overstate the fit)
+        if sketch_size:
+            mttkrp = tensor.sample(sketch_size, rng).mttkrp(factors, 2)
+        inner = float(weights @ np.einsum('ir,ir->r', mttkrp, factors[2]))
+        gram = (factors[0].T @ factors[0]) * (factors[1].T @ factors[1]) * (factors[2].T @ factors[2])
+        residual = norm * norm - 2.0 * inner + float(weights @ gram @ weights)
+        previous, fit = fit, 1.0 - np.sqrt(max(residual, 0.0)) / norm
+        history.append(fit)
+        if abs(fit - previous) < tolerance:
+            converged = True
+            break
+
+    return {
+        'factors': factors,
+        'weights': weights,
+        'fit': float(fit),
+        'history': history,
+        'iterations': iterations,
+        'converged': converged
+    }
+
+
+def tucker_hooi(
+    tensor: SparseTensor,
+    ranks: Sequence[int],
+    max_iterations: int = 100,
+    tolerance: float = 1e-6,
+    seed: int = 0,
+    sketch_size: Optional[int] = None,
+    deadline: Optional[float] = None
+) -> Dict[str, Any]:
+    """
+    Tucker decomposition by higher-order orthogonal iteration.
+
+    Each mode's factor is the leading left singular subspace of the TTMc
+    with the other two factors. Arguments and results as cp_als(), with
+    per-mode ``ranks`` and a ``core`` instead of weights.
+    """
+    rng = np.random.default_rng(seed)
+    ranks = [max(1, min(int(r), dim)) for r, dim in zip(ranks, tensor.shape)]
+    factors = [
+        np.linalg.qr(rng.standard_normal((dim, r)))[0] for dim, r in zip(tensor.shape, ranks)
+    ]
+    norm = tensor.norm() or 1.0
+    core = np.zeros(ranks)
+    fit = 0.0
+    history = []
+    converged = False
+    iterations = 0
+
+    while iterations < max_iterations and not _expired(deadline):
+        iterations += 1
+        sample = tensor.sample(sketch_size, rng) if sketch_size else tensor
+        for mode in range(3):
+            projected = sample.ttmc(factors, mode)
+            left = np.linalg.svd(projected, full_matrices=False)[0]
+            factors[mode] = left[:, :ranks[mode]]
+
+        # Orthonormal factors: ||T - X||² = ||T||² - ||G||² (G from a
+        # held-out sketch in randomized mode)
+        if sketch_size:
+            projected = tensor.sample(sketch_size, rng).ttmc(factors, 2)
+        core = (factors[2].T @ projected).reshape(ranks[2], ranks[0], ranks[1]).transpose(1, 2, 0)
+        core_norm = float(np.sqrt(np.sum(core * core)))
+        previous, fit = fit, 1.0 - np.sqrt(max(norm * norm - core_norm * core_norm, 0.0)) / norm
+        history.append(fit)
+        if abs(fit - previous) < tolerance:
+            converged = True
+            break
+
+    return {
+        'factors': factors,
+        'core': core,
+        'fit': float(fit),
+        'history': history,
+        'iterations': iterations,
+        'converged': converged
+    }
+
+
+class TensorEngine:
+    """
+    QB tensor-method solver over the sparse cubic form of a QUBO.
+
+    The decomposition runs exactly on all nonzeros while a dense n³ copy
+    of the tensor would fit in ``memory_budget_mb``; beyond that (and
+    when the tensor has more than ``sketch_size`` nonzeros) every sweep
+    uses an importance-sampled sketch instead.
+    """
+
+    def __init__(self, config: Optional[Dict[str, Any]] = None):
+        """
+        Initialize tensor engine with configuration.
+
+        Args:
+            config: Configuration with format ('cp' or 'tucker'), rank,
+                memory_budget_mb, sketch_size, restarts (candidates that
+                are polished by local search), max_flips_per_variable,
+                pair_candidates, feasibility_tolerance and seed
+        """
+        config = config or {}
+        self.format = config.get('format', 'cp')
+        self.rank = config.get('rank', 8)
+        self.memory_budget = int(config.get('memory_budget_mb', 512) * 2 ** 20)
+        self.sketch_size = config.get('sketch_size', 200000)
+        self.restarts = config.get('restarts', 16)
+        self.max_flips_per_variable = config.get('max_flips_per_variable', 10)
+        self.pair_candidates = config.get('pair_candidates', 32)
+        self.feasibility_tolerance = config.get('feasibility_tolerance', 1e-6)
+        self.seed = config.get('seed', 0)
+
+        if self.format not in ('cp', 'tucker'):
+            raise ValueError(f"Unknown tensor format: {self.format}")
+
+    def solve(
+        self,
+        canonical: Any,
+        qubo: SparseQUBO,
+        params: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """
+        Decompose, round and polish (blocking; run it off the event loop).
+
+        Args:
+            canonical: Canonical problem (objective and feasibility are
+                reported against it)
+            qubo: Its QUBO form from the XFR bridge
+            params: max_iterations, convergence_threshold, time_limit,
+                gap_tolerance, optional warm_start (``start``) and, for
+                submitted jobs, on_incumbent (called with every improving
+                feasible restart) and cancel_event (skips further restarts)
+
+        Returns:
+            Dictionary with status, solution, objective_value, gap,
+            feasible, iterations and metrics['tensor']
+        """
+        start_time = time.monotonic()
+        time_limit = params.get('time_limit')
+        deadline = start_time + time_limit if time_limit else None
+
+        tensor = SparseTensor.from_qubo(qubo)
+        sketched = (
+            tensor.dense_nbytes() > self.memory_budget and tensor.nnz > self.sketch_size
+        )
+        decompose = cp_als if self.format == 'cp' else tucker_hooi
+        decomposition = decompose(
+            tensor,
+            self.rank if self.format == 'cp' else (self.rank,) * 3,
+            max_iterations=params.get('max_iterations', 100),
+            tolerance=params.get('convergence_threshold', 1e-6),
+            seed=self.seed,
+            sketch_size=self.sketch_size if sketched else None,
+            deadline=deadline
+        )
+
+        search = PenaltySearch(canonical, qubo.meta.get('penalty', 1.0), self.pair_candidates)
+        candidates = self._candidates(decomposition['factors'], canonical, params)
+        energies = np.array([search.energy(x) for x in candidates])
+        max_flips = self.max_flips_per_variable * max(canonical.num_variables, 1)
+        on_incumbent = params.get('on_incumbent')
+        cancel_event = params.get('cancel_event')
+        best, best_energy, flips = np.zeros(canonical.num_variables), np.inf, 0
+        for restart, index in enumerate(np.argsort(energies, kind='stable')[:self.restarts]):
+            if restart and cancel_event is not None and cancel_event.is_set():
+                break
+            x, used = search.descend(candidates[index], max_flips, deadline)
+            flips += used
+            energy = search.energy(x)
+            if energy < best_energy:
+                best, best_energy = x, energy
+                if on_incumbent is not None and canonical.max_violation(x) <= self.feasibility_tolerance:
+                    on_incumbent({
+                        'objective_value': canonical.objective_value(x),
+                        'restart': restart,
+                        'solution': {name: float(x[i]) for i, name in enumerate(canonical.names)}
+                    })
+
+        objective = canonical.objective_value(best)
+        feasible = canonical.max_violation(best) <= self.feasibility_tolerance
+        lower_bound = search.lower_bound()
+        value = search.sign * objective
+        gap = max(value - lower_bound, 0.0) / max(abs(value), abs(lower_bound), 1e-9)
+        if not feasible:
+            status = 'infeasible'
+        elif gap <= params.get('gap_tolerance', 0.01):
+            status = 'optimal'
+        else:
+            status = 'feasible'
+
+        return {
+            'status': status,
+            'solution': {name: float(best[i]) for i, name in enumerate(canonical.names)},
+            'objective_value': objective,
+            'gap': float(gap),
+            'feasible': bool(feasible),
+            'iterations': decomposition['iterations'],
+            'metrics': {
+                'tensor': {
+                    'format': self.format,
+                    'rank': self.rank,
+                    'mode': 'sketched' if sketched else 'exact',
+                    'shape': list(tensor.shape),
+                    'nnz': tensor.nnz,
+                    'fit': decomposition['fit'],
+                    'converged': decomposition['converged'],
+                    'candidates': int(len(candidates)),
+                    'flips': flips,
+                    'elapsed': time.monotonic() - start_time
+                }
+            }
+        }
+
+    def _candidates(
+        self,
+        factors: List[np.ndarray],
+        canonical: Any,
+        params: Dict[str, Any]
+    ) -> np.ndarray:
+        """
+        0/1 assignments of the original variables rounded from factor columns.
+
+        Every column (over the variable coordinates, skipping the constant
+        and slack coordinates) is rounded by sign and at its median, in
+        both orientations; the all-zero assignment and the warm start (if
+        any) are added.
+        """
+        n = canonical.num_variables
+        columns = np.hstack(factors)[1:n + 1].T
+        rounded = []
+        for oriented in (columns, -columns):
+            rounded.append(oriented > 0)
+            rounded.append(oriented > np.median(oriented, axis=1, keepdims=True))
+        candidates = [np.vstack(rounded).astype(np.float64), np.zeros((1, n))]
+
+        warm_start = params.get('warm_start') or {}
+        start = warm_start.get('start')
+        if start is not None and len(start) == n:
+            candidates.append(
+                (np.nan_to_num(np.asarray(start, dtype=np.float64)) > 0.5).astype(np.float64)[None, :]
+            )
+        return np.vstack(candidates)
+
+
+class PenaltySearch:
+    """
+    Greedy descent over 0/1 values of the original variables.
+
+    Minimizes the objective (as minimization) plus ``penalty`` times the
+    squared violation of every linear row. This is the QUBO energy with
+    the slack bits minimized out, so a move never has to re-encode a
+    slack; flipping variables one at a time through binary slack
+    encodings would stall at the first feasible point.
+    """
+
+    def __init__(self, canonical: Any, penalty: float, pair_candidates: int = 32):
+        n = canonical.num_variables
+        m = canonical.num_constraints
+        self.n = n
+        self.sign = 1.0 if canonical.sense == 'minimize' else -1.0
+        self.penalty = float(penalty)
+        self.pair_candidates = pair_candidates
+        self.constant = self.sign * canonical.obj_constant
+
+        # Objective: x_i * x_i = x_i for 0/1 values
+        qi, qj, qv = canonical.obj_quad
+        diag = qi == qj
+        self.linear = self.sign * canonical.objective.astype(np.float64)
+        np.add.at(self.linear, qi[diag], self.sign * qv[diag])
+        off = ~diag
+        self.coupling = CSRMatrix.from_coo(
+            np.concatenate([qi[off], qj[off]]),
+            np.concatenate([qj[off], qi[off]]),
+            self.sign * np.concatenate([qv[off], qv[off]]),
+            (n, n)
+        )
+
+        # Linear rows the QUBO penalizes, with column access for flip deltas
+        active = canonical.row_parsed.copy()
+        active[canonical.con_quad[0]] = False
+        A = canonical.A
+        keep = active[A.row_ids()]
+        self.rows = CSRMatrix.from_coo(
+            A.row_ids()[keep], A.indices[keep], A.data[keep], (m, n)
+        )
+        self.columns = CSRMatrix.from_coo(
+            A.indices[keep], A.row_ids()[keep], A.data[keep], (n, m)
+        )
+        self.column_ids = self.columns.row_ids()
+        self.rhs = canonical.rhs
+        self.row_sense = canonical.row_sense
+
+    def lower_bound(self) -> float:
+        """Bound on the minimization objective over 0/1 values (constraints dropped)."""
+        return float(
+            self.constant
+            + np.minimum(self.linear, 0.0).sum()
+            + 0.5 * np.minimum(self.coupling.data, 0.0).sum()
+        )
+
+    def energy(self, x: np.ndarray) -> float:
+        """Penalized minimization objective of one assignment."""
+        violation = self._violation(self.rows.dot(x), slice(None))
+        return float(
+            self.constant + self.linear @ x + 0.5 * x @ self.coupling.dot(x)
+            + self.penalty * violation @ violation
+        )
+
+    def descend(
+        self,
+        x: np.ndarray,
+        max_flips: int,
+        deadline: Optional[float]
+    ) -> Tuple[np.ndarray, int]:
+        """
+        Best-improvement descent from x.
+
+        Single flips first; at a single-flip minimum, pairs among the
+        ``pair_candidates`` cheapest flips are tried, so the search can
+        move along tight rows (e.g. swap two variables of a cardinality
+        row).
+        """
+        x = x.copy()
+        activity = self.rows.dot(x)
+        field = self.linear + self.coupling.dot(x)
+        entry_rows = self.columns.indices
+        flips = 0
+
+        while flips < max_flips:
+            step = 1.0 - 2.0 * x
+            before = self._violation(activity, slice(None))[entry_rows]
+            after = self._violation(activity[entry_rows] + step[self.column_ids] * self.columns.data, entry_rows)
+            delta = step * field + self.penalty * np.bincount(
+                self.column_ids, weights=after * after - before * before, minlength=self.n
+            )
+            i = int(np.argmin(delta)) if self.n else 0
+            if self.n and delta[i] < -1e-12:
+                moves = (i,)
+            else:
+                moves = self._best_pair(x, step, delta, field, activity)
+                if moves is None:
+                    break
+            for i in moves:
+                idx, coef = self.columns.row(i)
+                activity[idx] += step[i] * coef
+                idx, coef = self.coupling.row(i)
+                field[idx] += step[i] * coef
+                x[i] += step[i]
+            flips += len(moves)
+            if flips % 256 < len(moves) and _expired(deadline):
+                break
+        return x, flips
+
+    def _best_pair(
+        self,
+        x: np.ndarray,
+        step: np.ndarray,
+        delta: np.ndarray,
+        field: np.ndarray,
+        activity: np.ndarray
+    ) -> Optional[Tuple[int, int]]:
+        """Most improving pair of flips among the cheapest single flips, if any."""
+        k = min(self.pair_candidates, self.n)
+        if k < 2:
+            return None
+        candidates = np.argpartition(delta, k - 1)[:k]
+        s = step[candidates]
+
+        # Objective part: d_i + d_j + s_i s_j Q_ij
+        position = np.full(self.n, -1, dtype=np.int64)
+        position[candidates] = np.arange(k)
+        coupling = np.zeros((k, k))
+        entries = []
+        for a, i in enumerate(candidates):
+            idx, coef = self.coupling.row(i)
+            inside = position[idx] >= 0
+            coupling[a, position[idx[inside]]] = coef[inside]
+            rows, coef = self.columns.row(i)
+            entries.append((rows, coef, np.full(rows.size, a)))
+        objective = (field[candidates] * s)[:, None] + (field[candidates] * s)[None, :]
+        objective += np.outer(s, s) * coupling
+
+        # Penalty part, exact over the rows the candidates touch
+        rows = np.concatenate([e[0] for e in entries])
+        if rows.size:
+            touched, inverse = np.unique(rows, return_inverse=True)
+            block = np.zeros((touched.size, k))
+            block[inverse, np.concatenate([e[2] for e in entries])] = np.concatenate([e[1] for e in entries])
+            block *= s
+            base = activity[touched]
+            before = self._violation(base, touched)
+            after = self._violation(
+                base[:, None, None] + block[:, :, None] + block[:, None, :], touched[:, None, None]
+            )
+            penalty = self.penalty * ((after * after).sum(axis=0) - before @ before)
+        else:
+            penalty = 0.0
+
+        pair_delta = objective + penalty
+        np.fill_diagonal(pair_delta, np.inf)
+        a, b = np.unravel_index(int(np.argmin(pair_delta)), pair_delta.shape)
+        if pair_delta[a, b] >= -1e-12:
+            return None
+        return int(candidates[a]), int(candidates[b])
+
+    def _violation(self, activity: np.ndarray, rows: Any) -> np.ndarray:
+        """Violation of rows (index array, or slice for all) at the given activity."""
+        residual = activity - self.rhs[rows]
+        sense = self.row_sense[rows]
+        return np.where(
+            sense == SENSE_LE, np.maximum(residual, 0.0),
+            np.where(sense == SENSE_GE, np.maximum(-residual, 0.0), residual)
+        )
+
+
+def _unit_columns(matrix: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Columns scaled to unit norm, and their norms (zero columns left as is)."""
+    norms = np.linalg.norm(matrix, axis=0)
+    safe = np.where(norms > 0, norms, 1.0)
+    return matrix / safe, norms
+
+
+def _expired(deadline: Optional[float]) -> bool:
+    return deadline is not None and time.monotonic() >= deadline
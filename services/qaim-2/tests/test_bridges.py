@@ -0,0 +1,604 @@
+"""
+Test QAIM-2 AI Bridges
+
+Tests for PCAN, SM, SP, ARB, XFR and decomposition bridge components.
+"""
+
+import asyncio
+import copy
+import itertools
+import time
+from types import SimpleNamespace
+
+import pytest
+import numpy as np
+
+from bridges.canonical import CanonicalProblem, CSRMatrix, parse_terms
+from bridges.pcan import ProblemCanonicalizer
+from bridges.surrogate_models import SurrogateModels
+from bridges.cross_framework import CrossFrameworkTranslator
+from bridges.strategy_policy import StrategyPolicy
+from bridges.arbitration import Arbitration, ArmWindow
+from bridges.decomposition import ProblemDecomposer, connected_components
+from bridges.runtime_predictor import RuntimePredictor, load_records
+
+
+@pytest.fixture
+def sample_problem():
+    """Sample optimization problem."""
+    return {
+        'problem_type': 'vehicle_routing',
+        'variables': [
+            {'name': 'x1', 'type': 'binary'},
+            {'name': 'x2', 'type': 'binary'},
+            {'name': 'x3', 'type': 'binary'}
+        ],
+        'constraints': [
+            {'type': 'capacity', 'value': 100, 'unit': 'kg', 'sense': '<='}
+        ],
+        'objectives': [
+            {'name': 'minimize_distance', 'sense': 'minimize', 'weight': 1.0}
+        ]
+    }
+
+
+@pytest.mark.asyncio
+async def test_pcan_cache_hits(sample_problem):
+    """Test that identical problems are served from the PCAN cache."""
+    pcan = ProblemCanonicalizer({'cache_size': 10})
+
+    first = await pcan.canonicalize(sample_problem, {'ata_chapter': 'ATA-34'})
+    second = await pcan.canonicalize(dict(sample_problem), {'ata_chapter': 'ATA-34'})
+    other = await pcan.canonicalize(sample_problem, {'ata_chapter': 'ATA-22'})
+
+    assert second is first
+    assert other is not first
+
+    stats = pcan.get_statistics()
+    assert stats['hits'] == 1
+    assert stats['misses'] == 2
+    assert stats['hit_rate'] == pytest.approx(1 / 3)
+
+
+@pytest.mark.asyncio
+async def test_pcan_cache_lru_eviction(sample_problem):
+    """Test that the PCAN cache evicts the least recently used entry."""
+    pcan = ProblemCanonicalizer({'cache_size': 2})
+
+    problems = []
+    for i in range(3):
+        problem = dict(sample_problem)
+        problem['problem_type'] = f'routing_{i}'
+        problems.append(problem)
+
+    await pcan.canonicalize(problems[0])
+    await pcan.canonicalize(problems[1])
+    await pcan.canonicalize(problems[0])  # refresh 0, so 1 is least recent
+    await pcan.canonicalize(problems[2])  # evicts 1
+
+    stats = pcan.get_statistics()
+    assert stats['size'] == 2
+    assert stats['evictions'] == 1
+
+    await pcan.canonicalize(problems[0])
+    assert pcan.get_statistics()['hits'] == 2
+    await pcan.canonicalize(problems[1])
+    assert pcan.get_statistics()['misses'] == 4
+
+
+def test_pcan_fingerprint_is_exact():
+    """Test that arrays are fingerprinted by content and opaque objects bypass the cache."""
+    pcan = ProblemCanonicalizer({'cache_size': 10})
+    a = np.zeros(2000)
+    b = a.copy()
+    b[1000] = 1.0
+
+    assert pcan._fingerprint({'data': a}, None) == pcan._fingerprint({'data': a.copy()}, None)
+    assert pcan._fingerprint({'data': a}, None) != pcan._fingerprint({'data': b}, None)
+    assert pcan._fingerprint({'data': object()}, None) is None
+    assert pcan.get_statistics()['uncacheable'] == 1
+
+
+@pytest.mark.asyncio
+async def test_pcan_canonical_arrays():
+    """Test array-backed canonical problem with CSR constraints."""
+    pcan = ProblemCanonicalizer({'cache_size': 0})
+    problem = {
+        'problem_type': 'resource_allocation',
+        'variables': [
+            {'name': 'x1', 'type': 'binary'},
+            {'name': 'x2', 'type': 'integer', 'upper_bound': 5},
+            'x3'
+        ],
+        'constraints': [
+            {'type': 'linear', 'expression': '2*x1 + 3*x2 - 1', 'sense': '<=', 'rhs': 10},
+            {'type': 'linear', 'coefficients': {'x2': 1, 'x3': -1}, 'sense': '>=', 'value': 0}
+        ],
+        'objectives': [
+            {'name': 'cost', 'coefficients': {'x1': 4, 'x2*x3': 2}, 'sense': 'minimize'},
+            {'name': 'profit', 'expression': 'x3', 'sense': 'maximize', 'weight': 0.5}
+        ]
+    }
+
+    canonical = await pcan.canonicalize(problem)
+
+    assert isinstance(canonical, CanonicalProblem)
+    assert canonical.num_variables == 3
+    assert canonical.upper.tolist() == [1.0, 5.0, np.inf]
+    np.testing.assert_allclose(canonical.A.to_dense(), [[2, 3, 0], [0, 1, -1]])
+    np.testing.assert_allclose(canonical.rhs, [11, 0])
+    np.testing.assert_allclose(canonical.objective, [4, 0, -0.5])
+    np.testing.assert_allclose(canonical.A.dot(np.array([1.0, 1.0, 1.0])), [5, 0])
+
+    # Legacy dict view
+    assert canonical['problem_type'] == 'resource_allocation'
+    assert canonical['variables'][1]['type'] == 'integer'
+    assert canonical['constraints'][1]['sense'] == '>='
+    assert canonical.get('objectives')[1]['name'] == 'profit'
+    assert canonical.content_hash() == canonical.content_hash()
+
+    # Bytes shifted from one array into the next must not collide
+    shifted = [copy.copy(canonical) for _ in range(2)]
+    shifted[0].obj_quad = (np.array([0, 1]), np.array([2]), np.array([1.0]))
+    shifted[1].obj_quad = (np.array([0]), np.array([1, 2]), np.array([1.0]))
+    for problem in shifted:
+        problem._content_hash = None
+    assert shifted[0].content_hash() != shifted[1].content_hash()
+
+
+@pytest.mark.asyncio
+async def test_pcan_flags_unparsed_constraints():
+    """Test rows without a linear/bilinear form are flagged, not silently kept as 0 <= rhs."""
+    pcan = ProblemCanonicalizer({'cache_size': 0})
+    canonical = await pcan.canonicalize({
+        'variables': ['x1', 'x2'],
+        'constraints': [
+            {'expression': 'max(x1,x2)', 'rhs': -1},
+            {'expression': 'x1 + x2', 'rhs': 1}
+        ]
+    })
+
+    assert canonical.row_parsed.tolist() == [False, True]
+    assert canonical.num_unparsed == 1
+    assert canonical['constraints'][0]['parsed'] is False
+
+    qubo = CrossFrameworkTranslator({}).qubo_builder.build(canonical)
+    assert qubo.meta['unparsed_constraints'] == 1
+
+
+def test_parse_terms_expression():
+    """Test parsing of linear/bilinear expression strings."""
+    index = {'x1': 0, 'x2': 1}
+
+    linear, quadratic, constant = parse_terms('-x1 + 2.5*x2 - 3*x1*x2 + 1e1', index)
+    assert linear == [(0, -1.0), (1, 2.5)]
+    assert quadratic == [(0, 1, -3.0)]
+    assert constant == 10.0
+
+    # Free-form expressions are kept opaque
+    assert parse_terms('sum(x[i])', index) is None
+    assert parse_terms('x1 + y', index) is None
+
+    with pytest.raises(ValueError):
+        parse_terms({'y': 1.0}, index)
+
+
+@pytest.mark.asyncio
+async def test_pcan_rejects_problem_without_variables():
+    """Test that problems without decision variables are rejected."""
+    pcan = ProblemCanonicalizer({})
+
+    with pytest.raises(ValueError):
+        await pcan.canonicalize({'problem_type': 'unknown_type'})
+
+
+@pytest.fixture
+def knapsack_problem():
+    """Small knapsack with one capacity and one choice constraint."""
+    return {
+        'problem_type': 'knapsack',
+        'variables': [{'name': f'x{i}', 'type': 'binary'} for i in range(4)],
+        'constraints': [
+            {'type': 'capacity', 'coefficients': {'x0': 2, 'x1': 3, 'x2': 1, 'x3': 2},
+             'sense': '<=', 'rhs': 4},
+            {'type': 'linear', 'expression': 'x0 + x1', 'sense': '=', 'rhs': 1}
+        ],
+        'objectives': [
+            {'name': 'value', 'sense': 'maximize',
+             'coefficients': {'x0': 3, 'x1': 4, 'x2': 2, 'x3': 3}}
+        ]
+    }
+
+
+@pytest.mark.asyncio
+async def test_xfr_sparse_qubo_ground_state(knapsack_problem):
+    """Test that the QUBO ground state is the constrained optimum."""
+    canonical = await ProblemCanonicalizer({}).canonicalize(knapsack_problem)
+    translated = await CrossFrameworkTranslator({}).translate(canonical, 'qc_annealing')
+    qubo = translated['qubo']
+
+    assert qubo.meta['num_slack'] == 3  # capacity slack in [0, 4]
+    assert np.all(qubo.rows < qubo.cols)
+
+    samples = np.array(list(itertools.product([0, 1], repeat=qubo.num_variables)))
+    energies = qubo.energy(samples)
+    best = samples[np.argmin(energies)]
+
+    assert energies.min() == pytest.approx(-6.0)
+    assert qubo.decode(best)['x0'] + qubo.decode(best)['x1'] == 1
+    assert qubo.lower_bound() <= energies.min()
+
+    # Legacy dict export evaluates to the same energy
+    legacy = qubo.to_dict()
+    energy = legacy['offset'] + sum(v * best[i] for i, v in legacy['linear'].items())
+    energy += sum(v * best[i] * best[j] for (i, j), v in legacy['quadratic'].items())
+    assert energy == pytest.approx(energies.min())
+
+
+@pytest.mark.asyncio
+async def test_xfr_qubo_allocates_only_nonzeros():
+    """Test that sparse problems produce sparse QUBO couplings."""
+    n = 2000
+    problem = {
+        'problem_type': 'general_qubo',
+        'variables': [{'name': f'x{i}', 'type': 'binary'} for i in range(n)],
+        'constraints': [
+            {'type': 'linear', 'coefficients': {f'x{i}': 1, f'x{i + 1}': 1},
+             'sense': '=', 'rhs': 1}
+            for i in range(0, n, 2)
+        ],
+        'objectives': [{'name': 'cost', 'coefficients': {f'x{i}': i % 7 for i in range(n)}}]
+    }
+
+    canonical = await ProblemCanonicalizer({}).canonicalize(problem)
+    qubo = (await CrossFrameworkTranslator({}).translate(canonical, 'qc_qaoa'))['qubo']['qubo']
+
+    assert qubo.num_variables == n
+    assert qubo.nnz == n // 2
+
+
+def test_arm_window_sliding_statistics():
+    """Test ring-buffer reward windows keep exact running statistics."""
+    window = ArmWindow(3)
+    for reward in [1.0, 2.0, 3.0, 10.0]:
+        window.push(reward)
+
+    assert window.count == 3
+    assert window.rewards() == [2.0, 3.0, 10.0]
+    assert window.mean == pytest.approx(5.0)
+    assert window.variance == pytest.approx(np.var([2.0, 3.0, 10.0], ddof=1))
+
+
+def test_arbitration_tracks_drift_without_zero_counts():
+    """Test that old rewards slide out and rare arms keep their history."""
+    arb = Arbitration({'algorithm': 'ucb1', 'window_size': 5})
+    context = {'solver_type': 'cb_cbc',
+               'context': {'available_solvers': ['cb_cbc', 'cb_glpk']}}
+
+    arb.update_arm('cb_glpk', -1.0)
+    for _ in range(20):
+        arb.update_arm('cb_cbc', -10.0)
+    for _ in range(5):
+        arb.update_arm('cb_cbc', -0.5)  # CBC got faster
+
+    arms = arb.get_statistics()['arms']
+    assert arms['cb_cbc'] == {'count': 5, 'total_reward': pytest.approx(-2.5),
+                              'avg_reward': pytest.approx(-0.5), 'std_reward': pytest.approx(0.0)}
+    assert arms['cb_glpk']['count'] == 1
+    assert arb.select_arm(context) in ('cb_cbc', 'cb_glpk')
+
+    restored = Arbitration({'window_size': 5})
+    restored.load_state(arb.get_state())
+    assert restored.get_statistics() == arb.get_statistics()
+
+
+@pytest.mark.parametrize('model, good, bad', [
+    ('gaussian', -1.0, -5.0),
+    ('beta', 0.9, 0.1)
+])
+def test_arbitration_thompson_sampling(model, good, bad):
+    """Test that Thompson sampling explores, then favours the better arm."""
+    arb = Arbitration({'algorithm': 'thompson', 'thompson_model': model, 'seed': 7})
+    context = {'solver_type': 'cb_cbc',
+               'context': {'available_solvers': ['cb_cbc', 'cb_glpk']}}
+
+    assert arb.select_arm(context) == 'cb_cbc'
+    arb.update_arm('cb_cbc', bad)
+    assert arb.select_arm(context) == 'cb_glpk'  # unexplored arm first
+
+    rng = np.random.default_rng(0)
+    for _ in range(20):
+        arb.update_arm('cb_cbc', bad + rng.normal(0, 0.05))
+        arb.update_arm('cb_glpk', good + rng.normal(0, 0.05))
+
+    picks = [arb.select_arm(context) for _ in range(50)]
+    assert picks.count('cb_glpk') > 45
+
+
+def test_arbitration_avoids_saturated_pools():
+    """Test that pools at their in-flight limit are skipped while others are free."""
+    arbitration = Arbitration({'algorithm': 'simple', 'pool_limits': {'cb': 2}})
+    context = {
+        'solver_type': 'cb_cbc',
+        'context': {'available_solvers': ['cb_cbc', 'qb_lifted'], 'in_flight': {'cb': 2}}
+    }
+
+    assert arbitration.saturated_pools(context['context']) == ['cb']
+    assert arbitration.select_arm(context) == 'qb_lifted'
+    assert arbitration.rank_arms(context, 2) == ['qb_lifted']
+
+    context['context']['in_flight'] = {'cb': 1}
+    assert arbitration.select_arm(context) == 'cb_cbc'
+
+
+@pytest.mark.asyncio
+async def test_sp_and_arb_respect_qubit_limit():
+    """Test that problems larger than the QAOA simulator are not routed to qc_qaoa."""
+    features = {'structural_features': {'num_variables': 300, 'num_constraints': 10}}
+    policy = StrategyPolicy({'enabled': True, 'exploration_rate': 0.0, 'qc_enabled': True, 'qc_max_qubits': 26})
+    assert (await policy.select_solver(features, {}))[0] == 'qb_lifted'
+    policy = StrategyPolicy({'enabled': True, 'exploration_rate': 0.0, 'qc_enabled': True, 'qc_max_qubits': 400})
+    assert (await policy.select_solver(features, {}))[0] == 'qc_qaoa'
+
+    arbitration = Arbitration({'algorithm': 'simple', 'fallback': 'qb_lifted'})
+    context = {
+        'solver_type': 'qc_qaoa',
+        'features': features,
+        'context': {'available_solvers': ['qb_lifted', 'qc_qaoa'], 'qubit_limit': 26}
+    }
+    assert arbitration.select_arm(context) == 'qb_lifted'
+    assert arbitration.rank_arms(context, 2) == ['qb_lifted']
+
+    context['context']['qubit_limit'] = 400
+    assert arbitration.select_arm(context) == 'qc_qaoa'
+
+
+def test_connected_components_labels_chains_and_isolated_nodes():
+    """Test component labelling over rows and edges (a long chain needs pointer jumping)."""
+    n = 64
+    # Rows k join nodes (k, k+1) for a chain over 0..39; 40..59 by edges; 60..63 isolated
+    chain = np.arange(39)
+    pairs = np.arange(40, 60, 2)
+    groups = np.repeat(chain, 2)
+    nodes = np.stack([chain[::-1], chain[::-1] + 1], 1).ravel()
+    labels = connected_components(n, groups, nodes, (pairs + 1, pairs))
+
+    assert (labels[:40] == 0).all()
+    assert labels[40:60].tolist() == np.repeat(pairs, 2).tolist()
+    assert labels[60:].tolist() == [60, 61, 62, 63]
+
+
+def _block_problem():
+    """Two 2-variable binary blocks linked by one cardinality row."""
+    return CanonicalProblem(
+        'selection', ['a', 'b', 'c', 'd'],
+        np.zeros(4), np.ones(4), np.full(4, 2, dtype=np.int8),
+        np.array([-3.0, -1.0, -2.0, -1.0]),
+        CSRMatrix.from_coo(
+            [0, 0, 1, 1, 2, 2, 2, 2], [0, 1, 2, 3, 0, 1, 2, 3], np.ones(8), (3, 4)
+        ),
+        np.zeros(3, dtype=np.int8), np.array([2.0, 2.0, 2.0])
+    )
+
+
+async def _enumerate_block(index, sub):
+    """Exact block solver by enumeration of binary assignments."""
+    best = None
+    for bits in itertools.product([0.0, 1.0], repeat=sub.num_variables):
+        x = np.array(bits)
+        if (sub.A.dot(x) <= sub.rhs).all():
+            value = float(sub.objective @ x)
+            if best is None or value < best[0]:
+                best = (value, x)
+    return SimpleNamespace(
+        status='optimal',
+        solution=dict(zip(sub.names, best[1].tolist())),
+        metrics={'objective_value': best[0], 'gap': 0.0}
+    )
+
+
+@pytest.mark.asyncio
+async def test_decomposition_block_angular_lagrangian():
+    """Test linking row detection and Lagrangian coordination of the blocks."""
+    canonical = _block_problem()
+    decomposer = ProblemDecomposer({
+        'enabled': True, 'min_variables': 4, 'max_linking_fraction': 0.5, 'step_size': 0.5
+    })
+    plan = decomposer.plan(canonical)
+
+    assert plan.kind == 'block_angular'
+    assert plan.linking_rows.tolist() == [2]
+    assert [sub.names for sub in plan.subproblems] == [['a', 'b'], ['c', 'd']]
+    assert [rows.tolist() for rows in plan.rows] == [[0], [1]]
+
+    merged = await decomposer.coordinate(canonical, plan, _enumerate_block)
+    assert merged['solution'] == {'a': 1.0, 'b': 0.0, 'c': 1.0, 'd': 0.0}
+    assert merged['metrics']['objective_value'] == -5.0
+    assert merged['metrics']['decomposition']['iterations'] > 1
+    assert merged['metrics']['feasible'] is True and merged['status'] == 'feasible'
+
+    # Without enough iterations the linking row stays violated: fall back
+    decomposer.max_iterations = 1
+    assert await decomposer.coordinate(canonical, plan, _enumerate_block) is None
+    assert decomposer.get_statistics()['fallbacks'] == 1
+
+
+@pytest.mark.asyncio
+async def test_decomposition_independent_blocks_are_packed():
+    """Test that independent components are packed into balanced blocks."""
+    pcan = ProblemCanonicalizer({})
+    names = [f'x{i}' for i in range(12)]
+    canonical = await pcan.canonicalize({
+        'problem_type': 'resource_allocation',
+        'variables': [{'name': n, 'type': 'binary'} for n in names],
+        'constraints': [
+            {'type': 'capacity', 'sense': '<=', 'rhs': 2,
+             'coefficients': {names[i]: 1.0 for i in group}}
+            for group in ([0, 1, 2, 3], [4, 5], [6, 7], [8, 9])
+        ],
+        'objectives': [{'sense': 'minimize', 'coefficients': {n: -1.0 for n in names}}]
+    })
+    decomposer = ProblemDecomposer({'enabled': True, 'min_variables': 10, 'max_blocks': 3})
+    plan = decomposer.plan(canonical)
+
+    assert plan.kind == 'independent'
+    assert sorted(cols.size for cols in plan.columns) == [4, 4, 4]
+    assert sum(rows.size for rows in plan.rows) == 4
+    assert decomposer.plan(_block_problem()) is None  # below min_variables
+
+    merged = await decomposer.coordinate(canonical, plan, _enumerate_block)
+    assert merged['status'] == 'optimal'
+    assert merged['metrics']['objective_value'] == -10.0
+
+
+@pytest.mark.asyncio
+async def test_sm_structural_features():
+    """Test nnz density, degree, range, sense and component features."""
+    surrogate = SurrogateModels({})
+    features = (await surrogate.extract_features(_block_problem()))['structural_features']
+
+    assert features['nnz'] == 8
+    assert features['density'] == pytest.approx(8 / 12)
+    assert features['num_binary'] == 4 and features['num_le'] == 3 and features['num_eq'] == 0
+    assert features['row_degree'] == {'min': 2, 'mean': pytest.approx(8 / 3), 'max': 4,
+                                      'std': pytest.approx(np.std([2, 2, 4]))}
+    assert features['col_degree'] == {'min': 2, 'mean': 2.0, 'max': 2, 'std': 0.0}
+    assert features['coefficient_range'] == 0.0
+    assert features['objective_range'] == pytest.approx(np.log10(3))
+    assert features['num_components'] == 1 and features['largest_component'] == 4
+
+    pcan = ProblemCanonicalizer({})
+    names = [f'x{i}' for i in range(8)]
+    canonical = await pcan.canonicalize({
+        'problem_type': 'general_qubo',
+        'variables': [{'name': n, 'type': 'integer', 'upper_bound': 5} for n in names],
+        'constraints': [
+            {'type': 'capacity', 'sense': '>=', 'rhs': 1, 'coefficients': {'x0': 0.01, 'x1': 100}},
+            {'type': 'capacity', 'sense': '=', 'rhs': 1, 'coefficients': {'x2': 1, 'x3': -2}}
+        ],
+        'objectives': [{'sense': 'minimize', 'coefficients': {'x4*x5': 1.0, 'x1': 1.0}}]
+    })
+    features = (await surrogate.extract_features(canonical))['structural_features']
+    assert features['coefficient_range'] == pytest.approx(4.0)
+    assert features['empty_columns'] == 4
+    assert features['num_quadratic_objective'] == 1
+    assert features['num_ge'] == 1 and features['num_eq'] == 1
+    # {x0, x1}, {x2, x3}, {x4, x5}, {x6}, {x7}
+    assert features['num_components'] == 5 and features['largest_component'] == 2
+    assert features['constraint_types'] == {'capacity': 2}
+
+
+def _runtime_records():
+    """Logged outcomes: cb_gurobi is fast on small problems, qb_tensor on large ones."""
+    records = []
+    for n in (10, 20, 40, 80, 1000, 2000, 4000, 8000):
+        features = {'num_variables': n, 'num_constraints': n // 2, 'nnz': 3 * n,
+                    'num_binary': n, 'row_degree': {'mean': 6.0, 'max': 9}}
+        small = n < 500
+        records.append({'features': features, 'solver': 'cb_gurobi',
+                        'solve_time': 0.1 if small else 50.0, 'quality': 1.0 if small else 0.5})
+        records.append({'features': features, 'solver': 'qb_tensor',
+                        'solve_time': 5.0 if small else 2.0, 'quality': 0.9})
+    return records
+
+
+@pytest.mark.asyncio
+async def test_runtime_predictor_train_save_and_recommend(tmp_path):
+    """Test offline training, memory-mapped loading and SM recommendations."""
+    log = tmp_path / 'outcomes.jsonl'
+    surrogate = SurrogateModels({'outcome_log': str(log), 'outcome_flush_every': 4})
+    due = [surrogate.record_outcome({'structural_features': r['features']}, r['solver'],
+                                    r['solve_time'], r['quality'])
+           for r in _runtime_records()]
+    assert due[:4] == [False, False, False, True]
+    surrogate.flush_outcomes()
+    records = load_records(str(log))
+    assert records == _runtime_records()
+
+    model = RuntimePredictor.fit(records, epochs=400, seed=1)
+    model.save(str(tmp_path / 'model'))
+    loaded = RuntimePredictor.load(str(tmp_path / 'model'))
+    assert isinstance(loaded.weights[0], np.memmap)
+    assert loaded.solvers == ['cb_gurobi', 'qb_tensor']
+
+    small, large = records[0]['features'], records[-1]['features']
+    predicted = loaded.predict(small)
+    assert predicted == model.predict(small)
+    assert predicted['cb_gurobi']['solve_time'] == pytest.approx(0.1, rel=0.5)
+    assert predicted['qb_tensor']['quality'] == pytest.approx(0.9, abs=0.1)
+    assert loaded.predict(large)['cb_gurobi']['solve_time'] > 10.0
+
+    surrogate = SurrogateModels({'enabled': True, 'models': [
+        {'type': 'runtime', 'path': str(tmp_path / 'model')},
+        {'type': 'runtime', 'path': str(tmp_path / 'missing')}
+    ]})
+    # The last entry wins; a missing model is skipped, not an error
+    assert surrogate.get_statistics()['models'] == []
+    surrogate = SurrogateModels({'enabled': True, 'models': [
+        {'type': 'runtime', 'path': str(tmp_path / 'model')}
+    ]})
+    pcan = ProblemCanonicalizer({})
+    canonical = await pcan.canonicalize({
+        'problem_type': 'general_qubo',
+        'variables': [{'name': f'x{i}', 'type': 'binary'} for i in range(10)],
+        'constraints': [],
+        'objectives': [{'sense': 'minimize', 'coefficients': {'x0': 1.0}}]
+    })
+    features = await surrogate.extract_features(canonical)
+    assert features['recommended_solvers'][0] == 'cb_gurobi'
+    assert features['predicted_solve_time'] < 1.0
+
+
+class _DelayedModel:
+    """Stub surrogate model answering after a delay (or raising)."""
+
+    def __init__(self, delay, prediction, cpu_bound=False, **config):
+        self.delay = delay
+        self.prediction = prediction
+        self.cpu_bound = cpu_bound
+        self.config = config
+
+    async def predict(self, canonical, structural=None):
+        await asyncio.sleep(self.delay)
+        if self.prediction is None:
+            raise RuntimeError('model failed')
+        return self.prediction
+
+    def predict_sync(self, canonical, structural=None):
+        time.sleep(self.delay)
+        return self.prediction
+
+
+@pytest.mark.asyncio
+async def test_sm_models_run_concurrently_with_deadlines(sample_problem):
+    """Test concurrent predictions, per-model deadlines and weighted aggregation."""
+    canonical = await ProblemCanonicalizer({}).canonicalize(sample_problem)
+    surrogate = SurrogateModels({'enabled': True, 'model_timeout': 0.5})
+    surrogate._gnn = _DelayedModel(0.2, {'solve_time': 10.0, 'quality': 0.9,
+                                         'solvers': ['qb_tensor']}, weight=3.0)
+    surrogate._gp = _DelayedModel(0.2, {'solve_time': 2.0, 'quality': 0.5,
+                                        'solvers': ['cb_cbc', 'qb_tensor']}, cpu_bound=True)
+    surrogate._transformer = _DelayedModel(1.0, {'solve_time': 99.0, 'solvers': ['qc_qaoa']},
+                                           timeout=0.25)
+
+    start = time.perf_counter()
+    features = await surrogate.extract_features(canonical)
+    elapsed = time.perf_counter() - start
+
+    # Models overlap: bounded by the transformer deadline, not the sum of delays
+    assert elapsed < 0.45
+    assert features['model_status'] == {'gnn': 'ok', 'gp': 'ok', 'transformer': 'timeout'}
+    assert features['predicted_solve_time'] == pytest.approx((3 * 10.0 + 2.0) / 4)
+    assert features['predicted_quality'] == pytest.approx((3 * 0.9 + 0.5) / 4)
+    assert features['recommended_solvers'] == ['qb_tensor', 'cb_cbc']
+    assert features['confidence'] == pytest.approx(4 / 5)
+
+    surrogate._gp = _DelayedModel(0.0, None)
+    features = await surrogate.extract_features(canonical)
+    assert features['model_status']['gp'] == 'error'
+    assert features['confidence'] == pytest.approx(3 / 5)
+
+    stats = surrogate.get_statistics()
+    assert stats['timeouts'] == {'transformer': 2} and stats['errors'] == {'gp': 1}
+    assert stats['answered'] == {'gnn': 2, 'gp': 1} and stats['degraded'] == 2
+    surrogate.close()
@@ -6,8 +6,11 @@ Tests for main orchestration logic and end-to-end optimization flows.
 
 import pytest
 import asyncio
+import json
+import time
 from unittest.mock import Mock, AsyncMock
 import yaml
+import numpy as np
 from pathlib import Path
 
 
@@ -20,7 +23,10 @@ def edge_config():
     """Load edge deployment configuration."""
     config_path = Path(__file__).parent.parent / 'config' / 'deployment-edge.yaml'
     with open(config_path) as f:
-        return yaml.safe_load(f)
+        config = yaml.safe_load(f)
+    # Keep arbitration independent of the test host's load
+    config['resource_monitor'] = {'enabled': False}
+    return config
 
 
 @pytest.fixture
@@ -128,6 +134,11 @@ async def test_error_handling(edge_config):
     assert 'evidence' in result
     assert result['solution'] is None
 
+    # Missing constraints are reported the same way, not raised
+    result = await orchestrator.optimize(problem=invalid_problem, constraints=None)
+    assert result['status'] == 'error'
+    assert 'evidence' in result
+
 
 @pytest.mark.asyncio
 async def test_hash_input():
@@ -178,5 +189,854 @@ async def test_multiple_objectives(edge_config):
     assert 'evidence' in result
 
 
+@pytest.mark.asyncio
+async def test_optimize_batch(edge_config, sample_problem, sample_constraints):
+    """Test batch optimization keeps input order and drains the pipeline."""
+    edge_config['pipeline'] = {'stage_concurrency': {'solve': 2}}
+    orchestrator = QAIM2Orchestrator(edge_config)
+
+    problems = []
+    for i in range(6):
+        problem = dict(sample_problem)
+        problem['problem_type'] = f'routing_{i}'
+        problems.append(problem)
+
+    metadata = [{'ata_chapter': 'ATA-34'}] + [None] * 5
+    results = await orchestrator.optimize_batch(problems, sample_constraints, metadata)
+
+    assert len(results) == len(problems)
+    assert all(r['status'] == 'optimal' for r in results)
+    # Batch items default to the batch class; metadata can still raise it
+    assert [r['metrics']['priority'] for r in results] == ['critical'] + ['batch'] * 5
+    assert len({r['request_id'] for r in results}) == len(problems)
+
+    stats = orchestrator.get_statistics()['pipeline']
+    assert stats['stages']['solve']['completed'] == len(problems)
+    assert orchestrator._get_queue_depth() == 0
+
+
+@pytest.mark.asyncio
+async def test_optimize_batch_queue_depth(edge_config, sample_problem, sample_constraints):
+    """Test that requests waiting for a stage show up in queue depth."""
+    edge_config['pipeline'] = {'stage_concurrency': {'solve': 1}}
+    orchestrator = QAIM2Orchestrator(edge_config)
+
+    batch = asyncio.ensure_future(
+        orchestrator.optimize_batch([sample_problem] * 3, sample_constraints)
+    )
+    await asyncio.sleep(0.05)
+    assert orchestrator._get_queue_depth() == 2
+
+    await batch
+    assert orchestrator._get_queue_depth() == 0
+
+
+@pytest.mark.asyncio
+async def test_result_cache_hit(edge_config, sample_problem, sample_constraints):
+    """Test identical re-submissions are served from the result cache."""
+    edge_config['result_cache'] = {'enabled': True, 'max_entries': 8}
+    orchestrator = QAIM2Orchestrator(edge_config)
+
+    first = await orchestrator.optimize(sample_problem, sample_constraints)
+    second = await orchestrator.optimize(sample_problem, sample_constraints)
+
+    assert first['evidence']['cached'] is False
+    assert second['evidence']['cached'] is True
+    assert second['metrics']['cached'] is True
+    assert second['solution'] == first['solution']
+    assert second['evidence']['input_hash'] == first['evidence']['input_hash']
+
+    stats = orchestrator.get_statistics()['result_cache']
+    assert stats['hits'] == 1
+    assert stats['misses'] == 1
+
+
+@pytest.mark.asyncio
+async def test_result_cache_key_is_independent_of_arm_choice(edge_config, sample_problem, sample_constraints):
+    """Test re-submissions hit although ARB picks another arm, and hits are copies."""
+    edge_config['result_cache'] = {'enabled': True}
+    orchestrator = QAIM2Orchestrator(edge_config)
+    arms = iter(['cb_cbc', 'cb_glpk', 'cb_ortools'])
+    orchestrator.arbitration.select_arm = lambda context: next(arms)
+
+    first = await orchestrator.optimize(sample_problem, sample_constraints)
+    first['solution']['x1'] = 'CORRUPTED'
+    second = await orchestrator.optimize(sample_problem, sample_constraints)
+    second['solution']['x1'] = 'CORRUPTED'
+    third = await orchestrator.optimize(sample_problem, dict(sample_constraints))
+
+    assert second['evidence']['cached'] is True
+    assert third['evidence']['cached'] is True
+    assert second['solver'] == third['solver'] == 'cb_cbc'
+    assert third['solution']['x1'] != 'CORRUPTED'
+
+
+def test_result_cache_degrades_to_memory_without_disk(tmp_path):
+    """Test an unwritable disk tier falls back to memory-only."""
+    from core.result_cache import ResultCache
+
+    blocker = tmp_path / 'file'
+    blocker.write_text('')
+    cache = ResultCache({'enabled': True, 'disk_path': str(blocker / 'cache')})
+    cache.put('key', {'status': 'optimal', 'solution': {}, 'metrics': {}})
+
+    assert cache.get('key') is not None
+    assert cache.get_statistics()['disk_errors'] == 1
+
+
+def test_result_cache_disk_tier_and_ttl(tmp_path):
+    """Test disk tier persistence across instances and TTL expiry."""
+    from core.result_cache import ResultCache
+
+    config = {'enabled': True, 'max_entries': 1, 'disk_path': str(tmp_path)}
+    cache = ResultCache(config)
+    key = ResultCache.make_key('abc', 'cb_cbc', {'time_limit': 10}, 0.01)
+    cache.put(key, {'status': 'optimal', 'solution': {'x1': 1.0}, 'metrics': {}})
+
+    reloaded = ResultCache(config)
+    assert reloaded.get(key)['solution'] == {'x1': 1.0}
+    assert reloaded.get_statistics()['disk_hits'] == 1
+
+    expired = ResultCache(dict(config, ttl_seconds=-1))
+    expired.put(key, {'status': 'optimal', 'solution': {}, 'metrics': {}})
+    assert expired.get(key) is None
+
+
+@pytest.mark.asyncio
+async def test_portfolio_race_takes_first_good_answer(edge_config, sample_problem, sample_constraints):
+    """Test portfolio mode returns the first arm within gap tolerance."""
+    edge_config['portfolio'] = {'enabled': True, 'top_k': 2}
+    orchestrator = QAIM2Orchestrator(edge_config)
+
+    result = await orchestrator.optimize(sample_problem, sample_constraints)
+
+    assert result['status'] == 'optimal'
+    assert result['solver'] == 'cb_cbc'  # 0.2 s vs 0.3 s for GLPK
+    assert result['metrics']['portfolio']['arms'] == ['cb_cbc', 'cb_glpk']
+    assert result['metrics']['portfolio']['cancelled'] == ['cb_glpk']
+
+    await orchestrator.close()
+    arms = orchestrator.arbitration.get_statistics()['arms']
+    assert list(arms) == ['cb_cbc']
+
+
+@pytest.mark.asyncio
+async def test_portfolio_race_falls_back_to_best_finisher(edge_config, sample_problem):
+    """Test that without a qualifying arm every finisher is fed back."""
+    edge_config['portfolio'] = {'enabled': True, 'top_k': 2}
+    orchestrator = QAIM2Orchestrator(edge_config)
+
+    result = await orchestrator.optimize(
+        sample_problem, {'time_limit': 60, 'gap_tolerance': 0.0}
+    )
+
+    assert result['solver'] == 'cb_cbc'  # smallest gap among finishers
+    assert result['metrics']['portfolio']['finished'] == ['cb_cbc', 'cb_glpk']
+
+    await orchestrator.close()
+    assert set(orchestrator.arbitration.get_statistics()['arms']) == {'cb_cbc', 'cb_glpk'}
+
+
+@pytest.mark.asyncio
+async def test_portfolio_race_reports_arm_errors(edge_config, sample_problem, sample_constraints):
+    """Test that crashing arms yield an error result and a failure reward."""
+    edge_config['portfolio'] = {'enabled': True, 'top_k': 2}
+    orchestrator = QAIM2Orchestrator(edge_config)
+
+    async def crash(problem, params):
+        raise RuntimeError(f"{params['solver_name']} crashed")
+    orchestrator.cb_pool.solve = crash
+
+    result = await orchestrator.optimize(sample_problem, sample_constraints)
+
+    assert result['status'] == 'error'
+    assert result['solver'] == 'none'
+    assert result['metrics']['solve_time'] < 1.0
+    assert 'cb_cbc crashed' in result['metrics']['error']
+    assert set(result['metrics']['portfolio']['errors']) == {'cb_cbc', 'cb_glpk'}
+    # Each arm held its own solve slot
+    assert orchestrator.get_statistics()['pipeline']['stages']['solve']['completed'] == 2
+
+    await orchestrator.close()
+    arms = orchestrator.arbitration.get_statistics()['arms']
+    assert set(arms) == {'cb_cbc', 'cb_glpk'}
+
+
+@pytest.mark.asyncio
+async def test_learning_loop_persists_state(tmp_path, edge_config, sample_problem, sample_constraints):
+    """Test that solve outcomes reach both learners and survive a restart."""
+    state_path = tmp_path / 'learning.json'
+    edge_config['strategy'] = {'enabled': True, 'training_mode': 'online',
+                               'exploration_rate': 0.0}
+    edge_config['learning'] = {'reward': 'pareto', 'state_path': str(state_path)}
+    orchestrator = QAIM2Orchestrator(edge_config)
+
+    result = await orchestrator.optimize(sample_problem, sample_constraints)
+    await orchestrator.close()
+
+    arms = orchestrator.arbitration.get_statistics()['arms']
+    assert arms[result['solver']]['count'] == 1
+    assert state_path.exists()
+
+    restarted = QAIM2Orchestrator(edge_config)
+    assert restarted.arbitration.get_statistics() == orchestrator.arbitration.get_statistics()
+    q_values = restarted.strategy.get_state()['q_values']
+    assert q_values == {'vehicle_routing|small': {result['solver']: pytest.approx(arms[result['solver']]['avg_reward'])}}
+
+
+@pytest.mark.asyncio
+async def test_close_flushes_telemetry_when_state_is_unwritable(tmp_path, edge_config, sample_problem, sample_constraints):
+    """Test that a failing learner state write does not abort close()."""
+    blocker = tmp_path / 'file'
+    blocker.write_text('')
+    edge_config['learning'] = {'state_path': str(blocker / 'state.json')}
+    edge_config['map'] = {'sinks': ['broker']}
+    orchestrator = QAIM2Orchestrator(edge_config)
+
+    await orchestrator.optimize(sample_problem, sample_constraints)
+    await orchestrator.close()
+
+    assert len(orchestrator.telemetry.broker.messages) == 2
+
+
+def test_compute_reward_modes(edge_config):
+    """Test time, quality and Pareto reward scalarizations."""
+    from core.qaim_orchestrator import OptimizationResult
+
+    constraints = {'time_limit': 10, 'gap_tolerance': 0.01}
+    good = OptimizationResult('optimal', {}, {'solve_time': 2.0, 'gap': 0.01, 'feasible': True})
+    bad = OptimizationResult('error', None, {'solve_time': 1.0, 'gap': float('inf'), 'feasible': False})
+
+    rewards = {}
+    for mode in ('time', 'quality', 'pareto'):
+        edge_config['learning'] = {'reward': mode}
+        orchestrator = QAIM2Orchestrator(edge_config)
+        rewards[mode] = (orchestrator._compute_reward(good, constraints),
+                         orchestrator._compute_reward(bad, constraints))
+
+    assert rewards['time'] == (-2.0, -10.0)
+    assert rewards['quality'] == (pytest.approx(0.5), 0.0)
+    assert rewards['pareto'] == (pytest.approx(0.5 * 0.5 - 0.5 * 0.2), pytest.approx(-0.5))
+
+
+def write_proc(root, load_1m, cpu_busy, cpu_idle, mem_available=1000):
+    """Write minimal /proc/loadavg, /proc/stat and /proc/meminfo files."""
+    (root / 'loadavg').write_text(f'{load_1m} 0.5 0.5 1/100 1234\n')
+    (root / 'stat').write_text(f'cpu  {cpu_busy} 0 0 {cpu_idle} 0 0 0 0 0 0\ncpu0 0 0 0 0\n')
+    (root / 'meminfo').write_text(
+        f'MemTotal:        4000 kB\nMemFree:          500 kB\nMemAvailable:     {mem_available} kB\n'
+    )
+
+
+def test_resource_monitor_reads_proc(tmp_path):
+    """Test CPU, load average and memory sampling from /proc."""
+    from core.resource_monitor import ResourceMonitor
+
+    write_proc(tmp_path, load_1m=2.0, cpu_busy=100, cpu_idle=300)
+    monitor = ResourceMonitor({'proc_root': str(tmp_path), 'cpu_count': 4,
+                               'sample_interval': 0.0})
+
+    assert monitor.sample() == {'cpu': 0.25, 'loadavg': 0.5, 'memory': 0.75}
+    assert monitor.load() == 0.5
+
+    # CPU utilization is measured between samples
+    write_proc(tmp_path, load_1m=2.0, cpu_busy=190, cpu_idle=310)
+    assert monitor.sample()['cpu'] == pytest.approx(0.9)
+
+    with monitor.track('cb_cbc'), monitor.track('qb_tensor'):
+        assert monitor.in_flight() == {'cb': 1, 'qb': 1, 'qc': 0}
+    assert monitor.in_flight() == {'cb': 0, 'qb': 0, 'qc': 0}
+
+    # Missing /proc degrades to zero load
+    assert ResourceMonitor({'proc_root': str(tmp_path / 'missing')}).load() == 0.0
+
+
+@pytest.mark.asyncio
+async def test_overload_prefers_fast_solver_and_shortens_time_limit(
+        tmp_path, edge_config, sample_problem, sample_constraints):
+    """Test that arbitration reacts to overload from real load telemetry."""
+    write_proc(tmp_path, load_1m=8.0, cpu_busy=100, cpu_idle=0)
+    edge_config['resource_monitor'] = {'proc_root': str(tmp_path), 'cpu_count': 2}
+    edge_config['portfolio'] = {'enabled': True, 'top_k': 2}
+    orchestrator = QAIM2Orchestrator(edge_config)
+
+    context = orchestrator._get_context()
+    assert context['load'] == 1.0
+    assert context['in_flight'] == {'cb': 0, 'qb': 0, 'qc': 0}
+
+    adjusted = orchestrator.arbitration.adjust_parameters(
+        {'time_limit': 60}, {'context': context}
+    )
+    assert adjusted['time_limit'] == 30
+
+    result = await orchestrator.optimize(sample_problem, sample_constraints)
+    assert result['solver'] == 'cb_glpk'
+    assert 'portfolio' not in result['metrics']  # no racing under overload
+    assert orchestrator.get_statistics()['resources']['load'] == 1.0
+
+
+@pytest.mark.asyncio
+async def test_admission_weighted_fair_dispatch():
+    """Test that queued critical work is served ahead of a batch burst."""
+    from core.admission import AdmissionController
+
+    admission = AdmissionController({'max_concurrent': 1})
+    await admission.acquire('batch')  # occupy the only slot
+
+    order = []
+
+    async def request(priority):
+        await admission.acquire(priority, time_limit=60)
+        order.append(priority)
+        admission.release()
+
+    tasks = [asyncio.ensure_future(request('batch')) for _ in range(3)]
+    await asyncio.sleep(0)
+    tasks += [asyncio.ensure_future(request('critical')) for _ in range(2)]
+    await asyncio.sleep(0)
+    assert admission.queue_depth() == 5
+
+    admission.release()
+    await asyncio.gather(*tasks)
+
+    assert order == ['critical', 'critical', 'batch', 'batch', 'batch']
+    assert admission.get_statistics()['classes']['critical']['admitted'] == 2
+
+
+@pytest.mark.asyncio
+async def test_admission_rejects_full_queue_and_missed_deadline():
+    """Test early rejection on queue overflow and infeasible time limits."""
+    from core.admission import AdmissionController, AdmissionRejected
+
+    admission = AdmissionController({'max_concurrent': 1, 'initial_service_time': 2.0,
+                                     'queue_size': {'normal': 1}})
+    await admission.acquire('normal')
+
+    with pytest.raises(AdmissionRejected) as excinfo:
+        await admission.acquire('normal', time_limit=1.0)
+    assert excinfo.value.reason == 'deadline'
+
+    waiter = asyncio.ensure_future(admission.acquire('normal', time_limit=60))
+    await asyncio.sleep(0)
+    with pytest.raises(AdmissionRejected) as excinfo:
+        await admission.acquire('normal', time_limit=60)
+    assert excinfo.value.reason == 'queue_full'
+
+    waiter.cancel()
+    await asyncio.gather(waiter, return_exceptions=True)
+    assert admission.queue_depth() == 0
+    assert admission.get_statistics()['classes']['normal']['rejected'] == {
+        'queue_full': 1, 'deadline': 1
+    }
+
+
+@pytest.mark.asyncio
+async def test_optimize_reports_admission(edge_config, sample_problem, sample_constraints):
+    """Test priority classes, queue wait reporting and rejected responses."""
+    edge_config['admission'] = {'max_concurrent': 1, 'queue_size': 1}
+    orchestrator = QAIM2Orchestrator(edge_config)
+
+    results = await asyncio.gather(
+        orchestrator.optimize(sample_problem, sample_constraints, {'ata_chapter': 'ATA-34'}),
+        orchestrator.optimize(sample_problem, sample_constraints, {'priority': 'batch'}),
+        orchestrator.optimize(sample_problem, sample_constraints, {'priority': 'batch'})
+    )
+
+    assert [r['status'] for r in results] == ['optimal', 'optimal', 'rejected']
+    assert results[0]['metrics']['priority'] == 'critical'
+    assert results[0]['evidence']['admission'] == {'priority': 'critical', 'queue_wait_ms': 0}
+    assert results[1]['metrics']['queue_wait_ms'] >= 150  # waited for the first solve
+    assert results[2]['metrics']['reason'] == 'queue_full'
+    assert results[2]['evidence']['status'] == 'rejected'
+
+
+@pytest.mark.asyncio
+async def test_map_publisher_batches_by_count_and_time(tmp_path):
+    """Test batching, MQTT-style subscriptions and the file sink."""
+    from core.telemetry import MAPPublisher
+
+    path = tmp_path / 'map.jsonl'
+    publisher = MAPPublisher({'sinks': ['broker', 'file'], 'file_path': str(path),
+                              'batch_size': 3, 'flush_interval': 0.05})
+    received = []
+    publisher.broker.subscribe('map/1/+', lambda topic, payload: received.append(payload['n']))
+    publisher.broker.subscribe('map/#', lambda topic, payload: None)
+
+    for n in range(4):
+        await publisher.publish('map/1/telemetry', {'n': n})
+    await asyncio.sleep(0.1)
+
+    # One full batch of 3, then the remainder after flush_interval
+    assert publisher.get_statistics()['batches'] == 2
+    assert received == [0, 1, 2, 3]
+
+    await publisher.publish('map/1/log', {'n': 4})
+    await publisher.close()
+    await publisher.publish('map/1/log', {'n': 5})  # ignored after close
+
+    assert received == [0, 1, 2, 3, 4]
+    assert len(path.read_text().splitlines()) == 5
+
+
+@pytest.mark.asyncio
+async def test_map_publisher_queue_policies():
+    """Test drop and backpressure policies when the queue is full."""
+    from core.telemetry import MAPPublisher
+
+    for policy, expected in [('drop_oldest', [2, 3]), ('drop_newest', [0, 1])]:
+        publisher = MAPPublisher({'sinks': ['broker'], 'queue_size': 2, 'policy': policy})
+        for n in range(4):
+            await publisher.publish('map/1/telemetry', {'n': n})  # no yield: queue fills
+        await publisher.close()
+
+        assert [m['payload']['n'] for m in publisher.broker.messages] == expected
+        assert publisher.get_statistics()['dropped'] == 2
+
+    publisher = MAPPublisher({'sinks': ['broker'], 'queue_size': 1, 'policy': 'block',
+                              'flush_interval': 0.0})
+    await asyncio.gather(*(publisher.publish('map/1/log', {'n': n}) for n in range(5)))
+    await publisher.close()
+
+    assert [m['payload']['n'] for m in publisher.broker.messages] == [0, 1, 2, 3, 4]
+    assert publisher.get_statistics()['dropped'] == 0
+
+
+@pytest.mark.asyncio
+async def test_orchestrator_publishes_map_records(edge_config, sample_problem, sample_constraints):
+    """Test that provenance and results go to MAP topics instead of stdout."""
+    edge_config['map'] = {'sinks': ['broker']}
+    orchestrator = QAIM2Orchestrator(edge_config)
+
+    result = await orchestrator.optimize(sample_problem, sample_constraints)
+    await orchestrator.close()
+
+    records = [(m['topic'], m['payload']['event']) for m in orchestrator.telemetry.broker.messages]
+    assert records == [('map/1/log', 'provenance'), ('map/1/telemetry', 'result')]
+    assert orchestrator.telemetry.broker.messages[1]['payload']['request_id'] == result['request_id']
+
+
+
+def make_evidence(n, timestamp):
+    """Minimal UTCS evidence record."""
+    from datetime import datetime, timezone
+    return {
+        'request_id': f'req-{n}',
+        'timestamp': datetime.fromtimestamp(timestamp, timezone.utc).replace(tzinfo=None).isoformat(),
+        'solution': {'status': 'optimal', 'objective_value': float(n)}
+    }
+
+
+def test_evidence_store_segments_index_and_chain(tmp_path):
+    """Test rotation, id lookup, time ranges, recovery and tamper detection."""
+    from core.evidence_store import EvidenceStore
+
+    config = {'enabled': True, 'path': str(tmp_path), 'segment_max_bytes': 2000,
+              'index_interval': 4}
+    store = EvidenceStore(config)
+    base = float(int(time.time()) - 1000)
+    for n in range(100):
+        store.append(make_evidence(n, base + n))
+
+    stats = store.get_statistics()
+    assert stats['segments'] > 3
+    assert stats['records'] == 100
+    assert store.maintenance_due and stats['compactions'] == 0  # left to the caller
+    assert store.get('req-42')['solution']['objective_value'] == 42.0
+    assert store.get('req-99')['request_id'] == 'req-99'  # active segment
+    assert store.get('missing') is None
+    assert [r['request_id'] for r in store.range(base + 10, base + 13)] == ['req-10', 'req-11', 'req-12']
+    store.close()
+
+    # Reopen: sealed indexes load from disk, a torn tail is dropped
+    active = sorted(tmp_path.glob('*.log'))[-1]
+    with open(active, 'ab') as f:
+        f.write(b'\x00\x00\x01')
+    reopened = EvidenceStore(config)
+    assert reopened.get('req-7')['request_id'] == 'req-7'
+    assert reopened.verify() == []
+    reopened.append(make_evidence(100, base + 100))
+    assert reopened.get('req-100') is not None
+    reopened.close()
+
+    # Editing a sealed record breaks its segment's chain
+    first = sorted(tmp_path.glob('*.log'))[0]
+    data = first.read_bytes()
+    first.write_bytes(data.replace(b'"objective_value":1.0', b'"objective_value":9.0'))
+    assert EvidenceStore(config).verify() == [0]
+
+
+def test_evidence_store_compaction_and_retention(tmp_path):
+    """Test that closed time windows are merged and expired segments dropped."""
+    from core.evidence_store import EvidenceStore
+
+    day = 86400.0
+    start = (time.time() // day - 3) * day  # three full days ago
+    store = EvidenceStore({'enabled': True, 'path': str(tmp_path), 'segment_max_bytes': 1000,
+                           'retention_days': 4})
+    for n in range(40):
+        store.append(make_evidence(n, start + day * (n // 20) + n))  # 20 records per day
+
+    store.maintain(now=start + 2 * day + 1)  # both windows are closed
+    stats = store.get_statistics()
+    assert stats['compactions'] >= 2
+    assert stats['segments'] == 3  # one per day plus the active segment
+    assert stats['records'] == 40
+    assert store.get('req-5')['request_id'] == 'req-5'
+    assert store.verify() == []
+
+    store.maintain(now=start + 4 * day + 100)  # day 0 is past retention
+    assert store.get('req-5') is None
+    assert store.get('req-25') is not None
+    assert store.get_statistics()['expired_segments'] == 1
+
+
+@pytest.mark.parametrize('crash', ['index_pending', 'log_swapped'])
+def test_evidence_store_merge_survives_crash(tmp_path, monkeypatch, crash):
+    """Test that an interrupted merge neither loses nor duplicates records."""
+    from core.evidence_store import EvidenceStore
+
+    day = 86400.0
+    start = (time.time() // day - 3) * day
+    config = {'enabled': True, 'path': str(tmp_path), 'segment_max_bytes': 1000}
+    store = EvidenceStore(config)
+    for n in range(20):
+        store.append(make_evidence(n, start + n))
+    store.close()
+
+    class Crash(OSError):
+        pass
+
+    write_index = EvidenceStore._write_index
+
+    def crash_before_index(self, segment):
+        if segment.covers > segment.seq:  # the merged segment
+            raise Crash()
+        write_index(self, segment)
+
+    def crash_on_unlink(segment):
+        raise Crash()
+
+    if crash == 'index_pending':
+        monkeypatch.setattr(EvidenceStore, '_write_index', crash_before_index)
+    else:
+        monkeypatch.setattr(EvidenceStore, '_unlink', staticmethod(crash_on_unlink))
+    crashed = EvidenceStore(config)
+    crashed.maintain(now=start + day + 1)
+    assert crashed.get_statistics()['errors'] == 1
+    monkeypatch.undo()
+
+    reopened = EvidenceStore(config)
+    ids = [r['request_id'] for r in reopened.range(start, start + day)]
+    assert ids == [f'req-{n}' for n in range(20)]
+    assert reopened.verify() == []
+    assert not list(tmp_path.glob('*.tmp'))
+
+
+@pytest.mark.asyncio
+async def test_orchestrator_persists_evidence(tmp_path, edge_config, sample_problem, sample_constraints):
+    """Test that results are retrievable by request_id from the evidence store."""
+    edge_config['evidence_store'] = {'enabled': True, 'path': str(tmp_path / 'evidence')}
+    orchestrator = QAIM2Orchestrator(edge_config)
+
+    result = await orchestrator.optimize(sample_problem, sample_constraints)
+    failed = await orchestrator.optimize({'problem_type': 'bad'}, sample_constraints)
+    await orchestrator.close()
+
+    assert orchestrator.get_evidence(result['request_id']) == result['evidence']
+    assert orchestrator.get_evidence(failed['request_id'])['status'] == 'error'
+
+
+
+def test_latency_histogram_percentiles():
+    """Test HDR-style histogram accuracy and Prometheus bucket counts."""
+    from core.tracing import LatencyHistogram
+
+    histogram = LatencyHistogram()
+    for ms in range(1, 1001):
+        histogram.record(ms / 1000.0)
+
+    assert histogram.count == 1000
+    for p, expected in ((50, 0.5), (95, 0.95), (99, 0.99)):
+        assert abs(histogram.percentile(p) - expected) / expected < 0.016
+    assert histogram.percentile(100) == 1.0
+    assert histogram.cumulative((0.0001, 0.1, 10.0)) == [0, 100, 1000]
+
+
+@pytest.mark.asyncio
+async def test_stage_tracing(edge_config, sample_problem, sample_constraints):
+    """Test per-stage spans, histogram series and the metrics endpoint."""
+    import urllib.request
+
+    edge_config['tracing'] = {'sample_rate': 1.0, 'metrics_host': '127.0.0.1', 'metrics_port': 0}
+    orchestrator = QAIM2Orchestrator(edge_config)
+
+    result = await orchestrator.optimize(sample_problem, sample_constraints)
+    stage_ms = result['metrics']['stage_ms']
+    assert {'admission', 'pcan', 'sm', 'sp', 'arb', 'xfr', 'solve', 'evidence', 'total'} <= set(stage_ms)
+    assert stage_ms['total'] >= stage_ms['solve'] > 0
+
+    series = orchestrator.get_statistics()['tracing']['series']
+    solve = [s for s in series if s['stage'] == 'solve']
+    assert solve[0]['solver'] == result['solver']
+    assert solve[0]['problem_type'] == 'vehicle_routing'
+    assert solve[0]['count'] == 1
+
+    assert orchestrator.tracer.server_address is None
+    host, port = orchestrator.serve_metrics()
+
+    # A second orchestrator on the same port stays up without the endpoint
+    edge_config['tracing']['metrics_port'] = port
+    other = QAIM2Orchestrator(edge_config)
+    assert other.serve_metrics() is None
+    assert other.get_statistics()['tracing']['serve_error']
+    await other.close()
+
+    body = await asyncio.to_thread(
+        lambda: urllib.request.urlopen(f'http://{host}:{port}/metrics', timeout=5).read().decode()
+    )
+    assert f'qaim2_stage_duration_seconds_count{{stage="solve",solver="{result["solver"]}",' in body
+    assert 'le="+Inf"' in body
+    assert body == orchestrator.get_metrics()
+    await orchestrator.close()
+    assert orchestrator.tracer.server_address is None
+
+    # Unsampled requests carry no spans
+    edge_config['tracing'] = {'sample_rate': 0.0}
+    orchestrator = QAIM2Orchestrator(edge_config)
+    result = await orchestrator.optimize(sample_problem, sample_constraints)
+    assert 'stage_ms' not in result['metrics']
+    assert orchestrator.get_statistics()['tracing']['skipped'] == 1
+    await orchestrator.close()
+
+
+
+@pytest.mark.asyncio
+async def test_benchmark_harness():
+    """Test synthetic families and a minimal closed-loop benchmark run."""
+    from benchmarks.qaim_bench import (
+        FAMILIES, FEATURE_BUDGET_MS, FAMILY_FEATURE_BUDGET_MS,
+        generate_problem, run_benchmark, bench_features, compare
+    )
+
+    for family in FAMILIES:
+        problem = generate_problem(family, 40, seed=1)
+        assert len(problem['variables']) == 40
+        assert problem == generate_problem(family, 40, seed=1)
+
+    run = await run_benchmark('qubo_lanes', 12, requests=4, concurrency=2, variants=2)
+    assert run['requests'] == 4
+    assert run['status'] == {'optimal': 4}
+    assert run['throughput_rps'] > 0
+    assert {'p50_ms', 'p95_ms', 'p99_ms'} <= set(run['latency'])
+    assert {'pcan', 'solve', 'total'} <= set(run['stages'])
+    assert run['peak_rss_mb'] > 0
+    assert run['peak_rss_scope'] in ('run', 'process')
+
+    slower = dict(run, throughput_rps=run['throughput_rps'] / 2)
+    report = compare({'runs': [run]}, {'runs': [slower]})
+    assert report[0]['regressed']
+    assert not compare({'runs': [run]}, {'runs': [run]})[0]['regressed']
+
+    features = await bench_features('qubo_lanes', 2000, repeats=3)
+    assert features['budget_ms'] == FAMILY_FEATURE_BUDGET_MS['qubo_lanes']
+    assert (await bench_features('routing', 2000, repeats=3))['budget_ms'] == FEATURE_BUDGET_MS
+
+
+@pytest.mark.asyncio
+async def test_warm_start_resolve(edge_config, sample_problem, sample_constraints):
+    """Test that a re-plan with a changed RHS is warm-started from the previous solve."""
+    edge_config['warm_start'] = {'max_delta': 0.5}
+    orchestrator = QAIM2Orchestrator(edge_config)
+    sample_problem['constraints'][0]['coefficients'] = {'x1': 40, 'x2': 30, 'x3': 50}
+
+    first = await orchestrator.optimize(sample_problem, sample_constraints)
+    assert 'warm_start' not in first['metrics']
+
+    sample_problem['constraints'][0]['value'] = 90
+    second = await orchestrator.optimize(
+        sample_problem, sample_constraints, base_request_id=first['request_id']
+    )
+    warm = second['metrics']['warm_start']
+    assert warm['base_request_id'] == first['request_id']
+    assert warm['delta']['rhs'] == 1 and warm['delta']['size'] == 1
+    assert warm['cold_solve_time'] == first['metrics']['solve_time']
+    assert warm['speedup'] > 0
+    assert second['metrics']['warm_started'] is True
+    assert second['evidence']['warm_start'] == warm
+
+    # Without base_request_id the latest solve with the same structure is used
+    sample_problem['constraints'][0]['value'] = 80
+    third = await orchestrator.optimize(sample_problem, sample_constraints)
+    assert third['metrics']['warm_start']['base_request_id'] == second['request_id']
+    assert third['metrics']['warm_start']['cold_solve_time'] == first['metrics']['solve_time']
+
+    # A different sparsity pattern is cold solved
+    sample_problem['constraints'][0]['coefficients'] = {'x1': 40, 'x2': 30}
+    fourth = await orchestrator.optimize(sample_problem, sample_constraints)
+    assert 'warm_start' not in fourth['metrics']
+    assert orchestrator.get_statistics()['warm_start']['warm_starts'] == 2
+    await orchestrator.close()
+
+
+def test_warm_start_cache_repairs_start_and_is_bounded():
+    """Test start repair to new bounds, delta limits and LRU eviction."""
+    from bridges.canonical import CanonicalProblem, CSRMatrix
+    from core.warm_start import WarmStartCache
+
+    def problem(upper, rhs):
+        return CanonicalProblem(
+            'assignment', ['a', 'b', 'c'],
+            np.zeros(3), np.array(upper, dtype=float), np.array([1, 1, 0], dtype=np.int8),
+            np.ones(3), CSRMatrix.from_coo([0, 0], [0, 1], [1.0, 1.0], (1, 3)),
+            np.zeros(1, dtype=np.int8), np.array([rhs], dtype=float)
+        )
+
+    cache = WarmStartCache({'max_entries': 2, 'max_delta': 0.5})
+    cache.retain('r1', problem([5, 5, 5], 8.0), {'a': 4.0, 'b': 4.0, 'c': 2.5}, 2.0)
+
+    warm = cache.lookup(problem([3, 5, 5], 8.0))
+    assert warm['base_request_id'] == 'r1'
+    assert warm['start'].tolist() == [3.0, 4.0, 2.5]
+    assert warm['delta']['bounds'] == 1 and warm['delta']['repaired'] == 1
+    assert cache.lookup(problem([1, 1, 1], 1.0)) is None  # too many changes
+
+    cache.retain('r2', problem([5, 5, 5], 7.0), {'a': 1.0}, 1.0, warm_start=warm)
+    cache.retain('r3', problem([5, 5, 5], 6.0), {'a': 1.0}, 1.0)
+    assert cache.get_statistics()['entries'] == 2
+    assert cache.lookup(problem([5, 5, 5], 6.0), base_request_id='r1')['base_request_id'] == 'r3'
+    assert cache.lookup(problem([5, 5, 5], 7.0), base_request_id='r2')['cold_solve_time'] == 2.0
+
+
+
+@pytest.mark.asyncio
+async def test_decomposed_solve(edge_config, sample_constraints):
+    """Test that large separable problems are solved as parallel blocks."""
+    from benchmarks.qaim_bench import generate_problem
+    edge_config['decomposition'] = {'enabled': True, 'min_variables': 100, 'max_blocks': 4}
+    edge_config['pipeline']['stage_concurrency']['solve'] = 4
+    orchestrator = QAIM2Orchestrator(edge_config)
+
+    start = time.perf_counter()
+    result = await orchestrator.optimize(generate_problem('allocation', 160), sample_constraints)
+    elapsed = time.perf_counter() - start
+
+    assert result['status'] == 'optimal'
+    assert result['solver'] == 'decomposed'
+    decomposition = result['metrics']['decomposition']
+    assert decomposition['kind'] == 'independent'
+    assert decomposition['block_variables'] == [48, 48, 32, 32]
+    assert len(decomposition['solvers']) == 4
+    assert all(solver.startswith('cb_') for solver in decomposition['solvers'])
+    assert result['evidence']['decomposition'] == decomposition
+    assert elapsed < 4 * 0.2  # blocks run concurrently
+
+    # Linking rows the mock solvers cannot satisfy fall back to one solve
+    result = await orchestrator.optimize(generate_problem('routing', 160), sample_constraints)
+    assert result['status'] == 'optimal'
+    assert result['solver'] != 'decomposed'
+    assert 'decomposition' not in result['metrics']
+    stats = orchestrator.get_statistics()['decomposition']
+    assert stats['decomposed'] == 2 and stats['fallbacks'] == 1
+    await orchestrator.close()
+
+
+
+@pytest.mark.asyncio
+async def test_submitted_job_streams_incumbents_and_cancels(edge_config, sample_problem, sample_constraints):
+    """Test submit/poll/wait, incumbent streaming from a QB run and cancellation."""
+    from core.qaim_orchestrator import OptimizationResult
+    orchestrator = QAIM2Orchestrator(edge_config)
+
+    job_id = await orchestrator.submit(sample_problem, sample_constraints, {'client': 'a'})
+    record = await orchestrator.wait(job_id, timeout=10)
+    assert record['status'] == 'completed' and record['metadata'] == {'client': 'a'}
+    assert record['result']['status'] == 'optimal' and record['result']['request_id']
+    assert orchestrator.poll(job_id, include_result=False)['status'] == 'completed'
+
+    # A long QB run: incumbents reported from the worker thread, stopped on cancel
+    stopped = []
+
+    async def long_qb(problem, params):
+        def run():
+            for k in range(3):
+                params['on_incumbent']({'objective_value': 10.0 - k, 'solution': {'x1': k}})
+            stopped.append(params['cancel_event'].wait(10))
+        await asyncio.to_thread(run)
+        return OptimizationResult('feasible', {}, {'feasible': True})
+
+    async def select_qb(canonical, constraints, base_request_id=None):
+        return 'qb_lifted', await orchestrator._solve('qb_lifted', {}, {})
+
+    orchestrator.qb_pool.solve = long_qb
+    orchestrator._select_and_solve = select_qb
+    job_id = await orchestrator.submit(sample_problem, sample_constraints)
+    incumbents = []
+    async for incumbent in orchestrator.stream(job_id):
+        incumbents.append(incumbent)
+        if len(incumbents) == 3:
+            break
+    assert [i['seq'] for i in incumbents] == [1, 2, 3]
+    assert incumbents[-1]['objective_value'] == 8.0 and incumbents[-1]['solver'] == 'qb_lifted'
+    assert orchestrator.poll(job_id)['status'] == 'running'
+    assert orchestrator.poll(job_id)['incumbent']['seq'] == 3
+
+    assert await orchestrator.cancel(job_id)
+    assert orchestrator.poll(job_id)['status'] == 'cancelled'
+    assert not await orchestrator.cancel(job_id)
+    await asyncio.sleep(0.1)
+    assert stopped == [True]
+    assert [i['seq'] async for i in orchestrator.stream(job_id, after=1)] == [2, 3]
+    stats = orchestrator.get_statistics()['jobs']
+    assert stats['completed'] == 1 and stats['cancelled'] == 1
+    await orchestrator.close()
+
+
+@pytest.mark.asyncio
+async def test_job_table_is_bounded_and_persistent(tmp_path):
+    """Test that the job table evicts finished jobs, rejects when full and reloads."""
+    from core.jobs import JobManager, JobTableFull
+    path = tmp_path / 'jobs'
+    jobs = JobManager({'max_jobs': 2, 'path': str(path)})
+    release = asyncio.Event()
+
+    async def blocked(job):
+        await release.wait()
+        return {'status': 'optimal'}
+
+    first = jobs.submit(blocked)
+    second = jobs.submit(blocked, {'client': 'b'})
+    with pytest.raises(JobTableFull):
+        jobs.submit(blocked)
+    release.set()
+    assert (await jobs.wait(first))['result'] == {'status': 'optimal'}
+    await jobs.wait(second)
+
+    release.clear()
+    third = jobs.submit(blocked)  # evicts the oldest finished job
+    await asyncio.sleep(0)
+    assert json.loads((path / f'{third}.json').read_text())['status'] == 'running'
+    assert jobs.get(first) is None and jobs.get(second)['status'] == 'completed'
+    assert jobs.get_statistics()['evictions'] == 1 and jobs.get_statistics()['rejected'] == 1
+    assert sorted(p.stem for p in path.glob('*.json')) == sorted([second, third])
+    with pytest.raises(asyncio.TimeoutError):
+        await jobs.wait(third, timeout=0.05)
+
+    # A restart reloads finished results; live jobs come back interrupted
+    reloaded = JobManager({'max_jobs': 2, 'path': str(path)})
+    assert reloaded.get(second)['result'] == {'status': 'optimal'}
+    assert reloaded.get(second)['metadata'] == {'client': 'b'}
+    assert reloaded.get(third)['status'] == 'interrupted'
+    assert [job['job_id'] for job in reloaded.list_jobs('interrupted')] == [third]
+    await jobs.close()
+    assert jobs.get(third)['status'] == 'cancelled'
+
+    # Retention prunes are counted apart from evictions
+    jobs.retention_seconds = 1e-6
+    release.set()
+    await jobs.wait(jobs.submit(blocked))
+    stats = jobs.get_statistics()
+    assert stats['expired'] == 2 and stats['evictions'] == 1 and stats['jobs'] == 1
+
+
 if __name__ == '__main__':
     pytest.main([__file__, '-v'])
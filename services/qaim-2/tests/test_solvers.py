@@ -0,0 +1,446 @@
+"""
+Test QAIM-2 Solver Pools
+
+Tests for CB, QB and QC solver pools and their execution backends.
+"""
+
+import asyncio
+import itertools
+import threading
+import time
+
+import numpy as np
+import pytest
+
+from bridges.canonical import CSRMatrix
+from bridges.pcan import ProblemCanonicalizer
+from bridges.cross_framework import CrossFrameworkTranslator
+from solvers.cb_pool import ClassicalSolverPool
+from solvers.qb_pool import CubicBitSolverPool
+from solvers.tensor_engine import SparseTensor, cp_als
+from solvers import lifted_engine
+from solvers.lifted_engine import solve_lp
+from solvers.qc_gateway import QuantumGateway
+from solvers import qubo_sampler
+from solvers.qubo_sampler import CouplingPlan, QUBOSampler, SampleSet, sample_qubo
+from solvers.qaoa_simulator import _Statevector, diagonal_energies
+from bridges.qubo import SparseQUBO
+
+
+def process_pool_config(**overrides):
+    """CB pool config with CBC and GLPK on the process executor."""
+    cbc = {'name': 'cbc', 'enabled': True, 'time_limit': 10, 'threads': 1,
+           'executor': 'process', 'workers': 2}
+    cbc.update(overrides)
+    glpk = {'name': 'glpk', 'enabled': True, 'time_limit': 10, 'threads': 1}
+    return [cbc, glpk]
+
+
+@pytest.mark.asyncio
+async def test_cb_process_executor_returns_result():
+    """Test that process-backed solvers return pickled results."""
+    pool = ClassicalSolverPool(process_pool_config())
+
+    result = await pool.solve({'type': 'mip'}, {'solver_name': 'cb_cbc'})
+
+    assert result.status == 'optimal'
+    assert result.objective_value == pytest.approx(10.8)
+
+    stats = pool.get_statistics()['executor']
+    assert stats == {'cb_cbc': {'workers': 2, 'in_flight': 0, 'completed': 1, 'killed': 0}}
+
+
+@pytest.mark.asyncio
+async def test_cb_process_executor_kills_on_time_limit():
+    """Test that a worker past its time limit is killed and reports timeout."""
+    pool = ClassicalSolverPool(process_pool_config(time_limit=0.05))
+
+    result = await pool.solve({'type': 'mip'}, {'solver': 'cb_cbc'})
+
+    assert result.status == 'timeout'
+    assert not result.feasible
+    assert pool.get_statistics()['executor']['cb_cbc']['killed'] == 1
+
+
+@pytest.mark.asyncio
+async def test_cb_process_executor_runs_concurrently():
+    """Test that worker slots run solves in parallel with the event loop."""
+    pool = ClassicalSolverPool(process_pool_config())
+    ticks = 0
+
+    async def ticker():
+        nonlocal ticks
+        while True:
+            ticks += 1
+            await asyncio.sleep(0.01)
+
+    tick_task = asyncio.create_task(ticker())
+    start = time.perf_counter()
+    results = await asyncio.gather(*[
+        pool.solve({'type': 'mip'}, {'solver': 'cb_cbc'}) for _ in range(2)
+    ])
+    elapsed = time.perf_counter() - start
+    tick_task.cancel()
+
+    assert [r.status for r in results] == ['optimal', 'optimal']
+    assert elapsed < 0.4  # two 0.2 s solves overlap
+    assert ticks > 5
+
+
+def binary_qubo_problem(n=12, seed=3):
+    """Random sparse binary quadratic problem with a cardinality constraint."""
+    rng = np.random.default_rng(seed)
+    coefficients = {f'x{i}': float(rng.normal()) for i in range(n)}
+    for i, j in itertools.combinations(range(n), 2):
+        if rng.random() < 0.4:
+            coefficients[f'x{i}*x{j}'] = float(rng.normal())
+    return {
+        'problem_type': 'general_qubo',
+        'variables': [{'name': f'x{i}', 'type': 'binary'} for i in range(n)],
+        'constraints': [{'type': 'cardinality', 'sense': '<=', 'rhs': 4,
+                         'coefficients': {f'x{i}': 1 for i in range(n)}}],
+        'objectives': [{'sense': 'minimize', 'coefficients': coefficients}]
+    }
+
+
+@pytest.mark.asyncio
+async def test_sparse_tensor_kernels_and_cp_als():
+    """Test the cubic QUBO form and the batched MTTKRP/TTMc kernels against dense math."""
+    canonical = await ProblemCanonicalizer({}).canonicalize(binary_qubo_problem())
+    qb_problem = await CrossFrameworkTranslator({}).translate(canonical, 'qb_tensor')
+    qubo = qb_problem['tensor_data']['qubo']
+    tensor = SparseTensor.from_qubo(qubo)
+    assert tensor.shape == qb_problem['tensor_shape'] == (qubo.num_variables + 1,) * 3
+    assert tensor.nnz == qb_problem['tensor_data']['nnz']
+
+    rng = np.random.default_rng(0)
+    x = rng.integers(0, 2, qubo.num_variables).astype(float)
+    assert tensor.contract(np.r_[1.0, x]) == pytest.approx(qubo.energy(x))
+
+    dense = np.zeros(tensor.shape)
+    np.add.at(dense, tensor.indices, tensor.values)
+    factors = [rng.normal(size=(dim, 3)) for dim in tensor.shape]
+    assert np.allclose(tensor.mttkrp(factors, 1), np.einsum('ijk,ir,kr->jr', dense, factors[0], factors[2]))
+    assert np.allclose(
+        tensor.ttmc(factors, 0),
+        np.einsum('ijk,ja,kb->iab', dense, factors[1], factors[2]).reshape(tensor.shape[0], -1)
+    )
+
+    # An exactly rank-2 tensor is recovered
+    a, b, c = (rng.normal(size=(6, 2)) for _ in range(3))
+    low_rank = np.einsum('ir,jr,kr->ijk', a, b, c)
+    decomposition = cp_als(SparseTensor(np.nonzero(low_rank), low_rank[np.nonzero(low_rank)], (6, 6, 6)),
+                           rank=2, max_iterations=500, tolerance=1e-10)
+    assert decomposition['fit'] > 0.999
+    assert decomposition['converged']
+
+
+@pytest.mark.asyncio
+async def test_qb_tensor_solves_small_problem():
+    """Test that CP and Tucker engines reach the brute-force optimum, exact and sketched."""
+    canonical = await ProblemCanonicalizer({}).canonicalize(binary_qubo_problem())
+    qb_problem = await CrossFrameworkTranslator({}).translate(canonical, 'qb_tensor')
+    optimum = min(
+        canonical.objective_value(np.array(bits, dtype=float))
+        for bits in itertools.product([0, 1], repeat=12) if sum(bits) <= 4
+    )
+    params = {'time_limit': 10, 'max_iterations': 100, 'convergence_threshold': 1e-6}
+
+    for tensor_config in ({}, {'format': 'tucker', 'rank': 6}):
+        pool = CubicBitSolverPool({'enabled': True, 'tensor': tensor_config})
+        result = await pool.solve(qb_problem, params)
+        assert result.feasible and result.status in ('optimal', 'feasible')
+        assert result.objective_value == pytest.approx(optimum)
+        assert sum(result.solution.values()) <= 4
+        assert result.metrics['tensor']['mode'] == 'exact'
+        assert 0 < result.metrics['tensor']['fit'] <= 1
+
+    # A dense copy would not fit the budget: randomized ALS on sketches
+    pool = CubicBitSolverPool({'enabled': True, 'tensor': {'memory_budget_mb': 0, 'sketch_size': 200}})
+    warm = {'start': np.ones(12)}
+    result = await pool.solve(qb_problem, dict(params, warm_start=warm))
+    assert result.metrics['tensor']['mode'] == 'sketched'
+    assert result.metrics['warm_started'] and result.feasible
+    assert result.iterations <= 100
+
+
+def test_solve_lp_interior_point():
+    """Test the NumPy interior point on bounded, free and infeasible LPs."""
+    inf = np.inf
+
+    # max 3x + 2y s.t. x + y <= 4, x + 3y <= 6, x <= 3 -> (3, 1)
+    result = solve_lp(np.array([-3.0, -2.0]), np.array([[1.0, 1.0], [1.0, 3.0]]), np.array([0, 0]),
+                      np.array([4.0, 6.0]), np.zeros(2), np.array([3.0, inf]))
+    assert result['status'] == 'optimal'
+    assert np.allclose(result['x'], [3.0, 1.0], atol=1e-6)
+    assert result['bound'] == pytest.approx(-11.0, abs=1e-6)
+
+    # Free variable and a >= row
+    result = solve_lp(np.array([1.0]), np.array([[1.0]]), np.array([1]), np.array([-2.0]),
+                      np.array([-inf]), np.array([inf]))
+    assert result['objective'] == pytest.approx(-2.0, abs=1e-6)
+
+    result = solve_lp(np.array([1.0, 1.0]), np.array([[1.0, 1.0]]), np.array([0]), np.array([-1.0]),
+                      np.zeros(2), np.full(2, inf))
+    assert result['status'] == 'infeasible'
+
+
+def test_solve_lp_conjugate_gradient_and_deadline(monkeypatch):
+    """Test the matrix-free normal equations against the dense path, and the LP deadline."""
+    rng = np.random.default_rng(4)
+    m, n = 60, 80
+    A = np.where(rng.random((m, n)) < 0.1, rng.normal(size=(m, n)), 0.0)
+    c = rng.normal(size=n)
+    row_sense = rng.integers(0, 3, m).astype(np.int8)
+    rhs = A @ rng.uniform(0.2, 0.8, n)
+    dense = solve_lp(c, A, row_sense, rhs, np.zeros(n), np.ones(n))
+    assert dense['status'] == 'optimal' and dense['cg_iterations'] == 0
+
+    monkeypatch.setattr(lifted_engine, 'DENSE_ROWS', 0)
+    sparse = solve_lp(c, CSRMatrix.from_coo(*np.nonzero(A), A[np.nonzero(A)], A.shape),
+                      row_sense, rhs, np.zeros(n), np.ones(n))
+    assert sparse['status'] == 'optimal' and sparse['cg_iterations'] > 0
+    assert sparse['objective'] == pytest.approx(dense['objective'], abs=1e-6)
+    assert sparse['bound'] == pytest.approx(dense['bound'], abs=1e-6)
+
+    started = time.monotonic()
+    result = solve_lp(c, A, row_sense, rhs, np.zeros(n), np.ones(n), deadline=started)
+    assert result['status'] == 'time_limit' and result['bound'] is None
+    assert result['iterations'] == 1
+
+
+@pytest.mark.asyncio
+async def test_qb_lifted_bound_gap_and_cuts():
+    """Test that the lifted relaxation bounds the optimum and tightens with separated cuts."""
+    canonical = await ProblemCanonicalizer({}).canonicalize(binary_qubo_problem(n=25, seed=2))
+    qb_problem = await CrossFrameworkTranslator({}).translate(canonical, 'qb_lifted')
+    pairs = qb_problem['lifted_pairs']
+    assert len(qb_problem['lifted_vars']) == len(pairs) == len(canonical.obj_quad[2])
+    assert qb_problem['lifted_vars'][0]['factors'] == tuple(canonical.names[k] for k in pairs[0])
+
+    bits = np.array([
+        [1.0 if k in chosen else 0.0 for k in range(25)]
+        for size in range(5) for chosen in itertools.combinations(range(25), size)
+    ])
+    optimum = min(canonical.objective_value(x) for x in bits)
+
+    pool = CubicBitSolverPool({'enabled': True})
+    incumbents = []
+    result = await pool.solve(
+        qb_problem, {'time_limit': 30, 'gap_tolerance': 1e-4, 'on_incumbent': incumbents.append}
+    )
+    lifted = result.metrics['lifted']
+    assert lifted['bound'] <= optimum + 1e-6
+    assert incumbents and incumbents[-1]['objective_value'] == pytest.approx(result.objective_value)
+    assert all(b['objective_value'] < a['objective_value'] for a, b in zip(incumbents, incumbents[1:]))
+    assert result.feasible and result.objective_value == pytest.approx(optimum)
+    assert result.status == 'optimal' and result.gap <= 1e-4
+    assert lifted['cuts']['triangle'] > 0
+    bounds = [entry['bound'] for entry in lifted['history']]
+    assert len(bounds) == lifted['rounds'] >= 2
+    assert all(b2 >= b1 - 1e-9 for b1, b2 in zip(bounds, bounds[1:]))
+
+    # Continuous bilinear terms: bound below the incumbent, tangent cuts for the square
+    problem = {
+        'problem_type': 'qp',
+        'variables': [
+            {'name': 'x', 'type': 'continuous', 'lower_bound': 0, 'upper_bound': 4},
+            {'name': 'y', 'type': 'continuous', 'lower_bound': -1, 'upper_bound': 3},
+            {'name': 'z', 'type': 'integer', 'lower_bound': 0, 'upper_bound': 5}
+        ],
+        'constraints': [
+            {'type': 'linear', 'sense': '<=', 'rhs': 6, 'coefficients': {'x': 1, 'y': 1, 'z': 1}},
+            {'type': 'quadratic', 'sense': '>=', 'rhs': 1, 'coefficients': {'x*z': 1}}
+        ],
+        'objectives': [{'sense': 'minimize', 'coefficients': {'x*y': -1, 'y*y': 1, 'z': -0.5, 'x': 0.3}}]
+    }
+    canonical = await ProblemCanonicalizer({}).canonicalize(problem)
+    qb_problem = await CrossFrameworkTranslator({}).translate(canonical, 'qb_lifted')
+    result = await pool.solve(qb_problem, {'time_limit': 30})
+    lifted = result.metrics['lifted']
+    assert result.feasible and canonical.max_violation(np.array(list(result.solution.values()))) <= 1e-6
+    assert lifted['lifted_variables'] == 3
+    assert lifted['cuts']['tangent'] > 0
+    assert lifted['bound'] <= result.objective_value
+    assert lifted['history'][-1]['gap'] == pytest.approx(result.gap)
+
+
+def test_qubo_sampler_kernels():
+    """Test batched local fields, annealing and tabu reads, and sample set aggregation."""
+    rng = np.random.default_rng(2)
+    n = 16
+    rows, cols = np.triu_indices(n, 1)
+    keep = rng.random(rows.size) < 0.3
+    qubo = SparseQUBO(rng.normal(size=n), rows[keep], cols[keep], rng.normal(size=int(keep.sum())))
+    states = np.array(list(itertools.product([0, 1], repeat=n)), dtype=np.int8)
+    optimum = qubo.energy(states).min()
+
+    # Dense and padded/segmented sparse field updates agree with Q x
+    X = rng.integers(0, 2, size=(n, 5)).astype(float)
+    expected = qubo.linear[:, None] + qubo.adjacency().to_dense() @ X
+    plan = CouplingPlan(qubo)
+    assert plan.dense and np.allclose(plan.fields(X), expected)
+    plan.dense = False
+    plan._segments = [plan._segment(members) for members in plan.classes]
+    assert np.allclose(plan.fields(X), expected)
+
+    for method in ('sa', 'tabu'):
+        sampleset = sample_qubo(qubo, method, 50, {'num_sweeps': 200, 'num_iterations': 100}, seed=3)
+        assert sampleset.num_reads == 50
+        assert sampleset.first[1] == pytest.approx(optimum)
+        assert np.all(np.diff(sampleset.energies) >= 0)
+        assert np.allclose(sampleset.energies, qubo.energy(sampleset.samples))
+        assert len(np.unique(sampleset.samples, axis=0)) == len(sampleset)
+
+    merged = SampleSet.concatenate([sampleset, sampleset])
+    assert merged.num_reads == 100 and len(merged) == len(sampleset)
+    assert merged.data(1)[0]['num_occurrences'] == 2 * sampleset.first[2]
+
+
+@pytest.mark.asyncio
+async def test_qc_annealing_runs_on_local_sampler():
+    """Test that qc_annealing samples on the local provider across worker processes."""
+    canonical = await ProblemCanonicalizer({}).canonicalize(binary_qubo_problem())
+    problem = await CrossFrameworkTranslator({}).translate(canonical, 'qc_annealing')
+    optimum = min(
+        canonical.objective_value(np.array(bits, dtype=float))
+        for bits in itertools.product([0, 1], repeat=12) if sum(bits) <= 4
+    )
+    gateway = QuantumGateway({
+        'enabled': True,
+        'algorithms': ['quantum_annealing'],
+        'providers': [{'name': 'local', 'type': 'local_sampler', 'method': 'tabu',
+                       'num_iterations': 200, 'workers': 2, 'min_chunk_reads': 16, 'seed': 1}]
+    })
+    try:
+        result = await gateway.solve(problem, {'num_reads': 64})
+        assert result.feasible and result.status in ('optimal', 'feasible')
+        assert result.objective_value == pytest.approx(optimum)
+        assert sum(result.solution.values()) <= 4 and set(result.solution) == set(canonical.names)
+        assert result.shots == result.sampleset.num_reads == 64
+        assert result.metrics['sampleset']['workers'] == 2
+        assert gateway.get_statistics()['local']['reads'] == 64
+
+        # Fewer reads than a chunk run on a thread; unknown providers fail cleanly
+        small = await gateway.solve(problem, {'num_reads': 8})
+        assert small.sampleset.num_reads == 8 and small.metrics['sampleset']['workers'] == 1
+        missing = await gateway.solve(problem, {'provider': 'dwave'})
+        assert missing.status == 'error'
+    finally:
+        gateway.close()
+
+
+@pytest.mark.asyncio
+async def test_qubo_sampler_stops_on_deadline_and_cancel():
+    """Test that reads stop at the time limit or on cancellation, on threads and worker processes."""
+    rng = np.random.default_rng(5)
+    n = 300
+    rows, cols = np.triu_indices(n, 1)
+    keep = rng.random(rows.size) < 0.05
+    qubo = SparseQUBO(rng.normal(size=n), rows[keep], cols[keep], rng.normal(size=int(keep.sum())))
+    endless = {'num_sweeps': 10 ** 7, 'workers': 2, 'min_chunk_reads': 4, 'seed': 0}
+
+    # Thread path: an already-set cancel event stops after the first sweep
+    event = threading.Event()
+    event.set()
+    sampleset = await QUBOSampler(endless).sample(qubo, 4, cancel_event=event)
+    assert sampleset.info['stopped'] and sampleset.num_reads == 4
+
+    sampler = QUBOSampler(endless)
+    try:
+        started = time.monotonic()
+        sampleset = await sampler.sample(qubo, 8, time_limit=1.0)
+        assert sampleset.info['stopped'] and sampleset.info['workers'] == 2
+        assert time.monotonic() - started < 10
+        assert np.allclose(sampleset.energies, qubo.energy(sampleset.samples))
+
+        # Cancelling the request stops the running chunks and frees their slot
+        task = asyncio.create_task(sampler.sample(qubo, 8))
+        await asyncio.sleep(0.5)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        for _ in range(100):
+            if len(sampler._free_slots) == qubo_sampler.STOP_SLOTS:
+                break
+            await asyncio.sleep(0.1)
+        assert len(sampler._free_slots) == qubo_sampler.STOP_SLOTS
+        assert sampler.get_statistics()['stopped'] == 1
+
+        # close() does not wait for running chunks
+        task = asyncio.create_task(sampler.sample(qubo, 8))
+        await asyncio.sleep(0.5)
+        started = time.monotonic()
+        sampler.close()
+        assert time.monotonic() - started < 1.0
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+    finally:
+        sampler.close()
+
+
+
+def test_qaoa_statevector_kernels():
+    """Test diagonal energies and batched QAOA layers against dense references."""
+    rng = np.random.default_rng(4)
+    n = 8
+    rows, cols = np.triu_indices(n, 1)
+    qubo = SparseQUBO(rng.normal(size=n), rows, cols, rng.normal(size=rows.size), 0.5)
+    states = ((np.arange(1 << n)[:, None] >> np.arange(n)) & 1).astype(np.int8)
+    energies = diagonal_energies(qubo)
+    assert np.allclose(energies, qubo.energy(states))
+
+    # Reference: e^{-iγE} then e^{-iβX} on each qubit as dense matrices
+    gammas, betas = np.array([[0.3, 0.7]]), np.array([[0.6, 0.2]])
+    psi = np.full(1 << n, 2 ** (-n / 2), dtype=complex)
+    for gamma, beta in zip(gammas[0], betas[0]):
+        psi = np.exp(-1j * gamma * energies) * psi
+        for k in range(n):
+            flipped = psi[np.arange(1 << n) ^ (1 << k)]
+            psi = np.cos(beta) * psi - 1j * np.sin(beta) * flipped
+
+    state = _Statevector(n, 4)
+    state.run(energies, np.vstack([gammas, 0 * gammas, gammas]), np.vstack([betas, 0 * betas, betas]))
+    assert np.allclose(state.psi[0], psi) and np.allclose(state.psi[2], psi)
+    assert np.allclose(state.psi[1], 2 ** (-n / 2))
+    exact = state.expectations(energies, 3, 0, rng)
+    assert exact[0] == pytest.approx(np.abs(psi) ** 2 @ energies)
+    assert exact[1] == pytest.approx(energies.mean())
+    assert state.expectations(energies, 1, 20000, rng)[0] == pytest.approx(exact[0], abs=0.1)
+
+
+@pytest.mark.asyncio
+async def test_qc_qaoa_runs_on_statevector():
+    """Test that qc_qaoa optimizes angles on the statevector provider."""
+    canonical = await ProblemCanonicalizer({}).canonicalize(binary_qubo_problem())
+    problem = await CrossFrameworkTranslator({}).translate(canonical, 'qc_qaoa')
+    gateway = QuantumGateway({
+        'enabled': True,
+        'providers': [{'name': 'sv', 'type': 'statevector', 'max_evaluations': 36, 'seed': 1}]
+    })
+    result = await gateway.solve(problem, {'shots': 1024})
+    run = result.metrics['qaoa']
+    assert result.status in ('optimal', 'feasible') and result.feasible
+    assert set(result.solution) == set(canonical.names) and sum(result.solution.values()) <= 4
+    assert result.shots == result.sampleset.num_reads == 1024
+    assert run['qubits'] == problem['qubo']['num_variables'] and run['evaluations'] <= 36
+    assert len(run['gammas']) == len(run['betas']) == problem['num_layers']
+    assert result.quantum_time == run['simulate_time'] > 0
+    assert gateway.get_statistics()['sv']['runs'] == 1
+
+    # Exact expectations still read out samples; oversized problems fail cleanly
+    exact = await gateway.solve(problem, {'shots': 0})
+    assert exact.status != 'error' and exact.shots == 1024
+    assert gateway.get_statistics()['sv']['evaluations'] == run['evaluations'] + exact.metrics['qaoa']['evaluations']
+    small = QuantumGateway({'enabled': True, 'providers': [{'name': 'sv', 'type': 'statevector', 'max_qubits': 10}]})
+    oversized = await small.solve(problem, {})
+    assert oversized.status == 'error' and 'qubits' in oversized.metrics['error']
+    assert small.max_qubits() == 10 and QuantumGateway({'enabled': True}).max_qubits() == 0
+
+    # Improving angle-search passes stream strictly improving incumbents
+    incumbents = []
+    reported = await gateway.solve(problem, {'shots': 0, 'on_incumbent': incumbents.append})
+    energies = [incumbent['energy'] for incumbent in incumbents]
+    assert reported.metrics['qaoa']['passes'] >= 1 and energies
+    assert energies == sorted(energies, reverse=True) and len(set(energies)) == len(energies)
+    assert set(incumbents[-1]['solution']) == set(canonical.names)